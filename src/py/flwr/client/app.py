@@ -27,8 +27,11 @@ from flwr.client.clientapp import ClientApp
 from flwr.client.typing import ClientFn
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH, EventType, Message, event
 from flwr.common.address import parse_address
+from flwr.common.compression import available_compressions
 from flwr.common.constant import (
     MISSING_EXTRA_REST,
+    PULL_TASK_INS_INTERVAL,
+    PULL_TASK_INS_TIMEOUT,
     TRANSPORT_TYPE_GRPC_BIDI,
     TRANSPORT_TYPE_GRPC_RERE,
     TRANSPORT_TYPE_REST,
@@ -103,6 +106,7 @@ def run_client_app() -> None:
         transport="rest" if args.rest else "grpc-rere",
         root_certificates=root_certificates,
         insecure=args.insecure,
+        compression=args.compression,
     )
     event(EventType.RUN_CLIENT_APP_LEAVE)
 
@@ -140,6 +144,13 @@ def _parse_args_run_client_app() -> argparse.ArgumentParser:
         default="0.0.0.0:9092",
         help="Server address",
     )
+    parser.add_argument(
+        "--compression",
+        choices=available_compressions(),
+        default=None,
+        help="Compress large messages exchanged with the server. gRPC supports "
+        "`gzip` and `deflate`, REST additionally `zstd` and `lz4` if installed.",
+    )
     parser.add_argument(
         "--dir",
         default="",
@@ -179,6 +190,7 @@ def start_client(
     root_certificates: Optional[Union[bytes, str]] = None,
     insecure: Optional[bool] = None,
     transport: Optional[str] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -212,6 +224,10 @@ def start_client(
         - 'grpc-bidi': gRPC, bidirectional streaming
         - 'grpc-rere': gRPC, request-response (experimental)
         - 'rest': HTTP (experimental)
+    compression : Optional[str] (default: None)
+        Compress messages of at least 1024 bytes exchanged with the server.
+        Allowed values: 'gzip' and 'deflate', and for 'rest' also 'zstd' and
+        'lz4' if the `zstandard` or `lz4` package is installed.
 
     Examples
     --------
@@ -253,6 +269,7 @@ def start_client(
         root_certificates=root_certificates,
         insecure=insecure,
         transport=transport,
+        compression=compression,
     )
     event(EventType.START_CLIENT_LEAVE)
 
@@ -271,6 +288,7 @@ def _start_client_internal(
     root_certificates: Optional[Union[bytes, str]] = None,
     insecure: Optional[bool] = None,
     transport: Optional[str] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -306,6 +324,8 @@ def _start_client_internal(
         - 'grpc-bidi': gRPC, bidirectional streaming
         - 'grpc-rere': gRPC, request-response (experimental)
         - 'rest': HTTP (experimental)
+    compression : Optional[str] (default: None)
+        Compress messages of at least 1024 bytes exchanged with the server.
     """
     if insecure is None:
         insecure = root_certificates is None
@@ -348,6 +368,7 @@ def _start_client_internal(
             insecure,
             grpc_max_message_length,
             root_certificates,
+            compression,
         ) as conn:
             receive, send, create_node, delete_node = conn
 
@@ -356,10 +377,13 @@ def _start_client_internal(
                 create_node()  # pylint: disable=not-callable
 
             while True:
-                # Receive
+                # Receive, the Fleet API waits for messages (long polling)
+                receive_time = time.time()
                 message = receive()
                 if message is None:
-                    time.sleep(3)  # Wait for 3s before asking again
+                    # Wait before asking again if the Fleet API did not wait
+                    if time.time() - receive_time < PULL_TASK_INS_TIMEOUT:
+                        time.sleep(PULL_TASK_INS_INTERVAL)
                     continue
 
                 # Handle control message
@@ -510,7 +534,7 @@ def _init_connection(
     transport: Optional[str], server_address: str
 ) -> Tuple[
     Callable[
-        [str, bool, int, Union[bytes, str, None]],
+        [str, bool, int, Union[bytes, str, None], Optional[str]],
         ContextManager[
             Tuple[
                 Callable[[], Optional[Message]],
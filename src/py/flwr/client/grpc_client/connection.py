@@ -59,6 +59,7 @@ def grpc_connection(  # pylint: disable=R0915
     insecure: bool,
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     root_certificates: Optional[Union[bytes, str]] = None,
+    compression: Optional[str] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -87,6 +88,9 @@ def grpc_connection(  # pylint: disable=R0915
         The PEM-encoded root certificates as a byte string or a path string.
         If provided, a secure connection using the certificates will be
         established to an SSL-enabled Flower server.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip" or "deflate") for requests of at least
+        1024 bytes. The server may compress its responses with it as well.
 
     Returns
     -------
@@ -115,6 +119,7 @@ def grpc_connection(  # pylint: disable=R0915
         insecure=insecure,
         root_certificates=root_certificates,
         max_message_length=max_message_length,
+        compression=compression,
     )
     channel.subscribe(on_channel_state_change)
 
@@ -21,10 +21,14 @@ from logging import DEBUG, ERROR
 from pathlib import Path
 from typing import Callable, Dict, Iterator, Optional, Tuple, Union, cast
 
+import grpc
+
 from flwr.client.message_handler.message_handler import validate_out_message
 from flwr.client.message_handler.task_handler import get_task_ins, validate_task_ins
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
-from flwr.common.grpc import create_channel
+from flwr.common.chunk import assemble_tasks, task_to_chunks
+from flwr.common.constant import PULL_TASK_INS_TIMEOUT
+from flwr.common.grpc import create_channel, is_unimplemented
 from flwr.common.logger import log, warn_experimental_feature
 from flwr.common.message import Message, Metadata
 from flwr.common.serde import message_from_taskins, message_to_taskres
@@ -36,10 +40,11 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
 )
 from flwr.proto.fleet_pb2_grpc import FleetStub  # pylint: disable=E0611
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
-from flwr.proto.task_pb2 import TaskIns  # pylint: disable=E0611
+from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 
 KEY_NODE = "node"
 KEY_METADATA = "in_message_metadata"
+KEY_STREAMING = "streaming"
 
 
 def on_channel_state_change(channel_connectivity: str) -> None:
@@ -48,11 +53,12 @@ def on_channel_state_change(channel_connectivity: str) -> None:
 
 
 @contextmanager
-def grpc_request_response(
+def grpc_request_response(  # pylint: disable=too-many-locals,too-many-statements
     server_address: str,
     insecure: bool,
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,  # pylint: disable=W0613
     root_certificates: Optional[Union[bytes, str]] = None,
+    compression: Optional[str] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -78,6 +84,9 @@ def grpc_request_response(
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip" or "deflate") for requests of at least
+        1024 bytes. The server may compress its responses with it as well.
 
     Returns
     -------
@@ -96,6 +105,7 @@ def grpc_request_response(
         insecure=insecure,
         root_certificates=root_certificates,
         max_message_length=max_message_length,
+        compression=compression,
     )
     channel.subscribe(on_channel_state_change)
     stub = FleetStub(channel)
@@ -106,6 +116,9 @@ def grpc_request_response(
     # Enable create_node and delete_node to store node
     node_store: Dict[str, Optional[Node]] = {KEY_NODE: None}
 
+    # Stream tasks in chunks unless the server does not support it
+    rpc_store: Dict[str, bool] = {KEY_STREAMING: True}
+
     ###########################################################################
     # receive/send functions
     ###########################################################################
@@ -131,6 +144,31 @@ def grpc_request_response(
 
         del node_store[KEY_NODE]
 
+    def pull_task_ins(request: PullTaskInsRequest) -> Optional[TaskIns]:
+        """Pull the first available TaskIns, streamed in chunks if possible."""
+        if rpc_store[KEY_STREAMING]:
+            try:
+                chunks = assemble_tasks(stub.PullTaskInsStream(request=request))
+                task_ins_list = [chunk.task_ins for chunk in chunks]
+                return task_ins_list[0] if task_ins_list else None
+            except grpc.RpcError as err:
+                if not is_unimplemented(err):
+                    raise
+                rpc_store[KEY_STREAMING] = False
+        return get_task_ins(stub.PullTaskIns(request=request))
+
+    def push_task_res(task_res: TaskRes) -> None:
+        """Push a TaskRes, streamed in chunks if possible."""
+        if rpc_store[KEY_STREAMING]:
+            try:
+                stub.PushTaskResStream(task_to_chunks(task_res))
+                return
+            except grpc.RpcError as err:
+                if not is_unimplemented(err):
+                    raise
+                rpc_store[KEY_STREAMING] = False
+        stub.PushTaskRes(PushTaskResRequest(task_res_list=[task_res]))
+
     def receive() -> Optional[Message]:
         """Receive next task from server."""
         # Get Node
@@ -139,12 +177,9 @@ def grpc_request_response(
             return None
         node: Node = cast(Node, node_store[KEY_NODE])
 
-        # Request instructions (task) from server
-        request = PullTaskInsRequest(node=node)
-        response = stub.PullTaskIns(request=request)
-
-        # Get the current TaskIns
-        task_ins: Optional[TaskIns] = get_task_ins(response)
+        # Request instructions (task) from server, waiting for them if necessary
+        request = PullTaskInsRequest(node=node, timeout=PULL_TASK_INS_TIMEOUT)
+        task_ins: Optional[TaskIns] = pull_task_ins(request)
 
         # Discard the current TaskIns if not valid
         if task_ins is not None and not (
@@ -184,8 +219,7 @@ def grpc_request_response(
         task_res = message_to_taskres(message)
 
         # Serialize ProtoBuf to bytes
-        request = PushTaskResRequest(task_res_list=[task_res])
-        _ = stub.PushTaskRes(request)
+        push_task_res(task_res)
 
         state[KEY_METADATA] = None
 
@@ -15,10 +15,12 @@
 """Mods."""
 
 
+from .quantization_mod import make_quantization_mod
 from .secure_aggregation.secaggplus_mod import secaggplus_mod
 from .utils import make_ffn
 
 __all__ = [
     "make_ffn",
+    "make_quantization_mod",
     "secaggplus_mod",
 ]
@@ -0,0 +1,83 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Modifier quantizing the parameters sent by the client."""
+
+
+import numpy as np
+
+from flwr.client.typing import ClientAppCallable, Mod
+from flwr.common import (
+    Context,
+    Message,
+    ParametersRecord,
+    array_to_ndarray,
+    ndarray_to_array,
+)
+from flwr.common.constant import STYPE_NUMPY, STYPE_NUMPY_FP16, STYPE_NUMPY_RAW
+from flwr.common.parameter import QUANTIZED_STYPES
+
+RECORD_KEY_RESIDUAL_PREFIX = "quantization_mod.residual."
+
+
+def make_quantization_mod(
+    stype: str = STYPE_NUMPY_FP16, error_feedback: bool = True
+) -> Mod:
+    """Create a mod quantizing the floating-point Arrays in replies of the client.
+
+    The server restores them with `array_to_ndarray`, which all strategies use to
+    deserialize parameters. Arrays that are not floating-point, sparse, or deltas
+    are sent unchanged.
+
+    Parameters
+    ----------
+    stype : str (default: STYPE_NUMPY_FP16)
+        The quantized encoding: `STYPE_NUMPY_FP16`, `STYPE_NUMPY_BF16`, or
+        `STYPE_NUMPY_INT8`.
+    error_feedback : bool (default: True)
+        If True, the quantization error of each Array is kept in the `Context` and
+        added to the same Array in the next reply, so that it is not lost.
+    """
+    if stype not in QUANTIZED_STYPES:
+        raise ValueError(f"Unsupported quantized stype: {stype}")
+
+    def quantization_mod(
+        msg: Message, ctxt: Context, call_next: ClientAppCallable
+    ) -> Message:
+        out_msg = call_next(msg, ctxt)
+        for name, record in out_msg.content.parameters.items():
+            residual_key = f"{RECORD_KEY_RESIDUAL_PREFIX}{name}"
+            residuals = ctxt.state.parameters.get(residual_key, ParametersRecord())
+            for key, array in list(record.items()):
+                if array.stype not in (STYPE_NUMPY, STYPE_NUMPY_RAW):
+                    continue
+                ndarray = array_to_ndarray(array, copy=False)
+                if not np.issubdtype(ndarray.dtype, np.floating):
+                    continue
+                if not error_feedback:
+                    record[key] = ndarray_to_array(ndarray, stype=stype)
+                    continue
+
+                # Add the error of the previous quantization, keep the new one
+                if key in residuals and residuals[key].shape == list(ndarray.shape):
+                    ndarray = ndarray + array_to_ndarray(residuals[key], copy=False)
+                record[key] = ndarray_to_array(ndarray, stype=stype)
+                residuals[key] = ndarray_to_array(
+                    ndarray - array_to_ndarray(record[key], copy=False)
+                )
+            if error_feedback and len(residuals) > 0:
+                ctxt.state.set_parameters(residual_key, residuals)
+        return out_msg
+
+    return quantization_mod
@@ -0,0 +1,111 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the quantization mod."""
+
+
+import unittest
+from typing import OrderedDict
+
+import numpy as np
+
+from flwr.common import (
+    Context,
+    Message,
+    Metadata,
+    ParametersRecord,
+    RecordSet,
+    array_to_ndarray,
+    ndarray_to_array,
+)
+from flwr.common.constant import MESSAGE_TYPE_FIT, STYPE_NUMPY_INT8, STYPE_NUMPY_RAW
+
+from .quantization_mod import make_quantization_mod
+
+WEIGHTS = np.array([0.3, -0.7, 0.05, 1.0], dtype=np.float32)
+STEPS = np.array([1, 2, 3], dtype=np.int64)
+
+
+def _app(message: Message, context: Context) -> Message:
+    """Reply with the same float and integer arrays."""
+    record = ParametersRecord(
+        OrderedDict(
+            weights=ndarray_to_array(WEIGHTS),
+            steps=ndarray_to_array(STEPS),
+        )
+    )
+    content = RecordSet(parameters={"fitres.parameters": record})
+    return message.create_reply(content, ttl="")
+
+
+def _fit_message() -> Message:
+    return Message(
+        content=RecordSet(),
+        metadata=Metadata(
+            run_id=0,
+            message_id="",
+            group_id="",
+            src_node_id=0,
+            dst_node_id=0,
+            reply_to_message="",
+            ttl="",
+            message_type=MESSAGE_TYPE_FIT,
+        ),
+    )
+
+
+class TestQuantizationMod(unittest.TestCase):
+    """Tests for `make_quantization_mod`."""
+
+    def test_quantize_floating_point_arrays(self) -> None:
+        """Test that only floating-point arrays are quantized."""
+        # Prepare
+        mod = make_quantization_mod(STYPE_NUMPY_INT8, error_feedback=False)
+        context = Context(state=RecordSet())
+
+        # Execute
+        out_message = mod(_fit_message(), context, _app)
+
+        # Assert
+        record = out_message.content.parameters["fitres.parameters"]
+        self.assertEqual(record["weights"].stype, STYPE_NUMPY_INT8)
+        self.assertEqual(record["steps"].stype, STYPE_NUMPY_RAW)
+        np.testing.assert_allclose(
+            array_to_ndarray(record["weights"]), WEIGHTS, atol=1e-2
+        )
+        np.testing.assert_equal(array_to_ndarray(record["steps"]), STEPS)
+        self.assertEqual(context.state.parameters, {})
+
+    def test_error_feedback(self) -> None:
+        """Test that the quantization error is added to the next reply."""
+        # Prepare
+        mod = make_quantization_mod(STYPE_NUMPY_INT8)
+        context = Context(state=RecordSet())
+        num_rounds = 5
+
+        # Execute
+        total = np.zeros_like(WEIGHTS)
+        for _ in range(num_rounds):
+            out_message = mod(_fit_message(), context, _app)
+            record = out_message.content.parameters["fitres.parameters"]
+            total += array_to_ndarray(record["weights"])
+
+        # Assert
+        # The errors cancel out, except for the error of the last round
+        np.testing.assert_allclose(total, num_rounds * WEIGHTS, atol=1e-2)
+
+    def test_invalid_stype(self) -> None:
+        """Test that only quantized stypes are accepted."""
+        with self.assertRaises(ValueError):
+            make_quantization_mod(STYPE_NUMPY_RAW)
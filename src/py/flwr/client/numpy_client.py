@@ -68,9 +68,15 @@ Example
 
 
 class NumPyClient(ABC):
-    """Abstract base class for Flower clients using NumPy."""
+    """Abstract base class for Flower clients using NumPy.
+
+    Set `copy_parameters` to False to receive the parameters passed to `fit` and
+    `evaluate` as read-only NDArrays which share memory with the received message
+    instead of writable copies.
+    """
 
     context: Context
+    copy_parameters: bool = True
 
     def get_properties(self, config: Config) -> Dict[str, Scalar]:
         """Return a client's set of properties.
@@ -232,7 +238,9 @@ def _get_parameters(self: Client, ins: GetParametersIns) -> GetParametersRes:
 def _fit(self: Client, ins: FitIns) -> FitRes:
     """Refine the provided parameters using the locally held dataset."""
     # Deconstruct FitIns
-    parameters: NDArrays = parameters_to_ndarrays(ins.parameters)
+    parameters: NDArrays = parameters_to_ndarrays(
+        ins.parameters, copy=self.numpy_client.copy_parameters  # type: ignore
+    )
 
     # Train
     results = self.numpy_client.fit(parameters, ins.config)  # type: ignore
@@ -257,7 +265,9 @@ def _fit(self: Client, ins: FitIns) -> FitRes:
 
 def _evaluate(self: Client, ins: EvaluateIns) -> EvaluateRes:
     """Evaluate the provided parameters using the locally held dataset."""
-    parameters: NDArrays = parameters_to_ndarrays(ins.parameters)
+    parameters: NDArrays = parameters_to_ndarrays(
+        ins.parameters, copy=self.numpy_client.copy_parameters  # type: ignore
+    )
 
     results = self.numpy_client.evaluate(parameters, ins.config)  # type: ignore
     if not (
@@ -19,12 +19,13 @@ import sys
 from contextlib import contextmanager
 from copy import copy
 from logging import ERROR, INFO, WARN
-from typing import Callable, Dict, Iterator, Optional, Tuple, Union, cast
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union, cast
 
 from flwr.client.message_handler.message_handler import validate_out_message
 from flwr.client.message_handler.task_handler import get_task_ins, validate_task_ins
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
-from flwr.common.constant import MISSING_EXTRA_REST
+from flwr.common.compression import COMPRESSION_THRESHOLD, compress, decompress
+from flwr.common.constant import MISSING_EXTRA_REST, PULL_TASK_INS_TIMEOUT
 from flwr.common.logger import log
 from flwr.common.message import Message, Metadata
 from flwr.common.serde import message_from_taskins, message_to_taskres
@@ -48,6 +49,7 @@ except ModuleNotFoundError:
 
 KEY_NODE = "node"
 KEY_METADATA = "in_message_metadata"
+KEY_ACCEPT_ENCODING = "accept_encoding"
 
 
 PATH_CREATE_NODE: str = "api/v0/fleet/create-node"
@@ -57,14 +59,15 @@ PATH_PUSH_TASK_RES: str = "api/v0/fleet/push-task-res"
 
 
 @contextmanager
-# pylint: disable-next=too-many-statements
+# pylint: disable-next=too-many-statements,too-many-locals
 def http_request_response(
     server_address: str,
     insecure: bool,  # pylint: disable=unused-argument
-    max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,  # pylint: disable=W0613
+    max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     root_certificates: Optional[
         Union[bytes, str]
     ] = None,  # pylint: disable=unused-argument
+    compression: Optional[str] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -85,11 +88,15 @@ def http_request_response(
         If the Flower server runs on the same machine
         on port 8080, then `server_address` would be `"http://[::]:8080"`.
     max_message_length : int
-        Ignored, only present to preserve API-compatibility.
+        The maximum length of decompressed responses.
     root_certificates : Optional[Union[bytes, str]] (default: None)
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip", "deflate", "zstd" or "lz4") for request
+        and response bodies of at least 1024 bytes. Requests are only
+        compressed once the server announced that it accepts the algorithm.
 
     Returns
     -------
@@ -125,6 +132,44 @@ def http_request_response(
     # Enable create_node and delete_node to store node
     node_store: Dict[str, Optional[Node]] = {KEY_NODE: None}
 
+    # Compression algorithms the server announced to accept
+    server_store: Dict[str, List[str]] = {KEY_ACCEPT_ENCODING: []}
+
+    def post(path: str, data: bytes) -> Tuple[requests.Response, bytes]:
+        """Post serialized ProtoBuf, return the response and its decoded body."""
+        headers = {
+            "Accept": "application/protobuf",
+            "Content-Type": "application/protobuf",
+            "Accept-Encoding": compression or "identity",
+        }
+        if (
+            compression in server_store[KEY_ACCEPT_ENCODING]
+            and len(data) >= COMPRESSION_THRESHOLD
+        ):
+            data = compress(data, cast(str, compression))
+            headers["Content-Encoding"] = cast(str, compression)
+
+        # Read the raw body, `requests` would only decode some content encodings
+        with requests.post(
+            url=f"{base_url}/{path}",
+            headers=headers,
+            data=data,
+            verify=verify,
+            timeout=None,
+            stream=True,
+        ) as res:
+            content: bytes = res.raw.read(decode_content=False)
+
+        if "accept-encoding" in res.headers:
+            server_store[KEY_ACCEPT_ENCODING] = [
+                coding.strip().lower()
+                for coding in res.headers["accept-encoding"].split(",")
+            ]
+        content_encoding = res.headers.get("content-encoding", "identity").lower()
+        if content_encoding != "identity":
+            content = decompress(content, content_encoding, max_message_length)
+        return res, content
+
     ###########################################################################
     # receive/send functions
     ###########################################################################
@@ -134,16 +179,7 @@ def http_request_response(
         create_node_req_proto = CreateNodeRequest()
         create_node_req_bytes: bytes = create_node_req_proto.SerializeToString()
 
-        res = requests.post(
-            url=f"{base_url}/{PATH_CREATE_NODE}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=create_node_req_bytes,
-            verify=verify,
-            timeout=None,
-        )
+        res, content = post(PATH_CREATE_NODE, create_node_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -165,7 +201,7 @@ def http_request_response(
 
         # Deserialize ProtoBuf from bytes
         create_node_response_proto = CreateNodeResponse()
-        create_node_response_proto.ParseFromString(res.content)
+        create_node_response_proto.ParseFromString(content)
         # pylint: disable-next=no-member
         node_store[KEY_NODE] = create_node_response_proto.node
 
@@ -177,16 +213,7 @@ def http_request_response(
         node: Node = cast(Node, node_store[KEY_NODE])
         delete_node_req_proto = DeleteNodeRequest(node=node)
         delete_node_req_req_bytes: bytes = delete_node_req_proto.SerializeToString()
-        res = requests.post(
-            url=f"{base_url}/{PATH_DELETE_NODE}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=delete_node_req_req_bytes,
-            verify=verify,
-            timeout=None,
-        )
+        res, _ = post(PATH_DELETE_NODE, delete_node_req_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -213,21 +240,14 @@ def http_request_response(
             return None
         node: Node = cast(Node, node_store[KEY_NODE])
 
-        # Request instructions (task) from server
-        pull_task_ins_req_proto = PullTaskInsRequest(node=node)
+        # Request instructions (task) from server, waiting for them if necessary
+        pull_task_ins_req_proto = PullTaskInsRequest(
+            node=node, timeout=PULL_TASK_INS_TIMEOUT
+        )
         pull_task_ins_req_bytes: bytes = pull_task_ins_req_proto.SerializeToString()
 
         # Request instructions (task) from server
-        res = requests.post(
-            url=f"{base_url}/{PATH_PULL_TASK_INS}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=pull_task_ins_req_bytes,
-            verify=verify,
-            timeout=None,
-        )
+        res, content = post(PATH_PULL_TASK_INS, pull_task_ins_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -249,7 +269,7 @@ def http_request_response(
 
         # Deserialize ProtoBuf from bytes
         pull_task_ins_response_proto = PullTaskInsResponse()
-        pull_task_ins_response_proto.ParseFromString(res.content)
+        pull_task_ins_response_proto.ParseFromString(content)
 
         # Get the current TaskIns
         task_ins: Optional[TaskIns] = get_task_ins(pull_task_ins_response_proto)
@@ -298,16 +318,7 @@ def http_request_response(
         )
 
         # Send ClientMessage to server
-        res = requests.post(
-            url=f"{base_url}/{PATH_PUSH_TASK_RES}",
-            headers={
-                "Accept": "application/protobuf",
-                "Content-Type": "application/protobuf",
-            },
-            data=push_task_res_request_bytes,
-            verify=verify,
-            timeout=None,
-        )
+        res, content = post(PATH_PUSH_TASK_RES, push_task_res_request_bytes)
 
         state[KEY_METADATA] = None
 
@@ -331,7 +342,7 @@ def http_request_response(
 
         # Deserialize ProtoBuf from bytes
         push_task_res_response_proto = PushTaskResResponse()
-        push_task_res_response_proto.ParseFromString(res.content)
+        push_task_res_response_proto.ParseFromString(content)
         log(
             INFO,
             "[Node] POST /%s: success, created result %s",
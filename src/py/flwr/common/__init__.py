@@ -24,10 +24,17 @@ from .logger import log as log
 from .message import Message as Message
 from .message import Metadata as Metadata
 from .metricsrecord import MetricsRecord as MetricsRecord
+from .parameter import array_to_ndarray as array_to_ndarray
+from .parameter import arrays_to_parameters as arrays_to_parameters
 from .parameter import bytes_to_ndarray as bytes_to_ndarray
+from .parameter import delta_base_version as delta_base_version
+from .parameter import ndarray_to_array as ndarray_to_array
 from .parameter import ndarray_to_bytes as ndarray_to_bytes
+from .parameter import ndarray_to_delta_array as ndarray_to_delta_array
 from .parameter import ndarrays_to_parameters as ndarrays_to_parameters
+from .parameter import parameters_to_arrays as parameters_to_arrays
 from .parameter import parameters_to_ndarrays as parameters_to_ndarrays
+from .parameter import parameters_version as parameters_version
 from .parametersrecord import Array as Array
 from .parametersrecord import ParametersRecord as ParametersRecord
 from .recordset import RecordSet as RecordSet
@@ -58,6 +65,8 @@ from .typing import Status as Status
 
 __all__ = [
     "Array",
+    "array_to_ndarray",
+    "arrays_to_parameters",
     "bytes_to_ndarray",
     "ClientMessage",
     "Code",
@@ -65,6 +74,7 @@ __all__ = [
     "ConfigsRecord",
     "configure",
     "Context",
+    "delta_base_version",
     "DisconnectRes",
     "EvaluateIns",
     "EvaluateRes",
@@ -83,13 +93,17 @@ __all__ = [
     "Metrics",
     "MetricsAggregationFn",
     "MetricsRecord",
+    "ndarray_to_array",
     "ndarray_to_bytes",
+    "ndarray_to_delta_array",
     "now",
     "NDArray",
     "NDArrays",
     "ndarrays_to_parameters",
     "Parameters",
+    "parameters_to_arrays",
     "parameters_to_ndarrays",
+    "parameters_version",
     "ParametersRecord",
     "Properties",
     "ReconnectIns",
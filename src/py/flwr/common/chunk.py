@@ -0,0 +1,208 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Chunked transfer of TaskIns and TaskRes."""
+
+
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.proto.recordset_pb2 import Array as ProtoArray  # pylint: disable=E0611
+from flwr.proto.recordset_pb2 import RecordSet as ProtoRecordSet
+from flwr.proto.task_pb2 import (  # pylint: disable=E0611
+    ArrayChunk,
+    Task,
+    TaskChunk,
+    TaskIns,
+    TaskRes,
+)
+
+# Maximum number of bytes of Array data in each chunk
+CHUNK_SIZE = 4 * 1024 * 1024
+# Maximum number of bytes of Array data in one reassembled task
+MAX_TASK_SIZE = 4 * 1024 * 1024 * 1024
+
+
+def task_to_chunks(
+    task: Union[TaskIns, TaskRes],
+    consumers: Sequence[Node] = (),
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[TaskChunk]:
+    """Split a TaskIns or TaskRes into chunks.
+
+    The first chunk holds the task without the data of its Arrays and the size of
+    the data of each Array, each following chunk holds at most `chunk_size` bytes
+    of the data of one Array.
+    """
+    header = TaskChunk(consumers=consumers)
+    task_header: Union[TaskIns, TaskRes] = (
+        header.task_ins if isinstance(task, TaskIns) else header.task_res
+    )
+    task_header.task_id = task.task_id
+    task_header.group_id = task.group_id
+    task_header.run_id = task.run_id
+    task_header.task.CopyFrom(_task_without_array_data(task.task))
+    for record_key, record in task.task.recordset.parameters.items():
+        for array_key, array in zip(record.data_keys, record.data_values):
+            header.array_sizes.add(
+                record_key=record_key, array_key=array_key, size=len(array.data)
+            )
+    yield header
+
+    for record_key, record in task.task.recordset.parameters.items():
+        for array_key, array in zip(record.data_keys, record.data_values):
+            data = array.data
+            for offset in range(0, len(data), chunk_size):
+                yield TaskChunk(
+                    array_chunk=ArrayChunk(
+                        record_key=record_key,
+                        array_key=array_key,
+                        size=len(data),
+                        offset=offset,
+                        data=data[offset : offset + chunk_size],
+                    )
+                )
+
+
+def assemble_tasks(
+    chunks: Iterable[TaskChunk], max_task_size: int = MAX_TASK_SIZE
+) -> Iterator[TaskChunk]:
+    """Reassemble tasks split by `task_to_chunks`.
+
+    Yields one TaskChunk holding the complete TaskIns or TaskRes (and its consumers,
+    if any) for each task in `chunks`. Raises `ValueError` if the chunks are
+    inconsistent or incomplete, or if the data of the Arrays of a task exceeds
+    `max_task_size` bytes. Buffers are only allocated for Arrays of the task, with
+    the sizes announced in the chunk holding the task.
+    """
+    header: Optional[TaskChunk] = None
+    sizes: Dict[Tuple[str, str], int] = {}
+    buffers: Dict[Tuple[str, str], _ArrayBuffer] = {}
+    for chunk in chunks:
+        if chunk.WhichOneof("chunk") != "array_chunk":
+            if header is not None:
+                yield _complete_task(header, sizes, buffers)
+            header, buffers = chunk, {}
+            sizes = _array_sizes(header, max_task_size)
+            continue
+
+        if header is None:
+            raise ValueError("Received an ArrayChunk before any task")
+        array_chunk = chunk.array_chunk
+        key = (array_chunk.record_key, array_chunk.array_key)
+        if key not in sizes:
+            raise ValueError(f"Received data of unknown Array {key[0]}/{key[1]}")
+        if key not in buffers:
+            buffers[key] = _ArrayBuffer(sizes[key])
+        buffers[key].write(array_chunk)
+
+    if header is not None:
+        yield _complete_task(header, sizes, buffers)
+
+
+class _ArrayBuffer:
+    """Preallocated buffer for the data of one Array."""
+
+    def __init__(self, size: int) -> None:
+        self.data = bytearray(size)
+        self.frames: Dict[int, int] = {}
+
+    def write(self, array_chunk: ArrayChunk) -> None:
+        """Write one frame into the buffer, frames may be sent again (resumed)."""
+        end = array_chunk.offset + len(array_chunk.data)
+        if array_chunk.size != len(self.data) or end > len(self.data):
+            raise ValueError("ArrayChunk does not match the size of the Array")
+        self.data[array_chunk.offset : end] = array_chunk.data
+        self.frames[array_chunk.offset] = len(array_chunk.data)
+
+    def complete(self) -> bool:
+        """Return True if all frames have been written."""
+        offset = 0
+        while offset < len(self.data) and self.frames.get(offset, 0) > 0:
+            offset += self.frames[offset]
+        return offset == len(self.data)
+
+
+def _task_without_array_data(task: Task) -> Task:
+    """Copy a Task, leaving out the data of all Arrays in its RecordSet."""
+    recordset = ProtoRecordSet()
+    recordset.metrics.MergeFrom(task.recordset.metrics)
+    recordset.configs.MergeFrom(task.recordset.configs)
+    for record_key, record in task.recordset.parameters.items():
+        record_header = recordset.parameters[record_key]
+        record_header.data_keys.extend(record.data_keys)
+        record_header.data_values.extend(
+            ProtoArray(dtype=array.dtype, shape=array.shape, stype=array.stype)
+            for array in record.data_values
+        )
+    fields = {
+        field.name: value
+        for field, value in task.ListFields()
+        if field.name != "recordset"
+    }
+    return Task(recordset=recordset, **fields)
+
+
+def _header_task(header: TaskChunk) -> Union[TaskIns, TaskRes]:
+    if header.HasField("task_ins"):
+        return header.task_ins
+    if header.HasField("task_res"):
+        return header.task_res
+    raise ValueError("Received a TaskChunk without a task")
+
+
+def _array_sizes(header: TaskChunk, max_task_size: int) -> Dict[Tuple[str, str], int]:
+    """Return the size of the data of each Array of the task in `header`."""
+    task = _header_task(header)
+    keys = {
+        (record_key, array_key)
+        for record_key, record in task.task.recordset.parameters.items()
+        for array_key in record.data_keys
+    }
+    sizes: Dict[Tuple[str, str], int] = {}
+    for array_size in header.array_sizes:
+        key = (array_size.record_key, array_size.array_key)
+        if key not in keys or key in sizes:
+            raise ValueError(f"Unexpected size of Array {key[0]}/{key[1]}")
+        sizes[key] = array_size.size
+    missing = keys - sizes.keys()
+    if missing:
+        record_key, array_key = sorted(missing)[0]
+        raise ValueError(f"Missing size of Array {record_key}/{array_key}")
+    if sum(sizes.values()) > max_task_size:
+        raise ValueError(
+            f"The data of the Arrays of the task exceeds {max_task_size} bytes"
+        )
+    return sizes
+
+
+def _complete_task(
+    header: TaskChunk,
+    sizes: Dict[Tuple[str, str], int],
+    buffers: Dict[Tuple[str, str], _ArrayBuffer],
+) -> TaskChunk:
+    """Move the data in `buffers` into the Arrays of the task in `header`."""
+    task = _header_task(header)
+    for record_key, record in task.task.recordset.parameters.items():
+        for array_key, array in zip(record.data_keys, record.data_values):
+            key = (record_key, array_key)
+            if sizes[key] == 0:
+                continue
+            buffer = buffers.get(key)
+            if buffer is None or not buffer.complete():
+                raise ValueError(f"Incomplete data of Array {record_key}/{array_key}")
+            array.data = bytes(buffer.data)
+            buffer.data = bytearray()
+    del header.array_sizes[:]
+    return header
@@ -0,0 +1,137 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Chunked transfer tests."""
+
+
+from typing import OrderedDict
+
+import numpy as np
+import pytest
+
+# pylint: disable=E0611
+from flwr.proto.node_pb2 import Node
+from flwr.proto.task_pb2 import Task, TaskChunk, TaskIns, TaskRes
+
+# pylint: enable=E0611
+from .chunk import assemble_tasks, task_to_chunks
+from .configsrecord import ConfigsRecord
+from .parameter import ndarray_to_array
+from .parametersrecord import ParametersRecord
+from .recordset import RecordSet
+from .serde import recordset_to_proto
+
+
+def _task() -> Task:
+    """Return a Task with Arrays of different sizes."""
+    recordset = RecordSet(
+        parameters={
+            "params": ParametersRecord(
+                OrderedDict(
+                    weights=ndarray_to_array(np.arange(100, dtype=np.float64)),
+                    bias=ndarray_to_array(np.ones(3, dtype=np.float32)),
+                    empty=ndarray_to_array(np.zeros(0)),
+                )
+            )
+        },
+        configs={"config": ConfigsRecord({"lr": 0.1})},
+    )
+    return Task(
+        consumer=Node(node_id=1),
+        task_type="fit",
+        recordset=recordset_to_proto(recordset),
+    )
+
+
+def test_chunks_and_back() -> None:
+    """Test that tasks are split into bounded chunks and reassembled."""
+    # Prepare
+    task_ins = TaskIns(task_id="0", run_id=1, task=_task())
+    task_res = TaskRes(task_id="1", run_id=1, task=_task())
+    consumers = [Node(node_id=2), Node(node_id=3)]
+
+    # Execute
+    chunks = list(task_to_chunks(task_ins, consumers, chunk_size=64))
+    chunks += list(task_to_chunks(task_res, chunk_size=64))
+    assembled = list(assemble_tasks(chunks))
+
+    # Assert
+    assert all(len(chunk.array_chunk.data) <= 64 for chunk in chunks)
+    assert len(chunks) == 2 * (1 + 13 + 1)
+    assert len(assembled) == 2
+    assert assembled[0].task_ins == task_ins
+    assert list(assembled[0].consumers) == consumers
+    assert assembled[1].task_res == task_res
+    assert not assembled[1].consumers
+
+
+def test_resent_chunks() -> None:
+    """Test that frames which are sent again are written again."""
+    # Prepare
+    task_ins = TaskIns(task_id="0", run_id=1, task=_task())
+    chunks = list(task_to_chunks(task_ins, chunk_size=64))
+
+    # Execute
+    assembled = list(assemble_tasks(chunks[:5] + chunks[3:]))
+
+    # Assert
+    assert assembled[0].task_ins == task_ins
+
+
+def test_incomplete_chunks() -> None:
+    """Test that missing frames are detected."""
+    # Prepare
+    task_ins = TaskIns(task_id="0", run_id=1, task=_task())
+    chunks = list(task_to_chunks(task_ins, chunk_size=64))
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        list(assemble_tasks(chunks[:3] + chunks[4:]))
+    with pytest.raises(ValueError):
+        list(assemble_tasks(chunks[1:]))
+
+
+def test_missing_array() -> None:
+    """Test that an Array without any frame is detected."""
+    # Prepare
+    task_ins = TaskIns(task_id="0", run_id=1, task=_task())
+    chunks = list(task_to_chunks(task_ins, chunk_size=64))
+
+    # Execute & Assert
+    # The second Array (bias) is sent in a single frame
+    assert chunks[14].array_chunk.array_key == "bias"
+    with pytest.raises(ValueError, match="Incomplete data"):
+        list(assemble_tasks(chunks[:14] + chunks[15:]))
+
+
+def test_unexpected_chunks() -> None:
+    """Test that frames of unknown Arrays and oversized tasks are rejected."""
+    # Prepare
+    task_ins = TaskIns(task_id="0", run_id=1, task=_task())
+    chunks = list(task_to_chunks(task_ins, chunk_size=64))
+    unknown = TaskChunk()
+    unknown.CopyFrom(chunks[1])
+    unknown.array_chunk.array_key = "unknown"
+    unknown.array_chunk.size = 1 << 62
+    no_sizes = TaskChunk()
+    no_sizes.CopyFrom(chunks[0])
+    del no_sizes.array_sizes[:]
+
+    # Execute & Assert
+    with pytest.raises(ValueError, match="unknown Array"):
+        list(assemble_tasks([chunks[0], unknown]))
+    with pytest.raises(ValueError, match="exceeds"):
+        list(assemble_tasks(chunks, max_task_size=100))
+    with pytest.raises(ValueError, match="Missing size"):
+        list(assemble_tasks([no_sizes] + chunks[1:]))
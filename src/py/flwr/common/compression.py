@@ -0,0 +1,112 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Message compression."""
+
+
+import importlib.util
+import zlib
+from typing import List, Optional, Sequence
+
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_DEFLATE = "deflate"
+COMPRESSION_ZSTD = "zstd"  # Requires `zstandard`
+COMPRESSION_LZ4 = "lz4"  # Requires `lz4`
+
+# Messages smaller than this (in bytes) are sent without compression
+COMPRESSION_THRESHOLD = 1024
+
+# Window bits selecting the gzip and zlib (HTTP "deflate") formats
+_WBITS = {COMPRESSION_GZIP: 31, COMPRESSION_DEFLATE: 15}
+_OPTIONAL_MODULES = {COMPRESSION_ZSTD: "zstandard", COMPRESSION_LZ4: "lz4"}
+
+
+def available_compressions() -> List[str]:
+    """Return the available compression algorithms, most preferred first."""
+    optional = [
+        algorithm
+        for algorithm, module in _OPTIONAL_MODULES.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+    return optional + [COMPRESSION_GZIP, COMPRESSION_DEFLATE]
+
+
+def compress(data: bytes, algorithm: str) -> bytes:
+    """Compress `data` with the given algorithm."""
+    if algorithm in _WBITS:
+        compressor = zlib.compressobj(wbits=_WBITS[algorithm])
+        return compressor.compress(data) + compressor.flush()
+    if algorithm == COMPRESSION_ZSTD:
+        import zstandard  # pylint: disable=import-outside-toplevel
+
+        return zstandard.ZstdCompressor().compress(data)  # type: ignore
+    if algorithm == COMPRESSION_LZ4:
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+
+        return lz4.frame.compress(data)  # type: ignore
+    raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+
+
+def decompress(data: bytes, algorithm: str, max_length: int) -> bytes:
+    """Decompress `data` compressed with the given algorithm.
+
+    Raises `ValueError` if the data is invalid or decompresses to more than
+    `max_length` bytes, so that small payloads cannot exhaust memory.
+    """
+    if algorithm in _WBITS:
+        decompressor = zlib.decompressobj(wbits=_WBITS[algorithm])
+        try:
+            result = decompressor.decompress(data, max_length)
+        except zlib.error as err:
+            raise ValueError(f"Invalid {algorithm} data") from err
+        if decompressor.unconsumed_tail or not decompressor.eof:
+            raise ValueError(f"Invalid or too large {algorithm} data")
+        return result
+    if algorithm == COMPRESSION_ZSTD:
+        import zstandard  # pylint: disable=import-outside-toplevel
+
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+                result = reader.read(max_length + 1)
+        except zstandard.ZstdError as err:
+            raise ValueError("Invalid zstd data") from err
+    elif algorithm == COMPRESSION_LZ4:
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+
+        lz4_decompressor = lz4.frame.LZ4FrameDecompressor()
+        try:
+            result = lz4_decompressor.decompress(data, max_length=max_length + 1)
+        except RuntimeError as err:
+            raise ValueError("Invalid lz4 data") from err
+    else:
+        raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+    if len(result) > max_length:
+        raise ValueError(f"Too large {algorithm} data")
+    return bytes(result)
+
+
+def select_compression(accept_encoding: str, preferred: Sequence[str]) -> Optional[str]:
+    """Select the first algorithm in `preferred` listed in an Accept-Encoding value.
+
+    Returns None if none of them is accepted.
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    for algorithm in preferred:
+        if algorithm in accepted:
+            return algorithm
+    return None
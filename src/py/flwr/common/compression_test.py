@@ -0,0 +1,88 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Message compression tests."""
+
+
+import pytest
+
+from .compression import (
+    COMPRESSION_DEFLATE,
+    COMPRESSION_GZIP,
+    available_compressions,
+    compress,
+    decompress,
+    select_compression,
+)
+
+DATA = b"flower" * 1000
+
+
+@pytest.mark.parametrize("algorithm", available_compressions())
+def test_compress_and_back(algorithm: str) -> None:
+    """Test that compressed data decompresses to the original data."""
+    # Execute
+    compressed = compress(DATA, algorithm)
+    actual = decompress(compressed, algorithm, max_length=len(DATA))
+
+    # Assert
+    assert len(compressed) < len(DATA)
+    assert actual == DATA
+
+
+@pytest.mark.parametrize("algorithm", available_compressions())
+def test_decompress_too_large(algorithm: str) -> None:
+    """Test that data decompressing to more than `max_length` bytes is rejected."""
+    # Prepare
+    compressed = compress(DATA, algorithm)
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        decompress(compressed, algorithm, max_length=len(DATA) - 1)
+
+
+@pytest.mark.parametrize("algorithm", [COMPRESSION_GZIP, COMPRESSION_DEFLATE])
+def test_decompress_invalid(algorithm: str) -> None:
+    """Test that invalid data is rejected."""
+    with pytest.raises(ValueError):
+        decompress(b"not compressed", algorithm, max_length=len(DATA))
+
+
+def test_unsupported_algorithm() -> None:
+    """Test that unknown algorithms are rejected."""
+    with pytest.raises(ValueError):
+        compress(DATA, "br")
+    with pytest.raises(ValueError):
+        decompress(DATA, "br", max_length=len(DATA))
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate", COMPRESSION_GZIP),
+        ("deflate;q=0.5, gzip", COMPRESSION_GZIP),
+        ("deflate, gzip;q=0", COMPRESSION_DEFLATE),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_select_compression(accept_encoding: str, expected: str) -> None:
+    """Test that the first preferred accepted algorithm is selected."""
+    # Execute
+    actual = select_compression(
+        accept_encoding, preferred=[COMPRESSION_GZIP, COMPRESSION_DEFLATE]
+    )
+
+    # Assert
+    assert actual == expected
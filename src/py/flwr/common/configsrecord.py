@@ -15,13 +15,19 @@
 """ConfigsRecord."""
 
 
-from typing import Dict, Optional, get_args
+from typing import Dict, Optional, Union, get_args
 
-from flwr.common.typing import ConfigsRecordValues, ConfigsScalar
+import numpy as np
+
+from flwr.common.typing import ConfigsRecordValues, ConfigsScalar, NDArray
 
 from .typeddict import TypedDict
 
 
+# NumPy dtype kinds converted to allowed types by `ndarray.tolist`
+_NDARRAY_KINDS = "biufUS"
+
+
 def _check_key(key: str) -> None:
     """Check if key is of expected type."""
     if not isinstance(key, str):
@@ -47,8 +53,11 @@ def _check_value(value: ConfigsRecordValues) -> None:
             is_valid(value[0])
             # all elements in the list must be of the same valid type
             # this is needed for protobuf
+            # (comparing the set of exact types first, which is much faster)
             value_type = type(value[0])
-            if not all(isinstance(v, value_type) for v in value):
+            if len(set(map(type, value))) > 1 and not all(
+                isinstance(v, value_type) for v in value
+            ):
                 raise TypeError(
                     "All values in a list must be of the same valid type. "
                     f"One of {ConfigsScalar}."
@@ -64,6 +73,7 @@ class ConfigsRecord(TypedDict[str, ConfigsRecordValues]):
         self,
         configs_dict: Optional[Dict[str, ConfigsRecordValues]] = None,
         keep_input: bool = True,
+        check_types: bool = True,
     ) -> None:
         """Construct a ConfigsRecord object.
 
@@ -72,16 +82,40 @@ class ConfigsRecord(TypedDict[str, ConfigsRecordValues]):
         configs_dict : Optional[Dict[str, ConfigsRecordValues]]
             A dictionary that stores basic types (i.e. `str`, `int`, `float`, `bytes` as
             defined in `ConfigsScalar`) and lists of such types (see
-            `ConfigsScalarList`).
+            `ConfigsScalarList`). 1-D ndarrays are converted to lists.
         keep_input : bool (default: True)
             A boolean indicating whether config passed should be deleted from the input
             dictionary immediately after adding them to the record. When set
             to True, the data is duplicated in memory. If memory is a concern, set
             it to False.
+        check_types : bool (default: True)
+            A boolean indicating whether the types of keys and values should be
+            checked. Only set it to False for entries known to be of valid types,
+            e.g. when deserializing them from ProtoBuf. The entries are then added
+            as they are, without the conversion of ndarrays.
         """
         super().__init__(_check_key, _check_value)
-        if configs_dict:
+        if configs_dict and not check_types:
+            self._update_unchecked(configs_dict)
+            if not keep_input:
+                configs_dict.clear()
+        elif configs_dict:
             for k in list(configs_dict.keys()):
                 self[k] = configs_dict[k]
                 if not keep_input:
                     del configs_dict[k]
+
+    def __setitem__(self, key: str, value: Union[ConfigsRecordValues, NDArray]) -> None:
+        """Set the given key to the given value after type checking.
+
+        A 1-D ndarray is converted to a list of Python scalars first. If its dtype
+        is allowed, all elements are of the same allowed type, so they are not
+        checked one by one.
+        """
+        if isinstance(value, np.ndarray) and value.ndim == 1:
+            if value.dtype.kind in _NDARRAY_KINDS:
+                _check_key(key)
+                self._update_unchecked({key: value.tolist()})
+                return
+            value = value.tolist()
+        super().__setitem__(key, value)  # type: ignore
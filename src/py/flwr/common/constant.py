@@ -32,6 +32,31 @@ TRANSPORT_TYPES = [
     TRANSPORT_TYPE_REST,
 ]
 
+# Number of seconds a SuperNode asks the Fleet API to wait for TaskIns in each
+# PullTaskIns request (long polling)
+PULL_TASK_INS_TIMEOUT = 20.0
+# Number of seconds a SuperNode waits before pulling again if the Fleet API responded
+# without waiting for TaskIns
+PULL_TASK_INS_INTERVAL = 3.0
+
+# Serialization types (`stype`) of Arrays in a ParametersRecord
+STYPE_NUMPY = "numpy.ndarray"  # `.npy` format, as written by `np.save`
+STYPE_NUMPY_RAW = "numpy.ndarray.raw"  # Raw buffer, `dtype` and `shape` in the Array
+# Non-zero entries only: flat indices followed by values
+STYPE_NUMPY_COO = "numpy.ndarray.coo"
+# Non-zero entries only: row pointers and column indices followed by values
+STYPE_NUMPY_CSR = "numpy.ndarray.csr"
+# Quantized, `dtype` is that of the restored ndarray: float16 values, the upper 16 bits
+# of float32 values (bfloat16), or a float32 scale followed by int8 values
+STYPE_NUMPY_FP16 = "numpy.ndarray.fp16"
+STYPE_NUMPY_BF16 = "numpy.ndarray.bf16"
+STYPE_NUMPY_INT8 = "numpy.ndarray.int8"
+# Appended to the stype of an Array holding the difference to a base model, followed
+# by the version of that base model (e.g. "numpy.ndarray.coo;delta=<version>")
+STYPE_DELTA = ";delta="
+# Tensor type of legacy Parameters whose tensors are serialized Arrays
+TENSOR_TYPE_ARRAY = "flwr.proto.Array"
+
 MESSAGE_TYPE_GET_PROPERTIES = "get_properties"
 MESSAGE_TYPE_GET_PARAMETERS = "get_parameters"
 MESSAGE_TYPE_FIT = "fit"
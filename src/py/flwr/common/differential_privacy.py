@@ -15,9 +15,12 @@
 """Utility functions for differential privacy."""
 
 
+from typing import Any, Dict, Optional
+
 import numpy as np
 
 from flwr.common import (
+    NDArray,
     NDArrays,
     Parameters,
     ndarrays_to_parameters,
@@ -27,15 +30,39 @@ from flwr.common import (
 
 def get_norm(input_arrays: NDArrays) -> float:
     """Compute the L2 norm of the flattened input."""
-    array_norms = [np.linalg.norm(array.flat) for array in input_arrays]
-    # pylint: disable=consider-using-generator
-    return float(np.sqrt(sum([norm**2 for norm in array_norms])))
+    return float(np.sqrt(sum(_squared_norm(array) for array in input_arrays)))
+
+
+def _squared_norm(array: NDArray) -> float:
+    flat = np.ravel(array)
+    if not np.issubdtype(flat.dtype, np.floating):
+        flat = flat.astype(np.float64)
+    return float(np.dot(flat, flat))
 
 
-def add_gaussian_noise_inplace(input_arrays: NDArrays, std_dev: float) -> None:
-    """Add Gaussian noise to each element of the input arrays."""
+def add_gaussian_noise_inplace(
+    input_arrays: NDArrays,
+    std_dev: float,
+    rng: Optional[np.random.Generator] = None,
+) -> None:
+    """Add Gaussian noise to each element of the input arrays.
+
+    The noise is drawn from `rng` (a new `np.random.Generator` if None) into a
+    buffer of the data type of the arrays, which is reused across arrays.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    max_size = max((array.size for array in input_arrays), default=0)
+    buffers: Dict[np.dtype[Any], NDArray] = {}
     for array in input_arrays:
-        array += np.random.normal(0, std_dev, array.shape)
+        # The generator supports float32 and float64 only
+        dtype = np.dtype(np.float64 if array.dtype == np.float64 else np.float32)
+        if dtype not in buffers:
+            buffers[dtype] = np.empty(max_size, dtype=dtype)
+        noise = buffers[dtype][: array.size]
+        rng.standard_normal(dtype=dtype, out=noise)
+        np.multiply(noise, std_dev, out=noise)
+        np.add(array, noise.reshape(array.shape), out=array, casting="same_kind")
 
 
 def clip_inputs_inplace(input_arrays: NDArrays, clipping_norm: float) -> None:
@@ -44,7 +71,9 @@ def clip_inputs_inplace(input_arrays: NDArrays, clipping_norm: float) -> None:
     FlatClip method of the paper: https://arxiv.org/abs/1710.06963
     """
     input_norm = get_norm(input_arrays)
-    scaling_factor = min(1, clipping_norm / input_norm)
+    if input_norm <= clipping_norm:
+        return
+    scaling_factor = clipping_norm / input_norm
     for array in input_arrays:
         array *= scaling_factor
 
@@ -64,12 +93,21 @@ def compute_clip_model_update(
 ) -> None:
     """Compute model update (param1 - param2) and clip it.
 
-    Then add the clipped value to param1."""
-    model_update = [np.subtract(x, y) for (x, y) in zip(param1, param2)]
-    clip_inputs_inplace(model_update, clipping_norm)
+    Then add the clipped value to param1. The update is computed in place of param1
+    (when its data type allows it), and its norm is accumulated in the same pass
+    over the layers."""
+    squared_norm = 0.0
+    for i, (x, y) in enumerate(zip(param1, param2)):
+        inplace = x.flags.writeable and np.result_type(x, y) == x.dtype
+        param1[i] = np.subtract(x, y, out=x if inplace else None)
+        squared_norm += _squared_norm(param1[i])
 
-    for i, _ in enumerate(param2):
-        param1[i] = param2[i] + model_update[i]
+    norm = np.sqrt(squared_norm)
+    scaling_factor = clipping_norm / norm if norm > clipping_norm else 1.0
+    for x, y in zip(param1, param2):
+        if scaling_factor < 1.0:
+            np.multiply(x, scaling_factor, out=x, casting="same_kind")
+        np.add(x, y, out=x, casting="same_kind")
 
 
 def add_gaussian_noise_to_params(
@@ -77,11 +115,13 @@ def add_gaussian_noise_to_params(
     noise_multiplier: float,
     clipping_norm: float,
     num_sampled_clients: int,
+    rng: Optional[np.random.Generator] = None,
 ) -> Parameters:
     """Add gaussian noise to model parameters."""
     model_params_ndarrays = parameters_to_ndarrays(model_params)
     add_gaussian_noise_inplace(
         model_params_ndarrays,
         compute_stdv(noise_multiplier, clipping_norm, num_sampled_clients),
+        rng,
     )
     return ndarrays_to_parameters(model_params_ndarrays)
@@ -56,6 +56,24 @@ def test_add_gaussian_noise_inplace() -> None:
         assert np.any(np.abs(noise_added) > 0)
 
 
+def test_add_gaussian_noise_inplace_dtype_and_seed() -> None:
+    """Test that noise keeps the dtype and is reproducible with a seeded rng."""
+    # Prepare
+    update = [np.zeros((3, 4), dtype=np.float32), np.zeros(5)]
+    other = [np.copy(layer) for layer in update]
+
+    # Execute
+    add_gaussian_noise_inplace(update, 2.0, np.random.default_rng(42))
+    add_gaussian_noise_inplace(other, 2.0, np.random.default_rng(42))
+
+    # Assert
+    assert update[0].dtype == np.float32
+    assert update[1].dtype == np.float64
+    for layer, other_layer in zip(update, other):
+        np.testing.assert_array_equal(layer, other_layer)
+    assert 1.0 < np.std(np.concatenate([x.ravel() for x in update])) < 3.0
+
+
 def test_get_norm() -> None:
     """Test get_norm function."""
     # Prepare
@@ -136,3 +154,20 @@ def test_compute_clip_model_update() -> None:
     # Verify
     for i, param in enumerate(param1):
         np.testing.assert_array_almost_equal(param, expected_result[i])
+
+
+def test_compute_clip_model_update_clipped() -> None:
+    """Test that updates above the clipping norm are scaled down in place."""
+    # Prepare
+    param2 = [np.array([1.0, 1.0]), np.array([[1.0]])]
+    param1 = [np.array([4.0, 1.0]), np.array([[5.0]])]
+    original_layer = param1[0]
+
+    # Execute
+    compute_clip_model_update(param1, param2, clipping_norm=1.0)
+
+    # Assert
+    # The update [3, 0, 4] has norm 5
+    np.testing.assert_allclose(param1[0], [1.6, 1.0])
+    np.testing.assert_allclose(param1[1], [[1.8]])
+    assert param1[0] is original_layer
@@ -19,6 +19,7 @@ from typing import Tuple
 
 import numpy as np
 
+from flwr.common.differential_privacy import add_gaussian_noise_inplace, get_norm
 from flwr.common.logger import warn_deprecated_feature
 from flwr.common.typing import NDArrays
 
@@ -26,25 +27,31 @@ from flwr.common.typing import NDArrays
 # Calculates the L2-norm of a potentially ragged array
 def _get_update_norm(update: NDArrays) -> float:
     warn_deprecated_feature("`_get_update_norm` method")
-    flattened_update = update[0]
-    for i in range(1, len(update)):
-        flattened_update = np.append(flattened_update, update[i])
-    return float(np.sqrt(np.sum(np.square(flattened_update))))
+    return get_norm(update)
 
 
 def add_gaussian_noise(update: NDArrays, std_dev: float) -> NDArrays:
-    """Add iid Gaussian noise to each floating point value in the update."""
+    """Add iid Gaussian noise to each floating point value in the update.
+
+    The noise is drawn from an `np.random.Generator` into a reused buffer of the
+    data type of each layer (float64 for integer layers), see
+    `add_gaussian_noise_inplace`.
+    """
     warn_deprecated_feature("`add_gaussian_noise` method")
     update_noised = [
-        layer + np.random.normal(0, std_dev, layer.shape) for layer in update
+        layer.astype(
+            layer.dtype if np.issubdtype(layer.dtype, np.floating) else np.float64
+        )
+        for layer in update
     ]
+    add_gaussian_noise_inplace(update_noised, std_dev)
     return update_noised
 
 
 def clip_by_l2(update: NDArrays, threshold: float) -> Tuple[NDArrays, bool]:
     """Scales the update so thats its L2 norm is upper-bound to threshold."""
     warn_deprecated_feature("`clip_by_l2` method")
-    update_norm = _get_update_norm(update)
+    update_norm = get_norm(update)
     scaling_factor = min(1, threshold / update_norm)
     update_clipped: NDArrays = [layer * scaling_factor for layer in update]
     return update_clipped, (scaling_factor < 1)
@@ -0,0 +1,51 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the DP building block functions."""
+
+
+import numpy as np
+
+from .dp import add_gaussian_noise, clip_by_l2
+
+
+def test_add_gaussian_noise() -> None:
+    """Test that noise is added to copies of the layers, in their data type."""
+    # Prepare
+    update = [np.zeros((100, 10), dtype=np.float32), np.zeros(1000, dtype=np.int64)]
+
+    # Execute
+    update_noised = add_gaussian_noise(update, std_dev=2.0)
+
+    # Assert
+    assert [layer.dtype for layer in update_noised] == [np.float32, np.float64]
+    assert all(np.all(layer == 0) for layer in update)
+    for layer in update_noised:
+        assert abs(np.std(layer) - 2.0) < 0.2
+
+
+def test_clip_by_l2() -> None:
+    """Test that updates with a larger norm than the threshold are scaled down."""
+    # Prepare
+    update = [np.array([3.0]), np.array([[4.0]])]
+
+    # Execute
+    clipped, was_clipped = clip_by_l2(update, threshold=1.0)
+    unchanged, was_not_clipped = clip_by_l2(update, threshold=10.0)
+
+    # Assert
+    assert was_clipped and not was_not_clipped
+    np.testing.assert_allclose(clipped[0], [0.6])
+    np.testing.assert_allclose(clipped[1], [[0.8]])
+    np.testing.assert_allclose(unchanged[1], [[4.0]])
@@ -15,23 +15,215 @@
 """Utility functions for gRPC."""
 
 
+from collections import namedtuple
+from itertools import chain
 from logging import INFO
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import grpc
+from google.protobuf.message import Message as GrpcMessage
 
+from flwr.common.compression import (
+    COMPRESSION_DEFLATE,
+    COMPRESSION_GZIP,
+    COMPRESSION_THRESHOLD,
+)
 from flwr.common.logger import log
 
 GRPC_MAX_MESSAGE_LENGTH: int = 536_870_912  # == 512 * 1024 * 1024
 
+# zstd and lz4 are not supported by gRPC, only by the REST transport
+GRPC_COMPRESSIONS: Dict[str, grpc.Compression] = {
+    COMPRESSION_GZIP: grpc.Compression.Gzip,
+    COMPRESSION_DEFLATE: grpc.Compression.Deflate,
+}
+
+
+def grpc_compression(compression: str) -> grpc.Compression:
+    """Return the gRPC compression algorithm with the given name."""
+    if compression not in GRPC_COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported gRPC compression algorithm: {compression}. Supported "
+            f"algorithms: {', '.join(GRPC_COMPRESSIONS)}"
+        )
+    return GRPC_COMPRESSIONS[compression]
+
+
+class _ClientCallDetails(
+    namedtuple(
+        "_ClientCallDetails",
+        (
+            "method",
+            "timeout",
+            "metadata",
+            "credentials",
+            "wait_for_ready",
+            "compression",
+        ),
+    ),
+    grpc.ClientCallDetails,
+):
+    """Details of an outgoing RPC."""
+
+
+class CompressionThresholdClientInterceptor(
+    grpc.UnaryUnaryClientInterceptor,  # type: ignore
+    grpc.UnaryStreamClientInterceptor,  # type: ignore
+    grpc.StreamUnaryClientInterceptor,  # type: ignore
+    grpc.StreamStreamClientInterceptor,  # type: ignore
+):
+    """Send requests smaller than `threshold` bytes without compression.
+
+    gRPC selects the compression of a call before its first request is sent. For
+    stream-unary calls, the first requests are therefore buffered until they add
+    up to `threshold` bytes, and the call is sent without compression only if all
+    its requests are smaller than that. Stream-stream calls always use the
+    channel compression: their requests can depend on the responses (e.g., the
+    bidirectional `Join` stream), so they cannot be buffered before the call.
+    """
+
+    def __init__(self, threshold: int = COMPRESSION_THRESHOLD) -> None:
+        self.threshold = threshold
+
+    def _call_details(
+        self, client_call_details: grpc.ClientCallDetails, request: GrpcMessage
+    ) -> grpc.ClientCallDetails:
+        if request.ByteSize() >= self.threshold:
+            return client_call_details
+        return self._uncompressed(client_call_details)
+
+    def _stream_call_details(
+        self,
+        client_call_details: grpc.ClientCallDetails,
+        request_iterator: Iterator[GrpcMessage],
+    ) -> Tuple[grpc.ClientCallDetails, Iterator[GrpcMessage]]:
+        """Buffer requests until `threshold` bytes or the end of the stream."""
+        buffered: List[GrpcMessage] = []
+        size = 0
+        for request in request_iterator:
+            buffered.append(request)
+            size += request.ByteSize()
+            if size >= self.threshold:
+                return client_call_details, chain(buffered, request_iterator)
+        return self._uncompressed(client_call_details), iter(buffered)
+
+    @staticmethod
+    def _uncompressed(
+        client_call_details: grpc.ClientCallDetails,
+    ) -> grpc.ClientCallDetails:
+        return _ClientCallDetails(
+            client_call_details.method,
+            client_call_details.timeout,
+            client_call_details.metadata,
+            client_call_details.credentials,
+            client_call_details.wait_for_ready,
+            grpc.Compression.NoCompression,
+        )
+
+    def intercept_unary_unary(
+        self, continuation: Callable[..., Any], client_call_details: Any, request: Any
+    ) -> Any:
+        """Intercept a unary-unary call."""
+        return continuation(self._call_details(client_call_details, request), request)
+
+    def intercept_unary_stream(
+        self, continuation: Callable[..., Any], client_call_details: Any, request: Any
+    ) -> Any:
+        """Intercept a unary-stream call."""
+        return continuation(self._call_details(client_call_details, request), request)
+
+    def intercept_stream_unary(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: Any,
+        request_iterator: Any,
+    ) -> Any:
+        """Intercept a stream-unary call."""
+        call_details, request_iterator = self._stream_call_details(
+            client_call_details, request_iterator
+        )
+        return continuation(call_details, request_iterator)
+
+    def intercept_stream_stream(
+        self,
+        continuation: Callable[..., Any],
+        client_call_details: Any,
+        request_iterator: Any,
+    ) -> Any:
+        """Intercept a stream-stream call, keeping the channel compression."""
+        return continuation(client_call_details, request_iterator)
+
+
+class CompressionThresholdServerInterceptor(grpc.ServerInterceptor):  # type: ignore
+    """Send responses smaller than `threshold` bytes without compression."""
+
+    def __init__(self, threshold: int = COMPRESSION_THRESHOLD) -> None:
+        self.threshold = threshold
+
+    def _check(self, response: GrpcMessage, context: grpc.ServicerContext) -> None:
+        if response.ByteSize() < self.threshold:
+            context.disable_next_message_compression()
+
+    def _wrap_unary(self, behavior: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(request: Any, context: grpc.ServicerContext) -> Any:
+            response = behavior(request, context)
+            self._check(response, context)
+            return response
+
+        return wrapper
+
+    def _wrap_stream(self, behavior: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(request: Any, context: grpc.ServicerContext) -> Iterator[Any]:
+            for response in behavior(request, context):
+                self._check(response, context)
+                yield response
+
+        return wrapper
+
+    def intercept_service(
+        self,
+        continuation: Callable[[grpc.HandlerCallDetails], grpc.RpcMethodHandler],
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> Optional[grpc.RpcMethodHandler]:
+        """Wrap the handler of an incoming RPC."""
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        kwargs = {
+            "request_deserializer": handler.request_deserializer,
+            "response_serializer": handler.response_serializer,
+        }
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary(handler.unary_unary), **kwargs
+            )
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(
+                self._wrap_unary(handler.stream_unary), **kwargs
+            )
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                self._wrap_stream(handler.unary_stream), **kwargs
+            )
+        return grpc.stream_stream_rpc_method_handler(
+            self._wrap_stream(handler.stream_stream), **kwargs
+        )
+
 
 def create_channel(
     server_address: str,
     insecure: bool,
     root_certificates: Optional[bytes] = None,
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
+    compression: Optional[str] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
 ) -> grpc.Channel:
-    """Create a gRPC channel, either secure or insecure."""
+    """Create a gRPC channel, either secure or insecure.
+
+    If `compression` is set, requests of at least `compression_threshold` bytes
+    are compressed with that algorithm. The server compresses its responses
+    only with algorithms the channel announces in `grpc-accept-encoding`.
+    """
     # Check for conflicting parameters
     if insecure and root_certificates is not None:
         raise ValueError(
@@ -47,14 +239,34 @@ def create_channel(
         ("grpc.max_receive_message_length", max_message_length),
     ]
 
+    channel_compression = None
+    if compression is not None:
+        channel_compression = grpc_compression(compression)
+
     if insecure:
-        channel = grpc.insecure_channel(server_address, options=channel_options)
+        channel = grpc.insecure_channel(
+            server_address, options=channel_options, compression=channel_compression
+        )
         log(INFO, "Opened insecure gRPC connection (no certificates were passed)")
     else:
         ssl_channel_credentials = grpc.ssl_channel_credentials(root_certificates)
         channel = grpc.secure_channel(
-            server_address, ssl_channel_credentials, options=channel_options
+            server_address,
+            ssl_channel_credentials,
+            options=channel_options,
+            compression=channel_compression,
         )
         log(INFO, "Opened secure gRPC connection using certificates")
 
+    if compression is not None:
+        channel = grpc.intercept_channel(
+            channel, CompressionThresholdClientInterceptor(compression_threshold)
+        )
+        log(INFO, "Compressing gRPC requests with %s", compression)
+
     return channel
+
+
+def is_unimplemented(err: grpc.RpcError) -> bool:
+    """Check if an RPC failed because the server does not implement it."""
+    return isinstance(err, grpc.Call) and err.code() == grpc.StatusCode.UNIMPLEMENTED
@@ -0,0 +1,85 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for gRPC utility functions."""
+
+
+from typing import Any, Iterator, List, Tuple
+
+import grpc
+
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+
+from .grpc import CompressionThresholdClientInterceptor, _ClientCallDetails
+
+CALL_DETAILS = _ClientCallDetails(
+    "/flwr.proto.Fleet/Method", None, None, None, None, grpc.Compression.Gzip
+)
+
+
+def _intercept_stream_unary(
+    threshold: int, requests: List[Node]
+) -> Tuple[Any, List[Node]]:
+    def continuation(call_details: Any, request_iterator: Iterator[Node]) -> Any:
+        return call_details, list(request_iterator)
+
+    interceptor = CompressionThresholdClientInterceptor(threshold)
+    return interceptor.intercept_stream_unary(  # type: ignore
+        continuation, CALL_DETAILS, iter(requests)
+    )
+
+
+def test_stream_unary_small_stream_uncompressed() -> None:
+    """Test that a stream smaller than the threshold is sent uncompressed."""
+    # Prepare
+    requests = [Node(node_id=1), Node(node_id=2)]
+
+    # Execute
+    call_details, sent = _intercept_stream_unary(1024, requests)
+
+    # Assert
+    assert call_details.compression == grpc.Compression.NoCompression
+    assert sent == requests
+
+
+def test_stream_unary_large_stream_compressed() -> None:
+    """Test that a stream reaching the threshold keeps its compression."""
+    # Prepare
+    requests = [Node(node_id=i) for i in range(1, 11)]
+    threshold = sum(request.ByteSize() for request in requests[:3])
+
+    # Execute
+    call_details, sent = _intercept_stream_unary(threshold, requests)
+
+    # Assert
+    assert call_details is CALL_DETAILS
+    assert sent == requests
+
+
+def test_stream_stream_not_buffered() -> None:
+    """Test that stream-stream requests are not consumed before the call."""
+    # Prepare
+    request_iterator = iter([Node(node_id=1)])
+
+    def continuation(call_details: Any, requests: Iterator[Node]) -> Any:
+        return call_details, requests
+
+    # Execute
+    call_details, requests = CompressionThresholdClientInterceptor(
+        1024
+    ).intercept_stream_stream(continuation, CALL_DETAILS, request_iterator)
+
+    # Assert
+    assert call_details is CALL_DETAILS
+    assert requests is request_iterator
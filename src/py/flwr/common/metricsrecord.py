@@ -15,13 +15,19 @@
 """MetricsRecord."""
 
 
-from typing import Dict, Optional, get_args
+from typing import Dict, Optional, Union, get_args
 
-from flwr.common.typing import MetricsRecordValues, MetricsScalar
+import numpy as np
+
+from flwr.common.typing import MetricsRecordValues, MetricsScalar, NDArray
 
 from .typeddict import TypedDict
 
 
+# NumPy dtype kinds converted to allowed types by `ndarray.tolist`
+_NDARRAY_KINDS = "fiu"
+
+
 def _check_key(key: str) -> None:
     """Check if key is of expected type."""
     if not isinstance(key, str):
@@ -47,8 +53,11 @@ def _check_value(value: MetricsRecordValues) -> None:
             is_valid(value[0])
             # all elements in the list must be of the same valid type
             # this is needed for protobuf
+            # (comparing the set of exact types first, which is much faster)
             value_type = type(value[0])
-            if not all(isinstance(v, value_type) for v in value):
+            if len(set(map(type, value))) > 1 and not all(
+                isinstance(v, value_type) for v in value
+            ):
                 raise TypeError(
                     "All values in a list must be of the same valid type. "
                     f"One of {MetricsScalar}."
@@ -64,6 +73,7 @@ class MetricsRecord(TypedDict[str, MetricsRecordValues]):
         self,
         metrics_dict: Optional[Dict[str, MetricsRecordValues]] = None,
         keep_input: bool = True,
+        check_types: bool = True,
     ):
         """Construct a MetricsRecord object.
 
@@ -72,15 +82,40 @@ class MetricsRecord(TypedDict[str, MetricsRecordValues]):
         metrics_dict : Optional[Dict[str, MetricsRecordValues]]
             A dictionary that stores basic types (i.e. `int`, `float` as defined
             in `MetricsScalar`) and list of such types (see `MetricsScalarList`).
+            1-D ndarrays are converted to lists.
         keep_input : bool (default: True)
             A boolean indicating whether metrics should be deleted from the input
             dictionary immediately after adding them to the record. When set
             to True, the data is duplicated in memory. If memory is a concern, set
             it to False.
+        check_types : bool (default: True)
+            A boolean indicating whether the types of keys and values should be
+            checked. Only set it to False for entries known to be of valid types,
+            e.g. when deserializing them from ProtoBuf. The entries are then added
+            as they are, without the conversion of ndarrays.
         """
         super().__init__(_check_key, _check_value)
-        if metrics_dict:
+        if metrics_dict and not check_types:
+            self._update_unchecked(metrics_dict)
+            if not keep_input:
+                metrics_dict.clear()
+        elif metrics_dict:
             for k in list(metrics_dict.keys()):
                 self[k] = metrics_dict[k]
                 if not keep_input:
                     del metrics_dict[k]
+
+    def __setitem__(self, key: str, value: Union[MetricsRecordValues, NDArray]) -> None:
+        """Set the given key to the given value after type checking.
+
+        A 1-D ndarray is converted to a list of Python scalars first. If its dtype
+        is allowed, all elements are of the same allowed type, so they are not
+        checked one by one.
+        """
+        if isinstance(value, np.ndarray) and value.ndim == 1:
+            if value.dtype.kind in _NDARRAY_KINDS:
+                _check_key(key)
+                self._update_unchecked({key: value.tolist()})
+                return
+            value = value.tolist()
+        super().__setitem__(key, value)  # type: ignore
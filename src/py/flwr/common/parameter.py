@@ -13,42 +13,400 @@
 # limitations under the License.
 # ==============================================================================
 """Parameter conversion."""
+# mypy: disallow_untyped_calls=False
 
 
+import hashlib
 from io import BytesIO
-from typing import cast
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 
+from flwr.proto.recordset_pb2 import Array as ProtoArray  # pylint: disable=E0611
+
+from .constant import (
+    STYPE_DELTA,
+    STYPE_NUMPY,
+    STYPE_NUMPY_BF16,
+    STYPE_NUMPY_COO,
+    STYPE_NUMPY_CSR,
+    STYPE_NUMPY_FP16,
+    STYPE_NUMPY_INT8,
+    STYPE_NUMPY_RAW,
+    TENSOR_TYPE_ARRAY,
+)
+from .parametersrecord import Array
 from .typing import NDArray, NDArrays, Parameters
 
+QUANTIZED_STYPES = (STYPE_NUMPY_FP16, STYPE_NUMPY_BF16, STYPE_NUMPY_INT8)
+
 
 def ndarrays_to_parameters(ndarrays: NDArrays) -> Parameters:
     """Convert NumPy ndarrays to parameters object."""
     tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
-    return Parameters(tensors=tensors, tensor_type="numpy.ndarray")
+    return Parameters(tensors=tensors, tensor_type=STYPE_NUMPY)
+
+
+def parameters_to_ndarrays(parameters: Parameters, copy: bool = True) -> NDArrays:
+    """Convert parameters object to NumPy ndarrays.
+
+    If `copy` is False, the ndarrays are read-only views of `parameters.tensors`
+    (where the encoding allows it). Parameters holding serialized Arrays
+    (`TENSOR_TYPE_ARRAY`) are decoded with `array_to_ndarray`.
+    """
+    if parameters.tensor_type == TENSOR_TYPE_ARRAY:
+        return [
+            array_to_ndarray(array, copy=copy)
+            for array in parameters_to_arrays(parameters)
+        ]
+    return [bytes_to_ndarray(tensor, copy=copy) for tensor in parameters.tensors]
+
+
+def arrays_to_parameters(arrays: Iterable[Array]) -> Parameters:
+    """Convert Arrays of any stype to parameters object.
+
+    Each tensor holds one serialized Array, including its `dtype`, `shape`, and
+    `stype`, so that sparse and delta Arrays can be sent as legacy Parameters.
+    """
+    tensors = [
+        ProtoArray(
+            dtype=array.dtype, shape=array.shape, stype=array.stype, data=array.data
+        ).SerializeToString()
+        for array in arrays
+    ]
+    return Parameters(tensors=tensors, tensor_type=TENSOR_TYPE_ARRAY)
+
+
+def parameters_to_arrays(parameters: Parameters) -> List[Array]:
+    """Convert parameters object to Arrays.
+
+    Tensors of other tensor types are wrapped in Arrays with that stype.
+    """
+    if parameters.tensor_type != TENSOR_TYPE_ARRAY:
+        return [
+            Array(dtype="", shape=[], stype=parameters.tensor_type, data=tensor)
+            for tensor in parameters.tensors
+        ]
+    arrays = []
+    for tensor in parameters.tensors:
+        proto = ProtoArray.FromString(tensor)
+        arrays.append(
+            Array(
+                dtype=proto.dtype,
+                shape=list(proto.shape),
+                stype=proto.stype,
+                data=proto.data,
+            )
+        )
+    return arrays
+
 
+def parameters_version(parameters: Parameters) -> str:
+    """Return a version string identifying the content of a parameters object.
 
-def parameters_to_ndarrays(parameters: Parameters) -> NDArrays:
-    """Convert parameters object to NumPy ndarrays."""
-    return [bytes_to_ndarray(tensor) for tensor in parameters.tensors]
+    Clients can use it as the `base_version` of delta Arrays computed against the
+    parameters they received, the server computes it for the parameters it sent.
+    """
+    digest = hashlib.sha256(parameters.tensor_type.encode())
+    for tensor in parameters.tensors:
+        digest.update(tensor)
+    return digest.hexdigest()
 
 
 def ndarray_to_bytes(ndarray: NDArray) -> bytes:
     """Serialize NumPy ndarray to bytes."""
-    bytes_io = BytesIO()
-    # WARNING: NEVER set allow_pickle to true.
+    # WARNING: NEVER serialize object arrays (i.e., NEVER allow pickle).
     # Reason: loading pickled data can execute arbitrary code
     # Source: https://numpy.org/doc/stable/reference/generated/numpy.save.html
-    np.save(bytes_io, ndarray, allow_pickle=False)
-    return bytes_io.getvalue()
+    if ndarray.dtype.hasobject:
+        raise ValueError("Object arrays cannot be saved when allow_pickle=False")
+    ndarray = np.asarray(ndarray, order="C")
 
+    # Write the same `.npy` format as `np.save`, but copy the data only once
+    header_io = BytesIO()
+    header: Dict[str, Any] = np.lib.format.header_data_from_array_1_0(ndarray)
+    try:
+        np.lib.format.write_array_header_1_0(header_io, header)
+    except ValueError:
+        np.lib.format.write_array_header_2_0(header_io, header)
+    return b"".join([header_io.getvalue(), ndarray.reshape(-1).view(np.uint8).data])
 
-def bytes_to_ndarray(tensor: bytes) -> NDArray:
-    """Deserialize NumPy ndarray from bytes."""
+
+def bytes_to_ndarray(tensor: bytes, copy: bool = True) -> NDArray:
+    """Deserialize NumPy ndarray from bytes.
+
+    If `copy` is False, the ndarray is a read-only view of `tensor`.
+    """
     bytes_io = BytesIO(tensor)
-    # WARNING: NEVER set allow_pickle to true.
+    version = np.lib.format.read_magic(bytes_io)
+    if version not in [(1, 0), (2, 0)]:
+        # WARNING: NEVER set allow_pickle to true.
+        # Reason: loading pickled data can execute arbitrary code
+        # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
+        bytes_io.seek(0)
+        return np.load(bytes_io, allow_pickle=False)  # type: ignore
+
+    read_array_header = (
+        np.lib.format.read_array_header_1_0
+        if version == (1, 0)
+        else np.lib.format.read_array_header_2_0
+    )
+    shape, fortran_order, dtype = read_array_header(bytes_io)
+    # WARNING: NEVER allow object arrays (i.e., NEVER allow pickle).
     # Reason: loading pickled data can execute arbitrary code
-    # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
-    ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
-    return cast(NDArray, ndarray_deserialized)
+    if dtype.hasobject:
+        raise ValueError("Object arrays cannot be loaded when allow_pickle=False")
+    ndarray: NDArray = np.frombuffer(
+        tensor, dtype=dtype, count=int(np.prod(shape)), offset=bytes_io.tell()
+    ).reshape(shape, order="F" if fortran_order else "C")
+    return ndarray.copy(order="K") if copy else ndarray
+
+
+def ndarray_to_array(
+    ndarray: NDArray, stype: str = STYPE_NUMPY_RAW, k: Optional[int] = None
+) -> Array:
+    """Serialize NumPy ndarray to an Array.
+
+    Parameters
+    ----------
+    ndarray : NDArray
+        The ndarray to serialize.
+    stype : str (default: STYPE_NUMPY_RAW)
+        The encoding: the raw buffer (`STYPE_NUMPY_RAW`), `.npy` bytes
+        (`STYPE_NUMPY`), only the non-zero entries in coordinate
+        (`STYPE_NUMPY_COO`) or compressed sparse row (`STYPE_NUMPY_CSR`) format,
+        or floating-point values quantized to float16 (`STYPE_NUMPY_FP16`),
+        bfloat16 (`STYPE_NUMPY_BF16`), or int8 with a per-tensor scale
+        (`STYPE_NUMPY_INT8`).
+    k : Optional[int] (default: None)
+        If set, keep only the `k` entries with the largest magnitude (top-k
+        sparsification). Requires a sparse `stype`.
+    """
+    if ndarray.dtype.hasobject:
+        raise ValueError("Object arrays cannot be serialized")
+    ndarray = np.asarray(ndarray, order="C")
+    if k is not None and stype not in (STYPE_NUMPY_COO, STYPE_NUMPY_CSR):
+        raise ValueError(f"Top-k sparsification is not supported with stype {stype}")
+
+    if stype == STYPE_NUMPY_RAW:
+        data = ndarray.tobytes()
+    elif stype == STYPE_NUMPY:
+        data = ndarray_to_bytes(ndarray)
+    elif stype in (STYPE_NUMPY_COO, STYPE_NUMPY_CSR):
+        flat = ndarray.reshape(-1)
+        indices = np.flatnonzero(flat) if k is None else _top_k_indices(flat, k)
+        data = _sparse_to_bytes(stype, ndarray.shape, indices, flat[indices])
+    elif stype in QUANTIZED_STYPES:
+        data = _quantize(ndarray, stype)
+    else:
+        raise ValueError(f"Unsupported stype: {stype}")
+    return Array(
+        dtype=ndarray.dtype.str, shape=list(ndarray.shape), stype=stype, data=data
+    )
+
+
+def ndarray_to_delta_array(
+    ndarray: NDArray,
+    base: NDArray,
+    base_version: str,
+    stype: str = STYPE_NUMPY_RAW,
+    k: Optional[int] = None,
+) -> Array:
+    """Serialize the difference between NumPy ndarray and a base model to an Array.
+
+    The difference is encoded as in `ndarray_to_array` and `base_version` (e.g.,
+    `parameters_version` of the base model) is appended to its stype. Decode it with
+    `array_to_ndarray` and the same base.
+    """
+    array = ndarray_to_array(np.subtract(ndarray, base), stype=stype, k=k)
+    array.stype = f"{array.stype}{STYPE_DELTA}{base_version}"
+    return array
+
+
+def delta_base_version(array: Array) -> Optional[str]:
+    """Return the version of the base model of a delta Array, None otherwise."""
+    _, delta, base_version = array.stype.partition(STYPE_DELTA)
+    return base_version if delta else None
+
+
+def array_to_ndarray(
+    array: Array, copy: bool = True, base: Optional[NDArray] = None
+) -> NDArray:
+    """Deserialize NumPy ndarray from an Array.
+
+    Supports all stypes written by `ndarray_to_array` and `ndarray_to_delta_array`.
+    Delta Arrays require the `base` they were computed against. If `copy` is False,
+    the ndarray of a raw or `.npy` Array is a read-only view of `array.data`.
+    """
+    if delta_base_version(array) is not None:
+        if base is None:
+            raise ValueError("Deserializing a delta Array requires its base")
+        ndarray = np.array(base, dtype=np.dtype(array.dtype), order="C")
+        add_array_to(ndarray, array)
+        return ndarray
+
+    if array.stype == STYPE_NUMPY:
+        return bytes_to_ndarray(array.data, copy=copy)
+    if array.stype in (STYPE_NUMPY_COO, STYPE_NUMPY_CSR):
+        ndarray = np.zeros(array.shape, dtype=_array_dtype(array))
+        indices, values = _sparse_from_array(array)
+        ndarray.reshape(-1)[indices] = values
+        return ndarray
+    if array.stype in QUANTIZED_STYPES:
+        return _dequantize(array)
+    if array.stype != STYPE_NUMPY_RAW:
+        raise ValueError(f"Unsupported stype: {array.stype}")
+    ndarray = np.frombuffer(array.data, dtype=_array_dtype(array)).reshape(array.shape)
+    return ndarray.copy() if copy else ndarray
+
+
+def add_array_to(out: NDArray, array: Array, weight: float = 1) -> None:
+    """Add the values of an Array, multiplied by `weight`, to `out` in place.
+
+    The entries of sparse Arrays are added without densifying them first. For delta
+    Arrays, only the difference to their base is added.
+    """
+    if tuple(array.shape) != out.shape:
+        raise ValueError(f"Array has shape {tuple(array.shape)}, expected {out.shape}")
+    stype = array.stype.partition(STYPE_DELTA)[0]
+    if stype in (STYPE_NUMPY_COO, STYPE_NUMPY_CSR):
+        if not out.flags.c_contiguous:
+            raise ValueError("Sparse Arrays can only be added to C-contiguous arrays")
+        indices, values = _sparse_from_array(array)
+        out.reshape(-1)[indices] += np.multiply(values, weight, dtype=out.dtype)
+        return
+    dense = Array(dtype=array.dtype, shape=array.shape, stype=stype, data=array.data)
+    np.add(
+        out,
+        np.multiply(array_to_ndarray(dense, copy=False), weight, dtype=out.dtype),
+        out=out,
+    )
+
+
+def _array_dtype(array: Array) -> np.dtype[Any]:
+    dtype = np.dtype(array.dtype)
+    if dtype.hasobject:
+        raise ValueError("Object arrays cannot be deserialized")
+    return dtype
+
+
+def _quantize(ndarray: NDArray, stype: str) -> bytes:
+    """Quantize the values of a floating-point ndarray."""
+    if not np.issubdtype(ndarray.dtype, np.floating):
+        raise ValueError(f"Cannot quantize ndarray of dtype {ndarray.dtype}")
+    if stype == STYPE_NUMPY_FP16:
+        return ndarray.astype("<f2").tobytes()
+    if stype == STYPE_NUMPY_BF16:
+        # Keep the upper 16 bits, rounded to nearest even, and keep NaNs quiet NaNs
+        bits = ndarray.astype("<f4").reshape(-1).view("<u4")
+        upper = (bits + (0x7FFF + ((bits >> 16) & 1))) >> 16
+        upper[np.isnan(bits.view("<f4"))] = 0x7FC0
+        return upper.astype("<u2").tobytes()
+    # Symmetric int8 quantization with one scale for the whole tensor
+    scale = np.float32(np.max(np.abs(ndarray), initial=0) / 127)
+    if not 0 < scale < np.inf:
+        scale = np.float32(1)
+    quantized = np.clip(np.rint(ndarray / scale), -127, 127).astype(np.int8)
+    return b"".join([scale.astype("<f4").tobytes(), quantized.tobytes()])
+
+
+def _dequantize(array: Array) -> NDArray:
+    """Restore the floating-point ndarray of a quantized Array."""
+    dtype = _array_dtype(array)
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError(f"Quantized Array has non-floating-point dtype {dtype}")
+    values: NDArray
+    if array.stype == STYPE_NUMPY_FP16:
+        values = np.frombuffer(array.data, dtype="<f2")
+    elif array.stype == STYPE_NUMPY_BF16:
+        upper = np.frombuffer(array.data, dtype="<u2").astype("<u4")
+        values = (upper << 16).view("<f4")
+    else:
+        scale = np.frombuffer(array.data, dtype="<f4", count=1)[0]
+        values = (
+            np.frombuffer(array.data, dtype=np.int8, offset=4).astype("<f4") * scale
+        )
+    if values.size != int(np.prod(array.shape)):
+        raise ValueError("Invalid size of quantized Array data")
+    return values.astype(dtype).reshape(array.shape)
+
+
+def _index_dtype(size: int) -> np.dtype[Any]:
+    """Return the dtype of the indices of sparse Arrays with `size` entries."""
+    if size <= np.iinfo(np.uint32).max:
+        return np.dtype("<u4")
+    return np.dtype("<u8")
+
+
+def _csr_shape(shape: Tuple[int, ...]) -> Tuple[int, int]:
+    """Return the 2-D shape as which ndarrays of `shape` are stored in CSR format."""
+    rows = shape[0] if len(shape) > 1 else 1
+    size = int(np.prod(shape))
+    return rows, size // rows if rows > 0 else 0
+
+
+def _top_k_indices(flat: NDArray, k: int) -> NDArray:
+    """Return the sorted indices of the `k` entries with the largest magnitude."""
+    if k >= flat.size:
+        return np.arange(flat.size)
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    indices = np.argpartition(np.abs(flat), flat.size - k)[flat.size - k :]
+    return np.sort(indices)
+
+
+def _sparse_to_bytes(
+    stype: str, shape: Tuple[int, ...], indices: NDArray, values: NDArray
+) -> bytes:
+    """Serialize the (sorted) flat `indices` and `values` of non-zero entries.
+
+    COO: indices, values. CSR: row pointers, column indices, values.
+    """
+    index_dtype = _index_dtype(int(np.prod(shape)))
+    if stype == STYPE_NUMPY_COO:
+        parts = [indices.astype(index_dtype)]
+    else:
+        rows, cols = _csr_shape(shape)
+        row_indices, col_indices = np.divmod(indices, max(cols, 1))
+        indptr = np.zeros(rows + 1, dtype=index_dtype)
+        indptr[1:] = np.cumsum(np.bincount(row_indices, minlength=rows))
+        parts = [indptr, col_indices.astype(index_dtype)]
+    parts.append(np.ascontiguousarray(values))
+    return b"".join(part.view(np.uint8).data for part in parts)
+
+
+def _sparse_from_array(array: Array) -> Tuple[NDArray, NDArray]:
+    """Deserialize the flat indices and values of the entries of a sparse Array."""
+    stype = array.stype.partition(STYPE_DELTA)[0]
+    shape = tuple(array.shape)
+    size = int(np.prod(shape))
+    dtype = _array_dtype(array)
+    index_dtype = _index_dtype(size)
+    offset = 0
+    if stype == STYPE_NUMPY_CSR:
+        rows, cols = _csr_shape(shape)
+        offset = (rows + 1) * index_dtype.itemsize
+        indptr = np.frombuffer(array.data, dtype=index_dtype, count=rows + 1)
+    nnz, remainder = divmod(
+        len(array.data) - offset, index_dtype.itemsize + dtype.itemsize
+    )
+    if remainder != 0 or nnz < 0:
+        raise ValueError("Invalid size of sparse Array data")
+    indices = np.frombuffer(
+        array.data, dtype=index_dtype, count=nnz, offset=offset
+    ).astype(np.int64)
+    values: NDArray = np.frombuffer(
+        array.data,
+        dtype=dtype,
+        count=nnz,
+        offset=offset + nnz * index_dtype.itemsize,
+    )
+    if stype == STYPE_NUMPY_CSR:
+        if indptr[-1] != nnz or np.any(np.diff(indptr.astype(np.int64)) < 0):
+            raise ValueError("Invalid row pointers of sparse Array")
+        if np.any(indices >= max(cols, 1)):
+            raise ValueError("Invalid column indices of sparse Array")
+        indices += np.repeat(np.arange(rows, dtype=np.int64) * cols, np.diff(indptr))
+    if np.any(indices >= size):
+        raise ValueError("Invalid indices of sparse Array")
+    return indices, values
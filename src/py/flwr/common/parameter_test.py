@@ -18,10 +18,35 @@ tests.
 """
 
 
+from io import BytesIO
+
 import numpy as np
 import pytest
 
-from .parameter import bytes_to_ndarray, ndarray_to_bytes
+from .constant import (
+    STYPE_NUMPY,
+    STYPE_NUMPY_BF16,
+    STYPE_NUMPY_COO,
+    STYPE_NUMPY_CSR,
+    STYPE_NUMPY_FP16,
+    STYPE_NUMPY_INT8,
+    STYPE_NUMPY_RAW,
+    TENSOR_TYPE_ARRAY,
+)
+from .parameter import (
+    add_array_to,
+    array_to_ndarray,
+    arrays_to_parameters,
+    bytes_to_ndarray,
+    delta_base_version,
+    ndarray_to_array,
+    ndarray_to_bytes,
+    ndarray_to_delta_array,
+    parameters_to_arrays,
+    parameters_to_ndarrays,
+)
+from .parametersrecord import Array
+from .typing import NDArray
 
 
 def test_serialisation_deserialisation() -> None:
@@ -37,3 +62,177 @@ def test_serialisation_deserialisation() -> None:
     # Test false positive
     with pytest.raises(AssertionError, match="Arrays are not equal"):
         np.testing.assert_equal(arr_deserialized, np.ones((3, 2)))
+
+
+def test_serialisation_matches_np_save() -> None:
+    """Test that serialized bytes are in the `.npy` format."""
+    for arr in [np.arange(6).reshape(2, 3), np.array(3.0), np.zeros((0, 2))]:
+        bytes_io = BytesIO()
+        np.save(bytes_io, arr, allow_pickle=False)
+
+        assert ndarray_to_bytes(arr) == bytes_io.getvalue()
+
+
+def test_deserialisation_without_copy() -> None:
+    """Test that deserializing without copy returns a read-only view."""
+    arr = np.asfortranarray(np.random.randn(3, 2))
+    bytes_io = BytesIO()
+    np.save(bytes_io, arr, allow_pickle=False)
+
+    arr_copy = bytes_to_ndarray(bytes_io.getvalue())
+    arr_view = bytes_to_ndarray(bytes_io.getvalue(), copy=False)
+
+    np.testing.assert_equal(arr_copy, arr)
+    np.testing.assert_equal(arr_view, arr)
+    assert arr_copy.flags.writeable
+    assert not arr_view.flags.writeable
+
+
+def test_array_serialisation_deserialisation() -> None:
+    """Test that the raw buffer of an ndarray is stored in an Array."""
+    arr = np.arange(6, dtype=np.float32).reshape(2, 3)[:, ::2]
+
+    array = ndarray_to_array(arr)
+    arr_deserialized = array_to_ndarray(array, copy=False)
+
+    assert array.stype == STYPE_NUMPY_RAW
+    assert array.dtype == "<f4"
+    assert array.shape == [2, 2]
+    assert array.data == arr.tobytes()
+    np.testing.assert_equal(arr_deserialized, arr)
+    assert not arr_deserialized.flags.writeable
+
+
+def test_array_to_ndarray_npy() -> None:
+    """Test that Arrays holding `.npy` bytes can be deserialized."""
+    arr = np.array([1, 2, 3])
+    array = Array(dtype="", shape=[], stype=STYPE_NUMPY, data=ndarray_to_bytes(arr))
+
+    np.testing.assert_equal(array_to_ndarray(array), arr)
+
+
+@pytest.mark.parametrize("stype", [STYPE_NUMPY_COO, STYPE_NUMPY_CSR])
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.array(3.0),
+        np.array([0.0, 1.5, 0.0, -2.0]),
+        np.array([[0, 1, 0], [0, 0, 0], [4, 0, 5]], dtype=np.int16),
+        np.zeros((2, 0, 3)),
+        np.where(np.random.rand(3, 4, 5) > 0.7, np.random.randn(3, 4, 5), 0.0),
+    ],
+)
+def test_sparse_array_serialisation_deserialisation(stype: str, arr: NDArray) -> None:
+    """Test that sparse Arrays store the non-zero entries only."""
+    array = ndarray_to_array(arr, stype=stype)
+    arr_deserialized = array_to_ndarray(array)
+
+    assert array.stype == stype
+    assert array.shape == list(arr.shape)
+    assert arr_deserialized.dtype == arr.dtype
+    np.testing.assert_equal(arr_deserialized, arr)
+    if stype == STYPE_NUMPY_COO:
+        assert len(array.data) == np.count_nonzero(arr) * (4 + arr.itemsize)
+
+
+@pytest.mark.parametrize("stype", [STYPE_NUMPY_COO, STYPE_NUMPY_CSR])
+def test_top_k_array(stype: str) -> None:
+    """Test that top-k sparsification keeps the entries with the largest magnitude."""
+    arr = np.array([[0.1, -5.0, 0.2], [3.0, 0.0, -0.3]])
+    expected = np.array([[0.0, -5.0, 0.0], [3.0, 0.0, -0.3]])
+
+    np.testing.assert_equal(
+        array_to_ndarray(ndarray_to_array(arr, stype, k=3)), expected
+    )
+    np.testing.assert_equal(
+        array_to_ndarray(ndarray_to_array(arr, stype, k=0)), 0 * arr
+    )
+    np.testing.assert_equal(array_to_ndarray(ndarray_to_array(arr, stype, k=9)), arr)
+    with pytest.raises(ValueError):
+        ndarray_to_array(arr, STYPE_NUMPY_RAW, k=3)
+
+
+@pytest.mark.parametrize("stype", [STYPE_NUMPY_RAW, STYPE_NUMPY_COO])
+def test_delta_array(stype: str) -> None:
+    """Test that delta Arrays are decoded against their base."""
+    base = np.arange(6, dtype=np.float32).reshape(2, 3)
+    arr = base.copy()
+    arr[1, 2] += 2.0
+
+    array = ndarray_to_delta_array(arr, base, "v1", stype=stype)
+
+    assert delta_base_version(array) == "v1"
+    assert delta_base_version(ndarray_to_array(arr)) is None
+    np.testing.assert_equal(array_to_ndarray(array, base=base), arr)
+    with pytest.raises(ValueError):
+        array_to_ndarray(array)
+
+
+@pytest.mark.parametrize(
+    "stype, itemsize, tolerance",
+    [
+        (STYPE_NUMPY_FP16, 2, 1e-3),
+        (STYPE_NUMPY_BF16, 2, 1e-2),
+        (STYPE_NUMPY_INT8, 1, 1e-2),
+    ],
+)
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_quantized_array(
+    stype: str, itemsize: int, tolerance: float, dtype: str
+) -> None:
+    """Test that quantized Arrays are smaller and restore the original dtype."""
+    arr = np.random.randn(4, 5).astype(dtype)
+
+    array = ndarray_to_array(arr, stype=stype)
+    arr_deserialized = array_to_ndarray(array)
+
+    assert len(array.data) <= arr.size * itemsize + 4
+    assert arr_deserialized.dtype == arr.dtype
+    assert arr_deserialized.shape == arr.shape
+    np.testing.assert_allclose(
+        arr_deserialized, arr, rtol=tolerance, atol=tolerance * np.abs(arr).max()
+    )
+    np.testing.assert_equal(array_to_ndarray(ndarray_to_array(0 * arr, stype)), 0 * arr)
+    with pytest.raises(ValueError):
+        ndarray_to_array(np.arange(3), stype=stype)
+
+
+def test_bf16_array_special_values() -> None:
+    """Test that bfloat16 Arrays keep infinities and NaNs and round to nearest."""
+    arr = np.array([np.inf, -np.inf, np.nan, 1.0 + 2**-8, 1.0 + 3 * 2**-8])
+
+    arr_deserialized = array_to_ndarray(ndarray_to_array(arr, STYPE_NUMPY_BF16))
+
+    np.testing.assert_equal(
+        arr_deserialized, [np.inf, -np.inf, np.nan, 1.0, 1.0 + 4 * 2**-8]
+    )
+
+
+def test_add_array_to() -> None:
+    """Test that Arrays of all stypes are added in place."""
+    arr = np.array([[0.0, 2.0], [0.0, -1.0]])
+    out = np.ones((2, 2))
+
+    for stype in [STYPE_NUMPY_RAW, STYPE_NUMPY, STYPE_NUMPY_COO, STYPE_NUMPY_CSR]:
+        add_array_to(out, ndarray_to_array(arr, stype), weight=2)
+
+    np.testing.assert_equal(out, 1 + 8 * arr)
+    with pytest.raises(ValueError):
+        add_array_to(np.ones(4), ndarray_to_array(arr, STYPE_NUMPY_COO))
+
+
+def test_arrays_to_parameters() -> None:
+    """Test that Arrays keep their metadata in parameters objects."""
+    arrays = [
+        ndarray_to_array(np.array([[0.0, 1.0]]), STYPE_NUMPY_CSR),
+        ndarray_to_array(np.array([1, 2], dtype=np.int8)),
+    ]
+
+    parameters = arrays_to_parameters(arrays)
+
+    assert parameters.tensor_type == TENSOR_TYPE_ARRAY
+    assert parameters_to_arrays(parameters) == arrays
+    np.testing.assert_equal(
+        parameters_to_ndarrays(parameters),
+        [np.array([[0.0, 1.0]]), np.array([1, 2], dtype=np.int8)],
+    )
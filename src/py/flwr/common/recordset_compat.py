@@ -18,6 +18,21 @@
 from typing import Dict, Mapping, OrderedDict, Tuple, Union, cast, get_args
 
 from . import Array, ConfigsRecord, MetricsRecord, ParametersRecord, RecordSet
+from .constant import (
+    STYPE_DELTA,
+    STYPE_NUMPY,
+    STYPE_NUMPY_COO,
+    STYPE_NUMPY_CSR,
+    STYPE_NUMPY_RAW,
+    TENSOR_TYPE_ARRAY,
+)
+from .parameter import (
+    QUANTIZED_STYPES,
+    array_to_ndarray,
+    arrays_to_parameters,
+    ndarray_to_bytes,
+    parameters_to_arrays,
+)
 from .typing import (
     Code,
     ConfigsRecordValues,
@@ -56,15 +71,32 @@ def parametersrecord_to_parameters(
         A boolean indicating whether entries in the record should be deleted from the
         input dictionary immediately after adding them to the record.
     """
+    if any(_is_compact(array) for array in record.values()):
+        # Keep the encoding, strategies add such Arrays without densifying them
+        parameters = arrays_to_parameters(record.values())
+        if not keep_input:
+            for key in list(record.keys()):
+                del record[key]
+        return parameters
+
     parameters = Parameters(tensors=[], tensor_type="")
 
     for key in list(record.keys()):
-        parameters.tensors.append(record[key].data)
+        array = record[key]
+        if array.stype == STYPE_NUMPY_RAW:
+            # Raw buffers are not self-describing, convert them to `.npy` bytes
+            array = Array(
+                dtype=array.dtype,
+                shape=array.shape,
+                stype=STYPE_NUMPY,
+                data=ndarray_to_bytes(array_to_ndarray(array, copy=False)),
+            )
+        parameters.tensors.append(array.data)
 
         if not parameters.tensor_type:
             # Setting from first array in record. Recall the warning in the docstrings
             # of this function.
-            parameters.tensor_type = record[key].stype
+            parameters.tensor_type = array.stype
 
         if not keep_input:
             del record[key]
@@ -91,6 +123,15 @@ def parameters_to_parametersrecord(
         adding them to the record.
     """
     tensor_type = parameters.tensor_type
+    if tensor_type == TENSOR_TYPE_ARRAY:
+        # Tensors are serialized Arrays, restore them including their metadata
+        arrays = parameters_to_arrays(parameters)
+        if not keep_input:
+            parameters.tensors.clear()
+        return ParametersRecord(
+            OrderedDict((str(idx), array) for idx, array in enumerate(arrays)),
+            keep_input=False,
+        )
 
     num_arrays = len(parameters.tensors)
     ordered_dict = OrderedDict()
@@ -106,6 +147,15 @@ def parameters_to_parametersrecord(
     return ParametersRecord(ordered_dict, keep_input=keep_input)
 
 
+def _is_compact(array: Array) -> bool:
+    """Return True if the Array holds a sparse or quantized encoding or a delta."""
+    return STYPE_DELTA in array.stype or array.stype in (
+        STYPE_NUMPY_COO,
+        STYPE_NUMPY_CSR,
+        *QUANTIZED_STYPES,
+    )
+
+
 def _check_mapping_from_recordscalartype_to_scalar(
     record_data: Mapping[str, Union[ConfigsRecordValues, MetricsRecordValues]]
 ) -> Dict[str, Scalar]:
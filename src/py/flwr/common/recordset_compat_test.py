@@ -15,12 +15,14 @@
 """RecordSet from legacy messages tests."""
 
 from copy import deepcopy
-from typing import Callable, Dict
+from typing import Callable, Dict, OrderedDict
 
 import numpy as np
 import pytest
 
-from .parameter import ndarrays_to_parameters
+from .constant import STYPE_NUMPY_COO, STYPE_NUMPY_FP16, TENSOR_TYPE_ARRAY
+from .parameter import ndarray_to_array, ndarrays_to_parameters, parameters_to_ndarrays
+from .parametersrecord import ParametersRecord
 from .recordset_compat import (
     evaluateins_to_recordset,
     evaluateres_to_recordset,
@@ -30,6 +32,8 @@ from .recordset_compat import (
     getparametersres_to_recordset,
     getpropertiesins_to_recordset,
     getpropertiesres_to_recordset,
+    parameters_to_parametersrecord,
+    parametersrecord_to_parameters,
     recordset_to_evaluateins,
     recordset_to_evaluateres,
     recordset_to_fitins,
@@ -192,6 +196,37 @@ def test_fitres_to_recordset_and_back(
     assert validate_freed_fn(fitres, fitres_copy, fitres_)
 
 
+def test_raw_parametersrecord_to_parameters() -> None:
+    """Test that raw Arrays are converted to `.npy` tensors."""
+    ndarrays = get_ndarrays()
+    record = ParametersRecord(
+        OrderedDict((str(i), ndarray_to_array(arr)) for i, arr in enumerate(ndarrays))
+    )
+
+    parameters = parametersrecord_to_parameters(record, keep_input=False)
+
+    assert parameters.tensor_type == "numpy.ndarray"
+    for arr, arr_ in zip(ndarrays, parameters_to_ndarrays(parameters)):
+        np.testing.assert_equal(arr, arr_)
+
+
+@pytest.mark.parametrize("stype", [STYPE_NUMPY_COO, STYPE_NUMPY_FP16])
+def test_compact_parametersrecord_to_parameters_and_back(stype: str) -> None:
+    """Test that sparse and quantized Arrays keep their encoding in Parameters."""
+    ndarrays = get_ndarrays()
+    arrays = OrderedDict(
+        (str(i), ndarray_to_array(arr, stype)) for i, arr in enumerate(ndarrays)
+    )
+    record = ParametersRecord(deepcopy(arrays))
+
+    parameters = parametersrecord_to_parameters(record, keep_input=False)
+    record_ = parameters_to_parametersrecord(parameters, keep_input=False)
+
+    assert parameters.tensor_type == TENSOR_TYPE_ARRAY
+    assert len(record) == 0 and len(parameters.tensors) == 0
+    assert record_ == ParametersRecord(arrays)
+
+
 @pytest.mark.parametrize(
     "keep_input, validate_freed_fn",
     [
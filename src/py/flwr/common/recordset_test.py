@@ -251,6 +251,28 @@ def test_set_metrics_to_metricsrecord_with_incorrect_types(
         m_record.update(my_metrics)
 
 
+def test_set_1d_ndarrays_to_records() -> None:
+    """Test that 1-D ndarrays are added to records as lists."""
+    # Prepare
+    floats = np.array([0.5, 1.5], dtype=np.float32)
+    ints = np.arange(3)
+
+    # Execute
+    m_record = MetricsRecord({"floats": floats, "ints": ints})  # type: ignore
+    c_record = ConfigsRecord()
+    c_record["flags"] = np.array([True, False])
+    c_record["names"] = np.array(["a", "bc"])
+
+    # Assert
+    assert m_record == {"floats": [0.5, 1.5], "ints": [0, 1, 2]}
+    assert type(m_record["ints"][0]) is int  # pylint: disable=unidiomatic-typecheck
+    assert c_record == {"flags": [True, False], "names": ["a", "bc"]}
+    with pytest.raises(TypeError):
+        m_record["flags"] = np.array([True, False])  # type: ignore
+    with pytest.raises(TypeError):
+        m_record["complex"] = np.array([1j])  # type: ignore
+
+
 @pytest.mark.parametrize(
     "keep_input",
     [
@@ -15,22 +15,29 @@
 """ProtoBuf serialization and deserialization."""
 
 
-from typing import Any, Dict, List, MutableMapping, OrderedDict, Type, TypeVar, cast
+from typing import (
+    Any,
+    Dict,
+    List,
+    MutableMapping,
+    OrderedDict,
+    Sequence,
+    Type,
+    TypeVar,
+    cast,
+)
 
 from google.protobuf.message import Message as GrpcMessage
 
 # pylint: disable=E0611
 from flwr.proto.node_pb2 import Node
 from flwr.proto.recordset_pb2 import Array as ProtoArray
-from flwr.proto.recordset_pb2 import BoolList, BytesList
 from flwr.proto.recordset_pb2 import ConfigsRecord as ProtoConfigsRecord
 from flwr.proto.recordset_pb2 import ConfigsRecordValue as ProtoConfigsRecordValue
-from flwr.proto.recordset_pb2 import DoubleList
 from flwr.proto.recordset_pb2 import MetricsRecord as ProtoMetricsRecord
 from flwr.proto.recordset_pb2 import MetricsRecordValue as ProtoMetricsRecordValue
 from flwr.proto.recordset_pb2 import ParametersRecord as ProtoParametersRecord
 from flwr.proto.recordset_pb2 import RecordSet as ProtoRecordSet
-from flwr.proto.recordset_pb2 import Sint64List, StringList
 from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
 from flwr.proto.transport_pb2 import (
     ClientMessage,
@@ -364,35 +371,59 @@ _type_to_field = {
     str: "string",
     bytes: "bytes",
 }
-_list_type_to_class_and_field = {
-    float: (DoubleList, "double_list"),
-    int: (Sint64List, "sint64_list"),
-    bool: (BoolList, "bool_list"),
-    str: (StringList, "string_list"),
-    bytes: (BytesList, "bytes_list"),
+_list_type_to_field = {
+    float: "double_list",
+    int: "sint64_list",
+    bool: "bool_list",
+    str: "string_list",
+    bytes: "bytes_list",
 }
+# Note: `bool` MUST be in front of `int` because `isinstance(False, int) == True`
+_metrics_record_value_types = (float, int)
+_configs_record_value_types = (bool, int, float, str, bytes)
 T = TypeVar("T")
 
 
 def _record_value_to_proto(
-    value: Any, allowed_types: List[type], proto_class: Type[T]
+    value: Any, allowed_types: Sequence[type], proto_class: Type[T]
 ) -> T:
     """Serialize `*RecordValue` to ProtoBuf.
 
-    Note: `bool` MUST be put in the front of allowd_types if it exists.
+    The type of a list is detected once, from the set of its element types, and its
+    elements are extended into the repeated field in bulk. Note: `bool` MUST be put
+    in the front of allowed_types if it exists.
     """
-    arg = {}
+    # Single element of exactly an allowed type
+    value_type = type(value)
+    if value_type in _type_to_field and value_type in allowed_types:
+        return proto_class(**{_type_to_field[value_type]: value})
+
+    # List whose elements are all of exactly one allowed type
+    list_type = None
+    if isinstance(value, list):
+        element_types = set(map(type, value))
+        if len(element_types) == 1:
+            list_type = element_types.pop()
+        elif len(element_types) == 0:
+            list_type = allowed_types[0]
+    if list_type in allowed_types:
+        proto = proto_class()
+        # pylint: disable-next=no-member
+        getattr(proto, _list_type_to_field[list_type]).vals.extend(value)
+        return proto
+
+    # Fall back to `isinstance` checks (e.g., subclasses or lists of bools and ints)
     for t in allowed_types:
         # Single element
         # Note: `isinstance(False, int) == True`.
         if isinstance(value, t):
-            arg[_type_to_field[t]] = value
-            return proto_class(**arg)
+            return proto_class(**{_type_to_field[t]: value})
         # List
         if isinstance(value, list) and all(isinstance(item, t) for item in value):
-            list_class, field_name = _list_type_to_class_and_field[t]
-            arg[field_name] = list_class(vals=value)
-            return proto_class(**arg)
+            proto = proto_class()
+            # pylint: disable-next=no-member
+            getattr(proto, _list_type_to_field[t]).vals.extend(value)
+            return proto
     # Invalid types
     raise TypeError(
         f"The type of the following value is not allowed "
@@ -412,22 +443,17 @@ def _record_value_from_proto(value_proto: GrpcMessage) -> Any:
 
 def _record_value_dict_to_proto(
     value_dict: TypedDict[str, Any],
-    allowed_types: List[type],
+    allowed_types: Sequence[type],
     value_proto_class: Type[T],
 ) -> Dict[str, T]:
     """Serialize the record value dict to ProtoBuf.
 
-    Note: `bool` MUST be put in the front of allowd_types if it exists.
+    Note: `bool` MUST be put in the front of allowed_types if it exists.
     """
-    # Move bool to the front
-    if bool in allowed_types and allowed_types[0] != bool:
-        allowed_types.remove(bool)
-        allowed_types.insert(0, bool)
-
-    def proto(_v: Any) -> T:
-        return _record_value_to_proto(_v, allowed_types, value_proto_class)
-
-    return {k: proto(v) for k, v in value_dict.items()}
+    return {
+        k: _record_value_to_proto(v, allowed_types, value_proto_class)
+        for k, v in value_dict.items()
+    }
 
 
 def _record_value_dict_from_proto(
@@ -475,7 +501,9 @@ def parameters_record_from_proto(
 def metrics_record_to_proto(record: MetricsRecord) -> ProtoMetricsRecord:
     """Serialize MetricsRecord to ProtoBuf."""
     return ProtoMetricsRecord(
-        data=_record_value_dict_to_proto(record, [float, int], ProtoMetricsRecordValue)
+        data=_record_value_dict_to_proto(
+            record, _metrics_record_value_types, ProtoMetricsRecordValue
+        )
     )
 
 
@@ -487,6 +515,7 @@ def metrics_record_from_proto(record_proto: ProtoMetricsRecord) -> MetricsRecord
             _record_value_dict_from_proto(record_proto.data),
         ),
         keep_input=False,
+        check_types=False,
     )
 
 
@@ -494,9 +523,7 @@ def configs_record_to_proto(record: ConfigsRecord) -> ProtoConfigsRecord:
     """Serialize ConfigsRecord to ProtoBuf."""
     return ProtoConfigsRecord(
         data=_record_value_dict_to_proto(
-            record,
-            [bool, int, float, str, bytes],
-            ProtoConfigsRecordValue,
+            record, _configs_record_value_types, ProtoConfigsRecordValue
         )
     )
 
@@ -509,6 +536,7 @@ def configs_record_from_proto(record_proto: ProtoConfigsRecord) -> ConfigsRecord
             _record_value_dict_from_proto(record_proto.data),
         ),
         keep_input=False,
+        check_types=False,
     )
 
 
@@ -19,6 +19,9 @@ import random
 import string
 from typing import Any, Optional, OrderedDict, Type, TypeVar, Union, cast
 
+import numpy as np
+import pytest
+
 # pylint: disable=E0611
 from flwr.proto import transport_pb2 as pb2
 from flwr.proto.recordset_pb2 import Array as ProtoArray
@@ -283,6 +286,51 @@ def test_configs_record_serialization_deserialization() -> None:
     assert original == deserialized
 
 
+def test_metrics_record_ndarray_and_empty_list_serialization() -> None:
+    """Test that 1-D ndarrays and empty lists are serialized as lists."""
+    # Prepare
+    original = MetricsRecord(
+        {
+            "floats": np.array([0.5, 1.5], dtype=np.float32),
+            "ints": np.arange(3),
+            "empty": [],
+        }
+    )
+
+    # Execute
+    deserialized = metrics_record_from_proto(metrics_record_to_proto(original))
+
+    # Assert
+    assert deserialized == {"floats": [0.5, 1.5], "ints": [0, 1, 2], "empty": []}
+
+
+def test_configs_record_mixed_list_serialization() -> None:
+    """Test that lists of bools and ints fall back to the type checks."""
+    # Prepare
+    original = ConfigsRecord(
+        {"mixed": [True, 1, 2], "bools": [True, False]}, check_types=False
+    )
+
+    # Execute
+    proto = configs_record_to_proto(original)
+    deserialized = configs_record_from_proto(proto)
+
+    # Assert
+    assert proto.data["mixed"].HasField("sint64_list")
+    assert proto.data["bools"].HasField("bool_list")
+    assert deserialized == {"mixed": [1, 1, 2], "bools": [True, False]}
+
+
+def test_metrics_record_invalid_type_serialization() -> None:
+    """Test that values of types not allowed in MetricsRecord are rejected."""
+    # Prepare
+    original = MetricsRecord({"text": ["a", "b"]}, check_types=False)  # type: ignore
+
+    # Execute & Assert
+    with pytest.raises(TypeError):
+        metrics_record_to_proto(original)
+
+
 def test_recordset_serialization_deserialization() -> None:
     """Test serialization and deserialization of RecordSet."""
     # Prepare
@@ -91,6 +91,10 @@ class TypedDict(Generic[K, V]):
         for key, value in dict(*args, **kwargs).items():
             self[key] = value
 
+    def _update_unchecked(self, data: Dict[K, V]) -> None:
+        """Add all items of `data` without type checking."""
+        self._data.update(data)
+
     def pop(self, key: K) -> V:
         """R.pop(k[,d]) -> v, remove specified key and return the corresponding value.
 
@@ -16,7 +16,7 @@ from flwr.proto import node_pb2 as flwr_dot_proto_dot_node__pb2
 from flwr.proto import task_pb2 as flwr_dot_proto_dot_task__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17\x66lwr/proto/driver.proto\x12\nflwr.proto\x1a\x15\x66lwr/proto/node.proto\x1a\x15\x66lwr/proto/task.proto\"\x12\n\x10\x43reateRunRequest\"#\n\x11\x43reateRunResponse\x12\x0e\n\x06run_id\x18\x01 \x01(\x12\"!\n\x0fGetNodesRequest\x12\x0e\n\x06run_id\x18\x01 \x01(\x12\"3\n\x10GetNodesResponse\x12\x1f\n\x05nodes\x18\x01 \x03(\x0b\x32\x10.flwr.proto.Node\"@\n\x12PushTaskInsRequest\x12*\n\rtask_ins_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskIns\"\'\n\x13PushTaskInsResponse\x12\x10\n\x08task_ids\x18\x02 \x03(\t\"F\n\x12PullTaskResRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x10\n\x08task_ids\x18\x02 \x03(\t\"A\n\x13PullTaskResResponse\x12*\n\rtask_res_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskRes2\xc1\x02\n\x06\x44river\x12J\n\tCreateRun\x12\x1c.flwr.proto.CreateRunRequest\x1a\x1d.flwr.proto.CreateRunResponse\"\x00\x12G\n\x08GetNodes\x12\x1b.flwr.proto.GetNodesRequest\x1a\x1c.flwr.proto.GetNodesResponse\"\x00\x12P\n\x0bPushTaskIns\x12\x1e.flwr.proto.PushTaskInsRequest\x1a\x1f.flwr.proto.PushTaskInsResponse\"\x00\x12P\n\x0bPullTaskRes\x12\x1e.flwr.proto.PullTaskResRequest\x1a\x1f.flwr.proto.PullTaskResResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17\x66lwr/proto/driver.proto\x12\nflwr.proto\x1a\x15\x66lwr/proto/node.proto\x1a\x15\x66lwr/proto/task.proto\"\x12\n\x10\x43reateRunRequest\"#\n\x11\x43reateRunResponse\x12\x0e\n\x06run_id\x18\x01 \x01(\x12\"!\n\x0fGetNodesRequest\x12\x0e\n\x06run_id\x18\x01 \x01(\x12\"3\n\x10GetNodesResponse\x12\x1f\n\x05nodes\x18\x01 \x03(\x0b\x32\x10.flwr.proto.Node\"^\n\x10TaskInsBroadcast\x12%\n\x08task_ins\x18\x01 \x01(\x0b\x32\x13.flwr.proto.TaskIns\x12#\n\tconsumers\x18\x02 \x03(\x0b\x32\x10.flwr.proto.Node\"\x7f\n\x12PushTaskInsRequest\x12*\n\rtask_ins_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskIns\x12=\n\x17task_ins_broadcast_list\x18\x02 \x03(\x0b\x32\x1c.flwr.proto.TaskInsBroadcast\"\'\n\x13PushTaskInsResponse\x12\x10\n\x08task_ids\x18\x02 \x03(\t\"W\n\x12PullTaskResRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x10\n\x08task_ids\x18\x02 \x03(\t\x12\x0f\n\x07timeout\x18\x03 \x01(\x01\"A\n\x13PullTaskResResponse\x12*\n\rtask_res_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskRes2\xe2\x03\n\x06\x44river\x12J\n\tCreateRun\x12\x1c.flwr.proto.CreateRunRequest\x1a\x1d.flwr.proto.CreateRunResponse\"\x00\x12G\n\x08GetNodes\x12\x1b.flwr.proto.GetNodesRequest\x1a\x1c.flwr.proto.GetNodesResponse\"\x00\x12P\n\x0bPushTaskIns\x12\x1e.flwr.proto.PushTaskInsRequest\x1a\x1f.flwr.proto.PushTaskInsResponse\"\x00\x12P\n\x0bPullTaskRes\x12\x1e.flwr.proto.PullTaskResRequest\x1a\x1f.flwr.proto.PullTaskResResponse\"\x00\x12O\n\x11PushTaskInsStream\x12\x15.flwr.proto.TaskChunk\x1a\x1f.flwr.proto.PushTaskInsResponse\"\x00(\x01\x12N\n\x11PullTaskResStream\x12\x1e.flwr.proto.PullTaskResRequest\x1a\x15.flwr.proto.TaskChunk\"\x00\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -31,14 +31,16 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_GETNODESREQUEST']._serialized_end=175
   _globals['_GETNODESRESPONSE']._serialized_start=177
   _globals['_GETNODESRESPONSE']._serialized_end=228
-  _globals['_PUSHTASKINSREQUEST']._serialized_start=230
-  _globals['_PUSHTASKINSREQUEST']._serialized_end=294
-  _globals['_PUSHTASKINSRESPONSE']._serialized_start=296
-  _globals['_PUSHTASKINSRESPONSE']._serialized_end=335
-  _globals['_PULLTASKRESREQUEST']._serialized_start=337
-  _globals['_PULLTASKRESREQUEST']._serialized_end=407
-  _globals['_PULLTASKRESRESPONSE']._serialized_start=409
-  _globals['_PULLTASKRESRESPONSE']._serialized_end=474
-  _globals['_DRIVER']._serialized_start=477
-  _globals['_DRIVER']._serialized_end=798
+  _globals['_TASKINSBROADCAST']._serialized_start=230
+  _globals['_TASKINSBROADCAST']._serialized_end=324
+  _globals['_PUSHTASKINSREQUEST']._serialized_start=326
+  _globals['_PUSHTASKINSREQUEST']._serialized_end=453
+  _globals['_PUSHTASKINSRESPONSE']._serialized_start=455
+  _globals['_PUSHTASKINSRESPONSE']._serialized_end=494
+  _globals['_PULLTASKRESREQUEST']._serialized_start=496
+  _globals['_PULLTASKRESREQUEST']._serialized_end=583
+  _globals['_PULLTASKRESRESPONSE']._serialized_start=585
+  _globals['_PULLTASKRESRESPONSE']._serialized_end=650
+  _globals['_DRIVER']._serialized_start=653
+  _globals['_DRIVER']._serialized_end=1135
 # @@protoc_insertion_point(module_scope)
@@ -55,20 +55,49 @@ class GetNodesResponse(google.protobuf.message.Message):
     def ClearField(self, field_name: typing_extensions.Literal["nodes",b"nodes"]) -> None: ...
 global___GetNodesResponse = GetNodesResponse
 
+class TaskInsBroadcast(google.protobuf.message.Message):
+    """PushTaskIns messages
+    TaskIns sent to multiple consumers. `task_ins.task.consumer` is ignored,
+    one TaskIns is created for each node in `consumers` and all of them share
+    the same `task_ins.task.recordset`.
+    """
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    TASK_INS_FIELD_NUMBER: builtins.int
+    CONSUMERS_FIELD_NUMBER: builtins.int
+    @property
+    def task_ins(self) -> flwr.proto.task_pb2.TaskIns: ...
+    @property
+    def consumers(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.node_pb2.Node]: ...
+    def __init__(self,
+        *,
+        task_ins: typing.Optional[flwr.proto.task_pb2.TaskIns] = ...,
+        consumers: typing.Optional[typing.Iterable[flwr.proto.node_pb2.Node]] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["task_ins",b"task_ins"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["consumers",b"consumers","task_ins",b"task_ins"]) -> None: ...
+global___TaskInsBroadcast = TaskInsBroadcast
+
 class PushTaskInsRequest(google.protobuf.message.Message):
-    """PushTaskIns messages"""
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     TASK_INS_LIST_FIELD_NUMBER: builtins.int
+    TASK_INS_BROADCAST_LIST_FIELD_NUMBER: builtins.int
     @property
     def task_ins_list(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.task_pb2.TaskIns]: ...
+    @property
+    def task_ins_broadcast_list(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___TaskInsBroadcast]: ...
     def __init__(self,
         *,
         task_ins_list: typing.Optional[typing.Iterable[flwr.proto.task_pb2.TaskIns]] = ...,
+        task_ins_broadcast_list: typing.Optional[typing.Iterable[global___TaskInsBroadcast]] = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["task_ins_list",b"task_ins_list"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["task_ins_broadcast_list",b"task_ins_broadcast_list","task_ins_list",b"task_ins_list"]) -> None: ...
 global___PushTaskInsRequest = PushTaskInsRequest
 
 class PushTaskInsResponse(google.protobuf.message.Message):
+    """`task_ids` contains one ID for each TaskIns in `task_ins_list`, followed by
+    one ID for each consumer of each TaskInsBroadcast in
+    `task_ins_broadcast_list`, in request order
+    """
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     TASK_IDS_FIELD_NUMBER: builtins.int
     @property
@@ -81,21 +110,28 @@ class PushTaskInsResponse(google.protobuf.message.Message):
 global___PushTaskInsResponse = PushTaskInsResponse
 
 class PullTaskResRequest(google.protobuf.message.Message):
-    """PullTaskRes messages"""
+    """PullTaskRes messages
+    If no TaskRes is available yet, the SuperLink waits up to `timeout` seconds
+    for one to arrive before responding (long polling). The default of 0 responds
+    immediately.
+    """
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     NODE_FIELD_NUMBER: builtins.int
     TASK_IDS_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
     @property
     def node(self) -> flwr.proto.node_pb2.Node: ...
     @property
     def task_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]: ...
+    timeout: builtins.float
     def __init__(self,
         *,
         node: typing.Optional[flwr.proto.node_pb2.Node] = ...,
         task_ids: typing.Optional[typing.Iterable[typing.Text]] = ...,
+        timeout: builtins.float = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["node",b"node"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids","timeout",b"timeout"]) -> None: ...
 global___PullTaskResRequest = PullTaskResRequest
 
 class PullTaskResResponse(google.protobuf.message.Message):
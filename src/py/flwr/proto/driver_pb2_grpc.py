@@ -3,6 +3,7 @@
 import grpc
 
 from flwr.proto import driver_pb2 as flwr_dot_proto_dot_driver__pb2
+from flwr.proto import task_pb2 as flwr_dot_proto_dot_task__pb2
 
 
 class DriverStub(object):
@@ -34,6 +35,16 @@ class DriverStub(object):
                 request_serializer=flwr_dot_proto_dot_driver__pb2.PullTaskResRequest.SerializeToString,
                 response_deserializer=flwr_dot_proto_dot_driver__pb2.PullTaskResResponse.FromString,
                 )
+        self.PushTaskInsStream = channel.stream_unary(
+                '/flwr.proto.Driver/PushTaskInsStream',
+                request_serializer=flwr_dot_proto_dot_task__pb2.TaskChunk.SerializeToString,
+                response_deserializer=flwr_dot_proto_dot_driver__pb2.PushTaskInsResponse.FromString,
+                )
+        self.PullTaskResStream = channel.unary_stream(
+                '/flwr.proto.Driver/PullTaskResStream',
+                request_serializer=flwr_dot_proto_dot_driver__pb2.PullTaskResRequest.SerializeToString,
+                response_deserializer=flwr_dot_proto_dot_task__pb2.TaskChunk.FromString,
+                )
 
 
 class DriverServicer(object):
@@ -67,6 +78,23 @@ class DriverServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PushTaskInsStream(self, request_iterator, context):
+        """Create one or more tasks, streaming them in chunks (see TaskChunk). A
+        TaskIns with consumers is handled like a TaskInsBroadcast. `task_ids` are
+        returned as for a PushTaskInsRequest holding the TaskIns without consumers
+        in `task_ins_list` and the others in `task_ins_broadcast_list`.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PullTaskResStream(self, request, context):
+        """Get task results, streaming them in chunks (see TaskChunk)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DriverServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -90,6 +118,16 @@ def add_DriverServicer_to_server(servicer, server):
                     request_deserializer=flwr_dot_proto_dot_driver__pb2.PullTaskResRequest.FromString,
                     response_serializer=flwr_dot_proto_dot_driver__pb2.PullTaskResResponse.SerializeToString,
             ),
+            'PushTaskInsStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.PushTaskInsStream,
+                    request_deserializer=flwr_dot_proto_dot_task__pb2.TaskChunk.FromString,
+                    response_serializer=flwr_dot_proto_dot_driver__pb2.PushTaskInsResponse.SerializeToString,
+            ),
+            'PullTaskResStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.PullTaskResStream,
+                    request_deserializer=flwr_dot_proto_dot_driver__pb2.PullTaskResRequest.FromString,
+                    response_serializer=flwr_dot_proto_dot_task__pb2.TaskChunk.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'flwr.proto.Driver', rpc_method_handlers)
@@ -167,3 +205,37 @@ class Driver(object):
             flwr_dot_proto_dot_driver__pb2.PullTaskResResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PushTaskInsStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/flwr.proto.Driver/PushTaskInsStream',
+            flwr_dot_proto_dot_task__pb2.TaskChunk.SerializeToString,
+            flwr_dot_proto_dot_driver__pb2.PushTaskInsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PullTaskResStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/flwr.proto.Driver/PullTaskResStream',
+            flwr_dot_proto_dot_driver__pb2.PullTaskResRequest.SerializeToString,
+            flwr_dot_proto_dot_task__pb2.TaskChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
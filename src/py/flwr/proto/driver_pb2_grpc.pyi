@@ -4,7 +4,9 @@ isort:skip_file
 """
 import abc
 import flwr.proto.driver_pb2
+import flwr.proto.task_pb2
 import grpc
+import typing
 
 class DriverStub:
     def __init__(self, channel: grpc.Channel) -> None: ...
@@ -28,6 +30,20 @@ class DriverStub:
         flwr.proto.driver_pb2.PullTaskResResponse]
     """Get task results"""
 
+    PushTaskInsStream: grpc.StreamUnaryMultiCallable[
+        flwr.proto.task_pb2.TaskChunk,
+        flwr.proto.driver_pb2.PushTaskInsResponse]
+    """Create one or more tasks, streaming them in chunks (see TaskChunk). A
+    TaskIns with consumers is handled like a TaskInsBroadcast. `task_ids` are
+    returned as for a PushTaskInsRequest holding the TaskIns without consumers
+    in `task_ins_list` and the others in `task_ins_broadcast_list`.
+    """
+
+    PullTaskResStream: grpc.UnaryStreamMultiCallable[
+        flwr.proto.driver_pb2.PullTaskResRequest,
+        flwr.proto.task_pb2.TaskChunk]
+    """Get task results, streaming them in chunks (see TaskChunk)"""
+
 
 class DriverServicer(metaclass=abc.ABCMeta):
     @abc.abstractmethod
@@ -62,5 +78,25 @@ class DriverServicer(metaclass=abc.ABCMeta):
         """Get task results"""
         pass
 
+    @abc.abstractmethod
+    def PushTaskInsStream(self,
+        request_iterator: typing.Iterator[flwr.proto.task_pb2.TaskChunk],
+        context: grpc.ServicerContext,
+    ) -> flwr.proto.driver_pb2.PushTaskInsResponse:
+        """Create one or more tasks, streaming them in chunks (see TaskChunk). A
+        TaskIns with consumers is handled like a TaskInsBroadcast. `task_ids` are
+        returned as for a PushTaskInsRequest holding the TaskIns without consumers
+        in `task_ins_list` and the others in `task_ins_broadcast_list`.
+        """
+        pass
+
+    @abc.abstractmethod
+    def PullTaskResStream(self,
+        request: flwr.proto.driver_pb2.PullTaskResRequest,
+        context: grpc.ServicerContext,
+    ) -> typing.Iterator[flwr.proto.task_pb2.TaskChunk]:
+        """Get task results, streaming them in chunks (see TaskChunk)"""
+        pass
+
 
 def add_DriverServicer_to_server(servicer: DriverServicer, server: grpc.Server) -> None: ...
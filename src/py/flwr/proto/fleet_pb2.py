@@ -16,7 +16,7 @@ from flwr.proto import node_pb2 as flwr_dot_proto_dot_node__pb2
 from flwr.proto import task_pb2 as flwr_dot_proto_dot_task__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x66lwr/proto/fleet.proto\x12\nflwr.proto\x1a\x15\x66lwr/proto/node.proto\x1a\x15\x66lwr/proto/task.proto\"\x13\n\x11\x43reateNodeRequest\"4\n\x12\x43reateNodeResponse\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"3\n\x11\x44\x65leteNodeRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"\x14\n\x12\x44\x65leteNodeResponse\"F\n\x12PullTaskInsRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x10\n\x08task_ids\x18\x02 \x03(\t\"k\n\x13PullTaskInsResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12*\n\rtask_ins_list\x18\x02 \x03(\x0b\x32\x13.flwr.proto.TaskIns\"@\n\x12PushTaskResRequest\x12*\n\rtask_res_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskRes\"\xae\x01\n\x13PushTaskResResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12=\n\x07results\x18\x02 \x03(\x0b\x32,.flwr.proto.PushTaskResResponse.ResultsEntry\x1a.\n\x0cResultsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\r:\x02\x38\x01\"\x1e\n\tReconnect\x12\x11\n\treconnect\x18\x01 \x01(\x04\x32\xc9\x02\n\x05\x46leet\x12M\n\nCreateNode\x12\x1d.flwr.proto.CreateNodeRequest\x1a\x1e.flwr.proto.CreateNodeResponse\"\x00\x12M\n\nDeleteNode\x12\x1d.flwr.proto.DeleteNodeRequest\x1a\x1e.flwr.proto.DeleteNodeResponse\"\x00\x12P\n\x0bPullTaskIns\x12\x1e.flwr.proto.PullTaskInsRequest\x1a\x1f.flwr.proto.PullTaskInsResponse\"\x00\x12P\n\x0bPushTaskRes\x12\x1e.flwr.proto.PushTaskResRequest\x1a\x1f.flwr.proto.PushTaskResResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x66lwr/proto/fleet.proto\x12\nflwr.proto\x1a\x15\x66lwr/proto/node.proto\x1a\x15\x66lwr/proto/task.proto\"\x13\n\x11\x43reateNodeRequest\"4\n\x12\x43reateNodeResponse\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"3\n\x11\x44\x65leteNodeRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"\x14\n\x12\x44\x65leteNodeResponse\"W\n\x12PullTaskInsRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x10\n\x08task_ids\x18\x02 \x03(\t\x12\x0f\n\x07timeout\x18\x03 \x01(\x01\"k\n\x13PullTaskInsResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12*\n\rtask_ins_list\x18\x02 \x03(\x0b\x32\x13.flwr.proto.TaskIns\"@\n\x12PushTaskResRequest\x12*\n\rtask_res_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskRes\"\xae\x01\n\x13PushTaskResResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12=\n\x07results\x18\x02 \x03(\x0b\x32,.flwr.proto.PushTaskResResponse.ResultsEntry\x1a.\n\x0cResultsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\r:\x02\x38\x01\"\x1e\n\tReconnect\x12\x11\n\treconnect\x18\x01 \x01(\x04\x32\xea\x03\n\x05\x46leet\x12M\n\nCreateNode\x12\x1d.flwr.proto.CreateNodeRequest\x1a\x1e.flwr.proto.CreateNodeResponse\"\x00\x12M\n\nDeleteNode\x12\x1d.flwr.proto.DeleteNodeRequest\x1a\x1e.flwr.proto.DeleteNodeResponse\"\x00\x12P\n\x0bPullTaskIns\x12\x1e.flwr.proto.PullTaskInsRequest\x1a\x1f.flwr.proto.PullTaskInsResponse\"\x00\x12P\n\x0bPushTaskRes\x12\x1e.flwr.proto.PushTaskResRequest\x1a\x1f.flwr.proto.PushTaskResResponse\"\x00\x12N\n\x11PullTaskInsStream\x12\x1e.flwr.proto.PullTaskInsRequest\x1a\x15.flwr.proto.TaskChunk\"\x00\x30\x01\x12O\n\x11PushTaskResStream\x12\x15.flwr.proto.TaskChunk\x1a\x1f.flwr.proto.PushTaskResResponse\"\x00(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,17 +34,17 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_DELETENODERESPONSE']._serialized_start=212
   _globals['_DELETENODERESPONSE']._serialized_end=232
   _globals['_PULLTASKINSREQUEST']._serialized_start=234
-  _globals['_PULLTASKINSREQUEST']._serialized_end=304
-  _globals['_PULLTASKINSRESPONSE']._serialized_start=306
-  _globals['_PULLTASKINSRESPONSE']._serialized_end=413
-  _globals['_PUSHTASKRESREQUEST']._serialized_start=415
-  _globals['_PUSHTASKRESREQUEST']._serialized_end=479
-  _globals['_PUSHTASKRESRESPONSE']._serialized_start=482
-  _globals['_PUSHTASKRESRESPONSE']._serialized_end=656
-  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_start=610
-  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_end=656
-  _globals['_RECONNECT']._serialized_start=658
-  _globals['_RECONNECT']._serialized_end=688
-  _globals['_FLEET']._serialized_start=691
-  _globals['_FLEET']._serialized_end=1020
+  _globals['_PULLTASKINSREQUEST']._serialized_end=321
+  _globals['_PULLTASKINSRESPONSE']._serialized_start=323
+  _globals['_PULLTASKINSRESPONSE']._serialized_end=430
+  _globals['_PUSHTASKRESREQUEST']._serialized_start=432
+  _globals['_PUSHTASKRESREQUEST']._serialized_end=496
+  _globals['_PUSHTASKRESRESPONSE']._serialized_start=499
+  _globals['_PUSHTASKRESRESPONSE']._serialized_end=673
+  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_start=627
+  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_end=673
+  _globals['_RECONNECT']._serialized_start=675
+  _globals['_RECONNECT']._serialized_end=705
+  _globals['_FLEET']._serialized_start=708
+  _globals['_FLEET']._serialized_end=1198
 # @@protoc_insertion_point(module_scope)
@@ -54,21 +54,28 @@ class DeleteNodeResponse(google.protobuf.message.Message):
 global___DeleteNodeResponse = DeleteNodeResponse
 
 class PullTaskInsRequest(google.protobuf.message.Message):
-    """PullTaskIns messages"""
+    """PullTaskIns messages
+    If no TaskIns is available yet, the SuperLink may wait up to `timeout`
+    seconds for one to arrive before responding (long polling). The default of 0
+    responds immediately.
+    """
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     NODE_FIELD_NUMBER: builtins.int
     TASK_IDS_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
     @property
     def node(self) -> flwr.proto.node_pb2.Node: ...
     @property
     def task_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]: ...
+    timeout: builtins.float
     def __init__(self,
         *,
         node: typing.Optional[flwr.proto.node_pb2.Node] = ...,
         task_ids: typing.Optional[typing.Iterable[typing.Text]] = ...,
+        timeout: builtins.float = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["node",b"node"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids","timeout",b"timeout"]) -> None: ...
 global___PullTaskInsRequest = PullTaskInsRequest
 
 class PullTaskInsResponse(google.protobuf.message.Message):
@@ -4,7 +4,9 @@ isort:skip_file
 """
 import abc
 import flwr.proto.fleet_pb2
+import flwr.proto.task_pb2
 import grpc
+import typing
 
 class FleetStub:
     def __init__(self, channel: grpc.Channel) -> None: ...
@@ -32,6 +34,16 @@ class FleetStub:
     HTTP API path: /api/v1/fleet/push-task-res
     """
 
+    PullTaskInsStream: grpc.UnaryStreamMultiCallable[
+        flwr.proto.fleet_pb2.PullTaskInsRequest,
+        flwr.proto.task_pb2.TaskChunk]
+    """Retrieve one or more tasks, streaming them in chunks (see TaskChunk)"""
+
+    PushTaskResStream: grpc.StreamUnaryMultiCallable[
+        flwr.proto.task_pb2.TaskChunk,
+        flwr.proto.fleet_pb2.PushTaskResResponse]
+    """Complete one or more tasks, streaming them in chunks (see TaskChunk)"""
+
 
 class FleetServicer(metaclass=abc.ABCMeta):
     @abc.abstractmethod
@@ -68,5 +80,21 @@ class FleetServicer(metaclass=abc.ABCMeta):
         """
         pass
 
+    @abc.abstractmethod
+    def PullTaskInsStream(self,
+        request: flwr.proto.fleet_pb2.PullTaskInsRequest,
+        context: grpc.ServicerContext,
+    ) -> typing.Iterator[flwr.proto.task_pb2.TaskChunk]:
+        """Retrieve one or more tasks, streaming them in chunks (see TaskChunk)"""
+        pass
+
+    @abc.abstractmethod
+    def PushTaskResStream(self,
+        request_iterator: typing.Iterator[flwr.proto.task_pb2.TaskChunk],
+        context: grpc.ServicerContext,
+    ) -> flwr.proto.fleet_pb2.PushTaskResResponse:
+        """Complete one or more tasks, streaming them in chunks (see TaskChunk)"""
+        pass
+
 
 def add_FleetServicer_to_server(servicer: FleetServicer, server: grpc.Server) -> None: ...
@@ -93,3 +93,74 @@ class TaskRes(google.protobuf.message.Message):
     def HasField(self, field_name: typing_extensions.Literal["task",b"task"]) -> builtins.bool: ...
     def ClearField(self, field_name: typing_extensions.Literal["group_id",b"group_id","run_id",b"run_id","task",b"task","task_id",b"task_id"]) -> None: ...
 global___TaskRes = TaskRes
+
+class ArrayChunk(google.protobuf.message.Message):
+    """Chunked transfer of TaskIns and TaskRes
+
+    A task is streamed as one TaskChunk holding the task, where the `data` of all
+    Arrays in its RecordSet is left empty, followed by one TaskChunk for each
+    frame of this data. Each frame holds the data of one Array from `offset` to
+    `offset + len(data)`. The chunk holding the task also lists the total size of
+    the data of each Array in `array_sizes`.
+    """
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    RECORD_KEY_FIELD_NUMBER: builtins.int
+    ARRAY_KEY_FIELD_NUMBER: builtins.int
+    SIZE_FIELD_NUMBER: builtins.int
+    OFFSET_FIELD_NUMBER: builtins.int
+    DATA_FIELD_NUMBER: builtins.int
+    record_key: typing.Text
+    """Key of the ParametersRecord in the RecordSet"""
+
+    array_key: typing.Text
+    """Key of the Array in the ParametersRecord"""
+
+    size: builtins.int
+    """Total size of the data of the Array in bytes"""
+
+    offset: builtins.int
+    data: builtins.bytes
+    def __init__(self,
+        *,
+        record_key: typing.Text = ...,
+        array_key: typing.Text = ...,
+        size: builtins.int = ...,
+        offset: builtins.int = ...,
+        data: builtins.bytes = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["array_key",b"array_key","data",b"data","offset",b"offset","record_key",b"record_key","size",b"size"]) -> None: ...
+global___ArrayChunk = ArrayChunk
+
+class TaskChunk(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    TASK_INS_FIELD_NUMBER: builtins.int
+    TASK_RES_FIELD_NUMBER: builtins.int
+    ARRAY_CHUNK_FIELD_NUMBER: builtins.int
+    CONSUMERS_FIELD_NUMBER: builtins.int
+    ARRAY_SIZES_FIELD_NUMBER: builtins.int
+    @property
+    def task_ins(self) -> global___TaskIns: ...
+    @property
+    def task_res(self) -> global___TaskRes: ...
+    @property
+    def array_chunk(self) -> global___ArrayChunk: ...
+    @property
+    def consumers(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.node_pb2.Node]:
+        """Consumers of a broadcast TaskIns (see TaskInsBroadcast in the Driver API)"""
+        pass
+    @property
+    def array_sizes(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___ArrayChunk]:
+        """Keys and total sizes (without data) of all Arrays of the task"""
+        pass
+    def __init__(self,
+        *,
+        task_ins: typing.Optional[global___TaskIns] = ...,
+        task_res: typing.Optional[global___TaskRes] = ...,
+        array_chunk: typing.Optional[global___ArrayChunk] = ...,
+        consumers: typing.Optional[typing.Iterable[flwr.proto.node_pb2.Node]] = ...,
+        array_sizes: typing.Optional[typing.Iterable[global___ArrayChunk]] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["array_chunk",b"array_chunk","chunk",b"chunk","task_ins",b"task_ins","task_res",b"task_res"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["array_chunk",b"array_chunk","array_sizes",b"array_sizes","chunk",b"chunk","consumers",b"consumers","task_ins",b"task_ins","task_res",b"task_res"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["chunk",b"chunk"]) -> typing.Optional[typing_extensions.Literal["task_ins","task_res","array_chunk"]]: ...
+global___TaskChunk = TaskChunk
@@ -20,6 +20,7 @@ from .app import run_driver_api as run_driver_api
 from .app import run_fleet_api as run_fleet_api
 from .app import run_superlink as run_superlink
 from .app import start_server as start_server
+from .async_server import AsyncServer as AsyncServer
 from .client_manager import ClientManager as ClientManager
 from .client_manager import SimpleClientManager as SimpleClientManager
 from .compat import start_driver as start_driver
@@ -31,6 +32,7 @@ from .server_app import ServerApp as ServerApp
 from .server_config import ServerConfig as ServerConfig
 
 __all__ = [
+    "AsyncServer",
     "ClientManager",
     "Driver",
     "History",
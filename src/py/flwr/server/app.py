@@ -30,6 +30,7 @@ import grpc
 
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH, EventType, event
 from flwr.common.address import parse_address
+from flwr.common.compression import available_compressions
 from flwr.common.constant import (
     MISSING_EXTRA_REST,
     TRANSPORT_TYPE_GRPC_RERE,
@@ -73,6 +74,7 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
     client_manager: Optional[ClientManager] = None,
     grpc_max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     certificates: Optional[Tuple[bytes, bytes, bytes]] = None,
+    compression: Optional[str] = None,
 ) -> History:
     """Start a Flower server using the gRPC transport layer.
 
@@ -111,6 +113,9 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
             * CA certificate.
             * server certificate.
             * server private key.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip" or "deflate") used for large messages sent
+        to clients which accept it. Clients choose their own compression.
 
     Returns
     -------
@@ -161,6 +166,7 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
         server_address=address,
         max_message_length=grpc_max_message_length,
         certificates=certificates,
+        compression=compression,
     )
     log(
         INFO,
@@ -248,6 +254,7 @@ def run_driver_api() -> None:
         address=address,
         state_factory=state_factory,
         certificates=certificates,
+        compression=args.compression,
     )
 
     # Graceful shutdown
@@ -298,6 +305,7 @@ def run_fleet_api() -> None:
                 args.ssl_certfile,
                 state_factory,
                 args.rest_fleet_api_workers,
+                args.compression,
             ),
         )
         fleet_thread.start()
@@ -313,6 +321,7 @@ def run_fleet_api() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            compression=args.compression,
         )
         grpc_servers.append(fleet_server)
     else:
@@ -357,6 +366,7 @@ def run_superlink() -> None:
         address=address,
         state_factory=state_factory,
         certificates=certificates,
+        compression=args.compression,
     )
 
     grpc_servers = [driver_server]
@@ -384,6 +394,7 @@ def run_superlink() -> None:
                 args.ssl_certfile,
                 state_factory,
                 args.rest_fleet_api_workers,
+                args.compression,
             ),
         )
         fleet_thread.start()
@@ -399,6 +410,7 @@ def run_superlink() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            compression=args.compression,
         )
         grpc_servers.append(fleet_server)
     else:
@@ -493,6 +505,7 @@ def _run_driver_api_grpc(
     address: str,
     state_factory: StateFactory,
     certificates: Optional[Tuple[bytes, bytes, bytes]],
+    compression: Optional[str] = None,
 ) -> grpc.Server:
     """Run Driver API (gRPC, request-response)."""
     # Create Driver API gRPC server
@@ -505,6 +518,7 @@ def _run_driver_api_grpc(
         server_address=address,
         max_message_length=GRPC_MAX_MESSAGE_LENGTH,
         certificates=certificates,
+        compression=compression,
     )
 
     log(INFO, "Flower ECE: Starting Driver API (gRPC-rere) on %s", address)
@@ -517,6 +531,7 @@ def _run_fleet_api_grpc_rere(
     address: str,
     state_factory: StateFactory,
     certificates: Optional[Tuple[bytes, bytes, bytes]],
+    compression: Optional[str] = None,
 ) -> grpc.Server:
     """Run Fleet API (gRPC, request-response)."""
     # Create Fleet API gRPC server
@@ -529,6 +544,7 @@ def _run_fleet_api_grpc_rere(
         server_address=address,
         max_message_length=GRPC_MAX_MESSAGE_LENGTH,
         certificates=certificates,
+        compression=compression,
     )
 
     log(INFO, "Flower ECE: Starting Fleet API (gRPC-rere) on %s", address)
@@ -545,6 +561,7 @@ def _run_fleet_api_rest(
     ssl_certfile: Optional[str],
     state_factory: StateFactory,
     workers: int,
+    compression: Optional[str] = None,
 ) -> None:
     """Run Driver API (REST-based)."""
     try:
@@ -563,6 +580,7 @@ def _run_fleet_api_rest(
 
     # See: https://www.starlette.io/applications/#accessing-the-app-instance
     fast_api_app.state.STATE_FACTORY = state_factory
+    fast_api_app.state.COMPRESSION = compression
 
     validation_exceptions = _validate_ssl_files(
         ssl_certfile=ssl_certfile, ssl_keyfile=ssl_keyfile
@@ -685,6 +703,15 @@ def _add_args_common(parser: argparse.ArgumentParser) -> None:
         "Flower will just create a state in memory.",
         default=DATABASE,
     )
+    parser.add_argument(
+        "--compression",
+        choices=available_compressions(),
+        default=None,
+        help="Compress large messages sent to clients (and Driver API users) that "
+        "accept the given algorithm. gRPC supports `gzip` and `deflate`, REST "
+        "additionally `zstd` and `lz4` if installed. Compressed messages from "
+        "clients are always accepted.",
+    )
 
 
 def _add_args_driver_api(parser: argparse.ArgumentParser) -> None:
@@ -0,0 +1,281 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Flower server for asynchronous (buffered) federated learning."""
+
+
+import concurrent.futures
+import timeit
+from logging import DEBUG, INFO, WARNING
+from typing import Dict, List, Optional, Tuple, Union
+
+from flwr.common import Code, FitRes, Parameters
+from flwr.common.logger import log
+from flwr.server.client_manager import ClientManager
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.history import History
+from flwr.server.server import Server, fit_client
+from flwr.server.strategy import AsyncStrategy, BufferedFitRes
+
+InFlight = Dict[
+    concurrent.futures.Future,  # type: ignore
+    Tuple[ClientProxy, int, Parameters],
+]
+
+
+class AsyncServer(Server):
+    """Flower server for asynchronous (buffered) federated learning.
+
+    Instead of waiting for all clients of a round, the server keeps clients
+    training at all times (see `AsyncStrategy.configure_fit_async`), buffers their
+    results as they arrive, and updates the global model whenever the strategy
+    decides to (see `AsyncStrategy.should_aggregate`). Clients which have returned
+    a result are given new work immediately, so slow clients do not hold back the
+    others. Each result records its staleness, the number of global model updates
+    since its client received the global model.
+
+    `num_rounds` in `fit` is the number of global model updates. The model is
+    evaluated centrally (`Strategy.evaluate`) after each update, and on a sample of
+    clients (`Strategy.configure_evaluate`) once training has finished.
+
+    Clients are instructed one by one (`ClientProxy.fit`), which works both for
+    clients connected to the server and for clients reached through the Driver
+    API (see `start_driver`). Each client training occupies a thread, so
+    `max_workers` (see `set_max_workers`) must be at least the `concurrency` of
+    the strategy (e.g., `FedBuff`), otherwise `fit` raises a `ValueError`. If
+    `max_workers` is None, it defaults to that `concurrency`.
+    """
+
+    def __init__(
+        self,
+        *,
+        client_manager: ClientManager,
+        strategy: AsyncStrategy,
+    ) -> None:
+        if not isinstance(strategy, AsyncStrategy):
+            raise TypeError("AsyncServer requires an AsyncStrategy, e.g., FedBuff")
+        super().__init__(client_manager=client_manager, strategy=strategy)
+        self.strategy: AsyncStrategy = strategy
+
+    def set_strategy(self, strategy: AsyncStrategy) -> None:  # type: ignore
+        """Replace server strategy."""
+        if not isinstance(strategy, AsyncStrategy):
+            raise TypeError("AsyncServer requires an AsyncStrategy, e.g., FedBuff")
+        self.strategy = strategy
+
+    # pylint: disable=too-many-locals
+    def fit(self, num_rounds: int, timeout: Optional[float]) -> History:
+        """Run asynchronous federated learning for a number of model updates."""
+        history = History()
+
+        # Each client training occupies a thread until it returns
+        max_workers = self.max_workers
+        concurrency: Optional[int] = getattr(self.strategy, "concurrency", None)
+        if concurrency is not None:
+            if max_workers is None:
+                max_workers = concurrency
+            elif max_workers < concurrency:
+                raise ValueError(
+                    f"`max_workers` ({max_workers}) must be at least the "
+                    f"`concurrency` of the strategy ({concurrency})"
+                )
+
+        # Initialize parameters
+        log(INFO, "Initializing global parameters")
+        self.parameters = self._get_initial_parameters(timeout=timeout)
+        log(INFO, "Evaluating initial parameters")
+        res = self.strategy.evaluate(0, parameters=self.parameters)
+        if res is not None:
+            log(
+                INFO,
+                "initial parameters (loss, other metrics): %s, %s",
+                res[0],
+                res[1],
+            )
+            history.add_loss_centralized(server_round=0, loss=res[0])
+            history.add_metrics_centralized(server_round=0, metrics=res[1])
+
+        # Run asynchronous federated learning for num_rounds model updates
+        log(INFO, "FL starting (asynchronous)")
+        start_time = timeit.default_timer()
+
+        server_version = 0
+        results: List[BufferedFitRes] = []
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+        in_flight: InFlight = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while server_version < num_rounds:
+                # Give new work to idle clients
+                self._dispatch_fit(server_version, in_flight, executor, timeout)
+                if not in_flight:
+                    log(
+                        INFO,
+                        "fit_async %s: no clients selected, cancel",
+                        server_version,
+                    )
+                    break
+
+                # Buffer results as they arrive
+                finished_fs, _ = concurrent.futures.wait(
+                    fs=in_flight,
+                    timeout=None,  # Handled in the respective communication stack
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in finished_fs:
+                    _handle_finished_future_after_fit_async(
+                        future,
+                        in_flight.pop(future),
+                        server_version,
+                        results,
+                        failures,
+                    )
+                if not self.strategy.should_aggregate(
+                    server_version, results, failures
+                ):
+                    continue
+
+                # Update the global model with the buffered results
+                server_version += 1
+                log(
+                    DEBUG,
+                    "fit_async %s: aggregating %s results and %s failures",
+                    server_version,
+                    len(results),
+                    len(failures),
+                )
+                parameters_prime, fit_metrics = self.strategy.aggregate_fit_async(
+                    server_version, self.parameters, results, failures
+                )
+                results, failures = [], []
+                if parameters_prime:
+                    self.parameters = parameters_prime
+                else:
+                    log(
+                        WARNING,
+                        "fit_async %s: global model not updated",
+                        server_version,
+                    )
+                history.add_metrics_distributed_fit(
+                    server_round=server_version, metrics=fit_metrics
+                )
+
+                # Evaluate model using strategy implementation
+                self._evaluate_centralized(server_version, history, start_time)
+
+            # Results of clients still training are discarded, but the clients are
+            # waited for so that they are idle for the federated evaluation
+            log(
+                DEBUG,
+                "fit_async: waiting for %s clients still training",
+                len(in_flight),
+            )
+
+        # Evaluate model on a sample of available clients
+        res_fed = self.evaluate_round(server_round=server_version, timeout=timeout)
+        if res_fed is not None:
+            loss_fed, evaluate_metrics_fed, _ = res_fed
+            if loss_fed is not None:
+                history.add_loss_distributed(server_round=server_version, loss=loss_fed)
+                history.add_metrics_distributed(
+                    server_round=server_version, metrics=evaluate_metrics_fed
+                )
+
+        # Bookkeeping
+        end_time = timeit.default_timer()
+        elapsed = end_time - start_time
+        log(INFO, "FL finished in %s", elapsed)
+        return history
+
+    def _evaluate_centralized(
+        self, server_version: int, history: History, start_time: float
+    ) -> None:
+        """Evaluate the global model using the strategy implementation."""
+        res_cen = self.strategy.evaluate(server_version, parameters=self.parameters)
+        if res_cen is not None:
+            loss_cen, metrics_cen = res_cen
+            log(
+                INFO,
+                "fit progress: (%s, %s, %s, %s)",
+                server_version,
+                loss_cen,
+                metrics_cen,
+                timeit.default_timer() - start_time,
+            )
+            history.add_loss_centralized(server_round=server_version, loss=loss_cen)
+            history.add_metrics_centralized(
+                server_round=server_version, metrics=metrics_cen
+            )
+
+    def _dispatch_fit(
+        self,
+        server_version: int,
+        in_flight: InFlight,
+        executor: concurrent.futures.ThreadPoolExecutor,
+        timeout: Optional[float],
+    ) -> None:
+        """Start training on the idle clients selected by the strategy."""
+        busy_cids = {client.cid for client, _, _ in in_flight.values()}
+        client_instructions = self.strategy.configure_fit_async(
+            server_version=server_version,
+            parameters=self.parameters,
+            client_manager=self._client_manager,
+            busy_cids=busy_cids,
+        )
+        if client_instructions:
+            log(
+                DEBUG,
+                "fit_async %s: strategy sampled %s clients (%s busy, out of %s)",
+                server_version,
+                len(client_instructions),
+                len(busy_cids),
+                self._client_manager.num_available(),
+            )
+        for client_proxy, ins in client_instructions:
+            future = executor.submit(fit_client, client_proxy, ins, timeout)
+            in_flight[future] = (client_proxy, server_version, ins.parameters)
+
+
+def _handle_finished_future_after_fit_async(
+    future: concurrent.futures.Future,  # type: ignore
+    dispatched: Tuple[ClientProxy, int, Parameters],
+    server_version: int,
+    results: List[BufferedFitRes],
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+) -> None:
+    """Convert finished future into either a buffered result or a failure."""
+    # Check if there was an exception
+    failure = future.exception()
+    if failure is not None:
+        failures.append(failure)
+        return
+
+    # Successfully received a result from a client
+    result: Tuple[ClientProxy, FitRes] = future.result()
+    client_proxy, res = result
+
+    # Check result status code
+    if res.status.code == Code.OK:
+        _, base_version, base_parameters = dispatched
+        results.append(
+            BufferedFitRes(
+                client=client_proxy,
+                fit_res=res,
+                base_parameters=base_parameters,
+                staleness=server_version - base_version,
+            )
+        )
+        return
+
+    # Not successful, client returned a result where the status code is not OK
+    failures.append(result)
@@ -0,0 +1,181 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Asynchronous Flower server tests."""
+
+
+import threading
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from flwr.common import (
+    Code,
+    FitIns,
+    FitRes,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_manager import SimpleClientManager
+from flwr.server.strategy import FedAvg, FedBuff
+
+from .async_server import AsyncServer
+from .server_test import FailingClient, SuccessClient
+
+
+class IncrementClient(SuccessClient):
+    """Test class adding one to the received parameters."""
+
+    def __init__(self, cid: str, release: Optional[threading.Event] = None) -> None:
+        super().__init__(cid)
+        self.release = release
+        self.num_fit = 0
+
+    def fit(self, ins: FitIns, timeout: Optional[float]) -> FitRes:
+        """Simulate fit by returning the received parameters plus one."""
+        self.num_fit += 1
+        if self.release is not None:
+            # Simulate a straggler
+            self.release.wait()
+        ndarrays = parameters_to_ndarrays(ins.parameters)
+        return FitRes(
+            status=Status(code=Code.OK, message="Success"),
+            parameters=ndarrays_to_parameters([x + 1.0 for x in ndarrays]),
+            num_examples=1,
+            metrics={},
+        )
+
+
+def test_fit_does_not_wait_for_stragglers() -> None:
+    """Test that fast clients keep training while a slow client is busy."""
+    # Prepare
+    num_rounds = 5
+    release = threading.Event()
+    fast_clients = [IncrementClient("0"), IncrementClient("1")]
+    slow_client = IncrementClient("2", release)
+    client_manager = SimpleClientManager()
+    for client in fast_clients + [slow_client]:
+        client_manager.register(client)
+    strategy = FedBuff(
+        concurrency=3,
+        buffer_size=2,
+        min_available_clients=3,
+        fraction_evaluate=0.0,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+        # Release the straggler once the last update is done
+        evaluate_fn=lambda version, ndarrays, _: (
+            release.set() if version == num_rounds else None
+        ),
+    )
+    server = AsyncServer(client_manager=client_manager, strategy=strategy)
+    server.set_max_workers(3)
+
+    # Execute
+    server.fit(num_rounds=num_rounds, timeout=None)
+
+    # Assert
+    assert slow_client.num_fit == 1
+    assert sum(client.num_fit for client in fast_clients) >= 2 * num_rounds
+    # Each update moves the model by one at most (less with stale results)
+    actual = parameters_to_ndarrays(server.parameters)[0]
+    assert np.all(actual > 2.0) and np.all(actual <= num_rounds)
+
+
+def test_fit_failures() -> None:
+    """Test that failing clients free their slot for other clients."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    increment_client = IncrementClient("0")
+    client_manager.register(increment_client)
+    client_manager.register(FailingClient("1"))
+    updates = []
+    strategy = FedBuff(
+        concurrency=2,
+        buffer_size=1,
+        min_available_clients=2,
+        fraction_evaluate=0.0,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+        evaluate_fn=lambda version, ndarrays, _: updates.append(
+            (version, ndarrays[0][0])
+        ),
+    )
+    server = AsyncServer(client_manager=client_manager, strategy=strategy)
+
+    # Execute
+    server.fit(num_rounds=3, timeout=None)
+
+    # Assert
+    assert [version for version, _ in updates] == [0, 1, 2, 3]
+    # Each buffer holds either one result, moving the model by one at most, or
+    # one failure, leaving it unchanged
+    values = [value for _, value in updates]
+    assert all(0.0 <= b - a <= 1.0 for a, b in zip(values, values[1:]))
+    assert increment_client.num_fit >= values[-1]
+
+
+def test_fit_only_failures() -> None:
+    """Test that training ends when all clients fail."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    client_manager.register(FailingClient("0"))
+    client_manager.register(FailingClient("1"))
+    updates = []
+    strategy = FedBuff(
+        concurrency=2,
+        buffer_size=2,
+        min_available_clients=2,
+        fraction_evaluate=0.0,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+        evaluate_fn=lambda version, ndarrays, _: updates.append(version),
+    )
+    server = AsyncServer(client_manager=client_manager, strategy=strategy)
+
+    # Execute
+    server.fit(num_rounds=3, timeout=None)
+
+    # Assert
+    assert updates == [0, 1, 2, 3]
+    np.testing.assert_array_equal(parameters_to_ndarrays(server.parameters)[0], 0.0)
+
+
+def test_fit_too_few_workers() -> None:
+    """Test that a thread pool smaller than `concurrency` is rejected."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    clients = [IncrementClient(cid) for cid in "012"]
+    for client in clients:
+        client_manager.register(client)
+    strategy = FedBuff(
+        concurrency=3,
+        min_available_clients=3,
+        initial_parameters=ndarrays_to_parameters([np.zeros(2)]),
+    )
+    server = AsyncServer(client_manager=client_manager, strategy=strategy)
+    server.set_max_workers(2)
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        server.fit(num_rounds=1, timeout=None)
+    assert all(client.num_fit == 0 for client in clients)
+
+
+def test_requires_async_strategy() -> None:
+    """Test that synchronous strategies are rejected."""
+    with pytest.raises(TypeError):
+        AsyncServer(
+            client_manager=SimpleClientManager(),
+            strategy=FedAvg(),  # type: ignore
+        )
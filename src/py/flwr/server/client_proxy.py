@@ -16,7 +16,7 @@
 
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, List, Optional, Tuple, Union
 
 from flwr.common import (
     DisconnectRes,
@@ -38,6 +38,9 @@ class ClientProxy(ABC):
 
     node_id: int
 
+    # Client proxies which share a dispatcher are instructed in batches
+    dispatcher: Optional["ClientProxyDispatcher"] = None
+
     def __init__(self, cid: str):
         self.cid = cid
         self.properties: Properties = {}
@@ -81,3 +84,42 @@ class ClientProxy(ABC):
         timeout: Optional[float],
     ) -> DisconnectRes:
         """Disconnect and (optionally) reconnect later."""
+
+
+class ClientProxyDispatcher(ABC):
+    """Abstract base class for instructing many client proxies at once.
+
+    The server hands all `fit` and `evaluate` instructions of a round for client
+    proxies sharing a dispatcher (see `ClientProxy.dispatcher`) to the dispatcher in
+    a single call, instead of calling each client proxy in its own thread. The
+    dispatcher reports the outcome of each client as soon as it is available, so
+    that the server can process it while other clients are still working.
+    """
+
+    @abstractmethod
+    def fit(
+        self,
+        client_instructions: List[Tuple[ClientProxy, FitIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[FitRes, BaseException]], None],
+    ) -> None:
+        """Refine the provided parameters on all clients.
+
+        Calls `on_outcome` once per instruction with its index in
+        `client_instructions` and the result (or the exception raised for this
+        client), as soon as the result is available.
+        """
+
+    @abstractmethod
+    def evaluate(
+        self,
+        client_instructions: List[Tuple[ClientProxy, EvaluateIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[EvaluateRes, BaseException]], None],
+    ) -> None:
+        """Evaluate the provided parameters on all clients.
+
+        Calls `on_outcome` once per instruction with its index in
+        `client_instructions` and the result (or the exception raised for this
+        client), as soon as the result is available.
+        """
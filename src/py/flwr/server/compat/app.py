@@ -35,7 +35,7 @@ from flwr.server.strategy import Strategy
 
 from ..driver import Driver
 from ..driver.grpc_driver import GrpcDriver
-from .driver_client_proxy import DriverClientProxy
+from .driver_client_proxy import DriverClientProxy, DriverClientProxyDispatcher
 
 DEFAULT_SERVER_ADDRESS_DRIVER = "[::]:9091"
 
@@ -194,6 +194,9 @@ def update_client_manager(
         driver_pb2.CreateRunRequest()  # pylint: disable=E1101
     ).run_id
 
+    # All nodes share one dispatcher, which instructs them in batches
+    dispatcher = DriverClientProxyDispatcher(driver=driver, run_id=run_id)
+
     # Loop until the driver is disconnected
     registered_nodes: Dict[int, DriverClientProxy] = {}
     while True:
@@ -221,6 +224,7 @@ def update_client_manager(
                 driver=driver,
                 anonymous=False,
                 run_id=run_id,
+                dispatcher=dispatcher,
             )
             if client_manager.register(client_proxy):
                 registered_nodes[node_id] = client_proxy
@@ -16,7 +16,7 @@
 
 
 import time
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
 
 from flwr import common
 from flwr.common import RecordSet
@@ -28,23 +28,39 @@ from flwr.common.constant import (
     MESSAGE_TYPE_GET_PARAMETERS,
     MESSAGE_TYPE_GET_PROPERTIES,
 )
-from flwr.proto import driver_pb2, node_pb2, task_pb2  # pylint: disable=E0611
-from flwr.server.client_proxy import ClientProxy
+from flwr.proto import (  # pylint: disable=E0611
+    driver_pb2,
+    node_pb2,
+    recordset_pb2,
+    task_pb2,
+)
+from flwr.server.client_proxy import ClientProxy, ClientProxyDispatcher
 
-from ..driver.grpc_driver import GrpcDriver
+from ..driver.grpc_driver import PULL_TASK_RES_TIMEOUT, GrpcDriver
 
 SLEEP_TIME = 1
 
+InsT = TypeVar("InsT", common.FitIns, common.EvaluateIns)
+ResT = TypeVar("ResT", common.FitRes, common.EvaluateRes)
+
 
 class DriverClientProxy(ClientProxy):
     """Flower client proxy which delegates work using the Driver API."""
 
-    def __init__(self, node_id: int, driver: GrpcDriver, anonymous: bool, run_id: int):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        node_id: int,
+        driver: GrpcDriver,
+        anonymous: bool,
+        run_id: int,
+        dispatcher: Optional["DriverClientProxyDispatcher"] = None,
+    ):
         super().__init__(str(node_id))
         self.node_id = node_id
         self.driver = driver
         self.run_id = run_id
         self.anonymous = anonymous
+        self.dispatcher = dispatcher
 
     def get_properties(
         self, ins: common.GetPropertiesIns, timeout: Optional[float]
@@ -139,16 +155,20 @@ class DriverClientProxy(ClientProxy):
         if task_id == "":
             raise ValueError(f"Failed to schedule task for node {self.node_id}")
 
-        if timeout:
-            start_time = time.time()
-
+        start_time = time.time()
         while True:
+            # Let the Driver API wait for the TaskRes (long polling)
+            wait = PULL_TASK_RES_TIMEOUT
+            if timeout is not None:
+                wait = max(min(wait, start_time + timeout - time.time()), 0.0)
             pull_task_res_req = driver_pb2.PullTaskResRequest(  # pylint: disable=E1101
                 node=node_pb2.Node(node_id=0, anonymous=True),  # pylint: disable=E1101
                 task_ids=[task_id],
+                timeout=wait,
             )
 
             # Ask Driver API for TaskRes
+            pull_time = time.time()
             pull_task_res_res = self.driver.pull_task_res(req=pull_task_res_req)
 
             task_res_list: List[task_pb2.TaskRes] = list(  # pylint: disable=E1101
@@ -160,4 +180,216 @@ class DriverClientProxy(ClientProxy):
 
             if timeout is not None and time.time() > start_time + timeout:
                 raise RuntimeError("Timeout reached")
-            time.sleep(SLEEP_TIME)
+            # Driver APIs without long polling respond immediately, sleep instead
+            if time.time() - pull_time < wait:
+                time.sleep(SLEEP_TIME)
+
+
+class DriverClientProxyDispatcher(ClientProxyDispatcher):
+    """Instruct many DriverClientProxy instances at once using the Driver API.
+
+    All TaskIns of a round are pushed in a single request, clients receiving the same
+    instructions (e.g., the same global model) share a single broadcast TaskIns. The
+    TaskRes of all clients are then collected by a single long-polling loop, which
+    reports each of them as soon as it has been pulled.
+    """
+
+    def __init__(self, driver: GrpcDriver, run_id: int):
+        self.driver = driver
+        self.run_id = run_id
+
+    def fit(
+        self,
+        client_instructions: List[Tuple[ClientProxy, common.FitIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[common.FitRes, BaseException]], None],
+    ) -> None:
+        """Refine the provided parameters on all clients."""
+        self._send_receive(
+            client_instructions,
+            lambda ins: compat.fitins_to_recordset(ins, keep_input=True),
+            lambda recordset: compat.recordset_to_fitres(recordset, keep_input=False),
+            MESSAGE_TYPE_FIT,
+            timeout,
+            on_outcome,
+        )
+
+    def evaluate(
+        self,
+        client_instructions: List[Tuple[ClientProxy, common.EvaluateIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[common.EvaluateRes, BaseException]], None],
+    ) -> None:
+        """Evaluate the provided parameters on all clients."""
+        self._send_receive(
+            client_instructions,
+            lambda ins: compat.evaluateins_to_recordset(ins, keep_input=True),
+            compat.recordset_to_evaluateres,
+            MESSAGE_TYPE_EVALUATE,
+            timeout,
+            on_outcome,
+        )
+
+    def _send_receive(  # pylint: disable=too-many-arguments
+        self,
+        client_instructions: List[Tuple[ClientProxy, InsT]],
+        ins_to_recordset: Callable[[InsT], RecordSet],
+        recordset_to_res: Callable[[RecordSet], ResT],
+        task_type: str,
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[ResT, BaseException]], None],
+    ) -> None:
+        """Push one TaskIns per client and pull the TaskRes of all of them."""
+        task_ids = self._push_task_ins(client_instructions, ins_to_recordset, task_type)
+
+        # Index of the instruction of each scheduled TaskIns
+        indices: Dict[str, int] = {}
+        for index, ((client_proxy, _), task_id) in enumerate(
+            zip(client_instructions, task_ids)
+        ):
+            if task_id == "":
+                on_outcome(
+                    index,
+                    ValueError(f"Failed to schedule task for node {client_proxy.cid}"),
+                )
+            else:
+                indices[task_id] = index
+
+        def on_task_res(task_id: str, task_res: task_pb2.TaskRes) -> None:
+            outcome: Union[ResT, BaseException]
+            try:
+                recordset = serde.recordset_from_proto(task_res.task.recordset)
+                outcome = recordset_to_res(recordset)
+            except Exception as ex:  # pylint: disable=broad-except
+                outcome = ex
+            on_outcome(indices[task_id], outcome)
+
+        pending = self._pull_task_res(set(indices), timeout, on_task_res)
+        for task_id in pending:
+            on_outcome(indices[task_id], RuntimeError("Timeout reached"))
+
+    def _push_task_ins(
+        self,
+        client_instructions: List[Tuple[ClientProxy, InsT]],
+        ins_to_recordset: Callable[[InsT], RecordSet],
+        task_type: str,
+    ) -> List[str]:
+        """Push one TaskIns per client in a single request.
+
+        Clients receiving the same instructions object share one broadcast TaskIns, so
+        that its RecordSet is serialized and transmitted only once. Returns the task
+        ID of each client's TaskIns, in the order of `client_instructions`.
+        """
+        req = driver_pb2.PushTaskInsRequest()  # pylint: disable=E1101
+        order: List[int] = []
+        broadcast_order: List[int] = []
+        for indices in _group_by_instructions(client_instructions):
+            recordset = serde.recordset_to_proto(
+                ins_to_recordset(client_instructions[indices[0]][1])
+            )
+            consumers = [_consumer(client_instructions[index][0]) for index in indices]
+            task_ins = self._task_ins(consumers[0], task_type, recordset)
+            if len(indices) == 1:
+                req.task_ins_list.append(task_ins)
+                order += indices
+            else:
+                req.task_ins_broadcast_list.append(
+                    driver_pb2.TaskInsBroadcast(  # pylint: disable=E1101
+                        task_ins=task_ins, consumers=consumers
+                    )
+                )
+                broadcast_order += indices
+
+        # Send TaskIns to Driver API
+        res = self.driver.push_task_ins(req=req)
+        if len(res.task_ids) != len(client_instructions):
+            raise ValueError("Unexpected number of task_ids")
+
+        # Task IDs are returned for single TaskIns first, then for broadcasts
+        task_ids = [""] * len(client_instructions)
+        for index, task_id in zip(order + broadcast_order, res.task_ids):
+            task_ids[index] = task_id
+        return task_ids
+
+    def _task_ins(
+        self,
+        consumer: node_pb2.Node,  # pylint: disable=E1101
+        task_type: str,
+        recordset: recordset_pb2.RecordSet,  # pylint: disable=E1101
+    ) -> task_pb2.TaskIns:  # pylint: disable=E1101
+        """Create a TaskIns for `consumer`."""
+        return task_pb2.TaskIns(  # pylint: disable=E1101
+            task_id="",
+            group_id="",
+            run_id=self.run_id,
+            task=task_pb2.Task(  # pylint: disable=E1101
+                producer=node_pb2.Node(  # pylint: disable=E1101
+                    node_id=0,
+                    anonymous=True,
+                ),
+                consumer=consumer,
+                task_type=task_type,
+                recordset=recordset,
+            ),
+        )
+
+    def _pull_task_res(
+        self,
+        task_ids: Set[str],
+        timeout: Optional[float],
+        on_task_res: Callable[[str, task_pb2.TaskRes], None],  # pylint: disable=E1101
+    ) -> Set[str]:
+        """Pull the TaskRes for all `task_ids` until all arrived or `timeout`.
+
+        Calls `on_task_res` with the TaskIns ID and the TaskRes as soon as a TaskRes
+        has been pulled. Returns the TaskIns IDs without TaskRes.
+        """
+        pending = set(task_ids)
+        start_time = time.time()
+        while len(pending) > 0:
+            # Let the Driver API wait for the TaskRes (long polling)
+            wait = PULL_TASK_RES_TIMEOUT
+            if timeout is not None:
+                wait = max(min(wait, start_time + timeout - time.time()), 0.0)
+            pull_task_res_req = driver_pb2.PullTaskResRequest(  # pylint: disable=E1101
+                node=node_pb2.Node(node_id=0, anonymous=True),  # pylint: disable=E1101
+                task_ids=sorted(pending),
+                timeout=wait,
+            )
+
+            # Ask Driver API for TaskRes
+            pull_time = time.time()
+            pull_task_res_res = self.driver.pull_task_res(req=pull_task_res_req)
+            for task_res in pull_task_res_res.task_res_list:
+                ancestor = task_res.task.ancestry[0] if task_res.task.ancestry else ""
+                if ancestor in pending:
+                    pending.remove(ancestor)
+                    on_task_res(ancestor, task_res)
+
+            if timeout is not None and time.time() > start_time + timeout:
+                break
+            # Driver APIs without long polling respond immediately, sleep instead
+            if len(pull_task_res_res.task_res_list) == 0 and (
+                time.time() - pull_time < wait
+            ):
+                time.sleep(SLEEP_TIME)
+        return pending
+
+
+def _group_by_instructions(
+    client_instructions: List[Tuple[ClientProxy, InsT]]
+) -> List[List[int]]:
+    """Group the indices of clients receiving the same instructions object."""
+    groups: Dict[int, List[int]] = {}
+    for index, (_, ins) in enumerate(client_instructions):
+        groups.setdefault(id(ins), []).append(index)
+    return list(groups.values())
+
+
+def _consumer(client_proxy: ClientProxy) -> node_pb2.Node:  # pylint: disable=E1101
+    """Return the node of a DriverClientProxy."""
+    driver_client_proxy = cast(DriverClientProxy, client_proxy)
+    return node_pb2.Node(  # pylint: disable=E1101
+        node_id=driver_client_proxy.node_id,
+        anonymous=driver_client_proxy.anonymous,
+    )
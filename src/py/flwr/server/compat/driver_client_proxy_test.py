@@ -16,7 +16,7 @@
 
 
 import unittest
-from typing import Union, cast
+from typing import Dict, Union, cast
 from unittest.mock import MagicMock
 
 import numpy as np
@@ -45,7 +45,7 @@ from flwr.common.typing import (
 )
 from flwr.proto import driver_pb2, node_pb2, task_pb2  # pylint: disable=E0611
 
-from .driver_client_proxy import DriverClientProxy
+from .driver_client_proxy import DriverClientProxy, DriverClientProxyDispatcher
 
 MESSAGE_PARAMETERS = Parameters(tensors=[b"abc"], tensor_type="np")
 
@@ -246,3 +246,68 @@ class DriverClientProxyTestCase(unittest.TestCase):
         # Assert
         assert 0.0 == evaluate_res.loss
         assert 0 == evaluate_res.num_examples
+
+
+class DriverClientProxyDispatcherTestCase(unittest.TestCase):
+    """Tests for DriverClientProxyDispatcher."""
+
+    def test_fit(self) -> None:
+        """Test that a round is pushed in one request and pulled together."""
+        # Prepare
+        driver = MagicMock()
+        driver.push_task_ins.return_value = (
+            driver_pb2.PushTaskInsResponse(  # pylint: disable=E1101
+                task_ids=["id2", "id0", "id1"]
+            )
+        )
+        fit_res = FitRes(
+            status=CLIENT_STATUS,
+            parameters=MESSAGE_PARAMETERS,
+            num_examples=10,
+            metrics={},
+        )
+        task_res_list = []
+        for ancestor in ["id0", "id2"]:
+            task = _make_task(fit_res)
+            task.ancestry.append(ancestor)
+            task_res_list.append(task_pb2.TaskRes(task=task))  # pylint: disable=E1101
+        driver.pull_task_res.return_value = (
+            driver_pb2.PullTaskResResponse(  # pylint: disable=E1101
+                task_res_list=task_res_list
+            )
+        )
+        dispatcher = DriverClientProxyDispatcher(driver=driver, run_id=0)
+        clients = [
+            DriverClientProxy(
+                node_id=node_id,
+                driver=driver,
+                anonymous=False,
+                run_id=0,
+                dispatcher=dispatcher,
+            )
+            for node_id in [1, 2, 3]
+        ]
+        parameters = flwr.common.ndarrays_to_parameters([np.ones((2, 2))])
+        ins = flwr.common.FitIns(parameters, {})
+        other_ins = flwr.common.FitIns(parameters, {"lr": 0.1})
+
+        # Execute
+        outcomes: Dict[int, Union[FitRes, BaseException]] = {}
+        dispatcher.fit(
+            [(clients[0], ins), (clients[1], ins), (clients[2], other_ins)],
+            timeout=0.0,
+            on_outcome=outcomes.__setitem__,
+        )
+        push_req = driver.push_task_ins.call_args.kwargs["req"]
+
+        # Assert
+        driver.push_task_ins.assert_called_once()
+        assert len(push_req.task_ins_list) == 1
+        assert push_req.task_ins_list[0].task.consumer.node_id == 3
+        assert len(push_req.task_ins_broadcast_list) == 1
+        broadcast = push_req.task_ins_broadcast_list[0]
+        assert [node.node_id for node in broadcast.consumers] == [1, 2]
+        assert isinstance(outcomes[0], FitRes)
+        assert outcomes[0].num_examples == 10
+        assert isinstance(outcomes[1], RuntimeError)
+        assert isinstance(outcomes[2], FitRes)
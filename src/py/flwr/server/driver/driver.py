@@ -16,7 +16,7 @@
 
 
 import time
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from flwr.common.message import Message, Metadata
 from flwr.common.recordset import RecordSet
@@ -26,11 +26,16 @@ from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
     GetNodesRequest,
     PullTaskResRequest,
     PushTaskInsRequest,
+    TaskInsBroadcast,
 )
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
 from flwr.proto.task_pb2 import TaskIns  # pylint: disable=E0611
 
-from .grpc_driver import DEFAULT_SERVER_ADDRESS_DRIVER, GrpcDriver
+from .grpc_driver import (
+    DEFAULT_SERVER_ADDRESS_DRIVER,
+    PULL_TASK_RES_TIMEOUT,
+    GrpcDriver,
+)
 
 
 class Driver:
@@ -48,15 +53,20 @@ class Driver:
             * CA certificate.
             * server certificate.
             * server private key.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip" or "deflate") for messages of at least
+        1024 bytes exchanged with the Driver API.
     """
 
     def __init__(
         self,
         driver_service_address: str = DEFAULT_SERVER_ADDRESS_DRIVER,
         root_certificates: Optional[bytes] = None,
+        compression: Optional[str] = None,
     ) -> None:
         self.addr = driver_service_address
         self.root_certificates = root_certificates
+        self.compression = compression
         self.grpc_driver: Optional[GrpcDriver] = None
         self.run_id: Optional[int] = None
         self.node = Node(node_id=0, anonymous=True)
@@ -68,6 +78,7 @@ class Driver:
             self.grpc_driver = GrpcDriver(
                 driver_service_address=self.addr,
                 root_certificates=self.root_certificates,
+                compression=self.compression,
             )
             self.grpc_driver.connect()
             res = self.grpc_driver.create_run(CreateRunRequest())
@@ -144,7 +155,9 @@ class Driver:
         """Push messages to specified node IDs.
 
         This method takes an iterable of messages and sends each message
-        to the node specified in `dst_node_id`.
+        to the node specified in `dst_node_id`. Messages which share the same
+        `content` object and only differ in `dst_node_id` are sent as a single
+        broadcast, so that their content is transmitted and stored only once.
 
         Parameters
         ----------
@@ -158,20 +171,23 @@ class Driver:
             to pull replies.
         """
         grpc_driver, _ = self._get_grpc_driver_and_run_id()
-        # Construct TaskIns
-        task_ins_list: List[TaskIns] = []
-        for msg in messages:
+        msgs = list(messages)
+        for msg in msgs:
             # Check message
             self._check_message(msg)
-            # Convert Message to TaskIns
-            taskins = message_to_taskins(msg)
-            # Add to list
-            task_ins_list.append(taskins)
+        # Convert Messages to TaskIns
+        req, order = _messages_to_push_task_ins_request(msgs)
         # Call GrpcDriver method
-        res = grpc_driver.push_task_ins(PushTaskInsRequest(task_ins_list=task_ins_list))
-        return list(res.task_ids)
+        res = grpc_driver.push_task_ins(req)
+        # Return task IDs in the order of the messages
+        task_ids = [""] * len(msgs)
+        for index, task_id in zip(order, res.task_ids):
+            task_ids[index] = task_id
+        return task_ids
 
-    def pull_messages(self, message_ids: Iterable[str]) -> Iterable[Message]:
+    def pull_messages(
+        self, message_ids: Iterable[str], *, timeout: float = 0.0
+    ) -> Iterable[Message]:
         """Pull messages based on message IDs.
 
         This method is used to collect messages from the SuperLink
@@ -181,6 +197,9 @@ class Driver:
         ----------
         message_ids : Iterable[str]
             An iterable of message IDs for which reply messages are to be retrieved.
+        timeout : float (default: 0.0)
+            The number of seconds the SuperLink waits for reply messages if none are
+            available yet. By default, the SuperLink responds immediately.
 
         Returns
         -------
@@ -190,7 +209,7 @@ class Driver:
         grpc_driver, _ = self._get_grpc_driver_and_run_id()
         # Pull TaskRes
         res = grpc_driver.pull_task_res(
-            PullTaskResRequest(node=self.node, task_ids=message_ids)
+            PullTaskResRequest(node=self.node, task_ids=message_ids, timeout=timeout)
         )
         # Convert TaskRes to Message
         msgs = [message_from_taskres(taskres) for taskres in res.task_res_list]
@@ -225,9 +244,10 @@ class Driver:
         Notes
         -----
         This method uses `push_messages` to send the messages and `pull_messages`
-        to collect the replies. If `timeout` is set, the method may not return
-        replies for all sent messages. A message remains valid until its TTL,
-        which is not affected by `timeout`.
+        to collect the replies. Each pull waits on the SuperLink until replies are
+        available, so replies are received as soon as they arrive. If `timeout` is
+        set, the method may not return replies for all sent messages. A message
+        remains valid until its TTL, which is not affected by `timeout`.
         """
         # Push messages
         msg_ids = set(self.push_messages(messages))
@@ -236,15 +256,20 @@ class Driver:
         end_time = time.time() + (timeout if timeout is not None else 0.0)
         ret: List[Message] = []
         while timeout is None or time.time() < end_time:
-            res_msgs = self.pull_messages(msg_ids)
+            wait = PULL_TASK_RES_TIMEOUT
+            if timeout is not None:
+                wait = max(min(wait, end_time - time.time()), 0.0)
+            pull_time = time.time()
+            res_msgs = list(self.pull_messages(msg_ids, timeout=wait))
             ret.extend(res_msgs)
             msg_ids.difference_update(
                 {msg.metadata.reply_to_message for msg in res_msgs}
             )
             if len(msg_ids) == 0:
                 break
-            # Sleep
-            time.sleep(3)
+            # SuperLinks without long polling respond immediately, sleep instead
+            if len(res_msgs) == 0 and time.time() - pull_time < wait:
+                time.sleep(min(3.0, wait))
         return ret
 
     def __del__(self) -> None:
@@ -254,3 +279,45 @@ class Driver:
             return
         # Disconnect
         self.grpc_driver.disconnect()
+
+
+def _messages_to_push_task_ins_request(
+    msgs: List[Message],
+) -> Tuple[PushTaskInsRequest, List[int]]:
+    """Convert messages to a PushTaskInsRequest.
+
+    Messages which share the same `content` object and only differ in `dst_node_id`
+    are converted to a single TaskInsBroadcast. Returns the request and the index of
+    the message corresponding to each task ID in the response.
+    """
+    # Group messages with identical content and metadata (except `dst_node_id`)
+    groups: Dict[Tuple[int, str, str, str], List[int]] = {}
+    for index, msg in enumerate(msgs):
+        md = msg.metadata
+        key = (id(msg.content), md.message_type, md.group_id, md.ttl)
+        groups.setdefault(key, []).append(index)
+
+    # Construct TaskIns and TaskInsBroadcasts
+    task_ins_list: List[TaskIns] = []
+    task_ins_broadcast_list: List[TaskInsBroadcast] = []
+    single_indices: List[int] = []
+    broadcast_indices: List[int] = []
+    for indices in groups.values():
+        taskins = message_to_taskins(msgs[indices[0]])
+        if len(indices) == 1:
+            task_ins_list.append(taskins)
+            single_indices += indices
+            continue
+        consumers = [
+            Node(node_id=msgs[index].metadata.dst_node_id, anonymous=False)
+            for index in indices
+        ]
+        task_ins_broadcast_list.append(
+            TaskInsBroadcast(task_ins=taskins, consumers=consumers)
+        )
+        broadcast_indices += indices
+
+    req = PushTaskInsRequest(
+        task_ins_list=task_ins_list, task_ins_broadcast_list=task_ins_broadcast_list
+    )
+    return req, single_indices + broadcast_indices
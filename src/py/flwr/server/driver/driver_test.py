@@ -113,6 +113,30 @@ class TestDriver(unittest.TestCase):
         for task_ins in args[0].task_ins_list:
             self.assertEqual(task_ins.run_id, 61016)
 
+    def test_push_messages_broadcast(self) -> None:
+        """Test pushing messages with shared content as a broadcast."""
+        # Prepare
+        mock_response = Mock(task_ids=["id0", "id1", "id2"])
+        self.mock_grpc_driver.push_task_ins.return_value = mock_response
+        content = RecordSet()
+        msgs = [
+            self.driver.create_message(content, "", 1, "", ""),
+            self.driver.create_message(RecordSet(), "", 2, "", ""),
+            self.driver.create_message(content, "", 3, "", ""),
+        ]
+
+        # Execute
+        msg_ids = self.driver.push_messages(msgs)
+        args, _ = self.mock_grpc_driver.push_task_ins.call_args
+
+        # Assert
+        self.assertEqual(len(args[0].task_ins_list), 1)
+        self.assertEqual(args[0].task_ins_list[0].task.consumer.node_id, 2)
+        self.assertEqual(len(args[0].task_ins_broadcast_list), 1)
+        broadcast = args[0].task_ins_broadcast_list[0]
+        self.assertEqual([node.node_id for node in broadcast.consumers], [1, 3])
+        self.assertEqual(msg_ids, ["id1", "id0", "id2"])
+
     def test_push_messages_invalid(self) -> None:
         """Test pushing invalid messages."""
         # Prepare
@@ -152,6 +176,25 @@ class TestDriver(unittest.TestCase):
         self.assertEqual(args[0].task_ids, msg_ids)
         self.assertEqual(reply_tos, {"id2", "id3"})
 
+    def test_send_and_receive_messages_long_polling(self) -> None:
+        """Test that replies are pulled by asking the SuperLink to wait for them."""
+        # Prepare
+        mock_response = Mock(task_ids=["id1"])
+        self.mock_grpc_driver.push_task_ins.return_value = mock_response
+        mock_response = Mock(task_res_list=[TaskRes(task=Task(ancestry=["id1"]))])
+        self.mock_grpc_driver.pull_task_res.return_value = mock_response
+        msgs = [self.driver.create_message(RecordSet(), "", 0, "", "")]
+
+        # Execute
+        with patch("time.sleep") as mock_sleep:
+            ret_msgs = list(self.driver.send_and_receive(msgs, timeout=10.0))
+        args, _ = self.mock_grpc_driver.pull_task_res.call_args
+
+        # Assert
+        self.assertEqual(len(ret_msgs), 1)
+        self.assertGreater(args[0].timeout, 9.0)
+        mock_sleep.assert_not_called()
+
     def test_send_and_receive_messages_complete(self) -> None:
         """Test send and receive all messages successfully."""
         # Prepare
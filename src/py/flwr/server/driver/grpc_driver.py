@@ -16,12 +16,13 @@
 
 
 from logging import ERROR, INFO, WARNING
-from typing import Optional
+from typing import Iterator, Optional
 
 import grpc
 
 from flwr.common import EventType, event
-from flwr.common.grpc import create_channel
+from flwr.common.chunk import assemble_tasks, task_to_chunks
+from flwr.common.grpc import create_channel, is_unimplemented
 from flwr.common.logger import log
 from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
     CreateRunRequest,
@@ -34,9 +35,13 @@ from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
     PushTaskInsResponse,
 )
 from flwr.proto.driver_pb2_grpc import DriverStub  # pylint: disable=E0611
+from flwr.proto.task_pb2 import TaskChunk  # pylint: disable=E0611
 
 DEFAULT_SERVER_ADDRESS_DRIVER = "[::]:9091"
 
+# Number of seconds the SuperLink is asked to wait for TaskRes in each PullTaskRes
+PULL_TASK_RES_TIMEOUT = 30.0
+
 ERROR_MESSAGE_DRIVER_NOT_CONNECTED = """
 [Driver] Error: Not connected.
 
@@ -52,11 +57,15 @@ class GrpcDriver:
         self,
         driver_service_address: str = DEFAULT_SERVER_ADDRESS_DRIVER,
         root_certificates: Optional[bytes] = None,
+        compression: Optional[str] = None,
     ) -> None:
         self.driver_service_address = driver_service_address
         self.root_certificates = root_certificates
+        self.compression = compression
         self.channel: Optional[grpc.Channel] = None
         self.stub: Optional[DriverStub] = None
+        # Stream tasks in chunks unless the SuperLink does not support it
+        self.streaming = True
 
     def connect(self) -> None:
         """Connect to the Driver API."""
@@ -68,6 +77,7 @@ class GrpcDriver:
             server_address=self.driver_service_address,
             insecure=(self.root_certificates is None),
             root_certificates=self.root_certificates,
+            compression=self.compression,
         )
         self.stub = DriverStub(self.channel)
         log(INFO, "[Driver] Connected to %s", self.driver_service_address)
@@ -113,8 +123,18 @@ class GrpcDriver:
             log(ERROR, ERROR_MESSAGE_DRIVER_NOT_CONNECTED)
             raise ConnectionError("`GrpcDriver` instance not connected")
 
-        # Call gRPC Driver API
-        res: PushTaskInsResponse = self.stub.PushTaskIns(request=req)
+        # Call gRPC Driver API, streaming the TaskIns in chunks if possible
+        if self.streaming:
+            try:
+                res: PushTaskInsResponse = self.stub.PushTaskInsStream(
+                    _task_ins_chunks(req)
+                )
+                return res
+            except grpc.RpcError as err:
+                if not is_unimplemented(err):
+                    raise
+                self.streaming = False
+        res = self.stub.PushTaskIns(request=req)
         return res
 
     def pull_task_res(self, req: PullTaskResRequest) -> PullTaskResResponse:
@@ -124,6 +144,24 @@ class GrpcDriver:
             log(ERROR, ERROR_MESSAGE_DRIVER_NOT_CONNECTED)
             raise ConnectionError("`GrpcDriver` instance not connected")
 
-        # Call Driver API
+        # Call Driver API, streaming the TaskRes in chunks if possible
+        if self.streaming:
+            try:
+                chunks = assemble_tasks(self.stub.PullTaskResStream(request=req))
+                return PullTaskResResponse(
+                    task_res_list=[chunk.task_res for chunk in chunks]
+                )
+            except grpc.RpcError as err:
+                if not is_unimplemented(err):
+                    raise
+                self.streaming = False
         res: PullTaskResResponse = self.stub.PullTaskRes(request=req)
         return res
+
+
+def _task_ins_chunks(req: PushTaskInsRequest) -> Iterator[TaskChunk]:
+    """Split all TaskIns of a PushTaskInsRequest into chunks."""
+    for task_ins in req.task_ins_list:
+        yield from task_to_chunks(task_ins)
+    for broadcast in req.task_ins_broadcast_list:
+        yield from task_to_chunks(broadcast.task_ins, broadcast.consumers)
@@ -18,7 +18,7 @@
 import concurrent.futures
 import timeit
 from logging import DEBUG, INFO
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
 from flwr.common import (
     Code,
@@ -34,7 +34,7 @@ from flwr.common import (
 from flwr.common.logger import log
 from flwr.common.typing import GetParametersIns
 from flwr.server.client_manager import ClientManager
-from flwr.server.client_proxy import ClientProxy
+from flwr.server.client_proxy import ClientProxy, ClientProxyDispatcher
 from flwr.server.history import History
 from flwr.server.strategy import FedAvg, Strategy
 
@@ -51,6 +51,9 @@ ReconnectResultsAndFailures = Tuple[
     List[Union[Tuple[ClientProxy, DisconnectRes], BaseException]],
 ]
 
+InsT = TypeVar("InsT", FitIns, EvaluateIns)
+ResT = TypeVar("ResT", FitRes, EvaluateRes)
+
 
 class Server:
     """Flower server."""
@@ -227,11 +230,15 @@ class Server:
             self._client_manager.num_available(),
         )
 
-        # Collect `fit` results from all clients participating in this round
+        # Collect `fit` results from all clients participating in this round and let
+        # the strategy aggregate each result as soon as it arrives
         results, failures = fit_clients(
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
+            on_result=lambda result: self.strategy.aggregate_fit_partial(
+                server_round, result
+            ),
         )
         log(
             DEBUG,
@@ -241,7 +248,7 @@ class Server:
             len(failures),
         )
 
-        # Aggregate training results
+        # Finalize the aggregation of training results
         aggregated_result: Tuple[
             Optional[Parameters],
             Dict[str, Scalar],
@@ -327,25 +334,35 @@ def fit_clients(
     client_instructions: List[Tuple[ClientProxy, FitIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    on_result: Optional[Callable[[Tuple[ClientProxy, FitRes]], None]] = None,
 ) -> FitResultsAndFailures:
-    """Refine parameters concurrently on all selected clients."""
+    """Refine parameters concurrently on all selected clients.
+
+    If provided, `on_result` is called for each successful result as soon as it has
+    been received.
+    """
+    results: List[Tuple[ClientProxy, FitRes]] = []
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    batches, client_instructions = _group_by_dispatcher(client_instructions)
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         submitted_fs = {
             executor.submit(fit_client, client_proxy, ins, timeout)
             for client_proxy, ins in client_instructions
         }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
+        # Clients sharing a dispatcher are instructed in one batch each
+        for dispatcher, batch in batches.items():
+            submitted_fs |= _dispatch(dispatcher.fit, batch, timeout, executor)
+
+        # Gather results as they arrive (timeout is handled in the respective
+        # communication stack)
+        for future in concurrent.futures.as_completed(submitted_fs):
+            num_results = len(results)
+            _handle_finished_future_after_fit(
+                future=future, results=results, failures=failures
+            )
+            if on_result is not None and len(results) > num_results:
+                on_result(results[-1])
 
-    # Gather results
-    results: List[Tuple[ClientProxy, FitRes]] = []
-    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_fit(
-            future=future, results=results, failures=failures
-        )
     return results, failures
 
 
@@ -388,11 +405,15 @@ def evaluate_clients(
     timeout: Optional[float],
 ) -> EvaluateResultsAndFailures:
     """Evaluate parameters concurrently on all selected clients."""
+    batches, client_instructions = _group_by_dispatcher(client_instructions)
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         submitted_fs = {
             executor.submit(evaluate_client, client_proxy, ins, timeout)
             for client_proxy, ins in client_instructions
         }
+        # Clients sharing a dispatcher are instructed in one batch each
+        for dispatcher, batch in batches.items():
+            submitted_fs |= _dispatch(dispatcher.evaluate, batch, timeout, executor)
         finished_fs, _ = concurrent.futures.wait(
             fs=submitted_fs,
             timeout=None,  # Handled in the respective communication stack
@@ -441,3 +462,61 @@ def _handle_finished_future_after_evaluate(
 
     # Not successful, client returned a result where the status code is not OK
     failures.append(result)
+
+
+def _group_by_dispatcher(
+    client_instructions: List[Tuple[ClientProxy, InsT]],
+) -> Tuple[
+    Dict[ClientProxyDispatcher, List[Tuple[ClientProxy, InsT]]],
+    List[Tuple[ClientProxy, InsT]],
+]:
+    """Split instructions into batches per dispatcher and individual instructions."""
+    batches: Dict[ClientProxyDispatcher, List[Tuple[ClientProxy, InsT]]] = {}
+    individual: List[Tuple[ClientProxy, InsT]] = []
+    for client_proxy, ins in client_instructions:
+        if client_proxy.dispatcher is None:
+            individual.append((client_proxy, ins))
+        else:
+            batches.setdefault(client_proxy.dispatcher, []).append((client_proxy, ins))
+    return batches, individual
+
+
+def _dispatch(
+    dispatch_fn: Callable[
+        [
+            List[Tuple[ClientProxy, InsT]],
+            Optional[float],
+            Callable[[int, Union[ResT, BaseException]], None],
+        ],
+        None,
+    ],
+    client_instructions: List[Tuple[ClientProxy, InsT]],
+    timeout: Optional[float],
+    executor: concurrent.futures.ThreadPoolExecutor,
+) -> Set[concurrent.futures.Future]:  # type: ignore
+    """Run a batch of instructions, resolving one future per client on arrival."""
+    futures: List[concurrent.futures.Future] = [  # type: ignore
+        concurrent.futures.Future() for _ in client_instructions
+    ]
+
+    def on_outcome(index: int, outcome: Union[ResT, BaseException]) -> None:
+        future = futures[index]
+        if future.done():
+            return
+        if isinstance(outcome, BaseException):
+            future.set_exception(outcome)
+        else:
+            future.set_result((client_instructions[index][0], outcome))
+
+    def run() -> None:
+        try:
+            dispatch_fn(client_instructions, timeout, on_outcome)
+        except Exception as ex:  # pylint: disable=broad-except
+            for index in range(len(futures)):
+                on_outcome(index, ex)
+        # Clients the dispatcher did not report on have failed
+        for index in range(len(futures)):
+            on_outcome(index, RuntimeError("No outcome reported by the dispatcher"))
+
+    executor.submit(run)
+    return set(futures)
@@ -15,7 +15,8 @@
 """Flower server tests."""
 
 
-from typing import List, Optional
+import threading
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -37,7 +38,7 @@ from flwr.common import (
 )
 from flwr.server.client_manager import SimpleClientManager
 
-from .client_proxy import ClientProxy
+from .client_proxy import ClientProxy, ClientProxyDispatcher
 from .server import Server, evaluate_clients, fit_clients
 
 
@@ -109,6 +110,63 @@ class FailingClient(ClientProxy):
         raise NotImplementedError()
 
 
+class SequentialDispatcher(ClientProxyDispatcher):
+    """Dispatcher instructing each client proxy of a batch in turn."""
+
+    def __init__(self) -> None:
+        self.num_batches = 0
+
+    def fit(
+        self,
+        client_instructions: List[Tuple[ClientProxy, FitIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[FitRes, BaseException]], None],
+    ) -> None:
+        """Call `fit` on each client proxy."""
+        self.num_batches += 1
+        for index, (client_proxy, ins) in enumerate(client_instructions):
+            try:
+                on_outcome(index, client_proxy.fit(ins, timeout))
+            except Exception as ex:  # pylint: disable=broad-except
+                on_outcome(index, ex)
+
+    def evaluate(
+        self,
+        client_instructions: List[Tuple[ClientProxy, EvaluateIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[EvaluateRes, BaseException]], None],
+    ) -> None:
+        """Call `evaluate` on each client proxy."""
+        self.num_batches += 1
+        for index, (client_proxy, ins) in enumerate(client_instructions):
+            try:
+                on_outcome(index, client_proxy.evaluate(ins, timeout))
+            except Exception as ex:  # pylint: disable=broad-except
+                on_outcome(index, ex)
+
+
+class HoldingDispatcher(SequentialDispatcher):
+    """Dispatcher holding back the last outcome of a batch until `release` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.released = False
+
+    def fit(
+        self,
+        client_instructions: List[Tuple[ClientProxy, FitIns]],
+        timeout: Optional[float],
+        on_outcome: Callable[[int, Union[FitRes, BaseException]], None],
+    ) -> None:
+        """Call `fit` on each client proxy, waiting before the last one."""
+        self.num_batches += 1
+        for index, (client_proxy, ins) in enumerate(client_instructions):
+            if index == len(client_instructions) - 1:
+                self.released = self.release.wait(timeout=10)
+            on_outcome(index, client_proxy.fit(ins, timeout))
+
+
 def test_fit_clients() -> None:
     """Test fit_clients."""
     # Prepare
@@ -130,6 +188,32 @@ def test_fit_clients() -> None:
     assert results[0][1].num_examples == 1
 
 
+def test_fit_clients_on_result() -> None:
+    """Test that fit_clients passes each successful result to on_result."""
+    # Prepare
+    clients: List[ClientProxy] = [
+        FailingClient("0"),
+        SuccessClient("1"),
+        SuccessClient("2"),
+    ]
+    arr = np.array([[1, 2], [3, 4], [5, 6]])
+    ins: FitIns = FitIns(
+        Parameters(tensors=[ndarray_to_bytes(arr)], tensor_type=""), {}
+    )
+    client_instructions = [(c, ins) for c in clients]
+    received: List[Tuple[ClientProxy, FitRes]] = []
+
+    # Execute
+    results, failures = fit_clients(
+        client_instructions, None, None, on_result=received.append
+    )
+
+    # Assert
+    assert len(failures) == 1
+    assert received == results
+    assert {client.cid for client, _ in received} == {"1", "2"}
+
+
 def test_eval_clients() -> None:
     """Test eval_clients."""
     # Prepare
@@ -159,6 +243,73 @@ def test_eval_clients() -> None:
     assert results[0][1].num_examples == 1
 
 
+def test_fit_clients_with_dispatcher() -> None:
+    """Test that fit_clients instructs clients sharing a dispatcher in one batch."""
+    # Prepare
+    dispatcher = SequentialDispatcher()
+    clients: List[ClientProxy] = [
+        FailingClient("0"),
+        SuccessClient("1"),
+        SuccessClient("2"),
+    ]
+    clients[0].dispatcher = dispatcher
+    clients[1].dispatcher = dispatcher
+    ins: FitIns = FitIns(Parameters(tensors=[], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+
+    # Execute
+    results, failures = fit_clients(client_instructions, None, None)
+
+    # Assert
+    assert dispatcher.num_batches == 1
+    assert sorted(client.cid for client, _ in results) == ["1", "2"]
+    assert len(failures) == 1
+
+
+def test_fit_clients_with_dispatcher_on_result() -> None:
+    """Test that results of a dispatcher are processed as soon as they arrive."""
+    # Prepare
+    dispatcher = HoldingDispatcher()
+    clients: List[ClientProxy] = [SuccessClient("0"), SuccessClient("1")]
+    for client in clients:
+        client.dispatcher = dispatcher
+    ins: FitIns = FitIns(Parameters(tensors=[], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+
+    # Execute
+    results, failures = fit_clients(
+        client_instructions,
+        None,
+        None,
+        on_result=lambda _: dispatcher.release.set(),
+    )
+
+    # Assert
+    assert dispatcher.released
+    assert len(results) == 2
+    assert len(failures) == 0
+
+
+def test_eval_clients_with_dispatcher() -> None:
+    """Test that evaluate_clients instructs clients sharing a dispatcher at once."""
+    # Prepare
+    dispatcher = SequentialDispatcher()
+    clients: List[ClientProxy] = [FailingClient("0"), SuccessClient("1")]
+    for client in clients:
+        client.dispatcher = dispatcher
+    ins = EvaluateIns(Parameters(tensors=[], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+
+    # Execute
+    results, failures = evaluate_clients(client_instructions, None, None)
+
+    # Assert
+    assert dispatcher.num_batches == 1
+    assert len(results) == 1
+    assert len(failures) == 1
+    assert results[0][0].cid == "1"
+
+
 def test_set_max_workers() -> None:
     """Test eval_clients."""
     # Prepare
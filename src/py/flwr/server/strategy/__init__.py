@@ -15,6 +15,8 @@
 """Contains the strategy abstraction and different implementations."""
 
 
+from .async_strategy import AsyncStrategy as AsyncStrategy
+from .async_strategy import BufferedFitRes as BufferedFitRes
 from .bulyan import Bulyan as Bulyan
 from .dp_fixed_clipping import DifferentialPrivacyServerSideFixedClipping
 from .dpfedavg_adaptive import DPFedAvgAdaptive as DPFedAvgAdaptive
@@ -25,6 +27,7 @@ from .fedadam import FedAdam as FedAdam
 from .fedavg import FedAvg as FedAvg
 from .fedavg_android import FedAvgAndroid as FedAvgAndroid
 from .fedavgm import FedAvgM as FedAvgM
+from .fedbuff import FedBuff as FedBuff
 from .fedmedian import FedMedian as FedMedian
 from .fedopt import FedOpt as FedOpt
 from .fedprox import FedProx as FedProx
@@ -35,6 +38,7 @@ from .fedxgb_nn_avg import FedXgbNnAvg as FedXgbNnAvg
 from .fedyogi import FedYogi as FedYogi
 from .krum import Krum as Krum
 from .qfedavg import QFedAvg as QFedAvg
+from .quantized_strategy import QuantizedStrategy as QuantizedStrategy
 from .strategy import Strategy as Strategy
 
 __all__ = [
@@ -47,6 +51,7 @@ __all__ = [
     "FedXgbCyclic",
     "FedAvgAndroid",
     "FedAvgM",
+    "FedBuff",
     "FedOpt",
     "FedProx",
     "FedYogi",
@@ -58,5 +63,8 @@ __all__ = [
     "DPFedAvgAdaptive",
     "DPFedAvgFixed",
     "Strategy",
+    "AsyncStrategy",
+    "BufferedFitRes",
     "DifferentialPrivacyServerSideFixedClipping",
+    "QuantizedStrategy",
 ]
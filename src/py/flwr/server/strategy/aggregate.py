@@ -15,106 +15,569 @@
 """Aggregation functions for strategy implementations."""
 # mypy: disallow_untyped_calls=False
 
-from functools import reduce
-from typing import Any, Callable, List, Tuple
+import concurrent.futures
+import os
+import threading
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 
 import numpy as np
-
-from flwr.common import FitRes, NDArray, NDArrays, parameters_to_ndarrays
+from numpy.typing import DTypeLike
+
+from flwr.common import (
+    Array,
+    FitRes,
+    NDArray,
+    NDArrays,
+    Parameters,
+    bytes_to_ndarray,
+    delta_base_version,
+    parameters_to_arrays,
+    parameters_to_ndarrays,
+    parameters_version,
+)
+from flwr.common.constant import TENSOR_TYPE_ARRAY
+from flwr.common.parameter import add_array_to
 from flwr.server.client_proxy import ClientProxy
 
+from .flatparameters import FlatParameters
 
-def aggregate(results: List[Tuple[NDArrays, int]]) -> NDArrays:
-    """Compute weighted average."""
-    # Calculate the total number of examples used during training
-    num_examples_total = sum(num_examples for (_, num_examples) in results)
+# Maximum number of coordinates per client multiplied at once by `_compute_distances`
+DISTANCE_BLOCK_SIZE = 1 << 14
+# Maximum number of coordinates per client stacked at once by coordinate-wise rules
+COORDINATE_BLOCK_SIZE = 1 << 16
 
-    # Create a list of weights, each multiplied by the related number of examples
-    weighted_weights = [
-        [layer * num_examples for layer in weights] for weights, num_examples in results
-    ]
 
-    # Compute average weights of each layer
-    weights_prime: NDArrays = [
-        reduce(np.add, layer_updates) / num_examples_total
-        for layer_updates in zip(*weighted_weights)
-    ]
-    return weights_prime
+class WeightedAverageAccumulator:
+    """Accumulate a weighted average of NDArrays one result at a time.
 
+    Each result is scaled by its number of examples and added in place into buffers
+    which are allocated once (with `dtype`, `np.float64` by default) when the first
+    result arrives. Results can therefore be folded in as they arrive and released
+    right after; peak memory does not grow with the number of results.
 
-def aggregate_inplace(results: List[Tuple[ClientProxy, FitRes]]) -> NDArrays:
-    """Compute in-place weighted average."""
-    # Count total examples
-    num_examples_total = sum(fit_res.num_examples for (_, fit_res) in results)
+    Results holding serialized Arrays (`TENSOR_TYPE_ARRAY`) can use sparse and delta
+    stypes: sparse layers are added without densifying them, and deltas are added
+    to the base model passed to `result`.
 
-    # Compute scaling factors for each result
-    scaling_factors = [
-        fit_res.num_examples / num_examples_total for _, fit_res in results
-    ]
+    Once the first result has been added, further results can be added from several
+    threads at once (see `add_all_parameters`): each layer is decoded without holding
+    a lock, only scaling it into a scratch buffer (allocated once per layer and
+    reused for all results) and adding it in place are serialized per layer.
 
-    # Let's do in-place aggregation
-    # Get first result, then add up each other
-    params = [
-        scaling_factors[0] * x for x in parameters_to_ndarrays(results[0][1].parameters)
-    ]
-    for i, (_, fit_res) in enumerate(results[1:]):
-        res = (
-            scaling_factors[i + 1] * x
-            for x in parameters_to_ndarrays(fit_res.parameters)
+    If `clipping_norm` is set, the update of each result against `clipping_base`
+    (`result - clipping_base`) is clipped to that L2 norm before it is added, and
+    `result` returns `clipping_base` plus the weighted average of the clipped
+    updates (FlatClip method of the paper: https://arxiv.org/abs/1710.06963).
+
+    Examples
+    --------
+    >>> accumulator = WeightedAverageAccumulator()
+    >>> for _, fit_res in results:
+    >>>     accumulator.add_parameters(fit_res.parameters, fit_res.num_examples)
+    >>> ndarrays = accumulator.result()
+    """
+
+    def __init__(
+        self,
+        dtype: DTypeLike = np.float64,
+        max_workers: Optional[int] = 1,
+        clipping_norm: Optional[float] = None,
+        clipping_base: Optional[NDArrays] = None,
+    ) -> None:
+        if (clipping_norm is None) != (clipping_base is None):
+            raise ValueError("`clipping_norm` and `clipping_base` must be set together")
+        self.dtype = np.dtype(dtype)
+        self.max_workers = max_workers
+        self.clipping_norm = clipping_norm
+        self.clipping_base = clipping_base
+        self.num_results = 0
+        self.num_examples_total = 0
+        self.sums: NDArrays = []
+        self.result_dtypes: List[np.dtype[Any]] = []
+        self.delta_examples: List[int] = []
+        self.base_versions: Set[str] = set()
+        self._layer_locks: List[threading.Lock] = []
+        self._scratch: List[Optional[NDArray]] = []
+        self._count_lock = threading.Lock()
+        self._layer_executor = LayerExecutor(max_workers)
+        # Buffers holding the update of the result being clipped
+        self._updates: NDArrays = []
+        self._updates_lock = threading.Lock()
+
+    def add(self, ndarrays: NDArrays, num_examples: int) -> None:
+        """Add one result, weighted by `num_examples`."""
+        self._check_num_layers(len(ndarrays))
+        if self.clipping_norm is not None:
+            self._add_clipped(ndarrays, num_examples)
+        else:
+            self._for_each_layer(
+                lambda index: self._add_layer(index, ndarrays[index], num_examples),
+                len(ndarrays),
+            )
+        self._count(num_examples)
+
+    def add_parameters(self, parameters: Parameters, num_examples: int) -> None:
+        """Add one result, deserializing and adding one layer at a time."""
+        self._add_parameters(parameters, num_examples, self.max_workers)
+
+    def add_all_parameters(
+        self,
+        results: Sequence[Tuple[Parameters, int]],
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Add many results, decoding them across a pool of `max_workers` threads.
+
+        Each thread deserializes one result a layer at a time and adds every layer
+        as soon as it is decoded, so at most `max_workers` decoded layers are alive
+        at once and no result is held in memory as a whole. `max_workers` defaults
+        to `self.max_workers`.
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        results = list(results)
+        if self.num_results == 0 and len(results) > 0:
+            # The first result allocates the buffers
+            self.add_parameters(*results[0])
+            results = results[1:]
+        # Clipped updates share one update buffer, so they are added in turn
+        if max_workers == 1 or len(results) <= 1 or self.clipping_norm is not None:
+            for parameters, num_examples in results:
+                self.add_parameters(parameters, num_examples)
+            return
+
+        def add_result(position: int) -> None:
+            parameters, num_examples = results[position]
+            # Start each result at a different layer to spread out the layer locks
+            self._add_parameters(parameters, num_examples, 1, start=position)
+
+        if max_workers == self.max_workers:
+            # Spread the results over the pool that adds the layers of one result
+            self._layer_executor.for_each_layer(add_result, len(results))
+            return
+        for_each_layer(add_result, len(results), max_workers)
+
+    def result(self, base: Optional[Parameters] = None) -> NDArrays:
+        """Return the weighted average of all results added so far.
+
+        If results hold deltas, `base` must be the model they were computed against,
+        its `parameters_version` must match their base version.
+        """
+        if self.num_results == 0:
+            raise ValueError("No results have been added")
+        self._layer_executor.shutdown()
+        base_ndarrays = self._base_ndarrays(base) if self.base_versions else []
+        layers = []
+        for index, layer_sum in enumerate(self.sums):
+            if self.delta_examples[index] > 0:
+                layer_sum = layer_sum + np.multiply(
+                    base_ndarrays[index], self.delta_examples[index], dtype=self.dtype
+                )
+            average = np.divide(layer_sum, self.num_examples_total)
+            if self.clipping_base is not None:
+                np.add(average, self.clipping_base[index], out=average)
+            layers.append(average.astype(self.result_dtypes[index], copy=False))
+        return layers
+
+    def _base_ndarrays(self, base: Optional[Parameters]) -> NDArrays:
+        if base is None:
+            raise ValueError("Results hold deltas, but no base model was given")
+        if self.base_versions != {parameters_version(base)}:
+            raise ValueError(
+                f"Results hold deltas against base models {sorted(self.base_versions)}"
+                ", which do not match the given base model"
+            )
+        base_ndarrays = parameters_to_ndarrays(base, copy=False)
+        self._check_num_layers(len(base_ndarrays))
+        return base_ndarrays
+
+    def _add_clipped(self, ndarrays: NDArrays, num_examples: int) -> None:
+        """Clip the update of one result and add it, weighted by `num_examples`.
+
+        The update is computed into buffers which are allocated once and reused for
+        every result, and its norm is accumulated in the same pass. The update is
+        then scaled by `num_examples` and the clipping factor in place and added.
+        """
+        base = cast(NDArrays, self.clipping_base)
+        clipping_norm = cast(float, self.clipping_norm)
+        if len(base) != len(ndarrays):
+            raise ValueError(
+                f"Result has {len(ndarrays)} layers, but the base has {len(base)}"
+            )
+        with self._updates_lock:
+            squared_norm = 0.0
+            for index, (layer, base_layer) in enumerate(zip(ndarrays, base)):
+                layer_sum = self._prepare_layer(index, layer.shape, layer.dtype)
+                if index == len(self._updates):
+                    self._updates.append(np.empty_like(layer_sum))
+                update = self._updates[index]
+                np.subtract(layer, base_layer, out=update)
+                flat = update.reshape(-1)
+                squared_norm += float(np.dot(flat, flat))
+
+            norm = np.sqrt(squared_norm)
+            factor = num_examples * (
+                clipping_norm / norm if norm > clipping_norm else 1.0
+            )
+            for update, layer_sum, lock in zip(
+                self._updates, self.sums, self._layer_locks
+            ):
+                np.multiply(update, factor, out=update)
+                with lock:
+                    np.add(layer_sum, update, out=layer_sum)
+
+    def _add_parameters(
+        self,
+        parameters: Parameters,
+        num_examples: int,
+        max_workers: Optional[int],
+        start: int = 0,
+    ) -> None:
+        if self.clipping_norm is not None:
+            if parameters.tensor_type == TENSOR_TYPE_ARRAY and any(
+                delta_base_version(array) is not None
+                for array in parameters_to_arrays(parameters)
+            ):
+                raise ValueError("Updates of delta Arrays cannot be clipped")
+            ndarrays = parameters_to_ndarrays(parameters, copy=False)
+            self._check_num_layers(len(ndarrays))
+            self._add_clipped(ndarrays, num_examples)
+        elif parameters.tensor_type == TENSOR_TYPE_ARRAY:
+            arrays = parameters_to_arrays(parameters)
+            self._check_num_layers(len(arrays))
+            self._for_each_layer(
+                lambda index: self._add_array(index, arrays[index], num_examples),
+                len(arrays),
+                max_workers,
+                start,
+            )
+        else:
+            tensors = parameters.tensors
+            self._check_num_layers(len(tensors))
+            self._for_each_layer(
+                lambda index: self._add_layer(
+                    index, bytes_to_ndarray(tensors[index], copy=False), num_examples
+                ),
+                len(tensors),
+                max_workers,
+                start,
+            )
+        self._count(num_examples)
+
+    def _for_each_layer(
+        self,
+        fn: Callable[[int], None],
+        num_layers: int,
+        max_workers: Optional[int] = None,
+        start: int = 0,
+    ) -> None:
+        if self.num_results == 0:
+            # The buffers are allocated in order while adding the first result
+            max_workers, start = 1, 0
+        elif max_workers is None:
+            max_workers = self.max_workers
+        if start % max(num_layers, 1) != 0:
+            fn = partial(_call_shifted, fn, start, num_layers)
+        if max_workers == self.max_workers:
+            self._layer_executor.for_each_layer(fn, num_layers)
+        else:
+            for_each_layer(fn, num_layers, max_workers)
+
+    def _check_num_layers(self, num_layers: int) -> None:
+        if self.num_results > 0 and num_layers != len(self.sums):
+            raise ValueError(
+                f"Result has {num_layers} layers, expected {len(self.sums)}"
+            )
+
+    def _prepare_layer(
+        self, index: int, shape: Tuple[int, ...], dtype: np.dtype[Any]
+    ) -> NDArray:
+        if self.num_results == 0:
+            # Allocate the buffers while adding the first result
+            self.sums.append(np.zeros(shape, dtype=self.dtype))
+            floating = np.issubdtype(dtype, np.floating)
+            self.result_dtypes.append(dtype if floating else np.dtype(np.float64))
+            self.delta_examples.append(0)
+            self._layer_locks.append(threading.Lock())
+            self._scratch.append(None)
+        layer_sum = self.sums[index]
+        if layer_sum.shape != shape:
+            raise ValueError(
+                f"Layer {index} has shape {shape}, expected {layer_sum.shape}"
+            )
+        return layer_sum
+
+    def _add_layer(self, index: int, layer: NDArray, num_examples: int) -> None:
+        layer_sum = self._prepare_layer(index, layer.shape, layer.dtype)
+        with self._layer_locks[index]:
+            scratch = self._scratch[index]
+            if scratch is None:
+                scratch = np.empty_like(layer_sum)
+                self._scratch[index] = scratch
+            np.multiply(layer, num_examples, out=scratch, dtype=self.dtype)
+            np.add(layer_sum, scratch, out=layer_sum)
+
+    def _add_array(self, index: int, array: Array, num_examples: int) -> None:
+        layer_sum = self._prepare_layer(
+            index, tuple(array.shape), np.dtype(array.dtype)
         )
-        params = [reduce(np.add, layer_updates) for layer_updates in zip(params, res)]
+        base_version = delta_base_version(array)
+        with self._layer_locks[index]:
+            add_array_to(layer_sum, array, num_examples)
+            if base_version is not None:
+                self.delta_examples[index] += num_examples
+        if base_version is not None:
+            with self._count_lock:
+                self.base_versions.add(base_version)
+
+    def _count(self, num_examples: int) -> None:
+        with self._count_lock:
+            self.num_results += 1
+            self.num_examples_total += num_examples
+
+
+def _call_shifted(
+    fn: Callable[[int], None], start: int, num_layers: int, index: int
+) -> None:
+    fn((index + start) % num_layers)
+
+
+class LayerExecutor:
+    """Call a function with the index of each layer, across a reused thread pool.
+
+    The pool of `max_workers` threads is started by the first call that needs it and
+    kept for later calls, so it is started once per accumulator or strategy rather
+    than once per result or round. Layers are processed in the calling thread if
+    `max_workers` is 1. NumPy releases the GIL in most ufuncs, so in-place updates
+    of distinct layers run in parallel.
+    """
+
+    def __init__(self, max_workers: Optional[int] = 1) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the thread pool, copies start their own."""
+        return {"max_workers": self.max_workers, "_executor": None}
+
+    def for_each_layer(self, fn: Callable[[int], None], num_layers: int) -> None:
+        """Call `fn` with the index of each layer."""
+        if self.max_workers == 1 or num_layers <= 1:
+            for index in range(num_layers):
+                fn(index)
+            return
+        executor = self._executor
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers
+            )
+            self._executor = executor
+        # Consume the iterator to re-raise exceptions
+        for _ in executor.map(fn, range(num_layers)):
+            pass
+
+    def shutdown(self) -> None:
+        """Stop the thread pool, the next call starts a new one."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
 
-    return params
 
+def for_each_layer(
+    fn: Callable[[int], None], num_layers: int, max_workers: Optional[int] = 1
+) -> None:
+    """Call `fn` with the index of each layer, across a pool of `max_workers` threads.
 
-def aggregate_median(results: List[Tuple[NDArrays, int]]) -> NDArrays:
-    """Compute median."""
+    The pool only lives for this call, use a `LayerExecutor` to reuse it.
+    """
+    layer_executor = LayerExecutor(max_workers)
+    try:
+        layer_executor.for_each_layer(fn, num_layers)
+    finally:
+        layer_executor.shutdown()
+
+
+def aggregate(
+    results: List[Tuple[NDArrays, int]], max_workers: Optional[int] = 1
+) -> NDArrays:
+    """Compute weighted average.
+
+    The layers are added across a pool of `max_workers` threads.
+    """
+    accumulator = WeightedAverageAccumulator(max_workers=max_workers)
+    for weights, num_examples in results:
+        accumulator.add(weights, num_examples)
+    return accumulator.result()
+
+
+def aggregate_inplace(
+    results: List[Tuple[ClientProxy, FitRes]],
+    base: Optional[Parameters] = None,
+    max_workers: Optional[int] = 1,
+    clipping: Optional[Tuple[NDArrays, float]] = None,
+) -> NDArrays:
+    """Compute in-place weighted average.
+
+    `base` is required if results hold deltas against it. The results are
+    deserialized and added across a pool of `max_workers` threads, each decoded
+    layer is released as soon as it has been added. If `clipping` is set to
+    `(clipping_base, clipping_norm)`, the updates of the results against
+    `clipping_base` are clipped (see `WeightedAverageAccumulator`).
+    """
+    clipping_base, clipping_norm = clipping if clipping is not None else (None, None)
+    # Deserialize and add up the results one layer at a time
+    accumulator = WeightedAverageAccumulator(
+        max_workers=max_workers,
+        clipping_norm=clipping_norm,
+        clipping_base=clipping_base,
+    )
+    accumulator.add_all_parameters(
+        [(fit_res.parameters, fit_res.num_examples) for _, fit_res in results]
+    )
+    return accumulator.result(base)
+
+
+def aggregate_median(
+    results: List[Tuple[NDArrays, int]],
+    block_size: int = COORDINATE_BLOCK_SIZE,
+    max_workers: Optional[int] = 1,
+) -> NDArrays:
+    """Compute median.
+
+    Each layer is processed in blocks of `block_size` coordinates, across a thread
+    pool of `max_workers` threads (see `_reduce_layer_blocks`).
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
     # Compute median weight of each layer
     median_w: NDArrays = [
-        np.median(np.asarray(layer), axis=0) for layer in zip(*weights)
+        _reduce_layer_blocks(layer, _median, block_size, max_workers)
+        for layer in zip(*weights)
     ]
     return median_w
 
 
+def _median(block: NDArray) -> NDArray:
+    result: NDArray = np.median(block, axis=0)
+    return result
+
+
+def _reduce_layer_blocks(
+    layers: Sequence[NDArray],
+    reduce_fn: Callable[[NDArray], NDArray],
+    block_size: int,
+    max_workers: Optional[int],
+) -> NDArray:
+    """Reduce the same layer of all clients coordinate-wise, one block at a time.
+
+    The layers are never stacked as a whole: `reduce_fn` receives blocks of shape
+    `(len(layers), block_size)` and reduces them along axis 0. Blocks are reduced
+    across a thread pool if `max_workers` is not 1, so that at most `max_workers`
+    blocks are held at once.
+    """
+    shape = layers[0].shape
+    flat_layers = [np.ravel(layer) for layer in layers]
+    size = flat_layers[0].size
+
+    def reduce_block(start: int) -> NDArray:
+        block = np.stack(
+            [flat_layer[start : start + block_size] for flat_layer in flat_layers]
+        )
+        return reduce_fn(block)
+
+    # An empty layer is reduced as a single empty block
+    starts = range(0, max(size, 1), block_size)
+    if max_workers == 1 or len(starts) == 1:
+        return _concatenate_blocks(map(reduce_block, starts), size, shape)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return _concatenate_blocks(executor.map(reduce_block, starts), size, shape)
+
+
+def _concatenate_blocks(
+    blocks: Iterable[NDArray], size: int, shape: Tuple[int, ...]
+) -> NDArray:
+    result: Optional[NDArray] = None
+    start = 0
+    for block in blocks:
+        if result is None:
+            result = np.empty(size, dtype=block.dtype)
+        result[start : start + block.size] = block
+        start += block.size
+    return cast(NDArray, result).reshape(shape)
+
+
 def aggregate_krum(
-    results: List[Tuple[NDArrays, int]], num_malicious: int, to_keep: int
+    results: List[Tuple[NDArrays, int]],
+    num_malicious: int,
+    to_keep: int,
+    max_workers: Optional[int] = 1,
 ) -> NDArrays:
     """Choose one parameter vector according to the Krum function.
 
-    If to_keep is not None, then MultiKrum is applied.
+    If to_keep is not None, then MultiKrum is applied. The distances are computed
+    across a pool of `max_workers` threads.
     """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
     # Compute distances between vectors
-    distance_matrix = _compute_distances(weights)
+    distance_matrix = _compute_distances(weights, max_workers=max_workers)
 
+    best_indices = _krum_indices(distance_matrix, num_malicious, to_keep)
+    if to_keep > 0:
+        # Choose to_keep clients and return their average (MultiKrum)
+        best_results = [results[i] for i in best_indices]
+        return aggregate(best_results, max_workers)
+
+    # Return the model parameters that minimize the score (Krum)
+    return weights[best_indices[0]]
+
+
+def _krum_indices(
+    distance_matrix: NDArray, num_malicious: int, to_keep: int
+) -> List[int]:
+    """Return the indices chosen by Krum (or MultiKrum if `to_keep > 0`).
+
+    Parameters
+    ----------
+    distance_matrix: NDArray
+        Squared distances between the parameter vectors, as returned by
+        `_compute_distances`.
+    num_malicious: int
+        The maximum number of malicious clients.
+    to_keep: int
+        The number of indices to return for MultiKrum, or 0 for Krum.
+
+    Returns
+    -------
+    indices: List[int]
+        The `to_keep` indices with the lowest scores (MultiKrum), or a list holding
+        the single index minimizing the score (Krum).
+    """
     # For each client, take the n-f-2 closest parameters vectors
-    num_closest = max(1, len(weights) - num_malicious - 2)
-    closest_indices = []
-    for distance in distance_matrix:
-        closest_indices.append(
-            np.argsort(distance)[1 : num_closest + 1].tolist()  # noqa: E203
-        )
+    num_closest = max(1, len(distance_matrix) - num_malicious - 2)
 
     # Compute the score for each client, that is the sum of the distances
-    # of the n-f-2 closest parameters vectors
-    scores = [
-        np.sum(distance_matrix[i, closest_indices[i]])
-        for i in range(len(distance_matrix))
-    ]
+    # of the n-f-2 closest parameters vectors (skipping the client itself)
+    closest = np.sort(distance_matrix, axis=1)[:, 1 : num_closest + 1]  # noqa: E203
+    scores = np.sum(closest, axis=1)
 
     if to_keep > 0:
-        # Choose to_keep clients and return their average (MultiKrum)
         best_indices = np.argsort(scores)[::-1][len(scores) - to_keep :]  # noqa: E203
-        best_results = [results[i] for i in best_indices]
-        return aggregate(best_results)
-
-    # Return the model parameters that minimize the score (Krum)
-    return weights[np.argmin(scores)]
+        return cast(List[int], best_indices.tolist())
+    return [int(np.argmin(scores))]
 
 
 # pylint: disable=too-many-locals
@@ -160,7 +623,19 @@ def aggregate_bulyan(
     theta = len(results) - 2 * num_malicious
     beta = theta - 2 * num_malicious
 
-    for _ in range(theta):
+    if aggregation_rule is aggregate_krum and not aggregation_rule_kwargs.get(
+        "to_keep"
+    ):
+        # Compute the distances once, Krum is then applied to the distances
+        # between the remaining models
+        distance_matrix = _compute_distances([weights for weights, _ in results])
+        remaining = list(range(num_clients))
+        for _ in range(theta):
+            sub_matrix = distance_matrix[np.ix_(remaining, remaining)]
+            best_idx = _krum_indices(sub_matrix, num_malicious, to_keep=0)[0]
+            selected_models_set.append(results[remaining.pop(best_idx)])
+
+    for _ in range(theta - len(selected_models_set)):
         best_model = aggregation_rule(
             results=results, num_malicious=num_malicious, **aggregation_rule_kwargs
         )
@@ -212,35 +687,168 @@ def aggregate_qffl(
 ) -> NDArrays:
     """Compute weighted average based on Q-FFL paper."""
     demominator: float = np.sum(np.asarray(hs_fll))
-    scaled_deltas = []
+    flat_parameters = FlatParameters.from_ndarrays(parameters, dtype=np.float64)
+
+    # Sum the deltas of all clients in a single buffer
+    updates = FlatParameters(
+        np.zeros_like(flat_parameters.buffer), flat_parameters.shapes
+    )
     for client_delta in deltas:
-        scaled_deltas.append([layer * 1.0 / demominator for layer in client_delta])
-    updates = []
-    for i in range(len(deltas[0])):
-        tmp = scaled_deltas[0][i]
-        for j in range(1, len(deltas)):
-            tmp += scaled_deltas[j][i]
-        updates.append(tmp)
-    new_parameters = [(u - v) * 1.0 for u, v in zip(parameters, updates)]
-    return new_parameters
-
-
-def _compute_distances(weights: List[NDArrays]) -> NDArray:
+        for view, layer in zip(updates.to_ndarrays(), client_delta):
+            np.add(view, layer, out=view)
+    np.divide(updates.buffer, demominator, out=updates.buffer)
+    np.subtract(flat_parameters.buffer, updates.buffer, out=flat_parameters.buffer)
+
+    # Each layer keeps its data type (integer layers become float64)
+    return [
+        layer.astype(
+            before.dtype if np.issubdtype(before.dtype, np.floating) else np.float64,
+            copy=False,
+        )
+        for before, layer in zip(parameters, flat_parameters.to_ndarrays())
+    ]
+
+
+class QFFLAccumulator:
+    """Accumulate the q-FFL update one client at a time.
+
+    Each client's delta `before - after` is folded into a single float64 buffer,
+    and its squared norm is computed in the same pass. The weights `loss^q` of the
+    deltas and h-terms are kept relative to the largest one seen so far (in the log
+    domain), so that they cannot overflow for large `q`; they cancel out in the
+    update `sum(deltas) / sum(hs)`.
+
+    Paper: https://arxiv.org/abs/1905.10497
+    """
+
+    def __init__(
+        self, weights_before: NDArrays, q_param: float, learning_rate: float
+    ) -> None:
+        self.weights_before = weights_before
+        self.q_param = q_param
+        self.learning_rate = learning_rate
+        shapes = [layer.shape for layer in weights_before]
+        size = sum(layer.size for layer in weights_before)
+        self.sums = FlatParameters(np.zeros(size), shapes)
+        self.scratch = FlatParameters(np.empty(size), shapes)
+        self.hs_total = 0.0
+        self.log_scale = -np.inf
+
+    def add(self, new_weights: NDArrays, loss: float) -> None:
+        """Add the result of one client, whose model had the loss `loss`."""
+        if len(new_weights) != len(self.weights_before):
+            raise ValueError(
+                f"Result has {len(new_weights)} layers, "
+                f"expected {len(self.weights_before)}"
+            )
+        loss = loss + 1e-10
+        log_weight = self.q_param * np.log(loss)
+        if log_weight > self.log_scale:
+            # Rescale what was accumulated so far to the new largest weight
+            factor = np.exp(self.log_scale - log_weight)
+            np.multiply(self.sums.buffer, factor, out=self.sums.buffer)
+            self.hs_total *= factor
+            self.log_scale = log_weight
+        weight = np.exp(log_weight - self.log_scale)
+
+        # delta = before - after
+        for view, before, after in zip(
+            self.scratch.to_ndarrays(), self.weights_before, new_weights
+        ):
+            np.subtract(before, after, out=view)
+        delta = self.scratch.buffer
+        squared_norm = float(np.dot(delta, delta))
+
+        # h = q * loss^(q-1) * |delta / lr|^2 + loss^q / lr, divided by the scale
+        self.hs_total += weight * (
+            self.q_param * squared_norm / (loss * self.learning_rate**2)
+            + 1.0 / self.learning_rate
+        )
+        np.multiply(delta, weight, out=delta)
+        np.add(self.sums.buffer, delta, out=self.sums.buffer)
+
+    def result(self) -> NDArrays:
+        """Return the weights after applying the q-FFL update."""
+        if self.hs_total == 0.0:
+            raise ValueError("No results have been added")
+        # sum(deltas) / sum(hs), where each delta is (before - after) / lr
+        update = self.sums.buffer / (self.learning_rate * self.hs_total)
+        layers = []
+        for before, layer_update in zip(
+            self.weights_before, FlatParameters(update, self.sums.shapes).to_ndarrays()
+        ):
+            dtype = before.dtype
+            if not np.issubdtype(dtype, np.floating):
+                dtype = np.dtype(np.float64)
+            layers.append((before - layer_update).astype(dtype, copy=False))
+        return layers
+
+
+def _compute_distances(
+    weights: List[NDArrays],
+    block_size: int = DISTANCE_BLOCK_SIZE,
+    max_workers: Optional[int] = 1,
+) -> NDArray:
     """Compute distances between vectors.
 
     Input: weights - list of weights vectors
     Output: distances - matrix distance_matrix of squared distances between the vectors
+
+    The distances are derived from the Gram matrix of the vectors, using
+    `|a - b|^2 = |a|^2 + |b|^2 - 2 a.b`.
     """
-    flat_w = np.array([np.concatenate(p, axis=None).ravel() for p in weights])
-    distance_matrix = np.zeros((len(weights), len(weights)))
-    for i, flat_w_i in enumerate(flat_w):
-        for j, flat_w_j in enumerate(flat_w):
-            delta = flat_w_i - flat_w_j
-            norm = np.linalg.norm(delta)
-            distance_matrix[i, j] = norm**2
+    gram = _compute_gram(weights, block_size, max_workers)
+    squared_norms = np.diag(gram)
+    distance_matrix = squared_norms[:, None] + squared_norms[None, :] - 2 * gram
+    # Remove negative values caused by rounding errors
+    np.maximum(distance_matrix, 0.0, out=distance_matrix)
+    np.fill_diagonal(distance_matrix, 0.0)
     return distance_matrix
 
 
+def _compute_gram(
+    weights: List[NDArrays], block_size: int, max_workers: Optional[int] = 1
+) -> NDArray:
+    """Compute the Gram matrix of the flattened, centered weights vectors.
+
+    The vectors are never flattened as a whole: each layer is split into blocks of
+    at most `block_size` coordinates, which are stacked across clients, centered,
+    and multiplied, so that memory usage does not grow with the model size.
+    Centering does not change the distances, but avoids the loss of precision of
+    the Gram matrix identity when the vectors are close to each other.
+
+    The blocks are split into one shard per thread of a pool of `max_workers`
+    threads, each of which sums the Gram matrices of its blocks.
+    """
+    num_vectors = len(weights)
+    flat_weights = [[np.ravel(layer) for layer in layers] for layers in weights]
+    blocks = [
+        (layer_index, start)
+        for layer_index, layer in enumerate(flat_weights[0] if weights else [])
+        for start in range(0, layer.size, block_size)
+    ]
+
+    def shard_gram(shard: Sequence[Tuple[int, int]]) -> NDArray:
+        gram = np.zeros((num_vectors, num_vectors))
+        for layer_index, start in shard:
+            block = np.stack(
+                [
+                    layers[layer_index][start : start + block_size]
+                    for layers in flat_weights
+                ]
+            ).astype(np.float64)
+            block -= np.mean(block, axis=0)
+            gram += block @ block.T
+        return gram
+
+    if max_workers == 1 or len(blocks) <= 1:
+        return shard_gram(blocks)
+    num_shards = min(len(blocks), max_workers or os.cpu_count() or 1)
+    shards = [blocks[i::num_shards] for i in range(num_shards)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_shards) as executor:
+        return cast(NDArray, sum(executor.map(shard_gram, shards)))
+
+
 def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
     """Compute trimmed mean along axis=0.
 
@@ -265,14 +873,22 @@ def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
 
 
 def aggregate_trimmed_avg(
-    results: List[Tuple[NDArrays, int]], proportiontocut: float
+    results: List[Tuple[NDArrays, int]],
+    proportiontocut: float,
+    block_size: int = COORDINATE_BLOCK_SIZE,
+    max_workers: Optional[int] = 1,
 ) -> NDArrays:
-    """Compute trimmed average."""
+    """Compute trimmed average.
+
+    Each layer is processed in blocks of `block_size` coordinates, across a thread
+    pool of `max_workers` threads (see `_reduce_layer_blocks`).
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
+    trim_mean = partial(_trim_mean, proportiontocut=proportiontocut)
     trimmed_w: NDArrays = [
-        _trim_mean(np.asarray(layer), proportiontocut=proportiontocut)
+        _reduce_layer_blocks(layer, trim_mean, block_size, max_workers)
         for layer in zip(*weights)
     ]
 
@@ -320,7 +936,11 @@ def _find_reference_weights(
 
 
 def _aggregate_n_closest_weights(
-    reference_weights: NDArrays, results: List[Tuple[NDArrays, int]], beta_closest: int
+    reference_weights: NDArrays,
+    results: List[Tuple[NDArrays, int]],
+    beta_closest: int,
+    block_size: int = COORDINATE_BLOCK_SIZE,
+    max_workers: Optional[int] = 1,
 ) -> NDArrays:
     """Calculate element-wise mean of the `N` closest values.
 
@@ -336,6 +956,10 @@ def _aggregate_n_closest_weights(
         The weights from models
     beta_closest: int
         The number of the closest distance weights that will be averaged
+    block_size: int
+        The number of coordinates of each layer processed at once
+    max_workers: Optional[int]
+        The number of threads processing the blocks of each layer
 
     Returns
     -------
@@ -344,23 +968,33 @@ def _aggregate_n_closest_weights(
          reference weights
     """
     list_of_weights = [weights for weights, num_examples in results]
-    aggregated_weights = []
-
-    for layer_id, layer_weights in enumerate(reference_weights):
-        other_weights_layer_list = []
-        for other_w in list_of_weights:
-            other_weights_layer = other_w[layer_id]
-            other_weights_layer_list.append(other_weights_layer)
-        other_weights_layer_np = np.array(other_weights_layer_list)
-        diff_np = np.abs(layer_weights - other_weights_layer_np)
-        # Create indices of the smallest differences
-        # We do not need the exact order but just the beta closest weights
-        # therefore np.argpartition is used instead of np.argsort
-        indices = np.argpartition(diff_np, kth=beta_closest - 1, axis=0)
-        # Take the weights (coordinate-wise) corresponding to the beta of the
-        # closest distances
-        beta_closest_weights = np.take_along_axis(
-            other_weights_layer_np, indices=indices, axis=0
-        )[:beta_closest]
-        aggregated_weights.append(np.mean(beta_closest_weights, axis=0))
+    mean_of_closest = partial(_mean_of_closest, beta_closest=beta_closest)
+
+    # The reference layer is reduced as the first row of each block
+    aggregated_weights: NDArrays = [
+        _reduce_layer_blocks(
+            [layer_weights] + [other_w[layer_id] for other_w in list_of_weights],
+            mean_of_closest,
+            block_size,
+            max_workers,
+        )
+        for layer_id, layer_weights in enumerate(reference_weights)
+    ]
     return aggregated_weights
+
+
+def _mean_of_closest(block: NDArray, beta_closest: int) -> NDArray:
+    """Average the `beta_closest` values of `block[1:]` closest to `block[0]`."""
+    reference, others = block[0], block[1:]
+    diff_np = np.abs(reference - others)
+    # Create indices of the smallest differences
+    # We do not need the exact order but just the beta closest weights
+    # therefore np.argpartition is used instead of np.argsort
+    indices = np.argpartition(diff_np, kth=beta_closest - 1, axis=0)
+    # Take the weights (coordinate-wise) corresponding to the beta of the
+    # closest distances
+    beta_closest_weights = np.take_along_axis(others, indices=indices, axis=0)[
+        :beta_closest
+    ]
+    result: NDArray = np.mean(beta_closest_weights, axis=0)
+    return result
@@ -15,15 +15,38 @@
 """Aggregation function tests."""
 
 
+import copy
+import threading
 from typing import List, Tuple
 
 import numpy as np
+import pytest
+
+from flwr.common import (
+    NDArrays,
+    arrays_to_parameters,
+    ndarray_to_array,
+    ndarray_to_delta_array,
+    ndarrays_to_parameters,
+    parameters_version,
+)
+from flwr.common.constant import STYPE_NUMPY_COO, STYPE_NUMPY_CSR
 
 from .aggregate import (
+    LayerExecutor,
+    QFFLAccumulator,
+    WeightedAverageAccumulator,
     _aggregate_n_closest_weights,
     _check_weights_equality,
+    _compute_distances,
     _find_reference_weights,
+    _krum_indices,
     aggregate,
+    aggregate_bulyan,
+    aggregate_krum,
+    aggregate_median,
+    aggregate_qffl,
+    aggregate_trimmed_avg,
     weighted_loss_avg,
 )
 
@@ -46,6 +69,130 @@ def test_aggregate() -> None:
     np.testing.assert_equal(expected, actual)
 
 
+def test_weighted_average_accumulator() -> None:
+    """Test that deserialized and in-memory results are averaged alike."""
+    # Prepare
+    weights0 = [np.array([[1.0, 2.0]], dtype=np.float32), np.array([3.0])]
+    weights1 = [np.array([[4.0, 8.0]], dtype=np.float32), np.array([6.0])]
+    accumulator = WeightedAverageAccumulator()
+    expected = [np.array([[3.0, 6.0]], dtype=np.float32), np.array([5.0])]
+
+    # Execute
+    accumulator.add(weights0, 1)
+    accumulator.add_parameters(ndarrays_to_parameters(weights1), 2)
+    actual = accumulator.result()
+
+    # Assert
+    assert accumulator.num_examples_total == 3
+    np.testing.assert_equal(expected, actual)
+    assert [layer.dtype for layer in actual] == [np.float32, np.float64]
+
+
+def test_weighted_average_accumulator_scales_in_dtype() -> None:
+    """Test that layers are scaled in the data type of the accumulator."""
+    # Prepare
+    layer = np.array([1 + 2**-23], dtype=np.float32)
+    accumulator = WeightedAverageAccumulator()
+
+    # Execute
+    for _ in range(2):
+        accumulator.add([layer], 3)
+
+    # Assert
+    assert accumulator.sums[0][0] == 6 * np.float64(layer[0])
+
+
+def test_weighted_average_accumulator_sparse_and_delta() -> None:
+    """Test that sparse and delta results are averaged like dense ones."""
+    # Prepare
+    base: NDArrays = [np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32), np.zeros(3)]
+    base_parameters = ndarrays_to_parameters(base)
+    version = parameters_version(base_parameters)
+    weights0: NDArrays = [
+        np.array([[0.0, 2.0], [0.0, 0.0]], dtype=np.float32),
+        np.ones(3),
+    ]
+    weights1: NDArrays = [base[0] + 1.0, np.array([0.0, 3.0, 0.0])]
+    accumulator = WeightedAverageAccumulator()
+    expected = [
+        (weights0[0] + 2 * weights1[0]) / 3,
+        (weights0[1] + 2 * weights1[1]) / 3,
+    ]
+
+    # Execute
+    accumulator.add_parameters(
+        arrays_to_parameters(
+            [
+                ndarray_to_array(weights0[0], STYPE_NUMPY_CSR),
+                ndarray_to_array(weights0[1]),
+            ]
+        ),
+        1,
+    )
+    accumulator.add_parameters(
+        arrays_to_parameters(
+            [
+                ndarray_to_delta_array(weights1[0], base[0], version),
+                ndarray_to_delta_array(weights1[1], base[1], version, STYPE_NUMPY_COO),
+            ]
+        ),
+        2,
+    )
+    actual = accumulator.result(base_parameters)
+
+    # Assert
+    np.testing.assert_allclose(actual[0], expected[0], rtol=1e-6)
+    np.testing.assert_allclose(actual[1], expected[1])
+    assert actual[0].dtype == np.float32
+    with pytest.raises(ValueError):
+        accumulator.result()
+    with pytest.raises(ValueError):
+        accumulator.result(ndarrays_to_parameters(weights0))
+
+
+def test_weighted_average_accumulator_mismatch() -> None:
+    """Test that results with different layers are rejected."""
+    # Prepare
+    accumulator = WeightedAverageAccumulator(dtype=np.float32)
+    accumulator.add([np.zeros((2, 2)), np.zeros(3)], 1)
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        accumulator.add([np.zeros((2, 2))], 1)
+    with pytest.raises(ValueError):
+        accumulator.add([np.zeros((2, 2)), np.zeros(4)], 1)
+
+
+def test_weighted_average_accumulator_empty() -> None:
+    """Test that an empty accumulator has no result."""
+    with pytest.raises(ValueError):
+        WeightedAverageAccumulator().result()
+
+
+def test_weighted_average_accumulator_clipping() -> None:
+    """Test that updates against the clipping base are clipped before averaging."""
+    # Prepare
+    base = [np.ones(2, dtype=np.float32), np.zeros(1, dtype=np.float32)]
+    accumulator = WeightedAverageAccumulator(clipping_norm=1.0, clipping_base=base)
+    # Updates [3, 4, 0] (norm 5, clipped to [0.6, 0.8, 0]) and [0, 0, 0.5]
+    results = [
+        ([np.array([4.0, 5.0], dtype=np.float32), np.zeros(1, dtype=np.float32)], 1),
+        ([np.ones(2, dtype=np.float32), np.full(1, 0.5, dtype=np.float32)], 3),
+    ]
+
+    # Execute
+    accumulator.add(*results[0])
+    accumulator.add_parameters(ndarrays_to_parameters(results[1][0]), results[1][1])
+    actual = accumulator.result()
+
+    # Assert
+    assert actual[0].dtype == np.float32
+    np.testing.assert_allclose(actual[0], [1.15, 1.2], rtol=1e-6)
+    np.testing.assert_allclose(actual[1], [0.375], rtol=1e-6)
+    with pytest.raises(ValueError):
+        WeightedAverageAccumulator(clipping_norm=1.0)
+
+
 def test_weighted_loss_avg_single_value() -> None:
     """Test weighted loss averaging."""
     # Prepare
@@ -139,3 +286,272 @@ def test_aggregate_n_closest_weights_mean() -> None:
             for expected, result in zip(expected_averaged, beta_closest_weights)
         )
     )
+
+
+def test_compute_distances() -> None:
+    """Test that blocked distances match the distances of flattened vectors."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    weights = [
+        [rng.normal(size=(3, 5)).astype(np.float32), rng.normal(size=7)]
+        for _ in range(6)
+    ]
+    flat = np.array([np.concatenate([w.ravel() for w in ws]) for ws in weights])
+    expected = np.array([[np.sum((a - b) ** 2) for b in flat] for a in flat])
+
+    # Execute
+    actual = _compute_distances(weights, block_size=4)
+
+    # Assert
+    np.testing.assert_allclose(actual, expected, atol=1e-9)
+    np.testing.assert_array_equal(np.diag(actual), 0.0)
+
+
+def test_krum_indices() -> None:
+    """Test that Krum chooses the vectors closest to the others."""
+    # Prepare
+    weights = [[np.array([value])] for value in [0.0, 0.1, 0.2, 0.25, 5.0]]
+    distance_matrix = _compute_distances(weights)
+
+    # Execute
+    krum = _krum_indices(distance_matrix, num_malicious=1, to_keep=0)
+    multi_krum = _krum_indices(distance_matrix, num_malicious=1, to_keep=2)
+
+    # Assert
+    assert krum == [2]
+    assert sorted(multi_krum) == [1, 2]
+
+
+def test_aggregate_bulyan_krum() -> None:
+    """Test that Bulyan with Krum selects the same models as repeated Krum."""
+    # Prepare
+    rng = np.random.default_rng(1)
+    results = [([rng.normal(size=(2, 3)), rng.normal(size=4)], 1) for _ in range(7)]
+    results[3] = ([layer + 100.0 for layer in results[3][0]], 1)
+    selected = []
+    remaining = list(results)
+    for _ in range(len(results) - 2):
+        best = aggregate_krum(remaining, num_malicious=1, to_keep=0)
+        idx = _find_reference_weights(best, [weights for weights, _ in remaining])
+        selected.append(remaining.pop(idx))
+    expected = _aggregate_n_closest_weights(
+        [
+            np.median(np.asarray(layer), axis=0)
+            for layer in zip(*(w for w, _ in selected))
+        ],
+        selected,
+        beta_closest=len(results) - 4,
+    )
+
+    # Execute
+    actual = aggregate_bulyan(list(results), 1, aggregate_krum, to_keep=0)
+
+    # Assert
+    for expected_layer, actual_layer in zip(expected, actual):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_blocked_coordinate_wise_aggregation(max_workers: int) -> None:
+    """Test that blocked median, trimmed mean and closest mean match the full ones."""
+    # Prepare
+    rng = np.random.default_rng(2)
+    results = [
+        ([rng.normal(size=(5, 7)).astype(np.float32), rng.integers(9, size=3)], 1)
+        for _ in range(6)
+    ]
+    stacked = [np.asarray(layer) for layer in zip(*(w for w, _ in results))]
+    reference = [np.median(layer, axis=0) for layer in stacked]
+
+    # Execute
+    median = aggregate_median(results, block_size=4, max_workers=max_workers)
+    trimmed = aggregate_trimmed_avg(results, 0.2, block_size=4, max_workers=max_workers)
+    closest = _aggregate_n_closest_weights(
+        reference, results, beta_closest=2, block_size=4, max_workers=max_workers
+    )
+    expected_closest = _aggregate_n_closest_weights(reference, results, 2)
+
+    # Assert
+    for layer, expected, actual in zip(stacked, reference, median):
+        assert actual.shape == layer.shape[1:]
+        np.testing.assert_allclose(actual, expected)
+    for layer, actual in zip(stacked, trimmed):
+        expected = np.mean(np.sort(layer, axis=0)[1:-1], axis=0)
+        np.testing.assert_allclose(actual, expected, rtol=1e-6)
+    for expected, actual in zip(expected_closest, closest):
+        np.testing.assert_allclose(actual, expected)
+
+
+def test_aggregate_qffl() -> None:
+    """Test that the q-FFL update subtracts the normalized sum of the deltas."""
+    # Prepare
+    parameters = [np.array([[1.0, 2.0]]), np.array([3.0])]
+    deltas = [
+        [np.array([[0.5, 1.0]]), np.array([1.0])],
+        [np.array([[1.5, 1.0]]), np.array([3.0])],
+    ]
+    hs_fll = [np.array(1.0), np.array(3.0)]
+
+    # Execute
+    actual = aggregate_qffl(parameters, deltas, hs_fll)
+
+    # Assert
+    np.testing.assert_allclose(actual[0], [[0.5, 1.5]])
+    np.testing.assert_allclose(actual[1], [2.0])
+
+
+def test_aggregate_qffl_keeps_layer_dtypes() -> None:
+    """Test that each layer of a mixed-precision model keeps its data type."""
+    # Prepare
+    parameters = [
+        np.array([1.0, 2.0], dtype=np.float16),
+        np.array([3.0], dtype=np.float32),
+        np.array([4], dtype=np.int64),
+    ]
+    deltas = [[np.ones(2), np.ones(1), np.ones(1)]]
+    hs_fll = [np.array(2.0)]
+
+    # Execute
+    actual = aggregate_qffl(parameters, deltas, hs_fll)
+
+    # Assert
+    assert [layer.dtype for layer in actual] == [np.float16, np.float32, np.float64]
+    np.testing.assert_allclose(actual[0], [0.5, 1.5])
+    np.testing.assert_allclose(actual[1], [2.5])
+    np.testing.assert_allclose(actual[2], [3.5])
+
+
+def test_qffl_accumulator() -> None:
+    """Test that the streaming q-FFL update matches `aggregate_qffl`."""
+    # Prepare
+    rng = np.random.default_rng(3)
+    q_param, learning_rate, loss = 0.2, 0.1, 1.5
+    weights_before = [rng.normal(size=(3, 2)), rng.normal(size=4)]
+    results = [[layer + rng.normal(size=layer.shape) for layer in weights_before]]
+    results.append([layer + 1.0 for layer in weights_before])
+    deltas, hs_ffl = [], []
+    for new_weights in results:
+        grads = [(u - v) / learning_rate for u, v in zip(weights_before, new_weights)]
+        deltas.append([np.float_power(loss + 1e-10, q_param) * g for g in grads])
+        hs_ffl.append(
+            q_param
+            * np.float_power(loss + 1e-10, q_param - 1)
+            * sum(np.sum(np.square(g)) for g in grads)
+            + np.float_power(loss + 1e-10, q_param) / learning_rate
+        )
+    expected = aggregate_qffl(weights_before, deltas, hs_ffl)
+
+    # Execute
+    accumulator = QFFLAccumulator(weights_before, q_param, learning_rate)
+    for new_weights in results:
+        accumulator.add(new_weights, loss)
+    actual = accumulator.result()
+
+    # Assert
+    for expected_layer, actual_layer in zip(expected, actual):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+def test_qffl_accumulator_large_q() -> None:
+    """Test that large `q` values do not overflow."""
+    # Prepare
+    weights_before = [np.zeros(3, dtype=np.float32)]
+    accumulator = QFFLAccumulator(weights_before, q_param=500.0, learning_rate=1.0)
+
+    # Execute
+    accumulator.add([np.full(3, -1.0, dtype=np.float32)], loss=10.0)
+    accumulator.add([np.full(3, -2.0, dtype=np.float32)], loss=20.0)
+    actual = accumulator.result()
+
+    # Assert
+    # The client with the largest loss dominates the update
+    assert actual[0].dtype == np.float32
+    assert np.all(np.isfinite(actual[0]))
+    np.testing.assert_allclose(actual[0], -2.0 / (500.0 * 12.0 / 20.0 + 1.0), rtol=1e-5)
+
+
+def test_parallel_aggregation() -> None:
+    """Test that aggregating across threads matches the serial aggregation."""
+    # Prepare
+    rng = np.random.default_rng(4)
+    results = [
+        ([rng.normal(size=(4, 3)), rng.normal(size=5).astype(np.float32)], n)
+        for n in [1, 2, 3, 4, 5]
+    ]
+    weights = [w for w, _ in results]
+
+    # Execute
+    serial = aggregate(results)
+    parallel = aggregate(results, max_workers=3)
+    serial_distances = _compute_distances(weights, block_size=4)
+    parallel_distances = _compute_distances(weights, block_size=4, max_workers=3)
+
+    # Assert
+    for serial_layer, parallel_layer in zip(serial, parallel):
+        assert parallel_layer.dtype == serial_layer.dtype
+        np.testing.assert_allclose(parallel_layer, serial_layer)
+    np.testing.assert_allclose(parallel_distances, serial_distances)
+    for serial_layer, parallel_layer in zip(
+        aggregate_krum(results, 1, 0), aggregate_krum(results, 1, 0, max_workers=3)
+    ):
+        np.testing.assert_array_equal(parallel_layer, serial_layer)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_add_all_parameters(max_workers: int) -> None:
+    """Test that results decoded across threads are averaged like serial ones."""
+    # Prepare
+    rng = np.random.default_rng(5)
+    results = [
+        ([rng.normal(size=(4, 3)), rng.normal(size=5), rng.normal(size=2)], n)
+        for n in range(1, 9)
+    ]
+    parameters_results = [
+        (ndarrays_to_parameters(weights), n) for weights, n in results[:4]
+    ] + [
+        (
+            arrays_to_parameters(
+                [ndarray_to_array(layer, STYPE_NUMPY_COO) for layer in weights]
+            ),
+            n,
+        )
+        for weights, n in results[4:]
+    ]
+    accumulator = WeightedAverageAccumulator()
+
+    # Execute
+    accumulator.add_all_parameters(parameters_results, max_workers=max_workers)
+    actual = accumulator.result()
+
+    # Assert
+    assert accumulator.num_results == len(results)
+    assert accumulator.num_examples_total == 36
+    for expected_layer, actual_layer in zip(aggregate(results), actual):
+        np.testing.assert_allclose(actual_layer, expected_layer)
+
+
+def test_layer_executor_reuses_pool() -> None:
+    """Test that a LayerExecutor starts its pool once and can be copied."""
+    # Prepare
+    layer_executor = LayerExecutor(max_workers=2)
+    seen: List[int] = [0] * 8
+    threads = set()
+
+    def visit(index: int) -> None:
+        seen[index] += 1
+        threads.add(threading.get_ident())
+
+    # Execute
+    layer_executor.for_each_layer(visit, len(seen))
+    executor = layer_executor._executor  # pylint: disable=protected-access
+    layer_executor.for_each_layer(visit, len(seen))
+    layer_executor_copy = copy.deepcopy(layer_executor)
+    layer_executor.shutdown()
+
+    # Assert
+    assert seen == [2] * 8
+    assert executor is not None
+    assert layer_executor._executor is None  # pylint: disable=protected-access
+    assert len(threads) <= 2
+    assert layer_executor_copy.max_workers == 2
+    assert layer_executor_copy._executor is None  # pylint: disable=protected-access
@@ -0,0 +1,143 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Asynchronous server strategy."""
+
+
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from flwr.common import FitIns, FitRes, Parameters, Scalar
+from flwr.server.client_manager import ClientManager
+from flwr.server.client_proxy import ClientProxy
+
+from .strategy import Strategy
+
+
+@dataclass
+class BufferedFitRes:
+    """A training result and the global model it was computed from.
+
+    Parameters
+    ----------
+    client : ClientProxy
+        The client which returned the result.
+    fit_res : FitRes
+        The result of the client.
+    base_parameters : Parameters
+        The global model parameters sent to the client.
+    staleness : int
+        The number of global model updates since the client received
+        `base_parameters`.
+    """
+
+    client: ClientProxy
+    fit_res: FitRes
+    base_parameters: Parameters
+    staleness: int
+
+
+class AsyncStrategy(Strategy):
+    """Abstract base class for asynchronous (buffered) server strategies.
+
+    Used by `AsyncServer`, which keeps clients training without waiting for each
+    other: results are buffered as they arrive, the global model is updated once
+    `should_aggregate` returns True, and idle clients are given new work
+    immediately. `configure_fit` and `aggregate_fit` are not used by `AsyncServer`.
+    """
+
+    @abstractmethod
+    def configure_fit_async(
+        self,
+        server_version: int,
+        parameters: Parameters,
+        client_manager: ClientManager,
+        busy_cids: Set[str],
+    ) -> List[Tuple[ClientProxy, FitIns]]:
+        """Configure training on idle clients.
+
+        Parameters
+        ----------
+        server_version : int
+            The number of global model updates so far.
+        parameters : Parameters
+            The current (global) model parameters.
+        client_manager : ClientManager
+            The client manager which holds all currently connected clients.
+        busy_cids : Set[str]
+            The IDs of the clients which are currently training.
+
+        Returns
+        -------
+        fit_configuration : List[Tuple[ClientProxy, FitIns]]
+            The clients to start training now, each with its `FitIns`. An empty
+            list means that no further clients should be started for now.
+        """
+
+    @abstractmethod
+    def should_aggregate(
+        self,
+        server_version: int,
+        results: List[BufferedFitRes],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> bool:
+        """Decide whether the buffered results are aggregated now.
+
+        Parameters
+        ----------
+        server_version : int
+            The number of global model updates so far.
+        results : List[BufferedFitRes]
+            The successful results received since the last update.
+        failures : List[Union[Tuple[ClientProxy, FitRes], BaseException]]
+            The failures received since the last update.
+
+        Returns
+        -------
+        aggregate : bool
+            If True, `aggregate_fit_async` is called with the buffered results.
+        """
+
+    @abstractmethod
+    def aggregate_fit_async(
+        self,
+        server_version: int,
+        parameters: Parameters,
+        results: List[BufferedFitRes],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Update the global model with the buffered training results.
+
+        Parameters
+        ----------
+        server_version : int
+            The number of the global model update to compute, starting at 1.
+        parameters : Parameters
+            The current (global) model parameters.
+        results : List[BufferedFitRes]
+            The successful results received since the last update.
+        failures : List[Union[Tuple[ClientProxy, FitRes], BaseException]]
+            The failures received since the last update.
+
+        Returns
+        -------
+        parameters : Tuple[Optional[Parameters], Dict[str, Scalar]]
+            If parameters are returned, then the server will treat these as the
+            new global model parameters (i.e., it will replace the previous
+            parameters with the ones returned from this method). If `None` is
+            returned (e.g., because there were only failures and no viable
+            results) then the server will not update the previous model
+            parameters. The buffer is emptied in both cases.
+        """
@@ -21,6 +21,8 @@ Papers: https://arxiv.org/abs/1712.07557, https://arxiv.org/abs/1710.06963
 from logging import WARNING
 from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
+
 from flwr.common import (
     EvaluateIns,
     EvaluateRes,
@@ -42,6 +44,8 @@ from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 from flwr.server.strategy.strategy import Strategy
 
+from .fedavg import FedAvg
+
 
 class DifferentialPrivacyServerSideFixedClipping(Strategy):
     """Wrapper for Central DP with Server Side Fixed Clipping.
@@ -99,6 +103,7 @@ class DifferentialPrivacyServerSideFixedClipping(Strategy):
         self.num_sampled_clients = num_sampled_clients
 
         self.current_round_params: NDArrays = []
+        self.rng = np.random.default_rng()
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -146,19 +151,35 @@ class DifferentialPrivacyServerSideFixedClipping(Strategy):
                 len(results),
                 self.num_sampled_clients,
             )
-        for _, res in results:
-            param = parameters_to_ndarrays(res.parameters)
-            # Compute and clip update
-            compute_clip_model_update(
-                param, self.current_round_params, self.clipping_norm
-            )
-            # Convert back to parameters
-            res.parameters = ndarrays_to_parameters(param)
 
-        # Pass the new parameters for aggregation
-        aggregated_params, metrics = self.strategy.aggregate_fit(
-            server_round, results, failures
-        )
+        if (
+            isinstance(self.strategy, FedAvg)
+            and type(self.strategy).aggregate_fit is FedAvg.aggregate_fit
+        ):
+            # FedAvg clips each update while adding it into the weighted average
+            self.strategy.set_update_clipping(
+                (self.current_round_params, self.clipping_norm)
+            )
+            try:
+                aggregated_params, metrics = self.strategy.aggregate_fit(
+                    server_round, results, failures
+                )
+            finally:
+                self.strategy.set_update_clipping(None)
+        else:
+            for _, res in results:
+                param = parameters_to_ndarrays(res.parameters)
+                # Compute and clip update in place
+                compute_clip_model_update(
+                    param, self.current_round_params, self.clipping_norm
+                )
+                # Convert back to parameters
+                res.parameters = ndarrays_to_parameters(param)
+
+            # Pass the new parameters for aggregation
+            aggregated_params, metrics = self.strategy.aggregate_fit(
+                server_round, results, failures
+            )
 
         # Add Gaussian noise to the aggregated parameters
         if aggregated_params:
@@ -167,6 +188,7 @@ class DifferentialPrivacyServerSideFixedClipping(Strategy):
                 self.noise_multiplier,
                 self.clipping_norm,
                 self.num_sampled_clients,
+                self.rng,
             )
 
         return aggregated_params, metrics
@@ -0,0 +1,115 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""DifferentialPrivacyServerSideFixedClipping tests."""
+
+
+from logging import WARNING
+from typing import Dict, List, Optional, Tuple, Union
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArrays,
+    Parameters,
+    Scalar,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+
+from .dp_fixed_clipping import DifferentialPrivacyServerSideFixedClipping
+from .fedavg import FedAvg
+
+
+def _fit_results(weights: List[NDArrays]) -> List[Tuple[ClientProxy, FitRes]]:
+    return [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(ndarrays),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for ndarrays in weights
+    ]
+
+
+def test_clients_discrepancy_warning(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a warning is logged if fewer clients return results."""
+    # Prepare
+    strategy = DifferentialPrivacyServerSideFixedClipping(
+        FedAvg(), noise_multiplier=0.0, clipping_norm=1.0, num_sampled_clients=3
+    )
+    strategy.current_round_params = [np.zeros(2)]
+    results = _fit_results([[np.ones(2)], [np.ones(2)]])
+
+    # Execute
+    with caplog.at_level(WARNING, logger="flwr"):
+        strategy.aggregate_fit(1, results, [])
+
+    # Assert
+    messages = [
+        record.getMessage() for record in caplog.records if record.levelno == WARNING
+    ]
+    assert any(
+        "number of clients returning parameters (2)" in message
+        and "number of sampled clients (3)" in message
+        for message in messages
+    )
+
+
+class RoundTripFedAvg(FedAvg):
+    """FedAvg replacing `aggregate_fit`, which disables fused clipping."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using weighted average."""
+        return super().aggregate_fit(server_round, results, failures)
+
+
+def test_fused_clipping_equivalence() -> None:
+    """Test that clipping while aggregating matches clipping each result first."""
+    # Prepare
+    current = [np.random.randn(3, 2), np.random.randn(4)]
+    weights = [[layer + 2 * np.random.randn(*layer.shape) for layer in current]]
+    weights.append([layer + 0.01 for layer in current])
+
+    # Execute
+    aggregated = []
+    for fedavg in [FedAvg(), RoundTripFedAvg()]:
+        strategy = DifferentialPrivacyServerSideFixedClipping(
+            fedavg, noise_multiplier=0.0, clipping_norm=1.0, num_sampled_clients=2
+        )
+        strategy.current_round_params = current
+        results = _fit_results(weights)
+        results[1][1].num_examples = 3
+        parameters, _ = strategy.aggregate_fit(1, results, [])
+        assert parameters
+        aggregated.append(parameters_to_ndarrays(parameters))
+
+    # Assert
+    for fused, round_trip in zip(*aggregated):
+        np.testing.assert_allclose(fused, round_trip)
@@ -23,10 +23,12 @@ Paper: arxiv.org/abs/2003.00295
 from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from flwr.common import (
     FitRes,
     MetricsAggregationFn,
+    NDArray,
     NDArrays,
     Parameters,
     Scalar,
@@ -76,6 +78,13 @@ class FedAdagrad(FedOpt):
         Client-side learning rate. Defaults to 1e-1.
     tau : float, optional
         Controls the algorithm's degree of adaptability. Defaults to 1e-9.
+    moments_dtype : Optional[DTypeLike], optional
+        Data type of the moment buffers `m_t` and `v_t`, e.g. `np.float16` (or
+        `ml_dtypes.bfloat16`) to halve their memory. Defaults to None, which keeps
+        the data type of each layer.
+    max_workers : Optional[int], optional
+        Number of threads aggregating and updating the layers in parallel.
+        Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-locals,too-many-instance-attributes
@@ -102,6 +111,8 @@ class FedAdagrad(FedOpt):
         eta: float = 1e-1,
         eta_l: float = 1e-1,
         tau: float = 1e-9,
+        moments_dtype: Optional[DTypeLike] = None,
+        max_workers: Optional[int] = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -121,6 +132,8 @@ class FedAdagrad(FedOpt):
             beta_1=0.0,
             beta_2=0.0,
             tau=tau,
+            moments_dtype=moments_dtype,
+            max_workers=max_workers,
         )
 
     def __repr__(self) -> str:
@@ -143,29 +156,13 @@ class FedAdagrad(FedOpt):
 
         fedavg_weights_aggregate = parameters_to_ndarrays(fedavg_parameters_aggregated)
 
-        # Adagrad
-        delta_t: NDArrays = [
-            x - y for x, y in zip(fedavg_weights_aggregate, self.current_weights)
-        ]
-
-        # m_t
-        if not self.m_t:
-            self.m_t = [np.zeros_like(x) for x in delta_t]
-        self.m_t = [
-            np.multiply(self.beta_1, x) + (1 - self.beta_1) * y
-            for x, y in zip(self.m_t, delta_t)
-        ]
-
-        # v_t
-        if not self.v_t:
-            self.v_t = [np.zeros_like(x) for x in delta_t]
-        self.v_t = [x + np.multiply(y, y) for x, y in zip(self.v_t, delta_t)]
-
-        new_weights = [
-            x + self.eta * y / (np.sqrt(z) + self.tau)
-            for x, y, z in zip(self.current_weights, self.m_t, self.v_t)
-        ]
-
-        self.current_weights = new_weights
+        # Adagrad, updating the weights and moments in place
+        self._update_weights(fedavg_weights_aggregate)
 
         return ndarrays_to_parameters(self.current_weights), metrics_aggregated
+
+    def _update_v_t(
+        self, v_t: NDArray, delta_squared: NDArray, scratch: NDArray
+    ) -> None:
+        """Update `v_t` with the sum of the squared deltas."""
+        np.add(v_t, delta_squared, out=v_t)
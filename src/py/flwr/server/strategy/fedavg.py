@@ -33,11 +33,17 @@ from flwr.common import (
     ndarrays_to_parameters,
     parameters_to_ndarrays,
 )
+from flwr.common.constant import TENSOR_TYPE_ARRAY
 from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate, aggregate_inplace, weighted_loss_avg
+from .aggregate import (
+    WeightedAverageAccumulator,
+    aggregate,
+    aggregate_inplace,
+    weighted_loss_avg,
+)
 from .strategy import Strategy
 
 WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW = """
@@ -47,6 +53,11 @@ connected to the server. `min_available_clients` must be set to a value larger
 than or equal to the values of `min_fit_clients` and `min_evaluate_clients`.
 """
 
+# A result added by `aggregate_fit_partial`, with the Parameters, tensors, and
+# number of examples it held at that time (kept referenced so that their ids are
+# not reused)
+_PartialResult = Tuple[FitRes, Parameters, List[bytes], int]
+
 
 # pylint: disable=line-too-long
 class FedAvg(Strategy):
@@ -84,6 +95,15 @@ class FedAvg(Strategy):
         Metrics aggregation function, optional.
     evaluate_metrics_aggregation_fn : Optional[MetricsAggregationFn]
         Metrics aggregation function, optional.
+    inplace : bool (default: True)
+        Enable (True) or disable (False) in-place aggregation of model updates. If
+        enabled, model updates are added to the weighted average as soon as they
+        arrive (see `aggregate_fit_partial`). Results holding sparse or delta Arrays
+        (see `arrays_to_parameters`) are always aggregated in place, deltas
+        against the parameters sent in `configure_fit`.
+    max_workers : Optional[int] (default: 1)
+        Number of threads aggregating the layers of the results in parallel. If
+        None, it defaults to the number of processors (see `ThreadPoolExecutor`).
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -108,6 +128,7 @@ class FedAvg(Strategy):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         inplace: bool = True,
+        max_workers: Optional[int] = 1,
     ) -> None:
         super().__init__()
 
@@ -130,12 +151,30 @@ class FedAvg(Strategy):
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
         self.inplace = inplace
+        self.max_workers = max_workers
+        self._partial_round = 0
+        self._partial_results: List[_PartialResult] = []
+        self._partial_accumulator = WeightedAverageAccumulator(max_workers=max_workers)
+        self._fit_base: Optional[Parameters] = None
+        self._update_clipping: Optional[Tuple[NDArrays, float]] = None
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
         rep = f"FedAvg(accept_failures={self.accept_failures})"
         return rep
 
+    def set_update_clipping(
+        self, update_clipping: Optional[Tuple[NDArrays, float]]
+    ) -> None:
+        """Clip the update of each result while aggregating fit results.
+
+        If `update_clipping` is `(base, clipping_norm)`, `aggregate_fit` clips the
+        update of each result against `base` to an L2 norm of `clipping_norm`, and
+        returns `base` plus the weighted average of the clipped updates. Used by
+        `DifferentialPrivacyServerSideFixedClipping`. None disables clipping.
+        """
+        self._update_clipping = update_clipping
+
     def num_fit_clients(self, num_available_clients: int) -> Tuple[int, int]:
         """Return the sample size and the required number of available clients."""
         num_clients = int(num_available_clients * self.fraction_fit)
@@ -177,6 +216,8 @@ class FedAvg(Strategy):
             # Custom fit config function provided
             config = self.on_fit_config_fn(server_round)
         fit_ins = FitIns(parameters, config)
+        # Keep the parameters sent to the clients, the base of their deltas
+        self._fit_base = parameters
 
         # Sample clients
         sample_size, min_num_clients = self.num_fit_clients(
@@ -228,16 +269,31 @@ class FedAvg(Strategy):
         if not self.accept_failures and failures:
             return None, {}
 
-        if self.inplace:
-            # Does in-place weighted average of results
-            aggregated_ndarrays = aggregate_inplace(results)
+        if (
+            self.inplace
+            or self._update_clipping is not None
+            or any(
+                fit_res.parameters.tensor_type == TENSOR_TYPE_ARRAY
+                for _, fit_res in results
+            )
+        ):
+            # Does in-place weighted average of results, unless all of them have
+            # already been added as they arrived
+            aggregated_ndarrays = self._take_partial_aggregate(server_round, results)
+            if aggregated_ndarrays is None:
+                aggregated_ndarrays = aggregate_inplace(
+                    results, self._fit_base, self.max_workers, self._update_clipping
+                )
         else:
-            # Convert results
+            # Convert results (read-only, `aggregate` does not modify them)
             weights_results = [
-                (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
+                (
+                    parameters_to_ndarrays(fit_res.parameters, copy=False),
+                    fit_res.num_examples,
+                )
                 for _, fit_res in results
             ]
-            aggregated_ndarrays = aggregate(weights_results)
+            aggregated_ndarrays = aggregate(weights_results, self.max_workers)
 
         parameters_aggregated = ndarrays_to_parameters(aggregated_ndarrays)
 
@@ -251,6 +307,61 @@ class FedAvg(Strategy):
 
         return parameters_aggregated, metrics_aggregated
 
+    def aggregate_fit_partial(
+        self, server_round: int, result: Tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Add a single fit result to the weighted average of the round."""
+        # Subclasses replacing `aggregate_fit` would never use the partial aggregate
+        if not self.inplace or type(self).aggregate_fit is not FedAvg.aggregate_fit:
+            return
+
+        if server_round != self._partial_round:
+            self._reset_partial_aggregate(server_round)
+        _, fit_res = result
+        self._partial_accumulator.add_parameters(
+            fit_res.parameters, fit_res.num_examples
+        )
+        self._partial_results.append(
+            (
+                fit_res,
+                fit_res.parameters,
+                list(fit_res.parameters.tensors),
+                fit_res.num_examples,
+            )
+        )
+
+    def _take_partial_aggregate(
+        self, server_round: int, results: List[Tuple[ClientProxy, FitRes]]
+    ) -> Optional[NDArrays]:
+        """Return the partial aggregate if it covers exactly the given results.
+
+        Results modified after they were added (e.g., clipped by a wrapper strategy
+        such as `DifferentialPrivacyServerSideFixedClipping`) invalidate it.
+        """
+        added = {id(partial[0]): partial for partial in self._partial_results}
+        # Results are added to the partial aggregate without clipping
+        complete = (
+            self._update_clipping is None
+            and server_round == self._partial_round
+            and len(self._partial_results) == len(added) == len(results)
+            and all(
+                id(fit_res) in added and _is_unchanged(fit_res, added[id(fit_res)])
+                for _, fit_res in results
+            )
+        )
+        aggregated_ndarrays = (
+            self._partial_accumulator.result(self._fit_base) if complete else None
+        )
+        self._reset_partial_aggregate(0)
+        return aggregated_ndarrays
+
+    def _reset_partial_aggregate(self, server_round: int) -> None:
+        self._partial_round = server_round
+        self._partial_results = []
+        self._partial_accumulator = WeightedAverageAccumulator(
+            max_workers=self.max_workers
+        )
+
     def aggregate_evaluate(
         self,
         server_round: int,
@@ -281,3 +392,14 @@ class FedAvg(Strategy):
             log(WARNING, "No evaluate_metrics_aggregation_fn provided")
 
         return loss_aggregated, metrics_aggregated
+
+
+def _is_unchanged(fit_res: FitRes, partial: _PartialResult) -> bool:
+    """Check whether `fit_res` still holds what was added to the partial aggregate."""
+    _, parameters, tensors, num_examples = partial
+    return (
+        fit_res.parameters is parameters
+        and fit_res.num_examples == num_examples
+        and len(parameters.tensors) == len(tensors)
+        and all(new is old for new, old in zip(parameters.tensors, tensors))
+    )
@@ -21,10 +21,20 @@ from unittest.mock import MagicMock
 import numpy as np
 from numpy.testing import assert_allclose
 
-from flwr.common import Code, FitRes, Status, parameters_to_ndarrays
+from flwr.common import (
+    Code,
+    FitRes,
+    Status,
+    arrays_to_parameters,
+    ndarray_to_delta_array,
+    parameters_to_ndarrays,
+    parameters_version,
+)
+from flwr.common.constant import STYPE_NUMPY_CSR
 from flwr.common.parameter import ndarrays_to_parameters
 from flwr.server.client_proxy import ClientProxy
 
+from .dpfedavg_fixed import DPFedAvgFixed
 from .fedavg import FedAvg
 
 
@@ -178,3 +188,113 @@ def test_inplace_aggregate_fit_equivalence() -> None:
     # Assert
     for ref, inp in zip(reference_np, inplace_np):
         assert_allclose(ref, inp)
+
+
+def test_aggregate_fit_partial_equivalence() -> None:
+    """Test that adding results as they arrive gives the same aggregate."""
+    # Prepare
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters([np.random.randn(10, 4)]),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for num_examples in [1, 5, 2]
+    ]
+    fedavg_reference = FedAvg()
+    fedavg_partial = FedAvg()
+
+    # Execute
+    reference, _ = fedavg_reference.aggregate_fit(1, results, [])
+    for result in results:
+        fedavg_partial.aggregate_fit_partial(1, result)
+    partial, _ = fedavg_partial.aggregate_fit(1, results, [])
+    # Results which were not all added partially are aggregated from scratch
+    fedavg_partial.aggregate_fit_partial(2, results[0])
+    subset, _ = fedavg_partial.aggregate_fit(2, results[1:], [])
+    subset_reference, _ = fedavg_reference.aggregate_fit(2, results[1:], [])
+
+    # Assert
+    assert reference and partial and subset and subset_reference
+    assert_allclose(
+        parameters_to_ndarrays(reference)[0], parameters_to_ndarrays(partial)[0]
+    )
+    assert_allclose(
+        parameters_to_ndarrays(subset_reference)[0],
+        parameters_to_ndarrays(subset)[0],
+    )
+
+
+def test_partial_aggregate_of_modified_results_is_dropped() -> None:
+    """Test that results changed by a wrapper strategy are aggregated from scratch."""
+    # Prepare
+    fedavg = FedAvg()
+    strategy = DPFedAvgFixed(fedavg, num_sampled_clients=2, clip_norm=1.0)
+    strategy.noise_multiplier = 0.0
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters([np.full(2, value)]),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for value, num_examples in [(0.0, 1), (4.0, 3)]
+    ]
+
+    # Execute
+    for result in results:
+        # As if `aggregate_fit_partial` was forwarded to the wrapped strategy
+        fedavg.aggregate_fit_partial(1, result)
+    # The wrapper forces unweighted aggregation by modifying the results
+    parameters, _ = strategy.aggregate_fit(1, results, [])
+
+    # Assert
+    assert parameters
+    assert_allclose(parameters_to_ndarrays(parameters)[0], np.full(2, 2.0))
+
+
+def test_aggregate_fit_sparse_deltas() -> None:
+    """Test that sparse deltas are aggregated against the parameters sent."""
+    # Prepare
+    base = [np.random.randn(10, 4)]
+    base_parameters = ndarrays_to_parameters(base)
+    version = parameters_version(base_parameters)
+    weights = [[base[0] + np.random.randn(10, 4)] for _ in range(3)]
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=arrays_to_parameters(
+                    [ndarray_to_delta_array(w[0], base[0], version, STYPE_NUMPY_CSR)]
+                ),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for w, num_examples in zip(weights, [1, 5, 2])
+    ]
+    expected = (weights[0][0] + 5 * weights[1][0] + 2 * weights[2][0]) / 8
+    client_manager = MagicMock()
+    client_manager.sample.return_value = []
+
+    # Execute
+    aggregated = []
+    for strategy in [FedAvg(), FedAvg(inplace=False)]:
+        strategy.configure_fit(1, base_parameters, client_manager)
+        for result in results:
+            strategy.aggregate_fit_partial(1, result)
+        parameters, _ = strategy.aggregate_fit(1, results, [])
+        assert parameters
+        aggregated.append(parameters_to_ndarrays(parameters)[0])
+
+    # Assert
+    assert_allclose(aggregated[0], expected)
+    assert_allclose(aggregated[1], expected)
@@ -19,7 +19,10 @@ Paper: arxiv.org/pdf/1909.06335.pdf
 
 
 from logging import WARNING
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union, cast
+
+import numpy as np
+from numpy.typing import DTypeLike
 
 from flwr.common import (
     FitRes,
@@ -34,7 +37,7 @@ from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate
+from .aggregate import LayerExecutor, aggregate
 from .fedavg import FedAvg
 
 
@@ -71,6 +74,13 @@ class FedAvgM(FedAvg):
         Defaults to 1.0.
     server_momentum: float
         Server-side momentum factor used for FedAvgM. Defaults to 0.0.
+    momentum_dtype : Optional[DTypeLike], optional
+        Data type of the momentum buffer, e.g. `np.float16` (or `ml_dtypes.bfloat16`)
+        to halve its memory. Defaults to None, which keeps the data type of each
+        layer.
+    max_workers : Optional[int], optional
+        Number of threads aggregating and updating the layers in parallel.
+        Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -96,6 +106,8 @@ class FedAvgM(FedAvg):
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         server_learning_rate: float = 1.0,
         server_momentum: float = 0.0,
+        momentum_dtype: Optional[DTypeLike] = None,
+        max_workers: Optional[int] = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -110,13 +122,16 @@ class FedAvgM(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            max_workers=max_workers,
         )
         self.server_learning_rate = server_learning_rate
         self.server_momentum = server_momentum
         self.server_opt: bool = (self.server_momentum != 0.0) or (
             self.server_learning_rate != 1.0
         )
+        self.momentum_dtype = momentum_dtype
         self.momentum_vector: Optional[NDArrays] = None
+        self._layer_executor = LayerExecutor(max_workers)
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -147,7 +162,7 @@ class FedAvgM(FedAvg):
             for _, fit_res in results
         ]
 
-        fedavg_result = aggregate(weights_results)
+        fedavg_result = aggregate(weights_results, self.max_workers)
         # following convention described in
         # https://pytorch.org/docs/stable/generated/torch.optim.SGD.html
         if self.server_opt:
@@ -155,35 +170,47 @@ class FedAvgM(FedAvg):
             assert (
                 self.initial_parameters is not None
             ), "When using server-side optimization, model needs to be initialized."
-            initial_weights = parameters_to_ndarrays(self.initial_parameters)
-
-            # remember that updates are the opposite of gradients
-            pseudo_gradient: NDArrays = [
-                x - y
-                for x, y in zip(
-                    parameters_to_ndarrays(self.initial_parameters), fedavg_result
+            initial_weights = parameters_to_ndarrays(
+                self.initial_parameters, copy=False
+            )
+            if self.server_momentum > 0.0 and server_round > 1:
+                assert (
+                    self.momentum_vector
+                ), "Momentum should have been created on round 1."
+            elif self.server_momentum > 0.0:
+                self.momentum_vector = [
+                    np.empty_like(x, dtype=self.momentum_dtype) for x in fedavg_result
+                ]
+
+            def update_layer(index: int) -> None:
+                # remember that updates are the opposite of gradients
+                pseudo_gradient = np.subtract(
+                    initial_weights[index],
+                    fedavg_result[index],
+                    out=fedavg_result[index],
                 )
-            ]
-            if self.server_momentum > 0.0:
-                if server_round > 1:
-                    assert (
-                        self.momentum_vector
-                    ), "Momentum should have been created on round 1."
-                    self.momentum_vector = [
-                        self.server_momentum * x + y
-                        for x, y in zip(self.momentum_vector, pseudo_gradient)
-                    ]
-                else:
-                    self.momentum_vector = pseudo_gradient
-
-                # No nesterov for now
-                pseudo_gradient = self.momentum_vector
-
-            # SGD
-            fedavg_result = [
-                x - self.server_learning_rate * y
-                for x, y in zip(initial_weights, pseudo_gradient)
-            ]
+                if self.server_momentum > 0.0:
+                    momentum = cast(NDArrays, self.momentum_vector)[index]
+                    if server_round > 1:
+                        np.multiply(momentum, self.server_momentum, out=momentum)
+                        np.add(momentum, pseudo_gradient, out=momentum)
+                    else:
+                        np.copyto(momentum, pseudo_gradient, casting="same_kind")
+
+                    # No nesterov for now
+                    pseudo_gradient = momentum
+
+                # SGD
+                update = np.multiply(
+                    pseudo_gradient,
+                    self.server_learning_rate,
+                    out=fedavg_result[index],
+                )
+                np.subtract(initial_weights[index], update, out=update)
+
+            # Update the aggregated weights in place
+            self._layer_executor.for_each_layer(update_layer, len(fedavg_result))
+
             # Update current weights
             self.initial_parameters = ndarrays_to_parameters(fedavg_result)
 
@@ -0,0 +1,308 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Federated Learning with Buffered Asynchronous Aggregation (FedBuff) [Nguyen et
+al., 2022] strategy.
+
+Paper: arxiv.org/abs/2106.06639
+"""
+
+
+from logging import DEBUG, WARNING
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from flwr.common import (
+    FitIns,
+    FitRes,
+    MetricsAggregationFn,
+    NDArrays,
+    Parameters,
+    Scalar,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.common.logger import log
+from flwr.server.client_manager import ClientManager
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.criterion import Criterion
+
+from .async_strategy import AsyncStrategy, BufferedFitRes
+from .fedavg import FedAvg
+
+
+def polynomial_staleness(staleness: int) -> float:
+    """Return the weight `1 / sqrt(1 + staleness)` of a stale result."""
+    return float((1 + staleness) ** -0.5)
+
+
+class IdleCriterion(Criterion):
+    """Criterion selecting clients which are not busy."""
+
+    def __init__(self, busy_cids: Set[str]) -> None:
+        self.busy_cids = busy_cids
+
+    def select(self, client: ClientProxy) -> bool:
+        """Decide whether a client should be eligible for sampling or not."""
+        return client.cid not in self.busy_cids
+
+
+# pylint: disable=line-too-long
+class FedBuff(FedAvg, AsyncStrategy):
+    """Federated Learning with Buffered Asynchronous Aggregation strategy.
+
+    Implementation based on https://arxiv.org/abs/2106.06639
+
+    Used with `AsyncServer`, `concurrency` clients are kept training at all times.
+    Once `buffer_size` clients have returned, the updates of their results (the
+    difference between the returned parameters and the global model sent to the
+    client) are averaged, weighted by the number of examples and by `staleness_fn`,
+    and applied to the global model with `server_learning_rate`. Failures count
+    towards `buffer_size` as well, so failing clients cannot stall training: a
+    buffer without results (or with failures, unless `accept_failures` is True)
+    leaves the global model unchanged. Used with `Server`, it behaves like `FedAvg`.
+
+    Parameters
+    ----------
+    fraction_fit : float, optional
+        Fraction of clients used during training (only used by `Server`).
+        Defaults to 1.0.
+    fraction_evaluate : float, optional
+        Fraction of clients used during validation. In case `min_evaluate_clients`
+        is larger than `fraction_evaluate * available_clients`,
+        `min_evaluate_clients` will still be sampled. Defaults to 1.0.
+    min_fit_clients : int, optional
+        Minimum number of clients used during training (only used by `Server`).
+        Defaults to 2.
+    min_evaluate_clients : int, optional
+        Minimum number of clients used during validation. Defaults to 2.
+    min_available_clients : int, optional
+        Minimum number of total clients in the system. Defaults to 2.
+    evaluate_fn : Optional[Callable[[int, NDArrays, Dict[str, Scalar]],Optional[Tuple[float, Dict[str, Scalar]]]]]
+        Optional function used for validation. Defaults to None.
+    on_fit_config_fn : Callable[[int], Dict[str, Scalar]], optional
+        Function used to configure training. It is called with the number of
+        global model updates so far. Defaults to None.
+    on_evaluate_config_fn : Callable[[int], Dict[str, Scalar]], optional
+        Function used to configure validation. Defaults to None.
+    accept_failures : bool, optional
+        Whether or not accept buffers containing failures. Defaults to True.
+    initial_parameters : Parameters, optional
+        Initial global model parameters.
+    fit_metrics_aggregation_fn : Optional[MetricsAggregationFn]
+        Metrics aggregation function, optional.
+    evaluate_metrics_aggregation_fn : Optional[MetricsAggregationFn]
+        Metrics aggregation function, optional.
+    concurrency : int (default: 10)
+        Number of clients training at the same time.
+    buffer_size : int (default: 5)
+        Number of results and failures aggregated into each global model update.
+    server_learning_rate : float (default: 1.0)
+        Server-side learning rate applied to the averaged update.
+    staleness_fn : Callable[[int], float] (default: polynomial_staleness)
+        Weight of a result, given the number of global model updates since its
+        client received the global model.
+    max_staleness : Optional[int] (default: None)
+        If set, results staler than this are discarded.
+    max_workers : Optional[int] (default: 1)
+        Number of threads aggregating the layers of the results in parallel (only
+        used by `Server`).
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals
+    def __init__(
+        self,
+        *,
+        fraction_fit: float = 1.0,
+        fraction_evaluate: float = 1.0,
+        min_fit_clients: int = 2,
+        min_evaluate_clients: int = 2,
+        min_available_clients: int = 2,
+        evaluate_fn: Optional[
+            Callable[
+                [int, NDArrays, Dict[str, Scalar]],
+                Optional[Tuple[float, Dict[str, Scalar]]],
+            ]
+        ] = None,
+        on_fit_config_fn: Optional[Callable[[int], Dict[str, Scalar]]] = None,
+        on_evaluate_config_fn: Optional[Callable[[int], Dict[str, Scalar]]] = None,
+        accept_failures: bool = True,
+        initial_parameters: Optional[Parameters] = None,
+        fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        concurrency: int = 10,
+        buffer_size: int = 5,
+        server_learning_rate: float = 1.0,
+        staleness_fn: Callable[[int], float] = polynomial_staleness,
+        max_staleness: Optional[int] = None,
+        max_workers: Optional[int] = 1,
+    ) -> None:
+        super().__init__(
+            fraction_fit=fraction_fit,
+            fraction_evaluate=fraction_evaluate,
+            min_fit_clients=min_fit_clients,
+            min_evaluate_clients=min_evaluate_clients,
+            min_available_clients=min_available_clients,
+            evaluate_fn=evaluate_fn,
+            on_fit_config_fn=on_fit_config_fn,
+            on_evaluate_config_fn=on_evaluate_config_fn,
+            accept_failures=accept_failures,
+            initial_parameters=initial_parameters,
+            fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
+            evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            max_workers=max_workers,
+        )
+        if concurrency < 1 or buffer_size < 1:
+            raise ValueError("`concurrency` and `buffer_size` must be at least 1")
+        self.concurrency = concurrency
+        self.buffer_size = buffer_size
+        self.server_learning_rate = server_learning_rate
+        self.staleness_fn = staleness_fn
+        self.max_staleness = max_staleness
+
+    def __repr__(self) -> str:
+        """Compute a string representation of the strategy."""
+        rep = (
+            f"FedBuff(concurrency={self.concurrency}, "
+            f"buffer_size={self.buffer_size}, accept_failures={self.accept_failures})"
+        )
+        return rep
+
+    def configure_fit_async(
+        self,
+        server_version: int,
+        parameters: Parameters,
+        client_manager: ClientManager,
+        busy_cids: Set[str],
+    ) -> List[Tuple[ClientProxy, FitIns]]:
+        """Configure training on idle clients, up to `concurrency` busy clients."""
+        num_idle = sum(1 for cid in client_manager.all() if cid not in busy_cids)
+        if not busy_cids:
+            # Sampling waits until `min_available_clients` clients are connected
+            num_idle = max(num_idle, self.min_available_clients)
+        num_clients = min(self.concurrency - len(busy_cids), num_idle)
+        if num_clients <= 0:
+            return []
+
+        config = {}
+        if self.on_fit_config_fn is not None:
+            # Custom fit config function provided
+            config = self.on_fit_config_fn(server_version)
+        fit_ins = FitIns(parameters, config)
+
+        # Sample idle clients
+        clients = client_manager.sample(
+            num_clients=num_clients,
+            min_num_clients=self.min_available_clients,
+            criterion=IdleCriterion(busy_cids),
+        )
+
+        # Return client/config pairs
+        return [(client, fit_ins) for client in clients]
+
+    def should_aggregate(
+        self,
+        server_version: int,
+        results: List[BufferedFitRes],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> bool:
+        """Aggregate once `buffer_size` results or failures have arrived."""
+        return len(results) + len(failures) >= self.buffer_size
+
+    def aggregate_fit_async(
+        self,
+        server_version: int,
+        parameters: Parameters,
+        results: List[BufferedFitRes],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Apply the staleness-weighted average update of the buffered results."""
+        if not results:
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+
+        if self.max_staleness is not None:
+            num_results = len(results)
+            results = [res for res in results if res.staleness <= self.max_staleness]
+            if len(results) < num_results:
+                log(
+                    DEBUG,
+                    "aggregate_fit_async %s: discarded %s stale results",
+                    server_version,
+                    num_results - len(results),
+                )
+        num_examples_total = sum(res.fit_res.num_examples for res in results)
+        if num_examples_total == 0:
+            return None, {}
+
+        current = parameters_to_ndarrays(parameters, copy=False)
+        update = _weighted_update_sum(results, current, self.staleness_fn)
+        scale = self.server_learning_rate / num_examples_total
+        parameters_aggregated = ndarrays_to_parameters(
+            [
+                np.add(layer, scale * layer_update).astype(
+                    layer.dtype
+                    if np.issubdtype(layer.dtype, np.floating)
+                    else np.float64,
+                    copy=False,
+                )
+                for layer, layer_update in zip(current, update)
+            ]
+        )
+
+        # Aggregate custom metrics if aggregation fn was provided
+        metrics_aggregated = {}
+        if self.fit_metrics_aggregation_fn:
+            fit_metrics = [
+                (res.fit_res.num_examples, res.fit_res.metrics) for res in results
+            ]
+            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
+        elif server_version == 1:  # Only log this warning once
+            log(WARNING, "No fit_metrics_aggregation_fn provided")
+
+        return parameters_aggregated, metrics_aggregated
+
+
+def _weighted_update_sum(
+    results: List[BufferedFitRes],
+    current: NDArrays,
+    staleness_fn: Callable[[int], float],
+) -> NDArrays:
+    """Sum the updates of all results, weighted by examples and staleness."""
+    sums = [np.zeros(layer.shape, dtype=np.float64) for layer in current]
+    scratch = [np.empty_like(layer_sum) for layer_sum in sums]
+    # Results started from the same global model share their decoded base
+    bases: Dict[int, NDArrays] = {}
+    for res in results:
+        weight = res.fit_res.num_examples * staleness_fn(res.staleness)
+        base = bases.get(id(res.base_parameters))
+        if base is None:
+            base = parameters_to_ndarrays(res.base_parameters, copy=False)
+            bases[id(res.base_parameters)] = base
+        ndarrays = parameters_to_ndarrays(res.fit_res.parameters, copy=False)
+        if len(ndarrays) != len(current) or len(base) != len(current):
+            raise ValueError(
+                f"Result has {len(ndarrays)} layers and base {len(base)} layers, "
+                f"expected {len(current)}"
+            )
+        for layer_sum, layer_scratch, layer, base_layer in zip(
+            sums, scratch, ndarrays, base
+        ):
+            np.subtract(layer, base_layer, out=layer_scratch)
+            layer_scratch *= weight
+            layer_sum += layer_scratch
+    return sums
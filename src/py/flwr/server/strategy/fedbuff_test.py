@@ -0,0 +1,109 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FedBuff tests."""
+
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArrays,
+    Parameters,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_manager import SimpleClientManager
+
+from .async_strategy import BufferedFitRes
+from .fedbuff import FedBuff
+
+
+def _buffered(
+    ndarrays: NDArrays, base: Parameters, num_examples: int, staleness: int
+) -> BufferedFitRes:
+    fit_res = FitRes(
+        status=Status(code=Code.OK, message="Success"),
+        parameters=ndarrays_to_parameters(ndarrays),
+        num_examples=num_examples,
+        metrics={},
+    )
+    return BufferedFitRes(MagicMock(), fit_res, base, staleness)
+
+
+def test_aggregate_fit_async() -> None:
+    """Test that updates are weighted by examples and staleness."""
+    # Prepare
+    old_base = ndarrays_to_parameters([np.zeros(2, dtype=np.float32)])
+    current = ndarrays_to_parameters([np.ones(2, dtype=np.float32)])
+    strategy = FedBuff(server_learning_rate=0.5, max_staleness=1)
+    results = [
+        _buffered([np.array([3.0, 1.0], dtype=np.float32)], current, 1, 0),
+        _buffered([np.array([4.0, 4.0], dtype=np.float32)], old_base, 3, 1),
+        _buffered([np.array([9.0, 9.0], dtype=np.float32)], old_base, 5, 2),
+    ]
+    update = (np.array([2.0, 0.0]) + 3 * np.array([4.0, 4.0]) / np.sqrt(2)) / 4
+
+    # Execute
+    parameters, _ = strategy.aggregate_fit_async(2, current, results, [])
+
+    # Assert
+    assert parameters is not None
+    actual = parameters_to_ndarrays(parameters)[0]
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(actual, 1.0 + 0.5 * update, rtol=1e-6)
+
+
+def test_configure_fit_async() -> None:
+    """Test that only idle clients are sampled, up to `concurrency` busy clients."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    for cid in "0123":
+        client_proxy = MagicMock()
+        client_proxy.cid = cid
+        client_manager.register(client_proxy)
+    strategy = FedBuff(concurrency=3)
+    parameters = ndarrays_to_parameters([np.zeros(2)])
+
+    # Execute
+    instructions = strategy.configure_fit_async(
+        0, parameters, client_manager, busy_cids={"0"}
+    )
+    full = strategy.configure_fit_async(
+        0, parameters, client_manager, busy_cids={"0", "1", "2"}
+    )
+
+    # Assert
+    assert len(instructions) == 2
+    assert all(client.cid != "0" for client, _ in instructions)
+    assert full == []
+
+
+def test_should_aggregate_counts_failures() -> None:
+    """Test that failures fill the buffer as well as results."""
+    # Prepare
+    strategy = FedBuff(buffer_size=2)
+    base = ndarrays_to_parameters([np.zeros(2)])
+    result = _buffered([np.ones(2)], base, 1, 0)
+    failure = Exception()
+
+    # Execute & Assert
+    assert not strategy.should_aggregate(0, [result], [])
+    assert not strategy.should_aggregate(0, [], [failure])
+    assert strategy.should_aggregate(0, [result], [failure])
+    assert strategy.should_aggregate(0, [], [failure, failure])
@@ -62,7 +62,7 @@ class FedMedian(FedAvg):
             for _, fit_res in results
         ]
         parameters_aggregated = ndarrays_to_parameters(
-            aggregate_median(weights_results)
+            aggregate_median(weights_results, max_workers=self.max_workers)
         )
 
         # Aggregate custom metrics if aggregation fn was provided
@@ -18,16 +18,21 @@ Paper: arxiv.org/abs/2003.00295
 """
 
 
-from typing import Callable, Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple, cast
+
+import numpy as np
+from numpy.typing import DTypeLike
 
 from flwr.common import (
     MetricsAggregationFn,
+    NDArray,
     NDArrays,
     Parameters,
     Scalar,
     parameters_to_ndarrays,
 )
 
+from .aggregate import LayerExecutor
 from .fedavg import FedAvg
 
 
@@ -73,6 +78,13 @@ class FedOpt(FedAvg):
         Second moment parameter. Defaults to 0.0.
     tau : float, optional
         Controls the algorithm's degree of adaptability. Defaults to 1e-9.
+    moments_dtype : Optional[DTypeLike], optional
+        Data type of the moment buffers `m_t` and `v_t`, e.g. `np.float16` (or
+        `ml_dtypes.bfloat16`) to halve their memory. Defaults to None, which keeps
+        the data type of each layer.
+    max_workers : Optional[int], optional
+        Number of threads aggregating and updating the layers in parallel.
+        Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
@@ -101,6 +113,8 @@ class FedOpt(FedAvg):
         beta_1: float = 0.0,
         beta_2: float = 0.0,
         tau: float = 1e-9,
+        moments_dtype: Optional[DTypeLike] = None,
+        max_workers: Optional[int] = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -115,17 +129,79 @@ class FedOpt(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            max_workers=max_workers,
         )
-        self.current_weights = parameters_to_ndarrays(initial_parameters)
+        # The weights are updated in place, integer layers are promoted to float
+        self.current_weights = [
+            x if np.issubdtype(x.dtype, np.floating) else x.astype(np.float64)
+            for x in parameters_to_ndarrays(initial_parameters)
+        ]
         self.eta = eta
         self.eta_l = eta_l
         self.tau = tau
         self.beta_1 = beta_1
         self.beta_2 = beta_2
+        self.moments_dtype = moments_dtype
         self.m_t: Optional[NDArrays] = None
         self.v_t: Optional[NDArrays] = None
+        self._layer_executor = LayerExecutor(max_workers)
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
         rep = f"FedOpt(accept_failures={self.accept_failures})"
         return rep
+
+    def _update_weights(self, fedavg_weights_aggregate: NDArrays) -> None:
+        """Update `current_weights`, `m_t`, and `v_t` in place.
+
+        The moment buffers are allocated once, in the first round. Each layer of
+        `fedavg_weights_aggregate` is overwritten by its delta, and a single scratch
+        buffer per layer holds the intermediate results.
+        """
+        if self.m_t is None or self.v_t is None:
+            self.m_t = [
+                np.zeros_like(x, dtype=self.moments_dtype) for x in self.current_weights
+            ]
+            self.v_t = [
+                np.zeros_like(x, dtype=self.moments_dtype) for x in self.current_weights
+            ]
+
+        def update_layer(index: int) -> None:
+            m_t, v_t = cast(NDArrays, self.m_t)[index], cast(NDArrays, self.v_t)[index]
+            weights = self.current_weights[index]
+            delta_t = np.subtract(
+                fedavg_weights_aggregate[index],
+                weights,
+                out=fedavg_weights_aggregate[index],
+            )
+
+            # m_t
+            scratch = np.multiply(delta_t, 1.0 - self.beta_1)
+            np.multiply(m_t, self.beta_1, out=m_t)
+            np.add(m_t, scratch, out=m_t)
+
+            # v_t
+            np.multiply(delta_t, delta_t, out=scratch)
+            self._update_v_t(v_t, scratch, delta_t)
+
+            # weights += eta * m_t / (sqrt(v_t) + tau)
+            np.sqrt(v_t, out=scratch)
+            np.add(scratch, self.tau, out=scratch)
+            np.divide(m_t, scratch, out=scratch)
+            np.multiply(scratch, self.eta, out=scratch)
+            np.add(weights, scratch, out=weights)
+
+        self._layer_executor.for_each_layer(update_layer, len(self.current_weights))
+
+    def _update_v_t(
+        self, v_t: NDArray, delta_squared: NDArray, scratch: NDArray
+    ) -> None:
+        """Update the second moment `v_t` in place.
+
+        `delta_squared` holds the squared delta and `scratch` can be overwritten. By
+        default, `v_t` is an exponential moving average of the squared deltas with
+        `beta_2` (as in FedAdam). Subclasses override it for other update rules.
+        """
+        np.multiply(v_t, self.beta_2, out=v_t)
+        np.multiply(delta_squared, 1.0 - self.beta_2, out=scratch)
+        np.add(v_t, scratch, out=v_t)
@@ -0,0 +1,133 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FedOpt in-place update tests."""
+
+
+from typing import Callable, List, Optional, Tuple, Type
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from flwr.common import (
+    Code,
+    FitRes,
+    NDArray,
+    NDArrays,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.server.client_proxy import ClientProxy
+
+from .fedadagrad import FedAdagrad
+from .fedadam import FedAdam
+from .fedopt import FedOpt
+from .fedyogi import FedYogi
+
+# Default of FedAdam and FedYogi
+BETA_2 = 0.99
+
+
+def _adam_v_t(v_t: NDArray, delta_t: NDArray) -> NDArray:
+    return BETA_2 * v_t + (1 - BETA_2) * np.multiply(delta_t, delta_t)
+
+
+def _yogi_v_t(v_t: NDArray, delta_t: NDArray) -> NDArray:
+    squared = np.multiply(delta_t, delta_t)
+    return v_t - (1.0 - BETA_2) * squared * np.sign(v_t - squared)
+
+
+def _adagrad_v_t(v_t: NDArray, delta_t: NDArray) -> NDArray:
+    return v_t + np.multiply(delta_t, delta_t)
+
+
+def _fit_results(weights: NDArrays) -> List[Tuple[ClientProxy, FitRes]]:
+    fit_res = FitRes(
+        status=Status(code=Code.OK, message="Success"),
+        parameters=ndarrays_to_parameters(weights),
+        num_examples=1,
+        metrics={},
+    )
+    return [(MagicMock(), fit_res)]
+
+
+@pytest.mark.parametrize(
+    "strategy_class, v_t_fn",
+    [(FedAdam, _adam_v_t), (FedYogi, _yogi_v_t), (FedAdagrad, _adagrad_v_t)],
+)
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_aggregate_fit_in_place(
+    strategy_class: Type[FedOpt],
+    v_t_fn: Callable[[NDArray, NDArray], NDArray],
+    max_workers: Optional[int],
+) -> None:
+    """Test that in-place updates match the FedOpt update rules."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    weights = [rng.normal(size=(3, 4)), rng.normal(size=5)]
+    strategy = strategy_class(
+        initial_parameters=ndarrays_to_parameters(weights),
+        max_workers=max_workers,
+    )
+    m_t = [np.zeros_like(x) for x in weights]
+    v_t = [np.zeros_like(x) for x in weights]
+
+    for _ in range(3):
+        results = [x + rng.normal(size=x.shape) for x in weights]
+
+        # Execute
+        parameters, _ = strategy.aggregate_fit(1, _fit_results(results), [])
+
+        # Reference
+        delta_t = [x - y for x, y in zip(results, weights)]
+        m_t = [
+            strategy.beta_1 * x + (1 - strategy.beta_1) * y
+            for x, y in zip(m_t, delta_t)
+        ]
+        v_t = [v_t_fn(x, y) for x, y in zip(v_t, delta_t)]
+        weights = [
+            x + strategy.eta * y / (np.sqrt(z) + strategy.tau)
+            for x, y, z in zip(weights, m_t, v_t)
+        ]
+
+        # Assert
+        assert parameters is not None
+        for expected, actual in zip(weights, parameters_to_ndarrays(parameters)):
+            np.testing.assert_allclose(actual, expected)
+
+
+def test_aggregate_fit_float16_moments() -> None:
+    """Test that moments can be kept in a lower precision."""
+    # Prepare
+    weights = [np.zeros(4, dtype=np.float32)]
+    strategy = FedAdam(
+        initial_parameters=ndarrays_to_parameters(weights),
+        moments_dtype=np.float16,
+    )
+    results = [np.array([0.1, -0.2, 0.3, -0.4], dtype=np.float32)]
+
+    # Execute
+    parameters, _ = strategy.aggregate_fit(1, _fit_results(results), [])
+
+    # Assert
+    assert parameters is not None
+    assert strategy.m_t is not None and strategy.v_t is not None
+    assert strategy.m_t[0].dtype == np.float16
+    assert strategy.v_t[0].dtype == np.float16
+    actual = parameters_to_ndarrays(parameters)[0]
+    assert actual.dtype == np.float32
+    # Adam moves each weight by about eta * (1 - beta_1) / sqrt(1 - beta_2)
+    np.testing.assert_allclose(actual, 0.1 * np.sign(results[0]), rtol=1e-2)
@@ -65,6 +65,8 @@ class FedTrimmedAvg(FedAvg):
         Initial global model parameters.
     beta : float, optional
         Fraction to cut off of both tails of the distribution. Defaults to 0.2.
+    max_workers : Optional[int], optional
+        Number of threads aggregating the layers in parallel. Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -89,6 +91,7 @@ class FedTrimmedAvg(FedAvg):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         beta: float = 0.2,
+        max_workers: Optional[int] = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -103,6 +106,7 @@ class FedTrimmedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            max_workers=max_workers,
         )
         self.beta = beta
 
@@ -130,7 +134,9 @@ class FedTrimmedAvg(FedAvg):
             for _, fit_res in results
         ]
         parameters_aggregated = ndarrays_to_parameters(
-            aggregate_trimmed_avg(weights_results, self.beta)
+            aggregate_trimmed_avg(
+                weights_results, self.beta, max_workers=self.max_workers
+            )
         )
 
         # Aggregate custom metrics if aggregation fn was provided
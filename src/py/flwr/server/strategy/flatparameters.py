@@ -0,0 +1,112 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FlatParameters."""
+
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from flwr.common import (
+    NDArray,
+    NDArrays,
+    Parameters,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+
+
+class FlatParameters:
+    """Model parameters packed into one contiguous 1-D buffer.
+
+    Layer `i` is stored in `buffer[offsets[i]:offsets[i + 1]]` and has the shape
+    `shapes[i]`. All layers share the data type of the buffer. Operations on the
+    whole model (e.g., averages, norms, or scaling) can then run as a single
+    vectorized call on `buffer`, instead of one call per layer. It is used by the
+    q-FFL aggregation (`aggregate_qffl` and `QFFLAccumulator`).
+
+    Parameters
+    ----------
+    buffer : NDArray
+        The contiguous 1-D buffer holding all layers.
+    shapes : Sequence[Tuple[int, ...]]
+        The shape of each layer, in order.
+
+    Examples
+    --------
+    >>> flat = FlatParameters.from_ndarrays(ndarrays)
+    >>> flat.buffer *= 0.5  # Scales all layers
+    >>> ndarrays = flat.to_ndarrays()  # Views of `flat.buffer`
+    """
+
+    def __init__(self, buffer: NDArray, shapes: Sequence[Tuple[int, ...]]) -> None:
+        self.shapes: List[Tuple[int, ...]] = [tuple(shape) for shape in shapes]
+        sizes = [int(np.prod(shape)) for shape in self.shapes]
+        self.offsets: NDArray = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        if buffer.ndim != 1 or not buffer.flags.c_contiguous:
+            raise ValueError("The buffer must be a contiguous 1-D array")
+        if buffer.size != self.offsets[-1]:
+            raise ValueError(
+                f"The buffer has {buffer.size} elements, but the layers have "
+                f"{self.offsets[-1]}"
+            )
+        self.buffer = buffer
+
+    @classmethod
+    def from_ndarrays(
+        cls, ndarrays: NDArrays, dtype: Optional[DTypeLike] = None
+    ) -> "FlatParameters":
+        """Copy `ndarrays` into a new buffer.
+
+        The buffer has the data type `dtype`, or the common data type of all layers
+        if `dtype` is None.
+        """
+        if dtype is None:
+            dtype = np.result_type(*ndarrays) if ndarrays else np.float64
+        shapes = [ndarray.shape for ndarray in ndarrays]
+        buffer = np.empty(sum(ndarray.size for ndarray in ndarrays), dtype=dtype)
+        flat = cls(buffer, shapes)
+        for view, ndarray in zip(flat.to_ndarrays(), ndarrays):
+            np.copyto(view, ndarray, casting="unsafe")
+        return flat
+
+    @classmethod
+    def from_parameters(
+        cls, parameters: Parameters, dtype: Optional[DTypeLike] = None
+    ) -> "FlatParameters":
+        """Decode `parameters` and copy each layer into its slice of a new buffer.
+
+        Layers are decoded as read-only views of `parameters.tensors` where the
+        encoding allows it, so that their data is copied only once.
+        """
+        return cls.from_ndarrays(parameters_to_ndarrays(parameters, copy=False), dtype)
+
+    def __len__(self) -> int:
+        """Return the number of layers."""
+        return len(self.shapes)
+
+    def layer(self, index: int) -> NDArray:
+        """Return a view of the layer `index` with its shape."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.buffer[start:end].reshape(self.shapes[index])
+
+    def to_ndarrays(self) -> NDArrays:
+        """Return views of all layers, without copying the buffer."""
+        return [self.layer(index) for index in range(len(self))]
+
+    def to_parameters(self) -> Parameters:
+        """Serialize all layers to `Parameters`."""
+        return ndarrays_to_parameters(self.to_ndarrays())
@@ -0,0 +1,90 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FlatParameters tests."""
+
+
+import numpy as np
+import pytest
+
+from flwr.common import NDArrays, ndarrays_to_parameters, parameters_to_ndarrays
+
+from .flatparameters import FlatParameters
+
+
+def _ndarrays() -> NDArrays:
+    return [
+        np.arange(6, dtype=np.float32).reshape(2, 3),
+        np.array(7.0, dtype=np.float32),
+        np.zeros((0, 4), dtype=np.float32),
+        np.array([8, 9], dtype=np.int64),
+    ]
+
+
+def test_from_ndarrays_and_back() -> None:
+    """Test that layers are packed in order and restored with their shapes."""
+    # Prepare
+    ndarrays = _ndarrays()
+
+    # Execute
+    flat = FlatParameters.from_ndarrays(ndarrays)
+    actual = flat.to_ndarrays()
+
+    # Assert
+    assert len(flat) == len(ndarrays)
+    assert flat.buffer.dtype == np.float64
+    np.testing.assert_array_equal(flat.buffer, [0, 1, 2, 3, 4, 5, 7, 8, 9])
+    np.testing.assert_array_equal(flat.offsets, [0, 6, 7, 7, 9])
+    for expected_layer, actual_layer in zip(ndarrays, actual):
+        assert actual_layer.shape == expected_layer.shape
+        np.testing.assert_array_equal(actual_layer, expected_layer)
+
+
+def test_views_share_buffer() -> None:
+    """Test that the layers are views of the buffer."""
+    # Prepare
+    flat = FlatParameters.from_ndarrays(_ndarrays(), dtype=np.float32)
+
+    # Execute
+    flat.buffer *= 2
+    flat.layer(1)[...] = -1
+
+    # Assert
+    assert flat.buffer.dtype == np.float32
+    np.testing.assert_array_equal(flat.layer(0), [[0, 2, 4], [6, 8, 10]])
+    assert flat.buffer[6] == -1
+    assert all(np.shares_memory(view, flat.buffer) for view in flat.to_ndarrays()[:2])
+
+
+def test_parameters_and_back() -> None:
+    """Test conversion from and to Parameters."""
+    # Prepare
+    ndarrays = _ndarrays()[:2]
+
+    # Execute
+    flat = FlatParameters.from_parameters(ndarrays_to_parameters(ndarrays))
+    actual = parameters_to_ndarrays(flat.to_parameters())
+
+    # Assert
+    for expected_layer, actual_layer in zip(ndarrays, actual):
+        assert actual_layer.dtype == np.float32
+        np.testing.assert_array_equal(actual_layer, expected_layer)
+
+
+def test_invalid_buffer() -> None:
+    """Test that buffers not matching the shapes are rejected."""
+    with pytest.raises(ValueError):
+        FlatParameters(np.zeros(5), [(2, 3)])
+    with pytest.raises(ValueError):
+        FlatParameters(np.zeros((2, 3)), [(2, 3)])
@@ -72,6 +72,8 @@ class Krum(FedAvg):
         Whether or not accept rounds containing failures. Defaults to True.
     initial_parameters : Parameters, optional
         Initial global model parameters.
+    max_workers : Optional[int], optional
+        Number of threads computing the distances in parallel. Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes
@@ -97,6 +99,7 @@ class Krum(FedAvg):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        max_workers: Optional[int] = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -111,6 +114,7 @@ class Krum(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            max_workers=max_workers,
         )
         self.num_malicious_clients = num_malicious_clients
         self.num_clients_to_keep = num_clients_to_keep
@@ -140,7 +144,10 @@ class Krum(FedAvg):
         ]
         parameters_aggregated = ndarrays_to_parameters(
             aggregate_krum(
-                weights_results, self.num_malicious_clients, self.num_clients_to_keep
+                weights_results,
+                self.num_malicious_clients,
+                self.num_clients_to_keep,
+                self.max_workers,
             )
         )
 
@@ -21,8 +21,6 @@ Paper: openreview.net/pdf?id=ByexElSYDr
 from logging import WARNING
 from typing import Callable, Dict, List, Optional, Tuple, Union
 
-import numpy as np
-
 from flwr.common import (
     EvaluateIns,
     EvaluateRes,
@@ -39,7 +37,7 @@ from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate_qffl, weighted_loss_avg
+from .aggregate import QFFLAccumulator, weighted_loss_avg
 from .fedavg import FedAvg
 
 
@@ -167,23 +165,6 @@ class QFedAvg(FedAvg):
         # Do not aggregate if there are failures and failures are not accepted
         if not self.accept_failures and failures:
             return None, {}
-        # Convert results
-
-        def norm_grad(grad_list: NDArrays) -> float:
-            # input: nested gradients
-            # output: square of the L-2 norm
-            client_grads = grad_list[0]
-            for i in range(1, len(grad_list)):
-                client_grads = np.append(
-                    client_grads, grad_list[i]
-                )  # output a flattened array
-            squared = np.square(client_grads)
-            summed = np.sum(squared)
-            return float(summed)
-
-        deltas = []
-        hs_ffl = []
-
         if self.pre_weights is None:
             raise AttributeError("QffedAvg pre_weights are None in aggregate_fit")
 
@@ -194,26 +175,14 @@ class QFedAvg(FedAvg):
         if eval_result is not None:
             loss, _ = eval_result
 
+        # Fold the deltas and h-terms of the clients into one accumulator
+        accumulator = QFFLAccumulator(weights_before, self.q_param, self.learning_rate)
         for _, fit_res in results:
-            new_weights = parameters_to_ndarrays(fit_res.parameters)
-            # plug in the weight updates into the gradient
-            grads = [
-                np.multiply((u - v), 1.0 / self.learning_rate)
-                for u, v in zip(weights_before, new_weights)
-            ]
-            deltas.append(
-                [np.float_power(loss + 1e-10, self.q_param) * grad for grad in grads]
-            )
-            # estimation of the local Lipschitz constant
-            hs_ffl.append(
-                self.q_param
-                * np.float_power(loss + 1e-10, (self.q_param - 1))
-                * norm_grad(grads)
-                + (1.0 / self.learning_rate)
-                * np.float_power(loss + 1e-10, self.q_param)
+            accumulator.add(
+                parameters_to_ndarrays(fit_res.parameters, copy=False), loss
             )
 
-        weights_aggregated: NDArrays = aggregate_qffl(weights_before, deltas, hs_ffl)
+        weights_aggregated: NDArrays = accumulator.result()
         parameters_aggregated = ndarrays_to_parameters(weights_aggregated)
 
         # Aggregate custom metrics if aggregation fn was provided
@@ -0,0 +1,138 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Strategy wrapper sending quantized parameters to clients."""
+
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from flwr.common import (
+    EvaluateIns,
+    EvaluateRes,
+    FitIns,
+    FitRes,
+    Parameters,
+    Scalar,
+    arrays_to_parameters,
+    ndarray_to_array,
+    parameters_to_ndarrays,
+)
+from flwr.common.constant import STYPE_NUMPY_FP16, STYPE_NUMPY_RAW
+from flwr.common.parameter import QUANTIZED_STYPES
+from flwr.server.client_manager import ClientManager
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.strategy.strategy import Strategy
+
+
+class QuantizedStrategy(Strategy):
+    """Wrapper quantizing the parameters sent to clients.
+
+    The parameters are quantized once per round and passed to the wrapped strategy,
+    which configures the clients with them. Clients and strategies restore them with
+    `parameters_to_ndarrays`. Combine it with `make_quantization_mod` on the clients
+    to quantize their results as well.
+
+    Parameters
+    ----------
+    strategy : Strategy
+        The strategy whose parameters will be quantized by this wrapper.
+    stype : str (default: STYPE_NUMPY_FP16)
+        The quantized encoding: `STYPE_NUMPY_FP16`, `STYPE_NUMPY_BF16`, or
+        `STYPE_NUMPY_INT8`. Non-floating-point arrays are sent unchanged.
+
+    Examples
+    --------
+    Create a strategy:
+
+    >>> strategy = fl.server.strategy.FedAvg( ... )
+
+    Wrap the strategy with the QuantizedStrategy wrapper
+
+    >>> quantized_strategy = QuantizedStrategy(strategy, STYPE_NUMPY_BF16)
+    """
+
+    def __init__(self, strategy: Strategy, stype: str = STYPE_NUMPY_FP16) -> None:
+        super().__init__()
+
+        if stype not in QUANTIZED_STYPES:
+            raise ValueError(f"Unsupported quantized stype: {stype}")
+
+        self.strategy = strategy
+        self.stype = stype
+
+    def __repr__(self) -> str:
+        """Compute a string representation of the strategy."""
+        return f"QuantizedStrategy(strategy={self.strategy}, stype={self.stype})"
+
+    def initialize_parameters(
+        self, client_manager: ClientManager
+    ) -> Optional[Parameters]:
+        """Initialize global model parameters using given strategy."""
+        return self.strategy.initialize_parameters(client_manager)
+
+    def configure_fit(
+        self, server_round: int, parameters: Parameters, client_manager: ClientManager
+    ) -> List[Tuple[ClientProxy, FitIns]]:
+        """Configure the next round of training with quantized parameters."""
+        return self.strategy.configure_fit(
+            server_round, self._quantize(parameters), client_manager
+        )
+
+    def configure_evaluate(
+        self, server_round: int, parameters: Parameters, client_manager: ClientManager
+    ) -> List[Tuple[ClientProxy, EvaluateIns]]:
+        """Configure the next round of evaluation with quantized parameters."""
+        return self.strategy.configure_evaluate(
+            server_round, self._quantize(parameters), client_manager
+        )
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate training results using the given strategy."""
+        return self.strategy.aggregate_fit(server_round, results, failures)
+
+    def aggregate_evaluate(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, EvaluateRes]],
+        failures: List[Union[Tuple[ClientProxy, EvaluateRes], BaseException]],
+    ) -> Tuple[Optional[float], Dict[str, Scalar]]:
+        """Aggregate evaluation losses using the given strategy."""
+        return self.strategy.aggregate_evaluate(server_round, results, failures)
+
+    def evaluate(
+        self, server_round: int, parameters: Parameters
+    ) -> Optional[Tuple[float, Dict[str, Scalar]]]:
+        """Evaluate model parameters using an evaluation function from the strategy."""
+        return self.strategy.evaluate(server_round, parameters)
+
+    def _quantize(self, parameters: Parameters) -> Parameters:
+        """Quantize the floating-point arrays of a parameters object."""
+        return arrays_to_parameters(
+            ndarray_to_array(
+                ndarray,
+                stype=(
+                    self.stype
+                    if np.issubdtype(ndarray.dtype, np.floating)
+                    else STYPE_NUMPY_RAW
+                ),
+            )
+            for ndarray in parameters_to_ndarrays(parameters, copy=False)
+        )
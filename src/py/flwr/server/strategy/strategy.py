@@ -105,6 +105,26 @@ class Strategy(ABC):
             the global model parameters remain the same.
         """
 
+    def aggregate_fit_partial(
+        self, server_round: int, result: Tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Aggregate a single training result as soon as it has been received.
+
+        The server calls this method once for each successful result of the round, in
+        the order in which the results arrive, while it is still waiting for the
+        remaining clients. Afterwards, it calls `aggregate_fit` with all results,
+        which finalizes the aggregation. Strategies can override this method to
+        overlap (parts of) the aggregation with waiting for stragglers. The default
+        implementation does nothing.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        result : Tuple[ClientProxy, FitRes]
+            A successful update from one of the previously selected clients.
+        """
+
     @abstractmethod
     def configure_evaluate(
         self, server_round: int, parameters: Parameters, client_manager: ClientManager
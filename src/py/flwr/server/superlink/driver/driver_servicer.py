@@ -15,12 +15,14 @@
 """Driver API servicer."""
 
 
+import threading
 from logging import INFO
-from typing import List, Optional, Set
+from typing import Iterator, List, Optional, Set
 from uuid import UUID
 
 import grpc
 
+from flwr.common.chunk import assemble_tasks, task_to_chunks
 from flwr.common.logger import log
 from flwr.proto import driver_pb2_grpc  # pylint: disable=E0611
 from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
@@ -34,16 +36,24 @@ from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
     PushTaskInsResponse,
 )
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
-from flwr.proto.task_pb2 import TaskRes  # pylint: disable=E0611
+from flwr.proto.task_pb2 import TaskChunk, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state import State, StateFactory
 from flwr.server.utils.validator import validate_task_ins_or_res
 
+# Maximum number of seconds PullTaskRes waits for TaskRes to become available
+MAX_PULL_TASK_RES_TIMEOUT = 60.0
+
+# Maximum number of PullTaskRes requests waiting for TaskRes at the same time. Each
+# waiting request occupies a server thread, further requests are answered immediately.
+MAX_WAITING_PULL_TASK_RES = 500
+
 
 class DriverServicer(driver_pb2_grpc.DriverServicer):
     """Driver API servicer."""
 
     def __init__(self, state_factory: StateFactory) -> None:
         self.state_factory = state_factory
+        self.waiting_slots = threading.BoundedSemaphore(MAX_WAITING_PULL_TASK_RES)
 
     def GetNodes(
         self, request: GetNodesRequest, context: grpc.ServicerContext
@@ -73,10 +83,20 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
         log(INFO, "DriverServicer.PushTaskIns")
 
         # Validate request
-        _raise_if(len(request.task_ins_list) == 0, "`task_ins_list` must not be empty")
+        _raise_if(
+            len(request.task_ins_list) == 0
+            and len(request.task_ins_broadcast_list) == 0,
+            "`task_ins_list` and `task_ins_broadcast_list` must not both be empty",
+        )
         for task_ins in request.task_ins_list:
             validation_errors = validate_task_ins_or_res(task_ins)
             _raise_if(bool(validation_errors), ", ".join(validation_errors))
+        for broadcast in request.task_ins_broadcast_list:
+            _raise_if(len(broadcast.consumers) == 0, "`consumers` must not be empty")
+            for consumer in broadcast.consumers:
+                broadcast.task_ins.task.consumer.CopyFrom(consumer)
+                validation_errors = validate_task_ins_or_res(broadcast.task_ins)
+                _raise_if(bool(validation_errors), ", ".join(validation_errors))
 
         # Init state
         state: State = self.state_factory.state()
@@ -87,6 +107,12 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
             task_id: Optional[UUID] = state.store_task_ins(task_ins=task_ins)
             task_ids.append(task_id)
 
+        # Store each broadcast TaskIns, sharing the RecordSet among all consumers
+        for broadcast in request.task_ins_broadcast_list:
+            task_ids += state.store_task_ins_broadcast(
+                task_ins=broadcast.task_ins, consumers=list(broadcast.consumers)
+            )
+
         return PushTaskInsResponse(
             task_ids=[str(task_id) if task_id else "" for task_id in task_ids]
         )
@@ -117,12 +143,95 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
 
         context.add_callback(on_rpc_done)
 
-        # Read from state
-        task_res_list: List[TaskRes] = state.get_task_res(task_ids=task_ids, limit=None)
+        task_res_list = self._pull_task_res(request, context, state, task_ids)
+        if task_res_list is None:
+            return PullTaskResResponse()
 
         context.set_code(grpc.StatusCode.OK)
         return PullTaskResResponse(task_res_list=task_res_list)
 
+    def PushTaskInsStream(
+        self, request_iterator: Iterator[TaskChunk], context: grpc.ServicerContext
+    ) -> PushTaskInsResponse:
+        """Push a set of TaskIns, streamed in chunks."""
+        log(INFO, "DriverServicer.PushTaskInsStream")
+
+        # Reassemble the TaskIns, the ones with consumers are broadcast
+        request = PushTaskInsRequest()
+        for chunk in assemble_tasks(request_iterator):
+            _raise_if(not chunk.HasField("task_ins"), "expected TaskIns")
+            if chunk.consumers:
+                request.task_ins_broadcast_list.add(
+                    task_ins=chunk.task_ins, consumers=chunk.consumers
+                )
+            else:
+                request.task_ins_list.append(chunk.task_ins)
+
+        return self.PushTaskIns(request, context)
+
+    def PullTaskResStream(
+        self, request: PullTaskResRequest, context: grpc.ServicerContext
+    ) -> Iterator[TaskChunk]:
+        """Pull a set of TaskRes, streamed in chunks."""
+        log(INFO, "DriverServicer.PullTaskResStream")
+
+        # Convert each task_id str to UUID
+        task_ids: Set[UUID] = {UUID(task_id) for task_id in request.task_ids}
+
+        # Init state
+        state: State = self.state_factory.state()
+
+        task_res_list = self._pull_task_res(request, context, state, task_ids)
+        if task_res_list is None:
+            return
+
+        # Register callback, the status code is only set once all chunks are sent
+        task_res_ids = {UUID(task_res.task_id) for task_res in task_res_list}
+
+        def on_rpc_done() -> None:
+            if context.code() == grpc.StatusCode.OK:
+                log(INFO, "DriverServicer.PullTaskResStream callback: delete tasks")
+                state.delete_tasks(task_ids=task_ids)
+            else:
+                # The stream was interrupted, return the TaskRes again next time
+                state.release_task_res(task_res_ids)
+
+        if not context.add_callback(on_rpc_done):
+            # The RPC has terminated already
+            on_rpc_done()
+            return
+
+        for task_res in task_res_list:
+            yield from task_to_chunks(task_res)
+        context.set_code(grpc.StatusCode.OK)
+
+    def _pull_task_res(
+        self,
+        request: PullTaskResRequest,
+        context: grpc.ServicerContext,
+        state: State,
+        task_ids: Set[UUID],
+    ) -> Optional[List[TaskRes]]:
+        """Wait for TaskRes to become available and mark them as delivered.
+
+        Returns `None` if the Driver has gone while waiting.
+        """
+        # Wait for TaskRes to become available (long polling), unless too many
+        # requests are waiting already
+        timeout = min(max(request.timeout, 0.0), MAX_PULL_TASK_RES_TIMEOUT)
+        # pylint: disable-next=consider-using-with
+        if timeout > 0.0 and self.waiting_slots.acquire(blocking=False):
+            try:
+                state.wait_for_task_res(task_ids=task_ids, timeout=timeout)
+            finally:
+                self.waiting_slots.release()
+            if not context.is_active():
+                # The Driver is gone, leave the TaskRes for its next request
+                return None
+
+        # Read from state
+        return state.get_task_res(task_ids=task_ids, limit=None)
+
 
 def _raise_if(validation_error: bool, detail: str) -> None:
     if validation_error:
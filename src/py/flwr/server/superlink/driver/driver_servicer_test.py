@@ -15,11 +15,57 @@
 """DriverServicer tests."""
 
 
-from flwr.server.superlink.driver.driver_servicer import _raise_if
+import threading
+import time
+from typing import Any, Callable, List, Optional
+from unittest.mock import Mock
+
+import grpc
+
+from flwr.common.chunk import assemble_tasks, task_to_chunks
+from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
+    PullTaskResRequest,
+    PushTaskInsRequest,
+    TaskInsBroadcast,
+)
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.server.superlink.driver.driver_servicer import DriverServicer, _raise_if
+from flwr.server.superlink.state import StateFactory
+from flwr.server.superlink.state.state_test import create_task_ins, create_task_res
 
 # pylint: disable=broad-except
 
 
+class StreamContext:
+    """Minimal `grpc.ServicerContext` running its callbacks on `terminate`."""
+
+    def __init__(self) -> None:
+        self.callbacks: List[Callable[[], Any]] = []
+        self.status_code: Optional[grpc.StatusCode] = None
+
+    def is_active(self) -> bool:
+        """Return True until the RPC terminates."""
+        return True
+
+    def add_callback(self, callback: Callable[[], Any]) -> bool:
+        """Register a callback run on termination."""
+        self.callbacks.append(callback)
+        return True
+
+    def set_code(self, code: grpc.StatusCode) -> None:
+        """Set the status code."""
+        self.status_code = code
+
+    def code(self) -> Optional[grpc.StatusCode]:
+        """Return the status code."""
+        return self.status_code
+
+    def terminate(self) -> None:
+        """Terminate the RPC."""
+        for callback in self.callbacks:
+            callback()
+
+
 def test_raise_if_false() -> None:
     """."""
     # Prepare
@@ -54,3 +100,170 @@ def test_raise_if_true() -> None:
         assert str(err) == "Malformed PushTaskInsRequest: test"
     except Exception as err:
         raise AssertionError() from err
+
+
+def test_push_task_ins_broadcast() -> None:
+    """Test that broadcast TaskIns are stored once for each consumer."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = DriverServicer(state_factory=state_factory)
+    single = create_task_ins(consumer_node_id=3, anonymous=False, run_id=run_id)
+    broadcast = TaskInsBroadcast(
+        task_ins=create_task_ins(consumer_node_id=0, anonymous=True, run_id=run_id),
+        consumers=[Node(node_id=1, anonymous=False), Node(node_id=2, anonymous=False)],
+    )
+    request = PushTaskInsRequest(
+        task_ins_list=[single], task_ins_broadcast_list=[broadcast]
+    )
+
+    # Execute
+    response = servicer.PushTaskIns(request, Mock())
+
+    # Assert
+    assert len(response.task_ids) == 3
+    for task_id, node_id in zip(response.task_ids, [3, 1, 2]):
+        task_ins_list = state.get_task_ins(node_id=node_id, limit=None)
+        assert [task_ins.task_id for task_ins in task_ins_list] == [task_id]
+
+
+def test_pull_task_res_long_polling() -> None:
+    """Test that PullTaskRes waits for TaskRes stored while the request is open."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = DriverServicer(state_factory=state_factory)
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+    )
+    task_res = create_task_res(
+        producer_node_id=1, anonymous=False, ancestry=[str(task_ins_id)], run_id=run_id
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)], timeout=10.0)
+    timer = threading.Timer(0.05, state.store_task_res, args=(task_res,))
+
+    # Execute
+    timer.start()
+    response = servicer.PullTaskRes(request, Mock())
+    timer.join()
+
+    # Assert
+    assert len(response.task_res_list) == 1
+    assert response.task_res_list[0].task.ancestry == [str(task_ins_id)]
+
+
+def test_pull_task_res_no_waiting_slot() -> None:
+    """Test that PullTaskRes does not wait once all waiting slots are taken."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = DriverServicer(state_factory=state_factory)
+    servicer.waiting_slots = threading.BoundedSemaphore(1)
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)], timeout=10.0)
+
+    # Execute
+    assert servicer.waiting_slots.acquire(blocking=False)
+    start = time.monotonic()
+    response = servicer.PullTaskRes(request, Mock())
+    elapsed = time.monotonic() - start
+    servicer.waiting_slots.release()
+
+    # Assert
+    assert len(response.task_res_list) == 0
+    assert elapsed < 5.0
+
+
+def test_push_task_ins_stream() -> None:
+    """Test that streamed TaskIns are reassembled and stored."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = DriverServicer(state_factory=state_factory)
+    single = create_task_ins(consumer_node_id=3, anonymous=False, run_id=run_id)
+    broadcast = create_task_ins(consumer_node_id=0, anonymous=True, run_id=run_id)
+    consumers = [Node(node_id=1, anonymous=False), Node(node_id=2, anonymous=False)]
+    chunks = [
+        *task_to_chunks(single, chunk_size=8),
+        *task_to_chunks(broadcast, consumers, chunk_size=8),
+    ]
+
+    # Execute
+    response = servicer.PushTaskInsStream(iter(chunks), Mock())
+
+    # Assert
+    assert len(response.task_ids) == 3
+    for task_id, node_id in zip(response.task_ids, [3, 1, 2]):
+        task_ins_list = state.get_task_ins(node_id=node_id, limit=None)
+        assert [task_ins.task_id for task_ins in task_ins_list] == [task_id]
+
+
+def test_pull_task_res_stream() -> None:
+    """Test that TaskRes are streamed in chunks."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = DriverServicer(state_factory=state_factory)
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+    )
+    state.store_task_res(
+        create_task_res(
+            producer_node_id=1,
+            anonymous=False,
+            ancestry=[str(task_ins_id)],
+            run_id=run_id,
+        )
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)])
+
+    # Execute
+    chunks = list(servicer.PullTaskResStream(request, Mock()))
+
+    # Assert
+    task_res_list = [chunk.task_res for chunk in assemble_tasks(chunks)]
+    assert len(task_res_list) == 1
+    assert task_res_list[0].task.ancestry == [str(task_ins_id)]
+
+
+def test_pull_task_res_stream_interrupted() -> None:
+    """Test that TaskRes are only deleted once the stream has been sent."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = DriverServicer(state_factory=state_factory)
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+    )
+    state.store_task_res(
+        create_task_res(
+            producer_node_id=1,
+            anonymous=False,
+            ancestry=[str(task_ins_id)],
+            run_id=run_id,
+        )
+    )
+    request = PullTaskResRequest(task_ids=[str(task_ins_id)])
+
+    # Execute: the Driver disconnects after the first chunk
+    context = StreamContext()
+    stream = servicer.PullTaskResStream(request, context)  # type: ignore
+    next(stream)
+    stream.close()
+    context.terminate()
+    context = StreamContext()
+    chunks = list(servicer.PullTaskResStream(request, context))  # type: ignore
+    context.terminate()
+
+    # Assert
+    task_res_list = [chunk.task_res for chunk in assemble_tasks(chunks)]
+    assert len(task_res_list) == 1
+    assert state.num_task_res() == 0
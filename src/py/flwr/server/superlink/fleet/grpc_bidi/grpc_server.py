@@ -23,6 +23,8 @@ from typing import Any, Callable, Optional, Tuple, Union
 import grpc
 
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.compression import COMPRESSION_THRESHOLD
+from flwr.common.grpc import CompressionThresholdServerInterceptor, grpc_compression
 from flwr.common.logger import log
 from flwr.proto.transport_pb2_grpc import (  # pylint: disable=E0611
     add_FlowerServiceServicer_to_server,
@@ -62,6 +64,7 @@ def start_grpc_server(  # pylint: disable=too-many-arguments
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     keepalive_time_ms: int = 210000,
     certificates: Optional[Tuple[bytes, bytes, bytes]] = None,
+    compression: Optional[str] = None,
 ) -> grpc.Server:
     """Create and start a gRPC server running FlowerServiceServicer.
 
@@ -113,6 +116,10 @@ def start_grpc_server(  # pylint: disable=too-many-arguments
             * CA certificate.
             * server certificate.
             * server private key.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip" or "deflate") for responses of at least
+        1024 bytes, if the client accepts it. Compressed requests are accepted
+        regardless of this setting.
 
     Returns
     -------
@@ -144,6 +151,7 @@ def start_grpc_server(  # pylint: disable=too-many-arguments
         max_message_length=max_message_length,
         keepalive_time_ms=keepalive_time_ms,
         certificates=certificates,
+        compression=compression,
     )
 
     server.start()
@@ -162,6 +170,8 @@ def generic_create_grpc_server(  # pylint: disable=too-many-arguments
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
     keepalive_time_ms: int = 210000,
     certificates: Optional[Tuple[bytes, bytes, bytes]] = None,
+    compression: Optional[str] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
 ) -> grpc.Server:
     """Create a gRPC server with a single servicer.
 
@@ -207,6 +217,12 @@ def generic_create_grpc_server(  # pylint: disable=too-many-arguments
             * CA certificate.
             * server certificate.
             * server private key.
+    compression : Optional[str] (default: None)
+        Compression algorithm ("gzip" or "deflate") for responses of at least
+        `compression_threshold` bytes, if the client accepts it. Compressed
+        requests are accepted regardless of this setting.
+    compression_threshold : int (default: 1024)
+        Responses smaller than this number of bytes are sent without compression.
 
     Returns
     -------
@@ -243,12 +259,24 @@ def generic_create_grpc_server(  # pylint: disable=too-many-arguments
         ("grpc.keepalive_permit_without_calls", 0),
     ]
 
+    # Compress responses with the given algorithm unless they are small, the
+    # client announces the algorithms it accepts in `grpc-accept-encoding`
+    server_compression = None
+    interceptors = []
+    if compression is not None:
+        server_compression = grpc_compression(compression)
+        interceptors.append(
+            CompressionThresholdServerInterceptor(threshold=compression_threshold)
+        )
+
     server = grpc.server(
         concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_workers),
+        interceptors=interceptors,
         # Set the maximum number of concurrent RPCs this server will service before
         # returning RESOURCE_EXHAUSTED status, or None to indicate no limit.
         maximum_concurrent_rpcs=max_concurrent_workers,
         options=options,
+        compression=server_compression,
     )
     add_servicer_to_server_fn(servicer, server)
 
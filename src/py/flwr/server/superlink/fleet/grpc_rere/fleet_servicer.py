@@ -15,10 +15,14 @@
 """Fleet API gRPC request-response servicer."""
 
 
+import threading
 from logging import INFO
+from typing import Iterator
+from uuid import UUID
 
 import grpc
 
+from flwr.common.chunk import assemble_tasks, task_to_chunks
 from flwr.common.logger import log
 from flwr.proto import fleet_pb2_grpc  # pylint: disable=E0611
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
@@ -31,6 +35,7 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     PushTaskResRequest,
     PushTaskResResponse,
 )
+from flwr.proto.task_pb2 import TaskChunk  # pylint: disable=E0611
 from flwr.server.superlink.fleet.message_handler import message_handler
 from flwr.server.superlink.state import StateFactory
 
@@ -40,6 +45,9 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
 
     def __init__(self, state_factory: StateFactory) -> None:
         self.state_factory = state_factory
+        self.waiting_slots = threading.BoundedSemaphore(
+            message_handler.MAX_WAITING_PULL_TASK_INS
+        )
 
     def CreateNode(
         self, request: CreateNodeRequest, context: grpc.ServicerContext
@@ -66,10 +74,7 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
     ) -> PullTaskInsResponse:
         """Pull TaskIns."""
         log(INFO, "FleetServicer.PullTaskIns")
-        return message_handler.pull_task_ins(
-            request=request,
-            state=self.state_factory.state(),
-        )
+        return self._pull_task_ins(request, context)
 
     def PushTaskRes(
         self, request: PushTaskResRequest, context: grpc.ServicerContext
@@ -80,3 +85,64 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
             request=request,
             state=self.state_factory.state(),
         )
+
+    def PullTaskInsStream(
+        self, request: PullTaskInsRequest, context: grpc.ServicerContext
+    ) -> Iterator[TaskChunk]:
+        """Pull TaskIns, streamed in chunks."""
+        log(INFO, "FleetServicer.PullTaskInsStream")
+        state = self.state_factory.state()
+        response = self._pull_task_ins(request, context)
+
+        # Register callback, the status code is only set once all chunks are sent
+        task_ids = {UUID(task_ins.task_id) for task_ins in response.task_ins_list}
+
+        def on_rpc_done() -> None:
+            if context.code() != grpc.StatusCode.OK:
+                # The stream was interrupted, return the TaskIns again next time
+                state.release_task_ins(task_ids)
+
+        if not context.add_callback(on_rpc_done):
+            # The RPC has terminated already
+            on_rpc_done()
+            return
+
+        for task_ins in response.task_ins_list:
+            yield from task_to_chunks(task_ins)
+        context.set_code(grpc.StatusCode.OK)
+
+    def PushTaskResStream(
+        self, request_iterator: Iterator[TaskChunk], context: grpc.ServicerContext
+    ) -> PushTaskResResponse:
+        """Push TaskRes, streamed in chunks."""
+        log(INFO, "FleetServicer.PushTaskResStream")
+        request = PushTaskResRequest()
+        for chunk in assemble_tasks(request_iterator):
+            if not chunk.HasField("task_res"):
+                raise ValueError("Malformed PushTaskResStream: expected TaskRes")
+            request.task_res_list.append(chunk.task_res)
+        return message_handler.push_task_res(
+            request=request,
+            state=self.state_factory.state(),
+        )
+
+    def _pull_task_ins(
+        self, request: PullTaskInsRequest, context: grpc.ServicerContext
+    ) -> PullTaskInsResponse:
+        state = self.state_factory.state()
+
+        # Wait for TaskIns unless too many requests are waiting already
+        # pylint: disable-next=consider-using-with
+        if self.waiting_slots.acquire(blocking=False):
+            try:
+                message_handler.wait_for_task_ins(request=request, state=state)
+            finally:
+                self.waiting_slots.release()
+            if not context.is_active():
+                # The node is gone, leave the TaskIns for its next request
+                return PullTaskInsResponse()
+
+        return message_handler.pull_task_ins(
+            request=request,
+            state=state,
+        )
@@ -0,0 +1,52 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FleetServicer tests."""
+
+
+from flwr.common.chunk import assemble_tasks
+from flwr.proto.fleet_pb2 import PullTaskInsRequest  # pylint: disable=E0611
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.server.superlink.driver.driver_servicer_test import StreamContext
+from flwr.server.superlink.fleet.grpc_rere.fleet_servicer import FleetServicer
+from flwr.server.superlink.state import StateFactory
+from flwr.server.superlink.state.state_test import create_task_ins
+
+
+def test_pull_task_ins_stream_interrupted() -> None:
+    """Test that TaskIns are delivered again if their stream was interrupted."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    servicer = FleetServicer(state_factory=state_factory)
+    task_ins_id = state.store_task_ins(
+        create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+    )
+    request = PullTaskInsRequest(node=Node(node_id=1, anonymous=False))
+
+    # Execute: the node disconnects after the first chunk
+    context = StreamContext()
+    stream = servicer.PullTaskInsStream(request, context)  # type: ignore
+    next(stream)
+    stream.close()
+    context.terminate()
+    context = StreamContext()
+    chunks = list(servicer.PullTaskInsStream(request, context))  # type: ignore
+    context.terminate()
+
+    # Assert
+    task_ins_list = [chunk.task_ins for chunk in assemble_tasks(chunks)]
+    assert [task_ins.task_id for task_ins in task_ins_list] == [str(task_ins_id)]
+    assert not state.get_task_ins(node_id=1, limit=None)
@@ -33,6 +33,13 @@ from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state import State
 
+# Maximum number of seconds PullTaskIns waits for TaskIns to become available
+MAX_PULL_TASK_INS_TIMEOUT = 60.0
+
+# Maximum number of PullTaskIns requests waiting for TaskIns at the same time. Each
+# waiting request occupies a server thread, further requests are answered immediately.
+MAX_WAITING_PULL_TASK_INS = 500
+
 
 def create_node(
     request: CreateNodeRequest,  # pylint: disable=unused-argument
@@ -71,6 +78,20 @@ def pull_task_ins(request: PullTaskInsRequest, state: State) -> PullTaskInsRespo
     return response
 
 
+def wait_for_task_ins(request: PullTaskInsRequest, state: State) -> None:
+    """Wait until TaskIns for the requesting node are available (long polling)."""
+    timeout = min(max(request.timeout, 0.0), MAX_PULL_TASK_INS_TIMEOUT)
+    if timeout == 0.0:
+        return
+
+    # Get node_id if client node is not anonymous
+    node = request.node  # pylint: disable=no-member
+    node_id: Optional[int] = None if node.anonymous else node.node_id
+
+    # Wait for TaskIns in State
+    state.wait_for_task_ins(node_id=node_id, timeout=timeout)
+
+
 def push_task_res(request: PushTaskResRequest, state: State) -> PushTaskResResponse:
     """Push TaskRes handler."""
     # pylint: disable=no-member
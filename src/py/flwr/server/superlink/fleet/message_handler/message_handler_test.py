@@ -26,7 +26,14 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
 from flwr.proto.task_pb2 import Task, TaskRes  # pylint: disable=E0611
 
-from .message_handler import create_node, delete_node, pull_task_ins, push_task_res
+from .message_handler import (
+    MAX_PULL_TASK_INS_TIMEOUT,
+    create_node,
+    delete_node,
+    pull_task_ins,
+    push_task_res,
+    wait_for_task_ins,
+)
 
 
 def test_create_node() -> None:
@@ -101,6 +108,35 @@ def test_pull_task_ins() -> None:
     state.get_task_res.assert_not_called()
 
 
+def test_wait_for_task_ins() -> None:
+    """Test wait_for_task_ins."""
+    # Prepare
+    request = PullTaskInsRequest(node=Node(node_id=1, anonymous=False), timeout=1e6)
+    state = MagicMock()
+
+    # Execute
+    wait_for_task_ins(request=request, state=state)
+
+    # Assert
+    state.wait_for_task_ins.assert_called_once_with(
+        node_id=1, timeout=MAX_PULL_TASK_INS_TIMEOUT
+    )
+    state.get_task_ins.assert_not_called()
+
+
+def test_wait_for_task_ins_without_timeout() -> None:
+    """Test that wait_for_task_ins returns immediately without timeout."""
+    # Prepare
+    request = PullTaskInsRequest(node=Node(node_id=1, anonymous=False))
+    state = MagicMock()
+
+    # Execute
+    wait_for_task_ins(request=request, state=state)
+
+    # Assert
+    state.wait_for_task_ins.assert_not_called()
+
+
 def test_push_task_res() -> None:
     """Test push_task_res."""
     # Prepare
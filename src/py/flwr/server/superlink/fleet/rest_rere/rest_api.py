@@ -15,13 +15,25 @@
 """Experimental REST API server."""
 
 
+import asyncio
 import sys
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.compression import (
+    COMPRESSION_THRESHOLD,
+    available_compressions,
+    compress,
+    decompress,
+    select_compression,
+)
 from flwr.common.constant import MISSING_EXTRA_REST
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     CreateNodeRequest,
     DeleteNodeRequest,
     PullTaskInsRequest,
+    PullTaskInsResponse,
     PushTaskResRequest,
 )
 from flwr.server.superlink.fleet.message_handler import message_handler
@@ -37,13 +49,24 @@ try:
 except ModuleNotFoundError:
     sys.exit(MISSING_EXTRA_REST)
 
+# Compression algorithms accepted in request bodies, announced in every response
+COMPRESSIONS = available_compressions()
+
+# PullTaskIns requests wait for TaskIns in separate threads, unless too many requests
+# are waiting already, so that the event loop is not blocked
+waiting_slots = threading.BoundedSemaphore(message_handler.MAX_WAITING_PULL_TASK_INS)
+waiting_executor = ThreadPoolExecutor(
+    max_workers=message_handler.MAX_WAITING_PULL_TASK_INS,
+    thread_name_prefix="pull_task_ins",
+)
+
 
 async def create_node(request: Request) -> Response:
     """Create Node."""
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    create_node_request_bytes: bytes = await request.body()
+    create_node_request_bytes: bytes = await _request_body(request)
 
     # Deserialize ProtoBuf
     create_node_request_proto = CreateNodeRequest()
@@ -59,11 +82,7 @@ async def create_node(request: Request) -> Response:
 
     # Return serialized ProtoBuf
     create_node_response_bytes = create_node_response_proto.SerializeToString()
-    return Response(
-        status_code=200,
-        content=create_node_response_bytes,
-        headers={"Content-Type": "application/protobuf"},
-    )
+    return _response(request, create_node_response_bytes)
 
 
 async def delete_node(request: Request) -> Response:
@@ -71,7 +90,7 @@ async def delete_node(request: Request) -> Response:
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    delete_node_request_bytes: bytes = await request.body()
+    delete_node_request_bytes: bytes = await _request_body(request)
 
     # Deserialize ProtoBuf
     delete_node_request_proto = DeleteNodeRequest()
@@ -87,11 +106,7 @@ async def delete_node(request: Request) -> Response:
 
     # Return serialized ProtoBuf
     delete_node_response_bytes = delete_node_response_proto.SerializeToString()
-    return Response(
-        status_code=200,
-        content=delete_node_response_bytes,
-        headers={"Content-Type": "application/protobuf"},
-    )
+    return _response(request, delete_node_response_bytes)
 
 
 async def pull_task_ins(request: Request) -> Response:
@@ -99,7 +114,7 @@ async def pull_task_ins(request: Request) -> Response:
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    pull_task_ins_request_bytes: bytes = await request.body()
+    pull_task_ins_request_bytes: bytes = await _request_body(request)
 
     # Deserialize ProtoBuf
     pull_task_ins_request_proto = PullTaskInsRequest()
@@ -108,6 +123,22 @@ async def pull_task_ins(request: Request) -> Response:
     # Get state from app
     state: State = app.state.STATE_FACTORY.state()
 
+    # Wait for TaskIns unless too many requests are waiting already
+    # pylint: disable-next=consider-using-with
+    if waiting_slots.acquire(blocking=False):
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                waiting_executor,
+                message_handler.wait_for_task_ins,
+                pull_task_ins_request_proto,
+                state,
+            )
+        finally:
+            waiting_slots.release()
+        if await request.is_disconnected():
+            # The node is gone, leave the TaskIns for its next request
+            return _response(request, PullTaskInsResponse().SerializeToString())
+
     # Handle message
     pull_task_ins_response_proto = message_handler.pull_task_ins(
         request=pull_task_ins_request_proto,
@@ -116,11 +147,7 @@ async def pull_task_ins(request: Request) -> Response:
 
     # Return serialized ProtoBuf
     pull_task_ins_response_bytes = pull_task_ins_response_proto.SerializeToString()
-    return Response(
-        status_code=200,
-        content=pull_task_ins_response_bytes,
-        headers={"Content-Type": "application/protobuf"},
-    )
+    return _response(request, pull_task_ins_response_bytes)
 
 
 async def push_task_res(request: Request) -> Response:  # Check if token is needed here
@@ -128,7 +155,7 @@ async def push_task_res(request: Request) -> Response:  # Check if token is need
     _check_headers(request.headers)
 
     # Get the request body as raw bytes
-    push_task_res_request_bytes: bytes = await request.body()
+    push_task_res_request_bytes: bytes = await _request_body(request)
 
     # Deserialize ProtoBuf
     push_task_res_request_proto = PushTaskResRequest()
@@ -145,11 +172,7 @@ async def push_task_res(request: Request) -> Response:  # Check if token is need
 
     # Return serialized ProtoBuf
     push_task_res_response_bytes = push_task_res_response_proto.SerializeToString()
-    return Response(
-        status_code=200,
-        content=push_task_res_response_bytes,
-        headers={"Content-Type": "application/protobuf"},
-    )
+    return _response(request, push_task_res_response_bytes)
 
 
 routes = [
@@ -175,3 +198,34 @@ def _check_headers(headers: Headers) -> None:
         raise HTTPException(status_code=400, detail="Missing header `Accept`")
     if headers["accept"] != "application/protobuf":
         raise HTTPException(status_code=400, detail="Unsupported `Accept`")
+
+
+async def _request_body(request: Request) -> bytes:
+    """Return the request body, decompressed according to `Content-Encoding`."""
+    body: bytes = await request.body()
+    content_encoding = request.headers.get("content-encoding", "identity").lower()
+    if content_encoding == "identity":
+        return body
+    if content_encoding not in COMPRESSIONS:
+        raise HTTPException(status_code=415, detail="Unsupported `Content-Encoding`")
+    try:
+        return decompress(body, content_encoding, GRPC_MAX_MESSAGE_LENGTH)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+
+
+def _response(request: Request, content: bytes) -> Response:
+    """Return serialized ProtoBuf, compressed if it is large and the node accepts it."""
+    headers = {
+        "Content-Type": "application/protobuf",
+        "Accept-Encoding": ", ".join(COMPRESSIONS),
+    }
+    compression = getattr(app.state, "COMPRESSION", None)
+    if compression is not None and len(content) >= COMPRESSION_THRESHOLD:
+        algorithm = select_compression(
+            request.headers.get("accept-encoding", ""), [compression, *COMPRESSIONS]
+        )
+        if algorithm is not None:
+            content = compress(content, algorithm)
+            headers["Content-Encoding"] = algorithm
+    return Response(status_code=200, content=content, headers=headers)
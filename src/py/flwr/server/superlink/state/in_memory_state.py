@@ -16,28 +16,93 @@
 
 
 import os
+import threading
 from datetime import datetime, timedelta
+from itertools import islice
 from logging import ERROR
 from typing import Dict, List, Optional, Set
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.proto.recordset_pb2 import RecordSet  # pylint: disable=E0611
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
+from flwr.server.superlink.state.notifier import Notifier
 from flwr.server.superlink.state.state import State
 from flwr.server.utils import validate_task_ins_or_res
 
 
-class InMemoryState(State):
-    """In-memory State implementation."""
+class InMemoryState(State):  # pylint: disable=too-many-instance-attributes
+    """In-memory State implementation.
+
+    Besides the TaskIns/TaskRes stores, this implementation maintains a set of
+    indices so that pulling and deleting tasks does not require scanning all stored
+    tasks:
+
+    - `task_ins_pending`: undelivered TaskIns per consumer (`None` for anonymous
+      consumers), in insertion order
+    - `task_res_pending`: undelivered TaskRes per ancestor TaskIns ID
+    - `task_res_delivered`: delivered TaskRes per ancestor TaskIns ID
+
+    TaskIns and TaskRes are guarded by separate locks so that the Fleet API and the
+    Driver API can access the state concurrently. Threads waiting for TaskIns or
+    TaskRes are woken up by `task_ins_notifier` (keyed like `task_ins_pending`) and
+    `task_res_notifier` (keyed by ancestor TaskIns ID).
+    """
 
     def __init__(self) -> None:
         self.node_ids: Set[int] = set()
         self.run_ids: Set[int] = set()
         self.task_ins_store: Dict[UUID, TaskIns] = {}
         self.task_res_store: Dict[UUID, TaskRes] = {}
+        # RecordSets shared by TaskIns stored via `store_task_ins_broadcast`
+        self.task_ins_recordsets: Dict[UUID, RecordSet] = {}
+
+        # Indices (dicts with `None` values are used as insertion-ordered sets)
+        self.task_ins_pending: Dict[Optional[int], Dict[UUID, None]] = {}
+        self.task_res_pending: Dict[str, Dict[UUID, None]] = {}
+        self.task_res_delivered: Dict[str, Set[UUID]] = {}
+
+        # Locks
+        self.lock = threading.Lock()
+        self.task_ins_lock = threading.Lock()
+        self.task_res_lock = threading.Lock()
+
+        # Notifications for threads waiting for TaskIns/TaskRes
+        self.task_ins_notifier = Notifier()
+        self.task_res_notifier = Notifier()
 
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns."""
+        return self._store_task_ins(task_ins, shared_recordset=None)
+
+    def store_task_ins_broadcast(
+        self, task_ins: TaskIns, consumers: List[Node]
+    ) -> List[Optional[UUID]]:
+        """Store one TaskIns for each consumer, sharing its RecordSet.
+
+        The RecordSet is moved out of `task_ins`, each stored TaskIns only references
+        it and receives a copy upon delivery.
+        """
+        # Detach the RecordSet so that copying the TaskIns for each consumer is cheap
+        recordset = task_ins.task.recordset
+        task_ins.task.ClearField("recordset")
+        task_ins.task.recordset.SetInParent()
+
+        task_ids: List[Optional[UUID]] = []
+        for consumer in consumers:
+            consumer_task_ins = TaskIns()
+            consumer_task_ins.CopyFrom(task_ins)
+            consumer_task_ins.task.consumer.CopyFrom(consumer)
+            task_ids.append(
+                self._store_task_ins(consumer_task_ins, shared_recordset=recordset)
+            )
+        return task_ids
+
+    def _store_task_ins(
+        self, task_ins: TaskIns, shared_recordset: Optional[RecordSet]
+    ) -> Optional[UUID]:
+        """Store one TaskIns, optionally referencing a shared RecordSet."""
         # Validate task
         errors = validate_task_ins_or_res(task_ins)
         if any(errors):
@@ -57,7 +122,13 @@ class InMemoryState(State):
         task_ins.task_id = str(task_id)
         task_ins.task.created_at = created_at.isoformat()
         task_ins.task.ttl = ttl.isoformat()
-        self.task_ins_store[task_id] = task_ins
+        consumer_key = _consumer_key(task_ins)
+        with self.task_ins_lock:
+            self.task_ins_store[task_id] = task_ins
+            self.task_ins_pending.setdefault(consumer_key, {})[task_id] = None
+            if shared_recordset is not None:
+                self.task_ins_recordsets[task_id] = shared_recordset
+        self.task_ins_notifier.notify(consumer_key)
 
         # Return the new task_id
         return task_id
@@ -69,33 +140,42 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskIns for node_id that were not delivered yet
-        task_ins_list: List[TaskIns] = []
-        for _, task_ins in self.task_ins_store.items():
-            # pylint: disable=too-many-boolean-expressions
-            if (
-                node_id is not None  # Not anonymous
-                and task_ins.task.consumer.anonymous is False
-                and task_ins.task.consumer.node_id == node_id
-                and task_ins.task.delivered_at == ""
-            ) or (
-                node_id is None  # Anonymous
-                and task_ins.task.consumer.anonymous is True
-                and task_ins.task.consumer.node_id == 0
-                and task_ins.task.delivered_at == ""
-            ):
+        with self.task_ins_lock:
+            # Find TaskIns for node_id that were not delivered yet
+            pending = self.task_ins_pending.get(node_id)
+            if not pending:
+                return []
+            task_ids = list(islice(pending, limit))
+
+            # Mark all of them as delivered
+            delivered_at = now().isoformat()
+            task_ins_list: List[TaskIns] = []
+            for task_id in task_ids:
+                del pending[task_id]
+                task_ins = self.task_ins_store[task_id]
+                task_ins.task.delivered_at = delivered_at
+                recordset = self.task_ins_recordsets.get(task_id)
+                if recordset is not None:
+                    # Deliver a copy which includes the shared RecordSet
+                    task_ins_with_recordset = TaskIns()
+                    task_ins_with_recordset.CopyFrom(task_ins)
+                    task_ins_with_recordset.task.recordset.CopyFrom(recordset)
+                    task_ins = task_ins_with_recordset
                 task_ins_list.append(task_ins)
-            if limit and len(task_ins_list) == limit:
-                break
-
-        # Mark all of them as delivered
-        delivered_at = now().isoformat()
-        for task_ins in task_ins_list:
-            task_ins.task.delivered_at = delivered_at
+            if not pending:
+                del self.task_ins_pending[node_id]
 
         # Return TaskIns
         return task_ins_list
 
+    def wait_for_task_ins(self, node_id: Optional[int], timeout: float) -> bool:
+        """Wait until TaskIns for the given node_id are available."""
+        with self.task_ins_notifier.subscribe([node_id]) as event:
+            with self.task_ins_lock:
+                if self.task_ins_pending.get(node_id):
+                    return True
+            return event.wait(timeout)
+
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes."""
         # Validate task
@@ -118,7 +198,11 @@ class InMemoryState(State):
         task_res.task_id = str(task_id)
         task_res.task.created_at = created_at.isoformat()
         task_res.task.ttl = ttl.isoformat()
-        self.task_res_store[task_id] = task_res
+        ancestor = task_res.task.ancestry[0]
+        with self.task_res_lock:
+            self.task_res_store[task_id] = task_res
+            self.task_res_pending.setdefault(ancestor, {})[task_id] = None
+        self.task_res_notifier.notify(ancestor)
 
         # Return the new task_id
         return task_id
@@ -128,45 +212,113 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskRes that were not delivered yet
-        task_res_list: List[TaskRes] = []
-        for _, task_res in self.task_res_store.items():
-            if (
-                UUID(task_res.task.ancestry[0]) in task_ids
-                and task_res.task.delivered_at == ""
-            ):
-                task_res_list.append(task_res)
-            if limit and len(task_res_list) == limit:
-                break
-
-        # Mark all of them as delivered
-        delivered_at = now().isoformat()
-        for task_res in task_res_list:
-            task_res.task.delivered_at = delivered_at
+        with self.task_res_lock:
+            # Find TaskRes that were not delivered yet
+            delivered_at = now().isoformat()
+            task_res_list: List[TaskRes] = []
+            for task_ins_id in task_ids:
+                ancestor = str(task_ins_id)
+                pending = self.task_res_pending.get(ancestor)
+                if not pending:
+                    continue
+                remaining = None if limit is None else limit - len(task_res_list)
+                found = list(islice(pending, remaining))
+
+                # Mark all of them as delivered
+                delivered = self.task_res_delivered.setdefault(ancestor, set())
+                for task_res_id in found:
+                    del pending[task_res_id]
+                    delivered.add(task_res_id)
+                    task_res = self.task_res_store[task_res_id]
+                    task_res.task.delivered_at = delivered_at
+                    task_res_list.append(task_res)
+                if not pending:
+                    del self.task_res_pending[ancestor]
+                if limit and len(task_res_list) == limit:
+                    break
 
         # Return TaskRes
         return task_res_list
 
+    def wait_for_task_res(self, task_ids: Set[UUID], timeout: float) -> bool:
+        """Wait until TaskRes for any of the given task_ids are available."""
+        ancestors = [str(task_id) for task_id in task_ids]
+        with self.task_res_notifier.subscribe(ancestors) as event:
+            with self.task_res_lock:
+                if any(ancestor in self.task_res_pending for ancestor in ancestors):
+                    return True
+            return event.wait(timeout)
+
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
         task_ins_to_be_deleted: Set[UUID] = set()
-        task_res_to_be_deleted: Set[UUID] = set()
 
-        for task_ins_id in task_ids:
-            # Find the task_id of the matching task_res
-            for task_res_id, task_res in self.task_res_store.items():
-                if UUID(task_res.task.ancestry[0]) != task_ins_id:
-                    continue
-                if task_res.task.delivered_at == "":
+        with self.task_res_lock:
+            for task_ins_id in task_ids:
+                # Find the task_ids of the matching delivered task_res
+                delivered = self.task_res_delivered.pop(str(task_ins_id), None)
+                if not delivered:
                     continue
 
                 task_ins_to_be_deleted.add(task_ins_id)
-                task_res_to_be_deleted.add(task_res_id)
-
-        for task_id in task_ins_to_be_deleted:
-            del self.task_ins_store[task_id]
-        for task_id in task_res_to_be_deleted:
-            del self.task_res_store[task_id]
+                for task_res_id in delivered:
+                    del self.task_res_store[task_res_id]
+
+        with self.task_ins_lock:
+            for task_id in task_ins_to_be_deleted:
+                self.task_ins_recordsets.pop(task_id, None)
+                task_ins = self.task_ins_store.pop(task_id, None)
+                if task_ins is None:
+                    continue
+                # Undelivered TaskIns are also removed from the pending index
+                consumer_key = _consumer_key(task_ins)
+                pending = self.task_ins_pending.get(consumer_key)
+                if pending is not None:
+                    pending.pop(task_id, None)
+                    if not pending:
+                        del self.task_ins_pending[consumer_key]
+
+    def release_task_ins(self, task_ids: Set[UUID]) -> None:
+        """Mark delivered TaskIns as not delivered again."""
+        released: Dict[Optional[int], Dict[UUID, None]] = {}
+        with self.task_ins_lock:
+            found: List[TaskIns] = []
+            for task_id in task_ids:
+                task_ins = self.task_ins_store.get(task_id)
+                if task_ins is not None and task_ins.task.delivered_at:
+                    found.append(task_ins)
+
+            # Restore the insertion order
+            for task_ins in sorted(found, key=lambda t: t.task.created_at):
+                task_id = UUID(task_ins.task_id)
+                task_ins.task.delivered_at = ""
+                released.setdefault(_consumer_key(task_ins), {})[task_id] = None
+
+            # Released TaskIns are delivered before the ones stored after them
+            for consumer_key, released_ids in released.items():
+                pending = self.task_ins_pending.get(consumer_key, {})
+                self.task_ins_pending[consumer_key] = {**released_ids, **pending}
+        for consumer_key in released:
+            self.task_ins_notifier.notify(consumer_key)
+
+    def release_task_res(self, task_ids: Set[UUID]) -> None:
+        """Mark delivered TaskRes as not delivered again."""
+        ancestors: Set[str] = set()
+        with self.task_res_lock:
+            for task_id in task_ids:
+                task_res = self.task_res_store.get(task_id)
+                if task_res is None or not task_res.task.delivered_at:
+                    continue
+                task_res.task.delivered_at = ""
+                ancestor = task_res.task.ancestry[0]
+                delivered = self.task_res_delivered[ancestor]
+                delivered.discard(task_id)
+                if not delivered:
+                    del self.task_res_delivered[ancestor]
+                self.task_res_pending.setdefault(ancestor, {})[task_id] = None
+                ancestors.add(ancestor)
+        for ancestor in ancestors:
+            self.task_res_notifier.notify(ancestor)
 
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
@@ -187,17 +339,19 @@ class InMemoryState(State):
         # Sample a random int64 as node_id
         node_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
 
-        if node_id not in self.node_ids:
-            self.node_ids.add(node_id)
-            return node_id
+        with self.lock:
+            if node_id not in self.node_ids:
+                self.node_ids.add(node_id)
+                return node_id
         log(ERROR, "Unexpected node registration failure.")
         return 0
 
     def delete_node(self, node_id: int) -> None:
         """Delete a client node."""
-        if node_id not in self.node_ids:
-            raise ValueError(f"Node {node_id} not found")
-        self.node_ids.remove(node_id)
+        with self.lock:
+            if node_id not in self.node_ids:
+                raise ValueError(f"Node {node_id} not found")
+            self.node_ids.remove(node_id)
 
     def get_nodes(self, run_id: int) -> Set[int]:
         """Return all available client nodes.
@@ -207,17 +361,26 @@ class InMemoryState(State):
         If the provided `run_id` does not exist or has no matching nodes,
         an empty `Set` MUST be returned.
         """
-        if run_id not in self.run_ids:
-            return set()
-        return self.node_ids
+        with self.lock:
+            if run_id not in self.run_ids:
+                return set()
+            return set(self.node_ids)
 
     def create_run(self) -> int:
         """Create one run."""
         # Sample a random int64 as run_id
         run_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
 
-        if run_id not in self.run_ids:
-            self.run_ids.add(run_id)
-            return run_id
+        with self.lock:
+            if run_id not in self.run_ids:
+                self.run_ids.add(run_id)
+                return run_id
         log(ERROR, "Unexpected run creation failure.")
         return 0
+
+
+def _consumer_key(task_ins: TaskIns) -> Optional[int]:
+    """Return the key of the pending TaskIns index for the consumer of `task_ins`."""
+    if task_ins.task.consumer.anonymous:
+        return None
+    return task_ins.task.consumer.node_id
@@ -0,0 +1,60 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Notification of threads waiting for tasks to be stored."""
+
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, Iterator, List, Set
+
+
+class Notifier:
+    """Wake up threads which wait for events on one or more keys.
+
+    A thread subscribes to a set of keys (e.g., the IDs of TaskIns it waits for replies
+    to) and receives an event, which is set as soon as any of these keys is notified.
+    Subscribing before checking the state for already available tasks guarantees that no
+    notification is lost in between.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.events: Dict[Hashable, Set[threading.Event]] = {}
+
+    @contextmanager
+    def subscribe(self, keys: Iterable[Hashable]) -> Iterator[threading.Event]:
+        """Subscribe to `keys` for the duration of the context."""
+        event = threading.Event()
+        subscribed: List[Hashable] = list(keys)
+        with self.lock:
+            for key in subscribed:
+                self.events.setdefault(key, set()).add(event)
+        try:
+            yield event
+        finally:
+            with self.lock:
+                for key in subscribed:
+                    events = self.events.get(key)
+                    if events is None:
+                        continue
+                    events.discard(event)
+                    if not events:
+                        del self.events[key]
+
+    def notify(self, key: Hashable) -> None:
+        """Wake up all threads subscribed to `key`."""
+        with self.lock:
+            for event in self.events.get(key, ()):
+                event.set()
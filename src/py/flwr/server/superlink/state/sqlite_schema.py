@@ -0,0 +1,359 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Schema and migrations of the SQLite based server state."""
+
+
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Sequence
+
+# Version of the database schema, stored in `PRAGMA user_version`. Databases with an
+# older version are upgraded by `migrate` (see `MIGRATIONS`).
+SCHEMA_VERSION = 2
+
+SQL_CREATE_TABLE_NODE = """
+CREATE TABLE IF NOT EXISTS node(
+    node_id INTEGER UNIQUE
+);
+"""
+
+SQL_CREATE_TABLE_RUN = """
+CREATE TABLE IF NOT EXISTS run(
+    run_id INTEGER UNIQUE
+);
+"""
+
+# Timestamps are stored as microseconds since the Unix epoch, `delivered_at` is NULL
+# until the task has been delivered. TaskIns have no ancestors (see
+# `validate_task_ins_or_res`), the ancestry of TaskRes is stored in
+# `task_res_ancestry`. Serialized RecordSets are stored in the `recordset` table and
+# referenced by `recordset_id`.
+SQL_CREATE_TABLE_TASK_INS = """
+CREATE TABLE IF NOT EXISTS task_ins(
+    task_id                 TEXT UNIQUE,
+    group_id                TEXT,
+    run_id                  INTEGER,
+    producer_anonymous      BOOLEAN,
+    producer_node_id        INTEGER,
+    consumer_anonymous      BOOLEAN,
+    consumer_node_id        INTEGER,
+    created_at              INTEGER,
+    delivered_at            INTEGER,
+    ttl                     INTEGER,
+    task_type               TEXT,
+    recordset_id            TEXT REFERENCES recordset(recordset_id),
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
+
+SQL_CREATE_TABLE_TASK_RES = """
+CREATE TABLE IF NOT EXISTS task_res(
+    task_id                 TEXT UNIQUE,
+    group_id                TEXT,
+    run_id                  INTEGER,
+    producer_anonymous      BOOLEAN,
+    producer_node_id        INTEGER,
+    consumer_anonymous      BOOLEAN,
+    consumer_node_id        INTEGER,
+    created_at              INTEGER,
+    delivered_at            INTEGER,
+    ttl                     INTEGER,
+    task_type               TEXT,
+    recordset_id            TEXT REFERENCES recordset(recordset_id),
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
+
+# Task tables of schema version 1, which stored the serialized RecordSet of each task
+# in the `recordset` column (only used by `_migrate_to_v1`)
+SQL_CREATE_TABLE_TASK_INS_V1 = """
+CREATE TABLE IF NOT EXISTS task_ins(
+    task_id                 TEXT UNIQUE,
+    group_id                TEXT,
+    run_id                  INTEGER,
+    producer_anonymous      BOOLEAN,
+    producer_node_id        INTEGER,
+    consumer_anonymous      BOOLEAN,
+    consumer_node_id        INTEGER,
+    created_at              INTEGER,
+    delivered_at            INTEGER,
+    ttl                     INTEGER,
+    task_type               TEXT,
+    recordset               BLOB,
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
+
+SQL_CREATE_TABLE_TASK_RES_V1 = """
+CREATE TABLE IF NOT EXISTS task_res(
+    task_id                 TEXT UNIQUE,
+    group_id                TEXT,
+    run_id                  INTEGER,
+    producer_anonymous      BOOLEAN,
+    producer_node_id        INTEGER,
+    consumer_anonymous      BOOLEAN,
+    consumer_node_id        INTEGER,
+    created_at              INTEGER,
+    delivered_at            INTEGER,
+    ttl                     INTEGER,
+    task_type               TEXT,
+    recordset               BLOB,
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
+
+SQL_CREATE_TABLE_TASK_RES_ANCESTRY = """
+CREATE TABLE IF NOT EXISTS task_res_ancestry(
+    task_id                 TEXT NOT NULL,
+    position                INTEGER NOT NULL,
+    ancestor_id             TEXT NOT NULL,
+    PRIMARY KEY(task_id, position),
+    FOREIGN KEY(task_id) REFERENCES task_res(task_id) ON DELETE CASCADE
+);
+"""
+
+# Serialized RecordSets, keyed by their SHA-256 digest. Tasks with identical RecordSets
+# (e.g., the same model sent to many nodes) share a single row.
+SQL_CREATE_TABLE_RECORDSET = """
+CREATE TABLE IF NOT EXISTS recordset(
+    recordset_id            TEXT PRIMARY KEY,
+    content                 BLOB
+);
+"""
+
+SQL_CREATE_INDEX_TASK_INS_CONSUMER = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_consumer
+ON task_ins(consumer_anonymous, consumer_node_id, delivered_at);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_ANCESTRY = """
+CREATE INDEX IF NOT EXISTS idx_task_res_ancestry_ancestor
+ON task_res_ancestry(ancestor_id, position, task_id);
+"""
+
+SQL_CREATE_INDEX_TASK_INS_RECORDSET = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_recordset ON task_ins(recordset_id);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_RECORDSET = """
+CREATE INDEX IF NOT EXISTS idx_task_res_recordset ON task_res(recordset_id);
+"""
+
+TASK_COLUMNS = (
+    "task_id",
+    "group_id",
+    "run_id",
+    "producer_anonymous",
+    "producer_node_id",
+    "consumer_anonymous",
+    "consumer_node_id",
+    "created_at",
+    "delivered_at",
+    "ttl",
+    "task_type",
+    "recordset_id",
+)
+
+SQL_INSERT_TASK_INS = f"""
+INSERT INTO task_ins({", ".join(TASK_COLUMNS)})
+VALUES({", ".join(f":{column}" for column in TASK_COLUMNS)});
+"""
+
+SQL_INSERT_TASK_RES = f"""
+INSERT INTO task_res({", ".join(TASK_COLUMNS)})
+VALUES({", ".join(f":{column}" for column in TASK_COLUMNS)});
+"""
+
+SQL_INSERT_RECORDSET = """
+INSERT OR IGNORE INTO recordset(recordset_id, content)
+VALUES(:recordset_id, :recordset);
+"""
+
+SQL_INSERT_TASK_RES_ANCESTRY = """
+INSERT INTO task_res_ancestry(task_id, position, ancestor_id)
+VALUES(:task_id, :position, :ancestor_id);
+"""
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_timestamp(value: str) -> Optional[int]:
+    """Convert an ISO 8601 date string to microseconds since the Unix epoch.
+
+    The empty string (i.e., an unset date) is converted to `None`.
+    """
+    if value == "":
+        return None
+    delta = datetime.fromisoformat(value) - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_timestamp(value: Optional[int]) -> str:
+    """Convert microseconds since the Unix epoch to an ISO 8601 date string.
+
+    `None` (i.e., an unset date) is converted to the empty string.
+    """
+    if value is None:
+        return ""
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def recordset_id(content: bytes) -> str:
+    """Return the content address (SHA-256 hex digest) of a serialized RecordSet."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indices of the current schema version."""
+    for statement in (
+        SQL_CREATE_TABLE_RUN,
+        SQL_CREATE_TABLE_RECORDSET,
+        SQL_CREATE_TABLE_TASK_INS,
+        SQL_CREATE_TABLE_TASK_RES,
+        SQL_CREATE_TABLE_TASK_RES_ANCESTRY,
+        SQL_CREATE_TABLE_NODE,
+        SQL_CREATE_INDEX_TASK_INS_CONSUMER,
+        SQL_CREATE_INDEX_TASK_RES_ANCESTRY,
+        SQL_CREATE_INDEX_TASK_INS_RECORDSET,
+        SQL_CREATE_INDEX_TASK_RES_RECORDSET,
+    ):
+        conn.execute(statement)
+
+
+def _create_schema_v1(conn: sqlite3.Connection) -> None:
+    """Create tables and indices of schema version 1."""
+    for statement in (
+        SQL_CREATE_TABLE_RUN,
+        SQL_CREATE_TABLE_TASK_INS_V1,
+        SQL_CREATE_TABLE_TASK_RES_V1,
+        SQL_CREATE_TABLE_TASK_RES_ANCESTRY,
+        SQL_CREATE_TABLE_NODE,
+        SQL_CREATE_INDEX_TASK_INS_CONSUMER,
+        SQL_CREATE_INDEX_TASK_RES_ANCESTRY,
+    ):
+        conn.execute(statement)
+
+
+def _migrate_to_v1(conn: sqlite3.Connection) -> None:
+    """Migrate to schema version 1.
+
+    Databases created before schema versioning was introduced store dates as ISO 8601
+    strings and the ancestry of each task as a comma-separated string. Their tasks are
+    copied into the new tables and converted along the way.
+    """
+    rows = conn.execute("SELECT name FROM sqlite_schema WHERE type = 'table';")
+    legacy_tables = {row["name"] for row in rows} & {"task_ins", "task_res"}
+    for table in legacy_tables:
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v0;")
+
+    _create_schema_v1(conn)
+
+    conn.create_function("to_timestamp", 1, to_timestamp, deterministic=True)
+    for table in legacy_tables:
+        conn.execute(
+            f"""
+            INSERT INTO {table}(
+                task_id, group_id, run_id, producer_anonymous, producer_node_id,
+                consumer_anonymous, consumer_node_id, created_at, delivered_at, ttl,
+                task_type, recordset
+            )
+            SELECT
+                task_id, group_id, run_id, producer_anonymous, producer_node_id,
+                consumer_anonymous, consumer_node_id, to_timestamp(created_at),
+                to_timestamp(delivered_at), to_timestamp(ttl), task_type, recordset
+            FROM {table}_v0;
+            """
+        )
+        if table == "task_res":
+            rows = conn.execute("SELECT task_id, ancestry FROM task_res_v0;")
+            conn.executemany(
+                SQL_INSERT_TASK_RES_ANCESTRY,
+                [
+                    {"task_id": row["task_id"], "position": pos, "ancestor_id": anc}
+                    for row in rows.fetchall()
+                    for pos, anc in enumerate(row["ancestry"].split(","))
+                ],
+            )
+        conn.execute(f"DROP TABLE {table}_v0;")
+
+
+def _migrate_to_v2(conn: sqlite3.Connection) -> None:
+    """Migrate to schema version 2.
+
+    Serialized RecordSets are moved out of the task tables into the content-addressed
+    `recordset` table, tasks reference them by `recordset_id`.
+    """
+    conn.execute(SQL_CREATE_TABLE_RECORDSET)
+    for table in ("task_ins", "task_res"):
+        conn.execute(
+            f"""
+            ALTER TABLE {table}
+            ADD COLUMN recordset_id TEXT REFERENCES recordset(recordset_id);
+            """
+        )
+        row_ids = conn.execute(f"SELECT rowid FROM {table};").fetchall()
+        for row_id in row_ids:
+            row = conn.execute(
+                f"SELECT recordset FROM {table} WHERE rowid = ?;", (row_id["rowid"],)
+            ).fetchone()
+            data = {
+                "recordset": row["recordset"],
+                "recordset_id": recordset_id(row["recordset"]),
+            }
+            conn.execute(SQL_INSERT_RECORDSET, data)
+            conn.execute(
+                f"UPDATE {table} SET recordset_id = :recordset_id WHERE rowid = :id;",
+                {**data, "id": row_id["rowid"]},
+            )
+        conn.execute(f"ALTER TABLE {table} DROP COLUMN recordset;")
+    conn.execute(SQL_CREATE_INDEX_TASK_INS_RECORDSET)
+    conn.execute(SQL_CREATE_INDEX_TASK_RES_RECORDSET)
+
+
+# Migration `i` upgrades a database from schema version `i` to version `i + 1`
+MIGRATIONS: Sequence[Callable[[sqlite3.Connection], None]] = (
+    _migrate_to_v1,
+    _migrate_to_v2,
+)
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    """Create the schema or migrate it to `SCHEMA_VERSION` in a single transaction.
+
+    Empty databases are created with the current schema directly, the migrations are
+    only run for existing databases. The connection is expected to return rows as
+    dicts (see `dict_factory`).
+    """
+    conn.execute("BEGIN;")
+    try:
+        row = conn.execute("PRAGMA user_version;").fetchone()
+        version: int = row["user_version"]
+        if version > SCHEMA_VERSION:
+            raise ValueError(
+                f"Database schema version {version} is newer than the "
+                f"supported schema version {SCHEMA_VERSION}"
+            )
+        row = conn.execute("SELECT EXISTS(SELECT 1 FROM sqlite_schema) AS found;")
+        if version == 0 and not row.fetchone()["found"]:
+            _create_schema(conn)
+        else:
+            for migration in MIGRATIONS[version:]:
+                migration(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
@@ -18,9 +18,11 @@
 import os
 import re
 import sqlite3
+import threading
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from logging import DEBUG, ERROR
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import Any, ContextManager, Dict, List, Optional, Set, Tuple, Union, cast
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
@@ -29,64 +31,34 @@ from flwr.proto.recordset_pb2 import RecordSet  # pylint: disable=E0611
 from flwr.proto.task_pb2 import Task, TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.utils.validator import validate_task_ins_or_res
 
+from .notifier import Notifier
+from .sqlite_schema import (
+    SQL_INSERT_RECORDSET,
+    SQL_INSERT_TASK_INS,
+    SQL_INSERT_TASK_RES,
+    SQL_INSERT_TASK_RES_ANCESTRY,
+    from_timestamp,
+    migrate,
+    recordset_id,
+    to_timestamp,
+)
 from .state import State
 
-SQL_CREATE_TABLE_NODE = """
-CREATE TABLE IF NOT EXISTS node(
-    node_id INTEGER UNIQUE
-);
-"""
-
-SQL_CREATE_TABLE_RUN = """
-CREATE TABLE IF NOT EXISTS run(
-    run_id INTEGER UNIQUE
-);
-"""
-
-SQL_CREATE_TABLE_TASK_INS = """
-CREATE TABLE IF NOT EXISTS task_ins(
-    task_id                 TEXT UNIQUE,
-    group_id                TEXT,
-    run_id                  INTEGER,
-    producer_anonymous      BOOLEAN,
-    producer_node_id        INTEGER,
-    consumer_anonymous      BOOLEAN,
-    consumer_node_id        INTEGER,
-    created_at              TEXT,
-    delivered_at            TEXT,
-    ttl                     TEXT,
-    ancestry                TEXT,
-    task_type               TEXT,
-    recordset               BLOB,
-    FOREIGN KEY(run_id) REFERENCES run(run_id)
-);
-"""
-
-
-SQL_CREATE_TABLE_TASK_RES = """
-CREATE TABLE IF NOT EXISTS task_res(
-    task_id                 TEXT UNIQUE,
-    group_id                TEXT,
-    run_id                  INTEGER,
-    producer_anonymous      BOOLEAN,
-    producer_node_id        INTEGER,
-    consumer_anonymous      BOOLEAN,
-    consumer_node_id        INTEGER,
-    created_at              TEXT,
-    delivered_at            TEXT,
-    ttl                     TEXT,
-    ancestry                TEXT,
-    task_type               TEXT,
-    recordset               BLOB,
-    FOREIGN KEY(run_id) REFERENCES run(run_id)
-);
-"""
-
 DictOrTuple = Union[Tuple[Any], Dict[str, Any]]
 
 
-class SqliteState(State):
-    """SQLite-based state implementation."""
+class SqliteState(State):  # pylint: disable=too-many-instance-attributes
+    """SQLite-based state implementation.
+
+    File-based databases are accessed through one long-lived connection per thread using
+    write-ahead logging, which allows concurrent readers alongside a single writer. A
+    database in RAM (":memory:") only exists for the connection which created it, which
+    is why all threads share one connection (serialized by a lock) in this case.
+
+    Threads waiting for TaskIns or TaskRes (see `wait_for_task_ins` and
+    `wait_for_task_res`) are only notified about tasks stored through this instance,
+    not about those written to the same database file by other processes.
+    """
 
     def __init__(
         self,
@@ -101,7 +73,46 @@ class SqliteState(State):
             a connection to a database that is in RAM, instead of on disk.
         """
         self.database_path = database_path
-        self.conn: Optional[sqlite3.Connection] = None
+        self.in_memory = database_path == ":memory:"
+        self.log_queries = False
+        self.initialized = False
+        self.local = threading.local()
+        self.shared_conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.RLock()
+        self.task_ins_notifier = Notifier()
+        self.task_res_notifier = Notifier()
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """Return the connection of the calling thread.
+
+        Returns `None` if the state has not been initialized yet.
+        """
+        if not self.initialized:
+            return None
+        if self.in_memory:
+            return self.shared_conn
+        conn: Optional[sqlite3.Connection] = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self.local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection to the database."""
+        conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        if not self.in_memory:
+            conn.execute("PRAGMA journal_mode = WAL;")
+            # Durable across application crashes in WAL mode, only a power loss
+            # might roll back the most recent transactions
+            conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.row_factory = dict_factory
+        if self.log_queries:
+            conn.set_trace_callback(
+                lambda query: log(DEBUG, re.sub(r"\s+", " ", query))
+            )
+        return conn
 
     def initialize(self, log_queries: bool = False) -> List[Tuple[str]]:
         """Create tables if they don't exist yet.
@@ -111,21 +122,18 @@ class SqliteState(State):
         log_queries : bool
             Log each query which is executed.
         """
-        self.conn = sqlite3.connect(self.database_path)
-        self.conn.execute("PRAGMA foreign_keys = ON;")
-        self.conn.row_factory = dict_factory
-        if log_queries:
-            self.conn.set_trace_callback(lambda query: log(DEBUG, query))
-        cur = self.conn.cursor()
-
-        # Create each table if not exists queries
-        cur.execute(SQL_CREATE_TABLE_RUN)
-        cur.execute(SQL_CREATE_TABLE_TASK_INS)
-        cur.execute(SQL_CREATE_TABLE_TASK_RES)
-        cur.execute(SQL_CREATE_TABLE_NODE)
-        res = cur.execute("SELECT name FROM sqlite_schema;")
-
-        return res.fetchall()
+        with self.lock:
+            self.log_queries = log_queries
+            if self.in_memory and self.shared_conn is None:
+                self.shared_conn = self._connect()
+            self.initialized = True
+            conn = cast(sqlite3.Connection, self.conn)
+
+            # Create or migrate the schema
+            migrate(conn)
+
+            res = conn.execute("SELECT name FROM sqlite_schema;")
+            return res.fetchall()
 
     def query(
         self,
@@ -133,25 +141,23 @@ class SqliteState(State):
         data: Optional[Union[List[DictOrTuple], DictOrTuple]] = None,
     ) -> List[Dict[str, Any]]:
         """Execute a SQL query."""
-        if self.conn is None:
+        conn = self.conn
+        if conn is None:
             raise AttributeError("State is not initialized.")
 
         if data is None:
             data = []
 
-        # Clean up whitespace to make the logs nicer
-        query = re.sub(r"\s+", " ", query)
-
         try:
-            with self.conn:
+            with self._serialized(), conn:
                 if (
                     len(data) > 0
                     and isinstance(data, (tuple, list))
                     and isinstance(data[0], (tuple, dict))
                 ):
-                    rows = self.conn.executemany(query, data)
+                    rows = conn.executemany(query, data)
                 else:
-                    rows = self.conn.execute(query, data)
+                    rows = conn.execute(query, data)
 
                 # Extract results before committing to support
                 #   INSERT/UPDATE ... RETURNING
@@ -162,6 +168,12 @@ class SqliteState(State):
 
         return result
 
+    def _serialized(self) -> ContextManager[Any]:
+        """Serialize access to the connection if it is shared between threads."""
+        if self.in_memory:
+            return self.lock
+        return nullcontext()
+
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns.
 
@@ -194,20 +206,88 @@ class SqliteState(State):
         task_ins.task_id = str(task_id)
         task_ins.task.created_at = created_at.isoformat()
         task_ins.task.ttl = ttl.isoformat()
-        data = (task_ins_to_dict(task_ins),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_ins VALUES({columns});"
+        data = task_ins_to_dict(task_ins)
+
+        conn = self.conn
+        if conn is None:
+            raise AttributeError("State is not initialized.")
 
         # Only invalid run_id can trigger IntegrityError.
         # This may need to be changed in the future version with more integrity checks.
         try:
-            self.query(query, data)
+            with self._serialized(), conn:
+                conn.execute(SQL_INSERT_RECORDSET, data)
+                conn.execute(SQL_INSERT_TASK_INS, data)
         except sqlite3.IntegrityError:
             log(ERROR, "`run` is invalid")
             return None
+        self.task_ins_notifier.notify(_consumer_key(task_ins.task.consumer))
 
         return task_id
 
+    def store_task_ins_broadcast(
+        self, task_ins: TaskIns, consumers: List[Node]
+    ) -> List[Optional[UUID]]:
+        """Store one TaskIns for each consumer, sharing its RecordSet.
+
+        The RecordSet is serialized and stored once, all TaskIns are inserted in a
+        single transaction.
+        """
+        # Validate the TaskIns for each consumer
+        valid: List[bool] = []
+        for consumer in consumers:
+            task_ins.task.consumer.CopyFrom(consumer)
+            errors = validate_task_ins_or_res(task_ins)
+            if any(errors):
+                log(ERROR, errors)
+            valid.append(not any(errors))
+
+        # Create created_at and ttl
+        created_at: datetime = now()
+        ttl: datetime = created_at + timedelta(hours=24)
+        task_ins.task.created_at = created_at.isoformat()
+        task_ins.task.ttl = ttl.isoformat()
+
+        # Serialize the shared RecordSet only once
+        template = task_ins_to_dict(task_ins)
+        task_ids: List[Optional[UUID]] = []
+        rows: List[Dict[str, Any]] = []
+        for consumer, is_valid in zip(consumers, valid):
+            if not is_valid:
+                task_ids.append(None)
+                continue
+            task_id = uuid4()
+            task_ids.append(task_id)
+            rows.append(
+                {
+                    **template,
+                    "task_id": str(task_id),
+                    "consumer_anonymous": consumer.anonymous,
+                    "consumer_node_id": consumer.node_id,
+                }
+            )
+        if len(rows) == 0:
+            return task_ids
+
+        conn = self.conn
+        if conn is None:
+            raise AttributeError("State is not initialized.")
+
+        # Only invalid run_id can trigger IntegrityError.
+        # This may need to be changed in the future version with more integrity checks.
+        try:
+            with self._serialized(), conn:
+                conn.execute(SQL_INSERT_RECORDSET, template)
+                conn.executemany(SQL_INSERT_TASK_INS, rows)
+        except sqlite3.IntegrityError:
+            log(ERROR, "`run` is invalid")
+            return [None] * len(consumers)
+        for consumer, is_valid in zip(consumers, valid):
+            if is_valid:
+                self.task_ins_notifier.notify(_consumer_key(consumer))
+
+        return task_ids
+
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
     ) -> List[TaskIns]:
@@ -246,23 +326,27 @@ class SqliteState(State):
 
         data: Dict[str, Union[str, int]] = {}
 
+        # The index `idx_task_ins_consumer` covers both SELECT queries, as every index
+        # also stores the rowid. Only the UPDATE below reads the selected rows, by rowid
         if node_id is None:
             # Retrieve all anonymous Tasks
             query = """
-                SELECT task_id
+                SELECT rowid
                 FROM task_ins
                 WHERE consumer_anonymous == 1
                 AND   consumer_node_id == 0
-                AND   delivered_at = ""
+                AND   delivered_at IS NULL
+                ORDER BY rowid
             """
         else:
             # Retrieve all TaskIns for node_id
             query = """
-                SELECT task_id
+                SELECT rowid
                 FROM task_ins
                 WHERE consumer_anonymous == 0
                 AND   consumer_node_id == :node_id
-                AND   delivered_at = ""
+                AND   delivered_at IS NULL
+                ORDER BY rowid
             """
             data["node_id"] = node_id
 
@@ -276,28 +360,52 @@ class SqliteState(State):
 
         if rows:
             # Prepare query
-            task_ids = [row["task_id"] for row in rows]
-            placeholders: str = ",".join([f":id_{i}" for i in range(len(task_ids))])
+            row_ids = [row["rowid"] for row in rows]
+            placeholders: str = ",".join([f":id_{i}" for i in range(len(row_ids))])
             query = f"""
                 UPDATE task_ins
                 SET delivered_at = :delivered_at
-                WHERE task_id IN ({placeholders})
-                RETURNING *;
+                WHERE rowid IN ({placeholders})
+                AND delivered_at IS NULL
+                RETURNING rowid, *;
             """
 
             # Prepare data for query
-            delivered_at = now().isoformat()
+            delivered_at = cast(int, to_timestamp(now().isoformat()))
             data = {"delivered_at": delivered_at}
-            for index, task_id in enumerate(task_ids):
-                data[f"id_{index}"] = str(task_id)
+            for index, row_id in enumerate(row_ids):
+                data[f"id_{index}"] = row_id
 
             # Run query
             rows = self.query(query, data)
+            rows.sort(key=lambda row: cast(int, row["rowid"]))
+
+            # Attach the RecordSet of each TaskIns
+            self._attach_recordsets(rows)
 
         result = [dict_to_task_ins(row) for row in rows]
 
         return result
 
+    def wait_for_task_ins(self, node_id: Optional[int], timeout: float) -> bool:
+        """Wait until TaskIns for the given node_id are available."""
+        query = """
+            SELECT EXISTS(
+                SELECT 1
+                FROM task_ins
+                WHERE consumer_anonymous == :anonymous
+                AND   consumer_node_id == :node_id
+                AND   delivered_at IS NULL
+            ) AS available;
+        """
+        data = {"anonymous": node_id is None, "node_id": node_id or 0}
+
+        with self.task_ins_notifier.subscribe([node_id]) as event:
+            rows = self.query(query, data)
+            if rows[0]["available"]:
+                return True
+            return event.wait(timeout)
+
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
 
@@ -329,17 +437,27 @@ class SqliteState(State):
         task_res.task_id = str(task_id)
         task_res.task.created_at = created_at.isoformat()
         task_res.task.ttl = ttl.isoformat()
-        data = (task_res_to_dict(task_res),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_res VALUES({columns});"
+        data = task_res_to_dict(task_res)
+        ancestry = [
+            {"task_id": data["task_id"], "position": position, "ancestor_id": ancestor}
+            for position, ancestor in enumerate(data["ancestry"])
+        ]
+
+        conn = self.conn
+        if conn is None:
+            raise AttributeError("State is not initialized.")
 
         # Only invalid run_id can trigger IntegrityError.
         # This may need to be changed in the future version with more integrity checks.
         try:
-            self.query(query, data)
+            with self._serialized(), conn:
+                conn.execute(SQL_INSERT_RECORDSET, data)
+                conn.execute(SQL_INSERT_TASK_RES, data)
+                conn.executemany(SQL_INSERT_TASK_RES_ANCESTRY, ancestry)
         except sqlite3.IntegrityError:
             log(ERROR, "`run` is invalid")
             return None
+        self.task_res_notifier.notify(data["ancestry"][0])
 
         return task_id
 
@@ -367,10 +485,12 @@ class SqliteState(State):
 
         placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
         query = f"""
-            SELECT *
-            FROM task_res
-            WHERE ancestry IN ({placeholders})
-            AND delivered_at = ""
+            SELECT task_res.task_id
+            FROM task_res_ancestry
+            JOIN task_res ON task_res.task_id = task_res_ancestry.task_id
+            WHERE task_res_ancestry.ancestor_id IN ({placeholders})
+            AND task_res_ancestry.position = 0
+            AND task_res.delivered_at IS NULL
         """
 
         data: Dict[str, Union[str, int]] = {}
@@ -394,11 +514,12 @@ class SqliteState(State):
                 UPDATE task_res
                 SET delivered_at = :delivered_at
                 WHERE task_id IN ({placeholders})
+                AND delivered_at IS NULL
                 RETURNING *;
             """
 
             # Prepare data for query
-            delivered_at = now().isoformat()
+            delivered_at = cast(int, to_timestamp(now().isoformat()))
             data = {"delivered_at": delivered_at}
             for index, task_id in enumerate(found_task_ids):
                 data[f"id_{index}"] = str(task_id)
@@ -406,9 +527,57 @@ class SqliteState(State):
             # Run query
             rows = self.query(query, data)
 
+            # Attach the ancestry and the RecordSet of each TaskRes
+            ancestry = self._get_task_res_ancestry([row["task_id"] for row in rows])
+            for row in rows:
+                row["ancestry"] = ancestry.get(row["task_id"], [])
+            self._attach_recordsets(rows)
+
         result = [dict_to_task_res(row) for row in rows]
         return result
 
+    def _attach_recordsets(self, rows: List[Dict[str, Any]]) -> None:
+        """Load the serialized RecordSet of each row into `row["recordset"]`.
+
+        Each distinct RecordSet is only read once, no matter how many rows reference it.
+        """
+        recordset_ids = list({row["recordset_id"] for row in rows})
+        if len(recordset_ids) == 0:
+            return
+
+        placeholders = ",".join([f":id_{i}" for i in range(len(recordset_ids))])
+        query = f"""
+            SELECT recordset_id, content
+            FROM recordset
+            WHERE recordset_id IN ({placeholders});
+        """
+        data = {f"id_{index}": rs_id for index, rs_id in enumerate(recordset_ids)}
+
+        contents = {
+            row["recordset_id"]: row["content"] for row in self.query(query, data)
+        }
+        for row in rows:
+            row["recordset"] = contents[row["recordset_id"]]
+
+    def _get_task_res_ancestry(self, task_ids: List[str]) -> Dict[str, List[str]]:
+        """Retrieve the ordered ancestry of each TaskRes in `task_ids`."""
+        if len(task_ids) == 0:
+            return {}
+
+        placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
+        query = f"""
+            SELECT task_id, ancestor_id
+            FROM task_res_ancestry
+            WHERE task_id IN ({placeholders})
+            ORDER BY task_id, position;
+        """
+        data = {f"id_{index}": task_id for index, task_id in enumerate(task_ids)}
+
+        ancestry: Dict[str, List[str]] = {}
+        for row in self.query(query, data):
+            ancestry.setdefault(row["task_id"], []).append(row["ancestor_id"])
+        return ancestry
+
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
 
@@ -430,6 +599,31 @@ class SqliteState(State):
         result: Dict[str, int] = rows[0]
         return result["num"]
 
+    def wait_for_task_res(self, task_ids: Set[UUID], timeout: float) -> bool:
+        """Wait until TaskRes for any of the given task_ids are available."""
+        if len(task_ids) == 0:
+            return False
+
+        ancestors = [str(task_id) for task_id in task_ids]
+        placeholders = ",".join([f":id_{i}" for i in range(len(ancestors))])
+        query = f"""
+            SELECT EXISTS(
+                SELECT 1
+                FROM task_res_ancestry
+                JOIN task_res ON task_res.task_id = task_res_ancestry.task_id
+                WHERE task_res_ancestry.ancestor_id IN ({placeholders})
+                AND task_res_ancestry.position = 0
+                AND task_res.delivered_at IS NULL
+            ) AS available;
+        """
+        data = {f"id_{index}": ancestor for index, ancestor in enumerate(ancestors)}
+
+        with self.task_res_notifier.subscribe(ancestors) as event:
+            rows = self.query(query, data)
+            if rows[0]["available"]:
+                return True
+            return event.wait(timeout)
+
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
         ids = list(task_ids)
@@ -442,31 +636,105 @@ class SqliteState(State):
         # 1. Query: Delete task_ins which have a delivered task_res
         query_1 = f"""
             DELETE FROM task_ins
-            WHERE delivered_at != ''
+            WHERE delivered_at IS NOT NULL
             AND task_id IN (
-                SELECT ancestry
-                FROM task_res
-                WHERE ancestry IN ({placeholders})
-                AND delivered_at != ''
-            );
+                SELECT task_res_ancestry.ancestor_id
+                FROM task_res_ancestry
+                JOIN task_res ON task_res.task_id = task_res_ancestry.task_id
+                WHERE task_res_ancestry.ancestor_id IN ({placeholders})
+                AND task_res_ancestry.position = 0
+                AND task_res.delivered_at IS NOT NULL
+            )
+            RETURNING recordset_id;
         """
 
         # 2. Query: Delete delivered task_res to be run after 1. Query
+        # (their ancestry is deleted by `ON DELETE CASCADE`)
         query_2 = f"""
             DELETE FROM task_res
-            WHERE ancestry IN ({placeholders})
-            AND delivered_at != '';
+            WHERE delivered_at IS NOT NULL
+            AND task_id IN (
+                SELECT task_id
+                FROM task_res_ancestry
+                WHERE ancestor_id IN ({placeholders})
+                AND position = 0
+            )
+            RETURNING recordset_id;
         """
 
-        if self.conn is None:
+        conn = self.conn
+        if conn is None:
             raise AttributeError("State not intitialized")
 
-        with self.conn:
-            self.conn.execute(query_1, data)
-            self.conn.execute(query_2, data)
+        with self._serialized(), conn:
+            rows = conn.execute(query_1, data).fetchall()
+            rows += conn.execute(query_2, data).fetchall()
+
+            # 3. Query: Delete RecordSets which are no longer referenced by any task
+            recordset_ids = list({row["recordset_id"] for row in rows})
+            placeholders = ",".join([f":id_{i}" for i in range(len(recordset_ids))])
+            query_3 = f"""
+                DELETE FROM recordset
+                WHERE recordset_id IN ({placeholders})
+                AND NOT EXISTS (
+                    SELECT 1 FROM task_ins
+                    WHERE task_ins.recordset_id = recordset.recordset_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM task_res
+                    WHERE task_res.recordset_id = recordset.recordset_id
+                );
+            """
+            conn.execute(
+                query_3,
+                {f"id_{index}": rs_id for index, rs_id in enumerate(recordset_ids)},
+            )
 
         return None
 
+    def release_task_ins(self, task_ids: Set[UUID]) -> None:
+        """Mark delivered TaskIns as not delivered again."""
+        if len(task_ids) == 0:
+            return
+
+        placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
+        query = f"""
+            UPDATE task_ins
+            SET delivered_at = NULL
+            WHERE task_id IN ({placeholders})
+            AND delivered_at IS NOT NULL
+            RETURNING consumer_anonymous, consumer_node_id;
+        """
+        data = {f"id_{index}": str(task_id) for index, task_id in enumerate(task_ids)}
+
+        rows = self.query(query, data)
+        consumer_keys = {
+            None if row["consumer_anonymous"] else row["consumer_node_id"]
+            for row in rows
+        }
+        for consumer_key in consumer_keys:
+            self.task_ins_notifier.notify(consumer_key)
+
+    def release_task_res(self, task_ids: Set[UUID]) -> None:
+        """Mark delivered TaskRes as not delivered again."""
+        if len(task_ids) == 0:
+            return
+
+        placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
+        query = f"""
+            UPDATE task_res
+            SET delivered_at = NULL
+            WHERE task_id IN ({placeholders})
+            AND delivered_at IS NOT NULL
+            RETURNING task_id;
+        """
+        data = {f"id_{index}": str(task_id) for index, task_id in enumerate(task_ids)}
+
+        rows = self.query(query, data)
+        ancestry = self._get_task_res_ancestry([row["task_id"] for row in rows])
+        for ancestor in {ancestors[0] for ancestors in ancestry.values()}:
+            self.task_res_notifier.notify(ancestor)
+
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
         # Sample a random int64 as node_id
@@ -520,6 +788,11 @@ class SqliteState(State):
         return 0
 
 
+def _consumer_key(consumer: Node) -> Optional[int]:
+    """Return the key under which threads wait for TaskIns for `consumer`."""
+    return None if consumer.anonymous else consumer.node_id
+
+
 def dict_factory(
     cursor: sqlite3.Cursor,
     row: sqlite3.Row,
@@ -534,7 +807,7 @@ def dict_factory(
 
 def task_ins_to_dict(task_msg: TaskIns) -> Dict[str, Any]:
     """Transform TaskIns to dict."""
-    result = {
+    result: Dict[str, Any] = {
         "task_id": task_msg.task_id,
         "group_id": task_msg.group_id,
         "run_id": task_msg.run_id,
@@ -542,19 +815,20 @@ def task_ins_to_dict(task_msg: TaskIns) -> Dict[str, Any]:
         "producer_node_id": task_msg.task.producer.node_id,
         "consumer_anonymous": task_msg.task.consumer.anonymous,
         "consumer_node_id": task_msg.task.consumer.node_id,
-        "created_at": task_msg.task.created_at,
-        "delivered_at": task_msg.task.delivered_at,
-        "ttl": task_msg.task.ttl,
-        "ancestry": ",".join(task_msg.task.ancestry),
+        "created_at": to_timestamp(task_msg.task.created_at),
+        "delivered_at": to_timestamp(task_msg.task.delivered_at),
+        "ttl": to_timestamp(task_msg.task.ttl),
+        "ancestry": list(task_msg.task.ancestry),
         "task_type": task_msg.task.task_type,
         "recordset": task_msg.task.recordset.SerializeToString(),
     }
+    result["recordset_id"] = recordset_id(result["recordset"])
     return result
 
 
 def task_res_to_dict(task_msg: TaskRes) -> Dict[str, Any]:
     """Transform TaskRes to dict."""
-    result = {
+    result: Dict[str, Any] = {
         "task_id": task_msg.task_id,
         "group_id": task_msg.group_id,
         "run_id": task_msg.run_id,
@@ -562,13 +836,14 @@ def task_res_to_dict(task_msg: TaskRes) -> Dict[str, Any]:
         "producer_node_id": task_msg.task.producer.node_id,
         "consumer_anonymous": task_msg.task.consumer.anonymous,
         "consumer_node_id": task_msg.task.consumer.node_id,
-        "created_at": task_msg.task.created_at,
-        "delivered_at": task_msg.task.delivered_at,
-        "ttl": task_msg.task.ttl,
-        "ancestry": ",".join(task_msg.task.ancestry),
+        "created_at": to_timestamp(task_msg.task.created_at),
+        "delivered_at": to_timestamp(task_msg.task.delivered_at),
+        "ttl": to_timestamp(task_msg.task.ttl),
+        "ancestry": list(task_msg.task.ancestry),
         "task_type": task_msg.task.task_type,
         "recordset": task_msg.task.recordset.SerializeToString(),
     }
+    result["recordset_id"] = recordset_id(result["recordset"])
     return result
 
 
@@ -590,10 +865,10 @@ def dict_to_task_ins(task_dict: Dict[str, Any]) -> TaskIns:
                 node_id=task_dict["consumer_node_id"],
                 anonymous=task_dict["consumer_anonymous"],
             ),
-            created_at=task_dict["created_at"],
-            delivered_at=task_dict["delivered_at"],
-            ttl=task_dict["ttl"],
-            ancestry=task_dict["ancestry"].split(","),
+            created_at=from_timestamp(task_dict["created_at"]),
+            delivered_at=from_timestamp(task_dict["delivered_at"]),
+            ttl=from_timestamp(task_dict["ttl"]),
+            ancestry=task_dict.get("ancestry", []),
             task_type=task_dict["task_type"],
             recordset=recordset,
         ),
@@ -619,10 +894,10 @@ def dict_to_task_res(task_dict: Dict[str, Any]) -> TaskRes:
                 node_id=task_dict["consumer_node_id"],
                 anonymous=task_dict["consumer_anonymous"],
             ),
-            created_at=task_dict["created_at"],
-            delivered_at=task_dict["delivered_at"],
-            ttl=task_dict["ttl"],
-            ancestry=task_dict["ancestry"].split(","),
+            created_at=from_timestamp(task_dict["created_at"]),
+            delivered_at=from_timestamp(task_dict["delivered_at"]),
+            ttl=from_timestamp(task_dict["ttl"]),
+            ancestry=task_dict.get("ancestry", []),
             task_type=task_dict["task_type"],
             recordset=recordset,
         ),
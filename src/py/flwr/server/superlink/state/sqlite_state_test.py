@@ -15,10 +15,48 @@
 """Test for utility functions."""
 # pylint: disable=invalid-name, disable=R0904
 
+import sqlite3
+import tempfile
 import unittest
+from typing import List, Set
+from uuid import UUID, uuid4
 
-from flwr.server.superlink.state.sqlite_state import task_ins_to_dict
-from flwr.server.superlink.state.state_test import create_task_ins
+from flwr.common import now
+from flwr.server.superlink.state.sqlite_schema import (
+    SCHEMA_VERSION,
+    _create_schema_v1,
+    from_timestamp,
+    migrate,
+    to_timestamp,
+)
+from flwr.server.superlink.state.sqlite_state import (
+    SqliteState,
+    dict_factory,
+    task_ins_to_dict,
+)
+from flwr.server.superlink.state.state_test import create_task_ins, create_task_res
+
+# Schema of databases created before schema versioning was introduced
+SQL_CREATE_LEGACY_TABLES = """
+CREATE TABLE run(run_id INTEGER UNIQUE);
+CREATE TABLE node(node_id INTEGER UNIQUE);
+CREATE TABLE task_ins(
+    task_id TEXT UNIQUE, group_id TEXT, run_id INTEGER,
+    producer_anonymous BOOLEAN, producer_node_id INTEGER,
+    consumer_anonymous BOOLEAN, consumer_node_id INTEGER,
+    created_at TEXT, delivered_at TEXT, ttl TEXT, ancestry TEXT,
+    task_type TEXT, recordset BLOB,
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+CREATE TABLE task_res(
+    task_id TEXT UNIQUE, group_id TEXT, run_id INTEGER,
+    producer_anonymous BOOLEAN, producer_node_id INTEGER,
+    consumer_anonymous BOOLEAN, consumer_node_id INTEGER,
+    created_at TEXT, delivered_at TEXT, ttl TEXT, ancestry TEXT,
+    task_type TEXT, recordset BLOB,
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
 
 
 class SqliteStateTest(unittest.TestCase):
@@ -42,6 +80,7 @@ class SqliteStateTest(unittest.TestCase):
             "ancestry",
             "task_type",
             "recordset",
+            "recordset_id",
         ]
 
         # Execute
@@ -51,6 +90,185 @@ class SqliteStateTest(unittest.TestCase):
         for key in expected_keys:
             assert key in result
 
+    def test_timestamp_roundtrip(self) -> None:
+        """Convert ISO 8601 dates to integer timestamps and back."""
+        # Prepare
+        date = now().isoformat()
+
+        # Execute
+        timestamp = to_timestamp(date)
+
+        # Assert
+        assert isinstance(timestamp, int)
+        assert from_timestamp(timestamp) == date
+        assert to_timestamp("") is None
+        assert from_timestamp(None) == ""
+
+    def test_get_task_ins_uses_index(self) -> None:
+        """Check that retrieving TaskIns does not scan or read `task_ins`."""
+        # Prepare
+        state = SqliteState(":memory:")
+        state.initialize()
+
+        for anonymous, node_id in [(0, 1), (1, 0)]:
+            # Execute
+            plan = state.query(
+                f"""
+                EXPLAIN QUERY PLAN
+                SELECT rowid FROM task_ins
+                WHERE consumer_anonymous == {anonymous}
+                AND consumer_node_id == {node_id}
+                AND delivered_at IS NULL
+                ORDER BY rowid;
+                """
+            )
+
+            # Assert
+            details = " ".join(row["detail"] for row in plan)
+            assert "COVERING INDEX idx_task_ins_consumer" in details
+            assert "TEMP B-TREE" not in details
+
+    def test_identical_recordsets_stored_once(self) -> None:
+        """Store the RecordSet shared by multiple TaskIns only once."""
+        # Prepare
+        state = SqliteState(":memory:")
+        state.initialize()
+        run_id = state.create_run()
+
+        # Execute
+        task_ids = [
+            state.store_task_ins(
+                create_task_ins(
+                    consumer_node_id=node_id, anonymous=False, run_id=run_id
+                )
+            )
+            for node_id in (1, 2, 3)
+        ]
+        num_recordsets = state.query("SELECT COUNT(*) AS num FROM recordset;")
+
+        # Assert
+        assert all(task_ids)
+        assert num_recordsets[0]["num"] == 1
+        assert len(state.get_task_ins(node_id=2, limit=None)) == 1
+
+    def test_delete_tasks_deletes_unreferenced_recordsets(self) -> None:
+        """Delete RecordSets once the last task referencing them is deleted."""
+        # Prepare
+        state = SqliteState(":memory:")
+        state.initialize()
+        run_id = state.create_run()
+        task_ins_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        assert task_ins_id
+        state.get_task_ins(node_id=1, limit=None)
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(task_ins_id)],
+                run_id=run_id,
+            )
+        )
+        state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+        # Execute
+        state.delete_tasks(task_ids={task_ins_id})
+        num_recordsets = state.query("SELECT COUNT(*) AS num FROM recordset;")
+
+        # Assert
+        assert state.num_task_ins() == 0
+        assert state.num_task_res() == 0
+        assert num_recordsets[0]["num"] == 0
+
+    def test_create_schema_matches_migrated_schema(self) -> None:
+        """Create new databases like databases migrated from the first version."""
+        # Prepare
+        migrated = sqlite3.connect(":memory:")
+        migrated.row_factory = dict_factory
+        migrated.execute("BEGIN;")
+        _create_schema_v1(migrated)
+        migrated.execute("PRAGMA user_version = 1;")
+        migrated.commit()
+        created = sqlite3.connect(":memory:")
+        created.row_factory = dict_factory
+
+        # Execute
+        migrate(migrated)
+        migrate(created)
+
+        # Assert
+        for table in ("task_ins", "task_res"):
+            assert _columns(created, table) == _columns(migrated, table)
+            assert "recordset" not in _columns(created, table)
+        assert _indices(created) == _indices(migrated)
+
+    def test_migrate_legacy_database(self) -> None:
+        """Migrate a database which was created without schema version."""
+        # Prepare
+        with tempfile.NamedTemporaryFile() as tmp_file:
+            run_id, created_at = 1, now().isoformat()
+            task_ins_id, task_res_id = str(uuid4()), str(uuid4())
+            task = {
+                "group_id": "",
+                "run_id": run_id,
+                "producer_anonymous": True,
+                "producer_node_id": 0,
+                "consumer_anonymous": True,
+                "consumer_node_id": 0,
+                "created_at": created_at,
+                "ttl": created_at,
+                "task_type": "mock",
+                "recordset": b"",
+            }
+            conn = sqlite3.connect(tmp_file.name)
+            conn.executescript(SQL_CREATE_LEGACY_TABLES)
+            conn.execute("INSERT INTO run VALUES(?);", (run_id,))
+            insert = (
+                "INSERT INTO {} VALUES(:task_id, :group_id, :run_id, "
+                ":producer_anonymous, :producer_node_id, :consumer_anonymous, "
+                ":consumer_node_id, :created_at, :delivered_at, :ttl, :ancestry, "
+                ":task_type, :recordset);"
+            )
+            conn.execute(
+                insert.format("task_ins"),
+                {**task, "task_id": task_ins_id, "delivered_at": "", "ancestry": ""},
+            )
+            conn.execute(
+                insert.format("task_res"),
+                {
+                    **task,
+                    "task_id": task_res_id,
+                    "delivered_at": "",
+                    "ancestry": task_ins_id,
+                },
+            )
+            conn.commit()
+            conn.close()
+
+            # Execute
+            state = SqliteState(tmp_file.name)
+            state.initialize()
+            version = state.query("PRAGMA user_version;")[0]["user_version"]
+            task_ins_list = state.get_task_ins(node_id=None, limit=None)
+            task_res_list = state.get_task_res({UUID(task_ins_id)}, limit=None)
+
+        # Assert
+        assert version == SCHEMA_VERSION
+        assert [t.task_id for t in task_ins_list] == [task_ins_id]
+        assert [t.task_id for t in task_res_list] == [task_res_id]
+        assert task_res_list[0].task.created_at == created_at
+        assert list(task_res_list[0].task.ancestry) == [task_ins_id]
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row["name"] for row in conn.execute(f"PRAGMA table_info({table});")]
+
+
+def _indices(conn: sqlite3.Connection) -> Set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_schema WHERE type = 'index';")
+    return {row["name"] for row in rows}
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -19,6 +19,7 @@ import abc
 from typing import List, Optional, Set
 from uuid import UUID
 
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 
 
@@ -47,6 +48,26 @@ class State(abc.ABC):
         storing the `task_ins` MUST fail.
         """
 
+    @abc.abstractmethod
+    def store_task_ins_broadcast(
+        self, task_ins: TaskIns, consumers: List[Node]
+    ) -> List[Optional[UUID]]:
+        """Store one TaskIns for each consumer.
+
+        Usually, the Driver API calls this to schedule the same instructions (e.g., the
+        same global model) on many nodes.
+
+        Behaves like calling `store_task_ins` once for each node in `consumers`, with
+        `task_ins.task.consumer` set to that node, but the RecordSet of `task_ins` is
+        stored only once and shared by all resulting TaskIns. Returns the `task_id`
+        (UUID) of each TaskIns in the order of `consumers`, or `None` for each TaskIns
+        which could not be stored.
+
+        Constraints
+        -----------
+        Each TaskIns MUST satisfy the constraints of `store_task_ins`.
+        """
+
     @abc.abstractmethod
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
@@ -75,6 +96,18 @@ class State(abc.ABC):
         `limit` is set, it has to be greater zero.
         """
 
+    @abc.abstractmethod
+    def wait_for_task_ins(self, node_id: Optional[int], timeout: float) -> bool:
+        """Wait until TaskIns for the given node_id are available.
+
+        Usually, the Fleet API calls this method to long-poll for instructions instead
+        of letting Nodes repeatedly call `get_task_ins`.
+
+        Returns `True` as soon as an undelivered TaskIns which `get_task_ins` would
+        return for `node_id` exists (either already or after it has been stored), and
+        `False` if none became available within `timeout` seconds.
+        """
+
     @abc.abstractmethod
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
@@ -113,6 +146,20 @@ class State(abc.ABC):
         available. If `limit` is set, it has to be greater zero.
         """
 
+    @abc.abstractmethod
+    def wait_for_task_res(self, task_ids: Set[UUID], timeout: float) -> bool:
+        """Wait until TaskRes for any of the given task_ids are available.
+
+        Usually, the Driver API calls this method to long-poll for results instead of
+        repeatedly calling `get_task_res`.
+
+        Returns `True` as soon as an undelivered TaskRes replying to one of `task_ids`
+        exists (either already or after `store_task_res` stored it), and `False` if
+        none became available within `timeout` seconds. Returning `True` does not
+        guarantee that a subsequent `get_task_res` finds the TaskRes, another caller
+        might have retrieved it in the meantime.
+        """
+
     @abc.abstractmethod
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
@@ -131,6 +178,27 @@ class State(abc.ABC):
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
 
+    @abc.abstractmethod
+    def release_task_ins(self, task_ids: Set[UUID]) -> None:
+        """Mark delivered TaskIns as not delivered again.
+
+        Usually, the Fleet API calls this method for TaskIns returned by
+        `get_task_ins` which could not be sent to the node, so that they are returned
+        by the next call to `get_task_ins`. TaskIns which do not exist or have not
+        been delivered are ignored.
+        """
+
+    @abc.abstractmethod
+    def release_task_res(self, task_ids: Set[UUID]) -> None:
+        """Mark delivered TaskRes as not delivered again.
+
+        Usually, the Driver API calls this method for TaskRes returned by
+        `get_task_res` which could not be sent to the Driver, so that they are
+        returned by the next call to `get_task_res`. `task_ids` are the IDs of the
+        TaskRes themselves, not of their TaskIns. TaskRes which do not exist or have
+        not been delivered are ignored.
+        """
+
     @abc.abstractmethod
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
@@ -15,6 +15,7 @@
 """Factory class that creates State instances."""
 
 
+import threading
 from logging import DEBUG
 from typing import Optional
 
@@ -26,20 +27,30 @@ from .state import State
 
 
 class StateFactory:
-    """Factory class that creates State instances."""
+    """Factory class that creates State instances.
+
+    The State instance is created (and, in case of `SqliteState`, its schema is
+    initialized) on first use and shared by all subsequent callers.
+    """
 
     def __init__(self, database: str) -> None:
         self.database = database
         self.state_instance: Optional[State] = None
+        self.lock = threading.Lock()
 
     def state(self) -> State:
         """Return a State instance and create it, if necessary."""
+        with self.lock:
+            if self.state_instance is None:
+                self.state_instance = self._create_state()
+        return self.state_instance
+
+    def _create_state(self) -> State:
+        """Create a new State instance."""
         # InMemoryState
         if self.database == ":flwr-in-memory-state:":
-            if self.state_instance is None:
-                self.state_instance = InMemoryState()
             log(DEBUG, "Using InMemoryState")
-            return self.state_instance
+            return InMemoryState()
 
         # SqliteState
         state = SqliteState(self.database)
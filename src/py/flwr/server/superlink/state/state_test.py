@@ -15,12 +15,14 @@
 """Tests all state implemenations have to conform to."""
 # pylint: disable=invalid-name, disable=R0904
 
+import sqlite3
 import tempfile
+import threading
 import unittest
 from abc import abstractmethod
 from datetime import datetime, timezone
-from typing import List
-from uuid import uuid4
+from typing import List, Optional
+from uuid import UUID, uuid4
 
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
 from flwr.proto.recordset_pb2 import RecordSet  # pylint: disable=E0611
@@ -302,6 +304,271 @@ class StateTest(unittest.TestCase):
         retrieved_task_res = task_res_list[0]
         assert retrieved_task_res.task_id == str(task_res_uuid)
 
+    def test_store_task_ins_broadcast(self) -> None:
+        """Store one TaskIns for multiple consumers and retrieve it for each."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins = create_task_ins(consumer_node_id=0, anonymous=True, run_id=run_id)
+        task_ins.task.recordset.configs["cfg"].data["key"].sint64 = 61016
+        consumers = [
+            Node(node_id=1, anonymous=False),
+            Node(node_id=0, anonymous=False),  # Invalid
+            Node(node_id=2, anonymous=False),
+        ]
+
+        # Execute
+        task_ids = state.store_task_ins_broadcast(task_ins, consumers)
+        task_ins_list_1 = state.get_task_ins(node_id=1, limit=None)
+        task_ins_list_2 = state.get_task_ins(node_id=2, limit=None)
+
+        # Assert
+        assert task_ids[0] is not None and task_ids[2] is not None
+        assert task_ids[1] is None
+        assert state.num_task_ins() == 2
+        for task_id, task_ins_list, node_id in (
+            (task_ids[0], task_ins_list_1, 1),
+            (task_ids[2], task_ins_list_2, 2),
+        ):
+            assert len(task_ins_list) == 1
+            assert task_ins_list[0].task_id == str(task_id)
+            assert task_ins_list[0].task.consumer.node_id == node_id
+            recordset = task_ins_list[0].task.recordset
+            assert recordset.configs["cfg"].data["key"].sint64 == 61016
+
+    def test_task_ins_get_with_limit(self) -> None:
+        """Retrieve TaskIns in insertion order, at most `limit` at a time."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ids = [
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+            for _ in range(3)
+        ]
+
+        # Execute
+        task_ins_list_0 = state.get_task_ins(node_id=1, limit=2)
+        task_ins_list_1 = state.get_task_ins(node_id=1, limit=2)
+
+        # Assert
+        assert [t.task_id for t in task_ins_list_0] == [str(i) for i in task_ids[:2]]
+        assert [t.task_id for t in task_ins_list_1] == [str(task_ids[2])]
+
+    def test_task_res_get_with_limit(self) -> None:
+        """Retrieve TaskRes for multiple task_ids, at most `limit` at a time."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_ids = [uuid4(), uuid4()]
+        for task_ins_id in task_ins_ids:
+            for _ in range(2):
+                state.store_task_res(
+                    create_task_res(
+                        producer_node_id=1,
+                        anonymous=False,
+                        ancestry=[str(task_ins_id)],
+                        run_id=run_id,
+                    )
+                )
+
+        # Execute
+        task_res_list_0 = state.get_task_res(task_ids=set(task_ins_ids), limit=3)
+        task_res_list_1 = state.get_task_res(task_ids=set(task_ins_ids), limit=3)
+
+        # Assert
+        assert len(task_res_list_0) == 3
+        assert len(task_res_list_1) == 1
+        assert {t.task_id for t in task_res_list_0}.isdisjoint(
+            {t.task_id for t in task_res_list_1}
+        )
+
+    def test_release_task_ins(self) -> None:
+        """Released TaskIns are delivered again, before later TaskIns."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ids = [
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+            for _ in range(3)
+        ]
+        delivered = state.get_task_ins(node_id=1, limit=2)
+
+        # Execute
+        state.release_task_ins({UUID(task_ins.task_id) for task_ins in delivered})
+        task_ins_list = state.get_task_ins(node_id=1, limit=None)
+
+        # Assert
+        assert [t.task_id for t in task_ins_list] == [str(i) for i in task_ids]
+        assert all(t.task.delivered_at != "" for t in task_ins_list)
+
+    def test_release_task_res(self) -> None:
+        """Released TaskRes are delivered again and not deleted."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        assert task_ins_id
+        state.get_task_ins(node_id=1, limit=None)
+        task_res_id = state.store_task_res(
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(task_ins_id)],
+                run_id=run_id,
+            )
+        )
+        assert task_res_id
+        state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+        # Execute
+        state.release_task_res({task_res_id})
+        state.delete_tasks({task_ins_id})
+        available = state.wait_for_task_res(task_ids={task_ins_id}, timeout=0.0)
+        task_res_list = state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+        # Assert
+        assert available
+        assert [t.task_id for t in task_res_list] == [str(task_res_id)]
+        assert state.num_task_ins() == 1
+
+    def test_wait_for_task_ins_timeout(self) -> None:
+        """Test waiting for TaskIns which do not arrive."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=2, anonymous=False, run_id=run_id)
+        )
+
+        # Execute
+        available = state.wait_for_task_ins(node_id=1, timeout=0.01)
+
+        # Assert
+        assert not available
+
+    def test_wait_for_task_ins_available(self) -> None:
+        """Test waiting for TaskIns which have already been stored."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=0, anonymous=True, run_id=run_id)
+        )
+
+        # Execute
+        available = state.wait_for_task_ins(node_id=None, timeout=0.0)
+
+        # Assert
+        assert available
+
+    def test_wait_for_task_ins_notified_by_store_task_ins(self) -> None:
+        """Test that storing a TaskIns wakes up a thread waiting for it."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins = create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        timer = threading.Timer(0.05, state.store_task_ins, args=(task_ins,))
+
+        # Execute
+        timer.start()
+        available = state.wait_for_task_ins(node_id=1, timeout=10.0)
+        timer.join()
+
+        # Assert
+        assert available
+        assert len(state.get_task_ins(node_id=1, limit=None)) == 1
+
+    def test_wait_for_task_ins_notified_by_store_task_ins_broadcast(self) -> None:
+        """Test that storing a broadcast TaskIns wakes up a thread waiting for it."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins = create_task_ins(consumer_node_id=0, anonymous=True, run_id=run_id)
+        consumers = [Node(node_id=1, anonymous=False), Node(node_id=2, anonymous=False)]
+        timer = threading.Timer(
+            0.05, state.store_task_ins_broadcast, args=(task_ins, consumers)
+        )
+
+        # Execute
+        timer.start()
+        available = state.wait_for_task_ins(node_id=2, timeout=10.0)
+        timer.join()
+
+        # Assert
+        assert available
+        assert len(state.get_task_ins(node_id=2, limit=None)) == 1
+
+    def test_wait_for_task_res_timeout(self) -> None:
+        """Test waiting for TaskRes which do not arrive."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_id = uuid4()
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(uuid4())],
+                run_id=run_id,
+            )
+        )
+
+        # Execute
+        available = state.wait_for_task_res(task_ids={task_ins_id}, timeout=0.01)
+
+        # Assert
+        assert not available
+
+    def test_wait_for_task_res_available(self) -> None:
+        """Test waiting for TaskRes which have already been stored."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_id = uuid4()
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(task_ins_id)],
+                run_id=run_id,
+            )
+        )
+
+        # Execute
+        available = state.wait_for_task_res(task_ids={task_ins_id}, timeout=0.0)
+
+        # Assert
+        assert available
+
+    def test_wait_for_task_res_notified_by_store_task_res(self) -> None:
+        """Test that storing a TaskRes wakes up a thread waiting for it."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_id = uuid4()
+        task_res = create_task_res(
+            producer_node_id=1,
+            anonymous=False,
+            ancestry=[str(task_ins_id)],
+            run_id=run_id,
+        )
+        timer = threading.Timer(0.05, state.store_task_res, args=(task_res,))
+
+        # Execute
+        timer.start()
+        available = state.wait_for_task_res(task_ids={task_ins_id}, timeout=10.0)
+        timer.join()
+
+        # Assert
+        assert available
+        assert len(state.get_task_res(task_ids={task_ins_id}, limit=None)) == 1
+
     def test_node_ids_initial_state(self) -> None:
         """Test retrieving all node_ids and empty initial state."""
         # Prepare
@@ -456,6 +723,44 @@ class InMemoryStateTest(StateTest):
         """Return InMemoryState."""
         return InMemoryState()
 
+    def test_concurrent_store_and_get_task_ins(self) -> None:
+        """Deliver each TaskIns exactly once under concurrent access."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run()
+        num_nodes, num_tasks = 8, 50
+        delivered: List[TaskIns] = []
+
+        def _store(node_id: int) -> None:
+            for _ in range(num_tasks):
+                state.store_task_ins(
+                    create_task_ins(
+                        consumer_node_id=node_id, anonymous=False, run_id=run_id
+                    )
+                )
+
+        def _pull(node_id: int) -> None:
+            for _ in range(num_tasks):
+                delivered.extend(state.get_task_ins(node_id=node_id, limit=None))
+
+        # Execute
+        threads = [
+            threading.Thread(target=target, args=(node_id,))
+            for node_id in range(1, num_nodes + 1)
+            for target in (_store, _pull)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for node_id in range(1, num_nodes + 1):
+            delivered.extend(state.get_task_ins(node_id=node_id, limit=None))
+
+        # Assert
+        assert len(delivered) == num_nodes * num_tasks
+        assert len({task_ins.task_id for task_ins in delivered}) == len(delivered)
+        assert state.num_task_ins() == num_nodes * num_tasks
+
 
 class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
     """Test SqliteState implemenation with in-memory database."""
@@ -477,7 +782,7 @@ class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 8
+        assert len(result) == 16
 
 
 class SqliteFileBasedTest(StateTest, unittest.TestCase):
@@ -502,7 +807,40 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 8
+        assert len(result) == 16
+
+    def test_journal_mode_wal(self) -> None:
+        """Test that file-based databases use write-ahead logging."""
+        # Prepare
+        state = self.state_factory()
+
+        # Execute
+        result = state.query("PRAGMA journal_mode;")
+
+        # Assert
+        assert result[0]["journal_mode"] == "wal"
+
+    def test_connection_per_thread(self) -> None:
+        """Test that each thread reuses its own connection."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run()
+        conns: List[Optional[sqlite3.Connection]] = []
+        node_ids: List[int] = []
+
+        def _create_node() -> None:
+            conns.append(state.conn)
+            node_ids.append(state.create_node())
+
+        # Execute
+        thread = threading.Thread(target=_create_node)
+        thread.start()
+        thread.join()
+
+        # Assert
+        assert state.conn is state.conn
+        assert conns[0] is not state.conn
+        assert state.get_nodes(run_id) == set(node_ids)
 
 
 if __name__ == "__main__":